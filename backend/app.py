@@ -1,17 +1,63 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
 import logging
-from typing import Dict, Optional, Any, Tuple
-from odoo_client import OdooClient
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+from odoo_client import COOPERATIVE_MEMBER_DOMAIN, SHIFT_HISTORY_STATES, OdooClient
+from fetch_plan import FetchPlan
+import counter_sources
+from counter_engine import replay_counters
+from counter_checkpoints import CounterCheckpointStore, fetch_with_checkpoint
+from history_segments import (
+    FINGERPRINT_SOURCES,
+    REGISTRATION_LINK_FIELDS,
+    HistorySegmentStore,
+    config_key,
+    fingerprint_domain,
+    split_into_cycles,
+)
+from barcode_table import BARCODE_STATUS_FIELDS, BarcodeTable, compact_status
+from member_index import SUBSTRING_MIN_LENGTH, MemberNameIndex, fold
+from partner_sync import PartnerSync
+from response_cache import ResponseCache
+from share_ledger import ShareLedger
+from shift_metadata import shift_type_kind
+from timeline import Timeline
+from history_events import (
+    CounterEvent,
+    HistoryEvent,
+    HistoryJSONProvider,
+    LeaveEndEvent,
+    LeaveStartEvent,
+    PurchaseEvent,
+    ShiftEvent,
+    event_from_json,
+    iter_json,
+    locate_events,
+)
+from photo_cache import (
+    ORIGINAL_FORMAT,
+    PHOTO_FORMATS,
+    PHOTO_SIZES,
+    PILLOW_AVAILABLE,
+    PhotoCache,
+    is_photo_version,
+    photo_version,
+    render_photo,
+    sniff_format,
+)
 from utils import (
     extract_id,
     extract_name,
     is_valid_many2one,
+    validate_non_negative_int,
     validate_positive_int,
-    get_last_n_cycles_date_range,
 )
+from cycle_calculator import CycleCalendar
 
 load_dotenv()
 
@@ -24,16 +70,121 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__, static_folder='static', static_url_path='')
+# History events are __slots__ records: the default JSON encoding converts
+# them with their to_json
+app.json = HistoryJSONProvider(app)
 CORS(app)
 
 odoo = OdooClient()
 
+# How counter events are fetched for the running totals: 'full' replays every
+# event the member ever had, 'read_group' only fetches the display window and
+# gets the opening balance with one aggregate query, 'checkpoint' carries the
+# opening balance forward from a local per-member checkpoint (see
+# counter_sources and counter_checkpoints).
+COUNTER_AGGREGATION_MODE = os.getenv("COUNTER_AGGREGATION_MODE", "full").lower()
+if COUNTER_AGGREGATION_MODE not in counter_sources.COUNTER_MODES:
+    raise ValueError(
+        f"COUNTER_AGGREGATION_MODE must be one of "
+        f"{', '.join(counter_sources.COUNTER_MODES)}, got {COUNTER_AGGREGATION_MODE}"
+    )
+checkpoint_store = (
+    CounterCheckpointStore() if COUNTER_AGGREGATION_MODE == "checkpoint" else None
+)
+
+# Events of closed cycles stored per member and cycle, so that history
+# requests only fetch the current and previous cycle (see history_segments)
+HISTORY_SEGMENTS = os.getenv("HISTORY_SEGMENTS", "false").lower() in ("1", "true", "yes")
+history_segment_store = HistorySegmentStore() if HISTORY_SEGMENTS else None
+
+# Member search page size (lean mode default) and upper bound
+MEMBER_SEARCH_LIMIT = int(os.getenv("MEMBER_SEARCH_LIMIT", 50))
+MEMBER_SEARCH_MAX_LIMIT = int(os.getenv("MEMBER_SEARCH_MAX_LIMIT", 200))
+
+# History page size in cycles (?cycles=) and upper bound
+HISTORY_CYCLES = int(os.getenv("HISTORY_CYCLES", 13))
+HISTORY_MAX_CYCLES = int(os.getenv("HISTORY_MAX_CYCLES", 52))
+
+# Maximum number of members per batch status request
+MEMBER_STATUS_BATCH_MAX = int(os.getenv("MEMBER_STATUS_BATCH_MAX", 100))
+
+# Local snapshot of small res.partner fields, polled by write_date, feeding
+# the accent-insensitive name index used by member search (see member_index)
+MEMBER_SEARCH_INDEX = os.getenv("MEMBER_SEARCH_INDEX", "true").lower() in ("1", "true", "yes")
+partner_sync = PartnerSync(
+    odoo,
+    ["name"] + BARCODE_STATUS_FIELDS,
+    refresh_interval=float(os.getenv("PARTNER_SYNC_INTERVAL", 60)),
+    domain=COOPERATIVE_MEMBER_DOMAIN,
+)
+member_index = MemberNameIndex()
+partner_sync.subscribe(member_index.apply_changes)
+# Barcode -> status table for shop-entrance scans (see barcode_table)
+BARCODE_TABLE = os.getenv("BARCODE_TABLE", "true").lower() in ("1", "true", "yes")
+barcode_table = BarcodeTable()
+partner_sync.subscribe(barcode_table.apply_changes)
+
+# Resized member photos (see photo_cache); versioned URLs are immutable
+photo_cache = PhotoCache(os.getenv("PHOTO_CACHE_DIR") or None)
+PHOTO_MAX_AGE = int(os.getenv("PHOTO_MAX_AGE", 86400))
+PHOTO_IMMUTABLE_MAX_AGE = 31536000
+
+# Local snapshot of every member's share information (see share_ledger),
+# used for reporting and to answer share lookups without Odoo
+SHARE_LEDGER = os.getenv("SHARE_LEDGER", "false").lower() in ("1", "true", "yes")
+share_ledger = (
+    ShareLedger(
+        odoo,
+        refresh_interval=float(os.getenv("SHARE_LEDGER_REFRESH_INTERVAL", 900)),
+        page_size=int(os.getenv("SHARE_LEDGER_PAGE_SIZE", 2000)),
+    )
+    if SHARE_LEDGER
+    else None
+)
+
+# Stale-while-revalidate cache of member history/status/shares responses
+# (see response_cache); off unless RESPONSE_CACHE=true, since responses may
+# then be up to RESPONSE_CACHE_HARD_TTL seconds old
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "false").lower() in ("1", "true", "yes")
+response_cache = ResponseCache(
+    soft_ttl=float(os.getenv("RESPONSE_CACHE_SOFT_TTL", 30)),
+    hard_ttl=float(os.getenv("RESPONSE_CACHE_HARD_TTL", 600)) if RESPONSE_CACHE else 0,
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 2000)),
+)
+
+# Bounded pool shared by all requests for concurrent Odoo round trips
+fetch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ODOO_FETCH_WORKERS", 8)),
+    thread_name_prefix="odoo-fetch",
+)
+
 
 @app.route("/api/health", methods=["GET"])
 def health():
     return jsonify({"status": "ok"})
 
 
+@app.route("/api/stats", methods=["GET"])
+def get_stats():
+    """
+    Get backend runtime statistics.
+
+    Returns:
+        JSON object with:
+        - odoo_pool: Odoo connection pool usage (checkouts, reuse, waits, ...)
+        - caches: In-process cache hit/miss counters
+    """
+    caches = dict(
+        odoo.get_cache_stats(),
+        partner_sync=partner_sync.stats(),
+        barcode_table={"ready": barcode_table.ready, "size": len(barcode_table)},
+        responses=response_cache.stats(),
+    )
+    if share_ledger is not None:
+        caches["share_ledger"] = share_ledger.stats()
+    return jsonify({"odoo_pool": odoo.get_transport_stats(), "caches": caches})
+
+
 @app.route("/api/odoo/test-connection", methods=["GET"])
 def test_odoo_connection():
     try:
@@ -83,8 +234,6 @@ def get_cycle_config():
         config = odoo.get_shift_config()
 
         # Adjust week_a_date to be one cycle earlier
-        from datetime import datetime, timedelta
-
         weeks_per_cycle = config["weeks_per_cycle"]
         original_week_a = datetime.strptime(config["week_a_date"], "%Y-%m-%d")
         adjusted_week_a = (original_week_a - timedelta(weeks=weeks_per_cycle)).strftime(
@@ -110,8 +259,94 @@ def get_cycle_config():
         ), 200  # Still return 200 with defaults
 
 
+def photo_url(member_id: int, write_date: Optional[str], size: str = "small") -> str:
+    """Versioned URL of a member photo (changes whenever the partner is written)."""
+    return f"/api/member/{member_id}/photo?size={size}&v={photo_version(write_date)}"
+
+
+def format_search_result(member: Dict, full: bool = False) -> Dict:
+    """
+    Format a res.partner search result for the API.
+
+    Args:
+        member: Partner record from search_members_by_name
+        full: Include the image and the raw Odoo record (full search mode)
+
+    Returns:
+        Dictionary with id, name, barcode_base, address, phone and photo_url
+        (plus image and raw in full mode)
+    """
+    address_parts = [
+        member.get("street"),
+        member.get("street2"),
+        member.get("zip"),
+        member.get("city"),
+    ]
+    address = ", ".join(filter(None, address_parts))
+
+    result = {
+        "id": member.get("id"),
+        "name": member.get("name"),
+        "barcode_base": member.get("barcode_base"),
+        "address": address if address else None,
+        "phone": member.get("phone") or member.get("mobile") or None,
+        "photo_url": photo_url(member.get("id"), member.get("write_date")),
+    }
+    if full:
+        image = (
+            member.get("image_small")
+            or member.get("image_medium")
+            or member.get("image")
+        )
+        result["image"] = image if image else None
+        result["raw"] = member
+    return result
+
+
+def search_member_index(name: str, limit: Optional[int], offset: int) -> Optional[Tuple[List[int], int]]:
+    """
+    Search the local member name index.
+
+    Returns:
+        Tuple of (ranked page of partner IDs, total matches), or None if the
+        index is disabled, could not be loaded or does not match substrings
+        of a query this short (search then uses Odoo)
+    """
+    if not MEMBER_SEARCH_INDEX or len(fold(name)) < SUBSTRING_MIN_LENGTH:
+        return None
+    if not partner_sync.loaded:
+        # The full load runs in the background, never inside a request
+        partner_sync.warm_up()
+        return None
+    try:
+        partner_sync.ensure_fresh(wait=False)
+    except Exception as e:
+        logger.warning(f"Member name index unavailable, searching Odoo: {e}")
+        return None
+    if not member_index.ready:
+        return None
+    return member_index.search(name, limit=limit, offset=offset)
+
+
 @app.route("/api/members/search", methods=["GET"])
 def search_members():
+    """
+    Search members by name.
+
+    Query parameters:
+        name: Name fragment (required, max 100 characters)
+        limit: Page size (default MEMBER_SEARCH_LIMIT, max MEMBER_SEARCH_MAX_LIMIT);
+               unbounded by default in full mode
+        offset: Number of results to skip (default 0)
+        mode: 'lean' (default, no images or raw record) or 'full'
+
+    Matching and ranking come from the local accent-insensitive name index
+    (Odoo is only queried to read the fields of the returned page); if the
+    index is unavailable, Odoo's name ilike search is used instead.
+
+    Returns:
+        JSON object with members, total (all matches), limit and offset
+    """
     name = request.args.get("name", "")
     if not name:
         return jsonify({"error": "Name parameter is required"}), 400
@@ -120,50 +355,296 @@ def search_members():
     if len(name) > 100:
         return jsonify({"error": "Name parameter too long (max 100 characters)"}), 400
 
+    mode = request.args.get("mode", "lean")
+    if mode not in ("lean", "full"):
+        return jsonify({"error": "mode must be 'lean' or 'full'"}), 400
+    full = mode == "full"
+
     try:
-        members = odoo.search_members_by_name(name)
+        limit = request.args.get("limit")
+        if limit is not None:
+            limit = validate_positive_int(limit, "limit")
+            if limit > MEMBER_SEARCH_MAX_LIMIT:
+                return jsonify({"error": f"limit must be at most {MEMBER_SEARCH_MAX_LIMIT}"}), 400
+        elif not full:
+            limit = MEMBER_SEARCH_LIMIT
+        offset = validate_non_negative_int(request.args.get("offset", "0"), "offset")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        indexed = search_member_index(name, limit, offset)
+        if indexed is not None:
+            member_ids, total = indexed
+            members = odoo.read_members(member_ids, with_images=full)
+        else:
+            plan = FetchPlan(fetch_executor, label=f"search '{name}'")
+            plan.add(
+                "members",
+                odoo.search_members_by_name,
+                name,
+                limit=limit,
+                offset=offset,
+                with_images=full,
+            )
+            if limit is not None or offset:
+                plan.add("total", odoo.count_members_by_name, name)
+            fetched = plan.run()
+            members = fetched["members"]
+            total = fetched.get("total", len(members))
+
         logger.info(f"Processing {len(members)} members for search query: {name}")
         result = []
         for member in members:
             logger.debug(f"Member data: {member}")
-            address_parts = [
-                member.get("street"),
-                member.get("street2"),
-                member.get("zip"),
-                member.get("city"),
-            ]
-            address = ", ".join(filter(None, address_parts))
-
-            image = (
-                member.get("image_small")
-                or member.get("image_medium")
-                or member.get("image")
-            )
-            result.append(
-                {
-                    "id": member.get("id"),
-                    "name": member.get("name"),
-                    "barcode_base": member.get("barcode_base"),
-                    "address": address if address else None,
-                    "phone": member.get("phone") or member.get("mobile") or None,
-                    "image": image if image else None,
-                    "raw": member,
-                }
-            )
+            result.append(format_search_result(member, full=full))
 
-        return jsonify({"members": result})
+        return jsonify(
+            {
+                "members": result,
+                "total": total,
+                "limit": limit,
+                "offset": offset,
+            }
+        )
     except Exception as e:
         logger.error(f"Error searching members: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/member/<int:member_id>/photo", methods=["GET"])
+def get_member_photo(member_id):
+    """
+    Get a member's photo, resized and cached on disk.
+
+    Query parameters:
+        size: 'small' (default, 128px), 'medium' (256px) or 'large' (512px)
+        format: 'webp' or 'jpeg' (default: webp if accepted by the client)
+        v: Photo version from search results; a matching cached photo is
+           served without querying Odoo and marked immutable (400 if it is
+           not a version)
+
+    Returns:
+        Image with a strong ETag (304 on If-None-Match match), or 404 if the
+        member has no photo
+    """
+    try:
+        member_id = validate_positive_int(member_id, "member_id")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    size = request.args.get("size", "small")
+    if size not in PHOTO_SIZES:
+        return jsonify({"error": f"size must be one of {', '.join(PHOTO_SIZES)}"}), 400
+
+    image_format = request.args.get("format")
+    if image_format is None:
+        image_format = "webp" if "image/webp" in request.headers.get("Accept", "") else "jpeg"
+    elif image_format not in ("webp", "jpeg"):
+        return jsonify({"error": "format must be 'webp' or 'jpeg'"}), 400
+    if not PILLOW_AVAILABLE:
+        image_format = ORIGINAL_FORMAT
+
+    requested_version = request.args.get("v")
+    if requested_version is not None and not is_photo_version(requested_version):
+        return jsonify({"error": "v must be a photo version from search results"}), 400
+    max_edge, image_field = PHOTO_SIZES[size]
+
+    try:
+        data = None
+        version = requested_version
+        if version:
+            data = photo_cache.get(member_id, version, size, image_format)
+
+        if data is None:
+            # One read for both the current version and the source image
+            partner = odoo.get_partner_photo(member_id, image_field)
+            if partner is None:
+                return jsonify({"error": "Member not found"}), 404
+            version = photo_version(partner.get("write_date"))
+            data = photo_cache.get(member_id, version, size, image_format)
+            if data is None:
+                if not partner.get(image_field):
+                    return jsonify({"error": "Member has no photo"}), 404
+                data, _ = render_photo(partner[image_field], max_edge, image_format)
+                photo_cache.put(member_id, version, size, image_format, data)
+                logger.info(f"Cached {size} photo of member {member_id} ({len(data)} bytes)")
+    except Exception as e:
+        logger.error(f"Error fetching photo for member {member_id}: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+    mimetype = PHOTO_FORMATS.get(image_format) or PHOTO_FORMATS[sniff_format(data)]
+    response = Response(data, mimetype=mimetype)
+    response.set_etag(f"{member_id}-{version}-{size}-{image_format}")
+    # Member photos are personal data: browser cache only, not shared proxies
+    response.cache_control.private = True
+    if requested_version == version:
+        response.cache_control.max_age = PHOTO_IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = PHOTO_MAX_AGE
+    response.vary.add("Accept")
+    return response.make_conditional(request)
+
+
+@app.route("/api/members/by-barcode/<code>", methods=["GET"])
+def get_member_by_barcode(code):
+    """
+    Get a member's status from a scanned card barcode or its barcode_base.
+
+    Answered from the in-memory barcode table (refreshed in the background,
+    never waited for once loaded); unknown codes and an unavailable table
+    fall back to an Odoo search.
+
+    Returns:
+        JSON object with member_id, name, barcode, barcode_base,
+        cooperative_state, is_worker_member, shift_type, is_unsubscribed,
+        customer and source ('table' or 'odoo')
+    """
+    code = code.strip()
+    if not code or len(code) > 32 or not code.isalnum():
+        return jsonify({"error": "Invalid barcode"}), 400
+
+    if BARCODE_TABLE and not partner_sync.loaded:
+        # Not loaded yet: load in the background, answer from Odoo meanwhile
+        partner_sync.warm_up()
+    elif BARCODE_TABLE:
+        try:
+            partner_sync.ensure_fresh(wait=False)
+        except Exception as e:
+            logger.warning(f"Barcode table unavailable, using Odoo: {e}")
+
+        status = barcode_table.lookup(code)
+        if status is None and code.isdigit():
+            # barcode_base typed with leading zeros
+            status = barcode_table.lookup(str(int(code)))
+        if status is not None:
+            return jsonify(dict(status, source="table"))
+
+    try:
+        partner = odoo.get_member_status_by_barcode(code)
+    except Exception as e:
+        logger.error(f"Error looking up barcode {code}: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+    if not partner:
+        return jsonify({"error": "Member not found"}), 404
+    return jsonify(dict(compact_status(partner), source="odoo"))
+
+
+def stored_counters(status: Dict) -> Dict[str, Optional[int]]:
+    """Counter balances stored on res.partner (None when not read)."""
+    counters = {}
+    for counter_type, field in (("standard", "final_standard_point"), ("ftop", "final_ftop_point")):
+        value = status.get(field)
+        counters[counter_type] = None if value is None or value is False else int(value)
+    return counters
+
+
+def counters_match(member_id: int, stored: Dict, replayed_totals: Dict) -> Optional[bool]:
+    """
+    Check the counters stored on res.partner against the history replay.
+
+    Args:
+        member_id: Member ID (for logging)
+        stored: Stored counters (see stored_counters)
+        replayed_totals: counter_totals of the most recent history page
+
+    Returns:
+        True if both agree, False if not, None if the stored counters are
+        unavailable
+    """
+    if None in stored.values():
+        return None
+    replayed = {counter_type: int(replayed_totals.get(counter_type, 0)) for counter_type in stored}
+    if stored != replayed:
+        logger.warning(
+            f"Stored counters of member {member_id} ({stored}) differ from replayed ones ({replayed})"
+        )
+        return False
+    return True
+
+
+def format_member_status(member_id: int, status: Dict) -> Dict:
+    """Format res.partner status fields for the status endpoints."""
+    return {
+        "member_id": member_id,
+        "name": status.get("name"),
+        "cooperative_state": status.get("cooperative_state"),
+        "is_worker_member": status.get("is_worker_member", False),
+        "shift_type": status.get("shift_type"),
+        "is_unsubscribed": status.get("is_unsubscribed", False),
+        "customer": status.get("customer", False),
+        "counters": stored_counters(status),
+        "date_alert_stop": status.get("date_alert_stop") or None,
+        "date_delay_stop": status.get("date_delay_stop") or None,
+        # Only known when the history was replayed as well
+        "counters_match": None,
+    }
+
+
+@app.route("/api/members/status", methods=["GET", "POST"])
+def get_members_status():
+    """
+    Get status information of many members at once.
+
+    IDs are given as ?ids=1,2,3 or as a JSON body {"ids": [1, 2, 3]} (POST),
+    at most MEMBER_STATUS_BATCH_MAX per call. All members are read from
+    Odoo in a single request.
+
+    Returns:
+        JSON object with:
+        - members: Map of member ID to the same fields as /api/member/<id>/status
+        - missing: IDs that do not exist
+    """
+    if request.method == "POST":
+        body = request.get_json(silent=True) or {}
+        raw_ids = body.get("ids")
+        if not isinstance(raw_ids, list):
+            return jsonify({"error": "Body must be a JSON object with an 'ids' list"}), 400
+    else:
+        raw_ids = [i for i in request.args.get("ids", "").split(",") if i.strip()]
+
+    if not raw_ids:
+        return jsonify({"error": "ids parameter is required"}), 400
+
+    try:
+        member_ids = list(dict.fromkeys(validate_positive_int(i, "ids") for i in raw_ids))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if len(member_ids) > MEMBER_STATUS_BATCH_MAX:
+        return jsonify({"error": f"At most {MEMBER_STATUS_BATCH_MAX} ids per request"}), 400
+
+    try:
+        statuses = odoo.get_members_status(member_ids)
+    except Exception as e:
+        logger.error(f"Error fetching status of {len(member_ids)} members: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify(
+        {
+            "members": {
+                str(member_id): format_member_status(member_id, statuses[member_id])
+                for member_id in member_ids
+                if member_id in statuses
+            },
+            "missing": [member_id for member_id in member_ids if member_id not in statuses],
+        }
+    )
+
+
 @app.route("/api/member/<int:member_id>/status", methods=["GET"])
 def get_member_status(member_id):
     """
     Get member status information.
 
     Returns cooperative_state, shift_type, and other status fields
-    that indicate the member's current standing in the cooperative.
+    that indicate the member's current standing in the cooperative, with
+    the counters (standard/ftop) and deadlines (date_alert_stop,
+    date_delay_stop) stored on the partner, from a single read.
+
+    With ?reconcile=true the history is replayed as well (through the
+    response cache) and counters_match tells whether both agree.
     """
     # Validate member_id
     try:
@@ -172,22 +653,18 @@ def get_member_status(member_id):
         return jsonify({"error": str(e)}), 400
 
     try:
-        status = odoo.get_member_status(member_id)
+        status = cached_member_status(member_id)
 
         if not status:
             return jsonify({"error": "Member not found"}), 404
 
-        return jsonify(
-            {
-                "member_id": member_id,
-                "name": status.get("name"),
-                "cooperative_state": status.get("cooperative_state"),
-                "is_worker_member": status.get("is_worker_member", False),
-                "shift_type": status.get("shift_type"),
-                "is_unsubscribed": status.get("is_unsubscribed", False),
-                "customer": status.get("customer", False),
-            }
-        )
+        response = format_member_status(member_id, status)
+        if request.args.get("reconcile", "").lower() in ("1", "true", "yes"):
+            history = cached_member_history(member_id)
+            response["counters_match"] = counters_match(
+                member_id, response["counters"], history["counter_totals"]
+            )
+        return jsonify(response)
     except Exception as e:
         logger.error(
             f"Error fetching member status for member {member_id}: {e}", exc_info=True
@@ -206,7 +683,7 @@ def determine_shift_type(
 
     Args:
         shift: Shift data from Odoo
-        shift_counter_map: Map of shift_id → counter data
+        shift_counter_map: Map of shift_id → ShiftCounter
         shift_id: The shift ID to check
 
     Returns:
@@ -217,19 +694,12 @@ def determine_shift_type(
     # Primary: Use shift's shift_type_id field
     shift_type_id = shift.get("shift_type_id")
     if shift_type_id:
-        if isinstance(shift_type_id, list) and len(shift_type_id) > 1:
-            # shift_type_id is [id, name] - check name
-            type_name = shift_type_id[1].lower()
-            if "ftop" in type_name or "volant" in type_name:
-                return ("ftop", shift_type_id)
-            else:
-                return ("standard", shift_type_id)
-        # If just ID, default to standard
-        return ("standard", shift_type_id)
+        # Classified by name once per shift type (an ID alone is standard)
+        return (shift_type_kind(shift_type_id), shift_type_id)
 
     # Fallback: Use counter event type (if shift_type_id missing)
     if shift_id and shift_id in shift_counter_map:
-        counter_type = shift_counter_map[shift_id].get("type", "standard")
+        counter_type = shift_counter_map[shift_id].type
         logger.warning(f"Using counter type as fallback for shift {shift_id}")
         return (counter_type, None)
 
@@ -238,561 +708,804 @@ def determine_shift_type(
     return ("unknown", None)
 
 
-@app.route("/api/member/<int:member_id>/history", methods=["GET"])
-def get_member_history(member_id):
-    # Validate member_id
-    try:
-        member_id = validate_positive_int(member_id, "member_id")
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+def fetch_exchange_registrations(shifts: List[Dict]) -> Dict[int, Dict]:
+    """
+    Fetch the registrations on the other side of the member's shift exchanges.
 
-    try:
-        # Fetch shift configuration from Odoo
-        shift_config = odoo.get_shift_config()
+    Collects exchange-related registration IDs from the member's shifts and
+    batch-reads them, along with their shift details.
 
-        # Adjust week_a_date to be one cycle earlier so Cycle 1 starts earlier
-        # This shifts all cycle numbering by +1 (current Cycle 12 becomes Cycle 13)
-        from datetime import datetime, timedelta
+    Args:
+        shifts: Shift registrations from get_member_shift_history()
 
-        weeks_per_cycle = shift_config["weeks_per_cycle"]
-        original_week_a = datetime.strptime(shift_config["week_a_date"], "%Y-%m-%d")
-        adjusted_week_a = (original_week_a - timedelta(weeks=weeks_per_cycle)).strftime(
-            "%Y-%m-%d"
-        )
+    Returns:
+        Map of registration ID → registration data enriched with
+        shift_name, shift_date, week_number and week_name
+    """
+    # Collect all exchange-related registration IDs that need to be fetched
+    exchange_reg_ids = set()
+    for shift in shifts or []:
+        # Try new exchange fields first
+        replacing_id = extract_id(shift.get("exchange_replacing_reg_id"))
+        replaced_id = extract_id(shift.get("exchange_replaced_reg_id"))
+
+        # Fall back to legacy field if new fields are empty
+        legacy_replaced_id = extract_id(shift.get("replaced_reg_id"))
+
+        if replacing_id:
+            exchange_reg_ids.add(replacing_id)
+        if replaced_id:
+            exchange_reg_ids.add(replaced_id)
+        if legacy_replaced_id and not replaced_id:
+            exchange_reg_ids.add(legacy_replaced_id)
+
+    # Batch fetch all exchange-related registrations
+    logger.info(f"Exchange reg IDs to fetch: {exchange_reg_ids}")
+    exchange_registrations = {}
+    if not exchange_reg_ids:
+        return exchange_registrations
+
+    # Fetch specific fields for all registrations
+    reg_data = odoo.execute(
+        "shift.registration",
+        "read",
+        list(exchange_reg_ids),
+        fields=[
+            "id",
+            "date_begin",
+            "date_end",
+            "shift_id",
+            "partner_id",
+            "state",
+        ],
+    )
+
+    # Also fetch shift details for these registrations
+    exchange_shift_ids = [
+        extract_id(r.get("shift_id")) for r in reg_data if r.get("shift_id")
+    ]
+    exchange_shift_ids = [sid for sid in exchange_shift_ids if sid is not None]
+
+    exchange_shift_data = odoo.get_shifts(exchange_shift_ids) if exchange_shift_ids else {}
+
+    # Map registration data with shift info
+    for reg in reg_data:
+        shift_id = extract_id(reg.get("shift_id"))
+        if shift_id and shift_id in exchange_shift_data:
+            reg["shift_name"] = exchange_shift_data[shift_id]["name"]
+            reg["shift_date"] = exchange_shift_data[shift_id]["date_begin"]
+            reg["week_number"] = exchange_shift_data[shift_id].get("week_number")
+            reg["week_name"] = exchange_shift_data[shift_id].get("week_name")
+        exchange_registrations[reg["id"]] = reg
+
+    return exchange_registrations
+
+
+def set_exchange_details(shift_event: ShiftEvent, shift: Dict, exchange_registrations: Dict[int, Dict]) -> None:
+    """
+    Set the exchange details and flags of a shift event.
 
-        # Create adjusted config with earlier week_a_date
-        adjusted_config = {
-            "weeks_per_cycle": shift_config["weeks_per_cycle"],
-            "week_a_date": adjusted_week_a,
+    Args:
+        shift_event: Event of the member's registration (updated in place)
+        shift: The registration, with its exchange fields
+        exchange_registrations: Result of fetch_exchange_registrations()
+    """
+    # Add exchange details if this shift is part of an exchange
+    exchange_details = {}
+
+    # exchange_replacing_reg_id = The registration that REPLACED this shift
+    # (i.e., the new shift that the member chose to replace this one)
+    replacement_reg_id = extract_id(shift.get("exchange_replacing_reg_id"))
+    if not replacement_reg_id:
+        # Fall back to legacy field
+        replacement_reg_id = extract_id(shift.get("replaced_reg_id"))
+
+    if replacement_reg_id and replacement_reg_id in exchange_registrations:
+        replacement_reg = exchange_registrations[replacement_reg_id]
+        exchange_details["replacement_shift"] = {
+            "date": replacement_reg.get("shift_date")
+            or replacement_reg.get("date_begin"),
+            "shift_name": replacement_reg.get("shift_name"),
+            "week_number": replacement_reg.get("week_number"),
+            "week_name": replacement_reg.get("week_name"),
         }
 
-        # Calculate date range for last 13 cycles using adjusted config
-        start_date, end_date = get_last_n_cycles_date_range(
-            n=13, shift_config=adjusted_config
-        )
+    # exchange_replaced_reg_id = The original registration that THIS shift is replacing
+    # (i.e., this is a replacement shift covering the original)
+    original_reg_id = extract_id(shift.get("exchange_replaced_reg_id"))
+    if original_reg_id and original_reg_id in exchange_registrations:
+        original_reg = exchange_registrations[original_reg_id]
+        exchange_details["original_shift"] = {
+            "date": original_reg.get("shift_date")
+            or original_reg.get("date_begin"),
+            "shift_name": original_reg.get("shift_name"),
+            "week_number": original_reg.get("week_number"),
+            "week_name": original_reg.get("week_name"),
+        }
 
+    # Add counter impact explanation
+    if shift.get("is_exchange") and shift.get("state") == "done":
+        exchange_details["counter_impact"] = (
+            "no_penalty_attended_replacement"
+        )
+    elif (
+        shift.get("is_exchanged")
+        and replacement_reg_id
+        and replacement_reg_id in exchange_registrations
+    ):
+        replacement_reg = exchange_registrations[replacement_reg_id]
+        # Check if replacement was attended (would need to check the registration state)
+        exchange_details["counter_impact"] = "exchanged_for_replacement"
+
+    # Add exchange state ONLY if we have actual exchange relationship data or counter impact
+    # This prevents showing exchange details for "waiting" shifts that are just during leave
+    if (
+        "replacement_shift" in exchange_details
+        or "original_shift" in exchange_details
+        or "counter_impact" in exchange_details
+    ):
+        exchange_state = shift.get("exchange_state")
+        if exchange_state:
+            exchange_details["exchange_state"] = exchange_state
+        # Fallback: infer exchange state from flags if not explicitly set
+        elif shift.get("is_exchanged"):
+            exchange_details["exchange_state"] = "replaced"
+        elif shift.get("is_exchange"):
+            exchange_details["exchange_state"] = "replacing"
+
+    # Only add exchange_details if we have meaningful exchange information
+    # Don't show exchange details for "waiting" shifts that are just during leave
+    shift_event.exchange_details = exchange_details or None
+    # Only set these flags when we have actual exchange data, otherwise
+    # definitely not an exchange
+    shift_event.is_exchanged = bool(exchange_details) and bool(shift.get("is_exchanged"))
+    shift_event.is_exchange = bool(exchange_details) and bool(shift.get("is_exchange"))
+
+    # Debug logging for waiting/replaced shifts
+    if shift.get("state") in ["waiting", "replaced"]:
         logger.info(
-            f"Fetching member {member_id} history from {start_date} to {end_date} (Cycle 1 starts {adjusted_week_a})"
+            f"Shift {shift.get('id')} ({shift.get('shift_name')}) state={shift.get('state')}: "
+            f"is_exchanged={shift.get('is_exchanged')}, "
+            f"exchange_state={shift.get('exchange_state')}, "
+            f"has_exchange_details={bool(exchange_details)}, "
+            f"exchange_details_keys={list(exchange_details.keys()) if exchange_details else []}, "
+            f"sent_is_exchanged={shift_event.is_exchanged}"
         )
 
-        # Store adjusted config for use in event processing
-        shift_config = adjusted_config
 
-        # Fetch member data with date filtering
-        purchases = odoo.get_member_purchase_history(member_id, start_date=start_date)
-        shifts = odoo.get_member_shift_history(member_id, start_date=start_date)
-        leaves = odoo.get_member_leaves(member_id, start_date=start_date)
-        counter_events = []
-        holidays = []
+def refresh_shift_event(
+    shift_event: ShiftEvent,
+    registration: Dict,
+    shifts: Optional[Dict[int, Dict]],
+    exchange_registrations: Optional[Dict[int, Dict]],
+) -> None:
+    """
+    Rebuild the fields a stored shift event takes from other Odoo rows.
 
-        try:
-            # Fetch ALL counter events (no date filter) for accurate running totals
-            counter_events = odoo.get_member_counter_events(member_id)
-        except Exception as counter_error:
-            logger.warning(
-                f"Error fetching counter events for member {member_id} (continuing without): {counter_error}",
-                exc_info=True,
-            )
+    The shift name and week come from shift.shift, the exchange details
+    from the registrations on the other side of the exchange; neither is
+    covered by the segment fingerprint (see history_segments).
 
-        try:
-            # Fetch holidays for the date range
-            holidays = odoo.get_holidays(start_date=start_date, end_date=end_date)
-        except Exception as holiday_error:
-            logger.warning(
-                f"Error fetching holidays (continuing without): {holiday_error}",
-                exc_info=True,
+    Args:
+        shift_event: Event from a stored segment (updated in place)
+        registration: Its registration's REGISTRATION_LINK_FIELDS
+        shifts: Result of odoo.get_shifts(), None to keep the stored names
+        exchange_registrations: Result of fetch_exchange_registrations(),
+                                None to keep the stored exchange details
+    """
+    if shifts is not None:
+        shift = shifts.get(extract_id(registration.get("shift_id"))) or {}
+        shift_event.shift_name = shift.get("name")
+        shift_event.week_number = shift.get("week_number")
+        shift_event.week_name = shift.get("week_name")
+    if exchange_registrations is not None:
+        set_exchange_details(shift_event, registration, exchange_registrations)
+
+
+def add_counter_steps(
+    plan: FetchPlan, member_id: int, start_date: str, before_date: Optional[str] = None
+) -> None:
+    """
+    Add the counter event fetch to a history plan.
+
+    Registers a 'counters' step resolving to (opening_totals, counter_events)
+    according to COUNTER_AGGREGATION_MODE. Counter errors are tolerated: the
+    history is then built without counters.
+
+    Pages of older cycles (before_date set) may also return events created
+    after the page; the caller drops them before the replay. Checkpoints
+    only follow the most recent window, so such pages use read_group instead.
+    """
+    fallback = (counter_sources.zero_totals(), [])
+    mode = COUNTER_AGGREGATION_MODE
+    if mode == "checkpoint" and before_date:
+        mode = "read_group"
+
+    if mode == "read_group":
+        plan.add(
+            "counter_window",
+            odoo.get_member_counter_events,
+            member_id,
+            start_date=start_date,
+            before_date=before_date,
+            fallback=None,
+        )
+
+        def fetch_opening(shifts, window_events):
+            if window_events is None:
+                raise Exception("Counter events in window unavailable")
+            return counter_sources.fetch_read_group(
+                odoo, member_id, start_date, shifts, window_events
             )
 
-        # Sort counter events chronologically (oldest first) for proper aggregation
-        # Handle missing create_date gracefully
-        counter_events_sorted = sorted(
-            counter_events, key=lambda x: x.get("create_date") or "1900-01-01"
+        plan.add(
+            "counters",
+            fetch_opening,
+            depends_on=["shifts", "counter_window"],
+            fallback=fallback,
         )
+        return
 
-        # Step 1: Aggregate counter events by shift_id AND counter type
-        # Members have two separate counters: ftop and standard (ABCD)
-        ftop_shift_map = {}
-        standard_shift_map = {}
-        ftop_manual_events = []
-        standard_manual_events = []
+    if mode == "checkpoint":
 
-        for counter_event in counter_events_sorted:
-            shift_id = extract_id(counter_event.get("shift_id"))
-            counter_type = counter_event.get("type", "standard")
+        def fetch_from_checkpoint(shifts):
+            return fetch_with_checkpoint(odoo, checkpoint_store, member_id, start_date, shifts)
 
-            if shift_id:
-                # Choose the right map based on counter type
-                shift_map = (
-                    ftop_shift_map if counter_type == "ftop" else standard_shift_map
-                )
+        plan.add("counters", fetch_from_checkpoint, depends_on=["shifts"], fallback=fallback)
+        return
 
-                counter_data = {
-                    "point_qty": counter_event.get("point_qty", 0),
-                    "create_date": counter_event.get("create_date", ""),
-                    "type": counter_type,
-                }
+    # Fetch ALL counter events (no date filter) for accurate running totals
+    plan.add("counters", counter_sources.fetch_full, odoo, member_id, fallback=fallback)
 
-                if shift_id in shift_map:
-                    shift_map[shift_id]["point_qty"] += counter_data["point_qty"]
-                    # Keep the latest create_date for this shift's aggregated events
-                    if counter_data["create_date"] > shift_map[shift_id]["create_date"]:
-                        shift_map[shift_id]["create_date"] = counter_data["create_date"]
-                else:
-                    shift_map[shift_id] = counter_data
-            else:
-                # Manual counter event with no shift_id
-                event_data = {
-                    "type": "manual",
-                    "create_date": counter_event.get("create_date", ""),
-                    "point_qty": counter_event.get("point_qty", 0),
-                    "counter_type": counter_type,
-                    "original_event": counter_event,
-                }
 
-                if counter_type == "ftop":
-                    ftop_manual_events.append(event_data)
-                else:
-                    standard_manual_events.append(event_data)
+def add_history_slice_steps(
+    plan: FetchPlan, member_id: int, start_date: str, end_before: Optional[str] = None
+) -> None:
+    """
+    Add the fetches of a history date slice to a plan.
+
+    Registers purchases, shifts, counters (see add_counter_steps) and
+    exchange_registrations steps for [start_date, end_before), the input of
+    assemble_history_slice.
+    """
+    slice_bounds = {"start_date": start_date}
+    if end_before:
+        slice_bounds["before_date"] = end_before
+    plan.add("purchases", odoo.get_member_purchase_history, member_id, **slice_bounds)
+    plan.add("shifts", odoo.get_member_shift_history, member_id, **slice_bounds)
+    # Counter events for the running totals, with the balance before them
+    add_counter_steps(plan, member_id, start_date, end_before)
+    plan.add(
+        "exchange_registrations",
+        fetch_exchange_registrations,
+        depends_on=["shifts"],
+        fallback={},
+    )
+
+
+def counter_balance(opening_totals: Dict, counter_events: List[Dict], before_date: str) -> Dict[str, int]:
+    """Counter totals before a date, from a slice's opening totals and replayed events."""
+    totals = dict(opening_totals)
+    for counter_event in counter_events:
+        if (counter_event.get("create_date") or "") < before_date:
+            counter_type = "ftop" if counter_event.get("type") == "ftop" else "standard"
+            totals[counter_type] += counter_event.get("point_qty", 0)
+    return {"ftop": int(totals["ftop"]), "standard": int(totals["standard"])}
+
+
+def assemble_history_slice(fetched: Dict, start_date: str, end_before: Optional[str] = None) -> Dict:
+    """
+    Build the purchase, shift and counter events of a history date slice.
 
-        # Step 2: Merge all counter items and calculate running totals for both counter types
-        # Each event needs to know BOTH counter totals at that point in time
-        all_counter_items = []
+    Replays the counter events chronologically so that every event carries
+    the ftop/standard running totals at its time.
 
-        # Add FTOP items
-        for shift_id, data in ftop_shift_map.items():
-            all_counter_items.append(
-                {
-                    "type": "shift",
-                    "counter_type": "ftop",
-                    "shift_id": shift_id,
-                    "create_date": data["create_date"],
-                    "point_qty": data["point_qty"],
-                }
+    Args:
+        fetched: Results of the add_history_slice_steps steps
+        start_date: First day of the slice
+        end_before: Optional first day after the slice
+
+    Returns:
+        Dictionary with:
+        - dated_events: (source date, event) pairs, the source date being the
+          one the event was fetched by (date_order, date_begin, create_date)
+        - counter_events: Replayed counter events (see counter_balance)
+        - opening_totals: Counter totals before the replayed events
+        - closing_totals: Counter totals after them
+    """
+    purchases = fetched["purchases"]
+    shifts = fetched["shifts"]
+    opening_totals, counter_events = fetched["counters"]
+    exchange_registrations = fetched["exchange_registrations"]
+
+    if end_before:
+        # Later events belong to newer pages: the replay ends at the slice end
+        counter_events = [
+            e for e in counter_events if (e.get("create_date") or "") < end_before
+        ]
+
+    # Sort counter events chronologically (oldest first) for proper aggregation
+    # Handle missing create_date gracefully
+    counter_events_sorted = sorted(
+        counter_events, key=lambda x: x.get("create_date") or "1900-01-01"
+    )
+
+    # Aggregate counter events per shift and replay both counters' running totals
+    shift_counter_map, closing_totals = replay_counters(counter_events_sorted, opening_totals)
+
+    dated_events = []
+
+    if purchases:
+        for purchase in purchases:
+            purchase_event = PurchaseEvent(
+                purchase.get("id"),
+                purchase.get("date_order"),
+                purchase.get("pos_reference") or purchase.get("name"),
             )
-        for manual_event in ftop_manual_events:
-            all_counter_items.append(
-                {
-                    "type": "manual",
-                    "counter_type": "ftop",
-                    "create_date": manual_event["create_date"],
-                    "point_qty": manual_event["point_qty"],
-                    "original_event": manual_event["original_event"],
-                }
+            dated_events.append((purchase.get("date_order"), purchase_event))
+
+    if shifts:
+        for shift in shifts:
+            # Debug: log exchange fields for waiting/replaced shifts
+            if shift.get("state") in ["waiting", "replaced"]:
+                logger.info(
+                    f"Shift {shift.get('id')} state={shift.get('state')}: "
+                    f"replaced_reg_id={shift.get('replaced_reg_id')}, "
+                    f"exchange_replacing_reg_id={shift.get('exchange_replacing_reg_id')}, "
+                    f"exchange_replaced_reg_id={shift.get('exchange_replaced_reg_id')}"
+                )
+
+            shift_id = extract_id(shift.get("shift_id"))
+
+            # Determine shift type
+            shift_type, shift_type_id = determine_shift_type(
+                shift, shift_counter_map, shift_id
             )
 
-        # Add Standard items
-        for shift_id, data in standard_shift_map.items():
-            all_counter_items.append(
-                {
-                    "type": "shift",
-                    "counter_type": "standard",
-                    "shift_id": shift_id,
-                    "create_date": data["create_date"],
-                    "point_qty": data["point_qty"],
-                }
+            # Determine the date to use for this shift
+            event_date = shift.get("date_begin")
+
+            # For technical FTOP shifts (cycle closing), use counter event date (when shift was closed)
+            # Check shift_type_id to distinguish technical FTOP from Standard shifts attended by FTOP members
+            is_technical_ftop = shift_type_kind(shift_type_id) == "ftop"
+
+            counter = shift_counter_map.get(shift_id) if shift_id else None
+            if is_technical_ftop and counter is not None and counter.create_date:
+                event_date = counter.create_date
+
+            shift_event = ShiftEvent(
+                shift.get("id"),
+                event_date,
+                shift.get("shift_name"),
+                shift.get("state"),
+                shift.get("is_late", False),
+                shift.get("week_number"),
+                shift.get("week_name"),
+                shift_type,
+                shift_type_id,
+                counter=counter,
             )
-        for manual_event in standard_manual_events:
-            all_counter_items.append(
+
+            set_exchange_details(shift_event, shift, exchange_registrations)
+
+            dated_events.append((shift.get("date_begin"), shift_event))
+
+    if counter_events:
+        for counter_event in counter_events:
+            shift_id = extract_id(counter_event.get("shift_id"))
+
+            is_manual = counter_event.get("is_manual", False)
+            if is_manual or not shift_id:
+                # Filter counter events for display - only include events within date range
+                event_date = counter_event.get("create_date", "")
+                if event_date and event_date >= start_date:
+                    display_event = CounterEvent(
+                        counter_event.get("id"),
+                        event_date,
+                        counter_event.get("point_qty", 0),
+                        counter_event.get("sum_current_qty", 0),
+                        counter_event.get("ftop_total", 0),
+                        counter_event.get("standard_total", 0),
+                        counter_event.get("name", ""),
+                        counter_event.get("type", ""),
+                    )
+                    dated_events.append((event_date, display_event))
+
+    return {
+        "dated_events": dated_events,
+        "counter_events": counter_events,
+        "opening_totals": opening_totals,
+        "closing_totals": closing_totals,
+    }
+
+
+def build_leave_events(leaves: List[Dict]) -> Tuple[List[HistoryEvent], List[Dict]]:
+    """
+    Build the leave timeline events of a member.
+
+    Returns:
+        Tuple of (leave_start/leave_end events, raw leave periods)
+    """
+    # Generate leave timeline events (start and end markers)
+    # Per spec Section 5.4: two events per leave
+    events = []
+    leave_periods = []
+    if leaves:
+        for leave in leaves:
+            leave_id = leave.get("id")
+            leave_type = leave.get("leave_type", "Leave")
+            start_date = leave.get("start_date")
+            stop_date = leave.get("stop_date")
+
+            # Create leave_start event, referencing the end date
+            if start_date:
+                events.append(LeaveStartEvent(leave_id, start_date, leave_type, stop_date))
+
+            # Create leave_end event (if not open-ended), referencing the start date
+            if stop_date:
+                events.append(LeaveEndEvent(leave_id, stop_date, leave_type, start_date))
+
+            # Keep raw leave periods for backward compatibility
+            leave_periods.append(
                 {
-                    "type": "manual",
-                    "counter_type": "standard",
-                    "create_date": manual_event["create_date"],
-                    "point_qty": manual_event["point_qty"],
-                    "original_event": manual_event["original_event"],
+                    "id": leave_id,
+                    "start_date": start_date,
+                    "stop_date": stop_date,
+                    "leave_type": leave_type,
+                    "state": leave.get("state"),
                 }
             )
 
-        # Sort all items chronologically
-        all_counter_items.sort(key=lambda x: x["create_date"])
-
-        # Calculate running totals for both counters as we go through chronologically
-        ftop_running_total = 0
-        standard_running_total = 0
-
-        for item in all_counter_items:
-            # Update the appropriate counter
-            if item["counter_type"] == "ftop":
-                ftop_running_total += item["point_qty"]
-            else:
-                standard_running_total += item["point_qty"]
-
-            # Store both running totals at this point in time
-            item["ftop_total"] = int(ftop_running_total)
-            item["standard_total"] = int(standard_running_total)
-            # For backward compatibility, sum_current_qty is the active counter's total
-            item["sum_current_qty"] = (
-                int(ftop_running_total)
-                if item["counter_type"] == "ftop"
-                else int(standard_running_total)
-            )
+    return events, leave_periods
 
-        # Step 3: Map totals back to shift maps and manual events
-        for item in all_counter_items:
-            if item["type"] == "shift":
-                if item["counter_type"] == "ftop":
-                    ftop_shift_map[item["shift_id"]]["ftop_total"] = item["ftop_total"]
-                    ftop_shift_map[item["shift_id"]]["standard_total"] = item[
-                        "standard_total"
-                    ]
-                    ftop_shift_map[item["shift_id"]]["sum_current_qty"] = item[
-                        "sum_current_qty"
-                    ]
-                else:
-                    standard_shift_map[item["shift_id"]]["standard_total"] = item[
-                        "standard_total"
-                    ]
-                    standard_shift_map[item["shift_id"]]["ftop_total"] = item[
-                        "ftop_total"
-                    ]
-                    standard_shift_map[item["shift_id"]]["sum_current_qty"] = item[
-                        "sum_current_qty"
-                    ]
-            elif item["type"] == "manual":
-                item["original_event"]["ftop_total"] = item["ftop_total"]
-                item["original_event"]["standard_total"] = item["standard_total"]
-                item["original_event"]["sum_current_qty"] = item["sum_current_qty"]
-
-        # Step 4: Combine the maps into a single shift_counter_map
-        shift_counter_map = {}
-        for shift_id, data in ftop_shift_map.items():
-            shift_counter_map[shift_id] = data
-        for shift_id, data in standard_shift_map.items():
-            if shift_id in shift_counter_map:
-                # Shouldn't happen (a shift should only have one counter type), but handle it
-                logger.warning(
-                    f"Shift {shift_id} has both ftop and standard counter events - merging data"
-                )
-                # Merge point quantities instead of overwriting
-                shift_counter_map[shift_id]["point_qty"] += data.get("point_qty", 0)
-                # Keep the later create_date
-                if data.get("create_date", "") > shift_counter_map[shift_id].get(
-                    "create_date", ""
-                ):
-                    shift_counter_map[shift_id]["create_date"] = data["create_date"]
-            else:
-                shift_counter_map[shift_id] = data
-
-        events = []
-
-        # Collect all exchange-related registration IDs that need to be fetched
-        exchange_reg_ids = set()
-        if shifts:
-            for shift in shifts:
-                # Try new exchange fields first
-                replacing_id = extract_id(shift.get("exchange_replacing_reg_id"))
-                replaced_id = extract_id(shift.get("exchange_replaced_reg_id"))
-
-                # Fall back to legacy field if new fields are empty
-                legacy_replaced_id = extract_id(shift.get("replaced_reg_id"))
-
-                if replacing_id:
-                    exchange_reg_ids.add(replacing_id)
-                if replaced_id:
-                    exchange_reg_ids.add(replaced_id)
-                if legacy_replaced_id and not replaced_id:
-                    exchange_reg_ids.add(legacy_replaced_id)
-
-        # Batch fetch all exchange-related registrations
-        logger.info(f"Exchange reg IDs to fetch: {exchange_reg_ids}")
-        exchange_registrations = {}
-        if exchange_reg_ids:
-            try:
-                # Fetch specific fields for all registrations
-                reg_data = odoo.execute(
-                    "shift.registration",
-                    "read",
-                    list(exchange_reg_ids),
-                    fields=[
-                        "id",
-                        "date_begin",
-                        "date_end",
-                        "shift_id",
-                        "partner_id",
-                        "state",
-                    ],
-                )
 
-                # Also fetch shift details for these registrations
-                exchange_shift_ids = [
-                    extract_id(r.get("shift_id")) for r in reg_data if r.get("shift_id")
-                ]
-                exchange_shift_ids = [
-                    sid for sid in exchange_shift_ids if sid is not None
-                ]
-
-                exchange_shift_data = {}
-                if exchange_shift_ids:
-                    shift_results = odoo.execute(
-                        "shift.shift",
-                        "read",
-                        exchange_shift_ids,
-                        fields=["id", "name", "date_begin", "week_number", "week_name"],
-                    )
-                    exchange_shift_data = {s["id"]: s for s in shift_results}
-
-                # Map registration data with shift info
-                for reg in reg_data:
-                    shift_id = extract_id(reg.get("shift_id"))
-                    if shift_id and shift_id in exchange_shift_data:
-                        reg["shift_name"] = exchange_shift_data[shift_id]["name"]
-                        reg["shift_date"] = exchange_shift_data[shift_id]["date_begin"]
-                        reg["week_number"] = exchange_shift_data[shift_id].get(
-                            "week_number"
-                        )
-                        reg["week_name"] = exchange_shift_data[shift_id].get(
-                            "week_name"
-                        )
-                    exchange_registrations[reg["id"]] = reg
-            except Exception as e:
-                logger.warning(f"Failed to fetch exchange registration details: {e}")
-
-        if purchases:
-            for purchase in purchases:
-                events.append(
-                    {
-                        "type": "purchase",
-                        "id": purchase.get("id"),
-                        "date": purchase.get("date_order"),
-                        "reference": purchase.get("pos_reference")
-                        or purchase.get("name"),
-                    }
-                )
+# Response order of the sliced event kinds for equal dates (leaves come after
+# them), and whether Odoo already returns each kind most recent first (shifts
+# are fetched by date_begin, but technical FTOP shifts are dated by their
+# counter event)
+HISTORY_EVENT_STREAMS = {"purchase": True, "shift": False, "counter": True}
 
-        if shifts:
-            for shift in shifts:
-                # Debug: log exchange fields for waiting/replaced shifts
-                if shift.get("state") in ["waiting", "replaced"]:
-                    logger.info(
-                        f"Shift {shift.get('id')} state={shift.get('state')}: "
-                        f"replaced_reg_id={shift.get('replaced_reg_id')}, "
-                        f"exchange_replacing_reg_id={shift.get('exchange_replacing_reg_id')}, "
-                        f"exchange_replaced_reg_id={shift.get('exchange_replaced_reg_id')}"
-                    )
 
-                shift_id = extract_id(shift.get("shift_id"))
+def add_fingerprint_steps(plan: FetchPlan, member_id: int, start_date: str, end_before: str) -> None:
+    """Add one fingerprint_<source> step per FINGERPRINT_SOURCES entry to a plan."""
+    for source, (model, _) in FINGERPRINT_SOURCES.items():
+        domain = fingerprint_domain(source, member_id, start_date, end_before, SHIFT_HISTORY_STATES)
+        plan.add(
+            f"fingerprint_{source}",
+            odoo.get_records_fingerprint,
+            model,
+            domain,
+            fallback=None,
+        )
 
-                # Determine shift type
-                shift_type, shift_type_id = determine_shift_type(
-                    shift, shift_counter_map, shift_id
-                )
 
-                # Determine the date to use for this shift
-                event_date = shift.get("date_begin")
-
-                # For technical FTOP shifts (cycle closing), use counter event date (when shift was closed)
-                # Check shift_type_id to distinguish technical FTOP from Standard shifts attended by FTOP members
-                is_technical_ftop = False
-                if (
-                    shift_type_id
-                    and isinstance(shift_type_id, list)
-                    and len(shift_type_id) > 1
-                ):
-                    type_name = shift_type_id[1].lower()
-                    is_technical_ftop = "ftop" in type_name or "volant" in type_name
-
-                if is_technical_ftop and shift_id and shift_id in shift_counter_map:
-                    counter_date = shift_counter_map[shift_id].get("create_date")
-                    if counter_date:
-                        event_date = counter_date
-
-                shift_event = {
-                    "type": "shift",
-                    "id": shift.get("id"),
-                    "date": event_date,
-                    "shift_name": shift.get("shift_name"),
-                    "state": shift.get("state"),
-                    "is_late": shift.get("is_late", False),
-                    # Don't set is_exchanged/is_exchange yet - will set later if exchange_details exists
-                    "week_number": shift.get("week_number"),
-                    "week_name": shift.get("week_name"),
-                    "shift_type": shift_type,
-                    "shift_type_id": shift_type_id,
-                }
+def collect_fingerprint(fetched: Dict) -> Optional[Dict]:
+    """Fingerprint from the fingerprint steps' results, None if one failed."""
+    fingerprint = {source: fetched[f"fingerprint_{source}"] for source in FINGERPRINT_SOURCES}
+    if any(value is None for value in fingerprint.values()):
+        return None
+    return fingerprint
 
-                if shift_id and shift_id in shift_counter_map:
-                    shift_event["counter"] = shift_counter_map[shift_id]
-
-                # Add exchange details if this shift is part of an exchange
-                exchange_details = {}
-
-                # exchange_replacing_reg_id = The registration that REPLACED this shift
-                # (i.e., the new shift that the member chose to replace this one)
-                replacement_reg_id = extract_id(shift.get("exchange_replacing_reg_id"))
-                if not replacement_reg_id:
-                    # Fall back to legacy field
-                    replacement_reg_id = extract_id(shift.get("replaced_reg_id"))
-
-                if replacement_reg_id and replacement_reg_id in exchange_registrations:
-                    replacement_reg = exchange_registrations[replacement_reg_id]
-                    exchange_details["replacement_shift"] = {
-                        "date": replacement_reg.get("shift_date")
-                        or replacement_reg.get("date_begin"),
-                        "shift_name": replacement_reg.get("shift_name"),
-                        "week_number": replacement_reg.get("week_number"),
-                        "week_name": replacement_reg.get("week_name"),
-                    }
-
-                # exchange_replaced_reg_id = The original registration that THIS shift is replacing
-                # (i.e., this is a replacement shift covering the original)
-                original_reg_id = extract_id(shift.get("exchange_replaced_reg_id"))
-                if original_reg_id and original_reg_id in exchange_registrations:
-                    original_reg = exchange_registrations[original_reg_id]
-                    exchange_details["original_shift"] = {
-                        "date": original_reg.get("shift_date")
-                        or original_reg.get("date_begin"),
-                        "shift_name": original_reg.get("shift_name"),
-                        "week_number": original_reg.get("week_number"),
-                        "week_name": original_reg.get("week_name"),
-                    }
-
-                # Add counter impact explanation
-                if shift.get("is_exchange") and shift.get("state") == "done":
-                    exchange_details["counter_impact"] = (
-                        "no_penalty_attended_replacement"
-                    )
-                elif (
-                    shift.get("is_exchanged")
-                    and replacement_reg_id
-                    and replacement_reg_id in exchange_registrations
-                ):
-                    replacement_reg = exchange_registrations[replacement_reg_id]
-                    # Check if replacement was attended (would need to check the registration state)
-                    exchange_details["counter_impact"] = "exchanged_for_replacement"
-
-                # Add exchange state ONLY if we have actual exchange relationship data or counter impact
-                # This prevents showing exchange details for "waiting" shifts that are just during leave
-                if (
-                    "replacement_shift" in exchange_details
-                    or "original_shift" in exchange_details
-                    or "counter_impact" in exchange_details
-                ):
-                    exchange_state = shift.get("exchange_state")
-                    if exchange_state:
-                        exchange_details["exchange_state"] = exchange_state
-                    # Fallback: infer exchange state from flags if not explicitly set
-                    elif shift.get("is_exchanged"):
-                        exchange_details["exchange_state"] = "replaced"
-                    elif shift.get("is_exchange"):
-                        exchange_details["exchange_state"] = "replacing"
-
-                # Only add exchange_details if we have meaningful exchange information
-                # Don't show exchange details for "waiting" shifts that are just during leave
-                if exchange_details:
-                    shift_event["exchange_details"] = exchange_details
-                    # Only set these flags when we have actual exchange data
-                    shift_event["is_exchanged"] = bool(shift.get("is_exchanged"))
-                    shift_event["is_exchange"] = bool(shift.get("is_exchange"))
-                else:
-                    # No exchange details, so definitely not an exchange
-                    shift_event["is_exchanged"] = False
-                    shift_event["is_exchange"] = False
-
-                # Debug logging for waiting/replaced shifts
-                if shift.get("state") in ["waiting", "replaced"]:
-                    logger.info(
-                        f"Shift {shift.get('id')} ({shift.get('shift_name')}) state={shift.get('state')}: "
-                        f"is_exchanged={shift.get('is_exchanged')}, "
-                        f"exchange_state={shift.get('exchange_state')}, "
-                        f"has_exchange_details={bool(exchange_details)}, "
-                        f"exchange_details_keys={list(exchange_details.keys()) if exchange_details else []}, "
-                        f"sent_is_exchanged={shift_event.get('is_exchanged')}"
-                    )
 
-                events.append(shift_event)
-
-        if counter_events:
-            for counter_event in counter_events:
-                shift_id = extract_id(counter_event.get("shift_id"))
-
-                is_manual = counter_event.get("is_manual", False)
-                if is_manual or not shift_id:
-                    # Filter counter events for display - only include events within date range
-                    event_date = counter_event.get("create_date", "")
-                    if event_date and event_date >= start_date:
-                        events.append(
-                            {
-                                "type": "counter",
-                                "id": counter_event.get("id"),
-                                "date": event_date,
-                                "point_qty": counter_event.get("point_qty", 0),
-                                "sum_current_qty": counter_event.get(
-                                    "sum_current_qty", 0
-                                ),
-                                "ftop_total": counter_event.get("ftop_total", 0),
-                                "standard_total": counter_event.get(
-                                    "standard_total", 0
-                                ),
-                                "name": counter_event.get("name", ""),
-                                "counter_type": counter_event.get("type", ""),
-                            }
-                        )
-
-        # Generate leave timeline events (start and end markers)
-        # Per spec Section 5.4: two events per leave
-        leave_periods = []
-        if leaves:
-            for leave in leaves:
-                leave_id = leave.get("id")
-                leave_type = leave.get("leave_type", "Leave")
-                start_date = leave.get("start_date")
-                stop_date = leave.get("stop_date")
-
-                # Create leave_start event
-                if start_date:
-                    events.append(
-                        {
-                            "type": "leave_start",
-                            "id": leave_id,
-                            "date": start_date,
-                            "leave_type": leave_type,
-                            "leave_end": stop_date,  # Reference to end date
-                            "leave_id": leave_id,
-                        }
-                    )
+def history_shift_config() -> Dict:
+    """
+    Get the shift configuration used to number history cycles.
 
-                # Create leave_end event (if not open-ended)
-                if stop_date:
-                    events.append(
-                        {
-                            "type": "leave_end",
-                            "id": leave_id,
-                            "date": stop_date,
-                            "leave_type": leave_type,
-                            "leave_start": start_date,  # Reference to start date
-                            "leave_id": leave_id,
-                        }
-                    )
+    week_a_date is moved one cycle earlier than the Odoo configuration so
+    Cycle 1 starts earlier: this shifts all cycle numbering by +1 (current
+    Cycle 12 becomes Cycle 13).
 
-                # Keep raw leave periods for backward compatibility
-                leave_periods.append(
-                    {
-                        "id": leave_id,
-                        "start_date": start_date,
-                        "stop_date": stop_date,
-                        "leave_type": leave_type,
-                        "state": leave.get("state"),
-                    }
-                )
+    Returns:
+        Dictionary with weeks_per_cycle and the adjusted week_a_date
+    """
+    shift_config = odoo.get_shift_config()
+    weeks_per_cycle = shift_config["weeks_per_cycle"]
+    original_week_a = datetime.strptime(shift_config["week_a_date"], "%Y-%m-%d")
+    adjusted_week_a = (original_week_a - timedelta(weeks=weeks_per_cycle)).strftime("%Y-%m-%d")
+    return {"weeks_per_cycle": weeks_per_cycle, "week_a_date": adjusted_week_a}
 
-        # Sort all events chronologically (most recent first)
-        events.sort(key=lambda x: x["date"] if x["date"] else "", reverse=True)
 
-        # Get the final counter totals (after all events have been processed)
-        final_ftop_total = ftop_running_total
-        final_standard_total = standard_running_total
+def history_page_error(page_args: Dict) -> Optional[str]:
+    """
+    Check the before_cycle cursor of a history page against the calendar.
 
-        return jsonify(
-            {
-                "member_id": member_id,
-                "events": events,
-                "leaves": leave_periods,
-                "holidays": holidays,
-                "counter_totals": {
-                    "ftop": int(final_ftop_total),
-                    "standard": int(final_standard_total),
-                },
+    Args:
+        page_args: Paging arguments (see parse_history_page_args)
+
+    Returns:
+        Error message if before_cycle is out of range, None otherwise
+
+    Raises:
+        Exception: If the shift configuration cannot be read or is invalid
+                   (a server error, not the client's)
+    """
+    before_cycle = page_args.get("before_cycle")
+    if before_cycle is None:
+        return None
+    config = history_shift_config()
+    current_cycle = CycleCalendar(config["week_a_date"], config["weeks_per_cycle"]).current_cycle()
+    if not 2 <= before_cycle <= current_cycle + 1:
+        return f"before_cycle must be between 2 and {current_cycle + 1}, got {before_cycle}"
+    return None
+
+
+def build_member_history(
+    member_id: int,
+    cycles: int = HISTORY_CYCLES,
+    before_cycle: Optional[int] = None,
+    use_segments: bool = True,
+) -> Dict:
+    """
+    Build one page of a member's event history.
+
+    A page covers `cycles` cycles ending with the current one, or with the
+    cycle before `before_cycle`. Purchases, shifts and leaves are only
+    fetched for the page's dates; counter totals are the balances at the
+    page bounds, so consecutive pages join up.
+
+    With HISTORY_SEGMENTS, the closed cycles of the most recent page (all
+    but the current and previous one) are served from stored segments while
+    their Odoo fingerprint is unchanged; only the last two cycles are then
+    fetched. Otherwise the whole page is fetched and its closed cycles
+    stored.
+
+    Args:
+        member_id: Member ID
+        cycles: Number of cycles in the page
+        before_cycle: Optional cursor (page.next_before_cycle of a newer page)
+        use_segments: Set to False to bypass the segment store
+
+    Returns:
+        Dictionary with member_id, events (most recent first, with their
+        cycle_number and week_letter), leaves, holidays, counter_totals
+        (balance at the end of the page) and page (cycle bounds,
+        opening_totals and the next_before_cycle cursor)
+
+    Raises:
+        ValueError: If before_cycle is out of range (endpoints check it
+                    first, see history_page_error)
+        Exception: If a required Odoo source fails
+    """
+    adjusted_config = history_shift_config()
+    adjusted_week_a = adjusted_config["week_a_date"]
+
+    # Calendar of the adjusted config: validated once, then used to page
+    # cycles and to locate every event
+    calendar = CycleCalendar(adjusted_config["week_a_date"], adjusted_config["weeks_per_cycle"])
+
+    # Calculate the page's date range using adjusted config
+    window = calendar.window(cycles, before_cycle=before_cycle)
+    start_date, end_date = window["start_date"], window["end_date"]
+    # Exclusive end of an older page (None for the most recent one)
+    end_before = window["end_before"]
+
+    logger.info(
+        f"Fetching member {member_id} history from {start_date} to {end_date} (Cycle 1 starts {adjusted_week_a})"
+    )
+
+    # Store adjusted config for use in event processing
+    shift_config = adjusted_config
+
+    # Closed cycles of the most recent page can come from stored segments
+    first_cycle = window["first_cycle"]
+    closed_last = window["last_cycle"] - 2
+    block = None
+    new_block = None
+    if (
+        use_segments
+        and history_segment_store is not None
+        and before_cycle is None
+        and first_cycle <= closed_last
+    ):
+        block = history_segment_store.get_block(member_id)
+        if block and not (
+            block["config_key"] == config_key(shift_config)
+            and block["first_cycle"] <= first_cycle
+            and block["last_cycle"] == closed_last
+        ):
+            block = None
+        if block is None:
+            # Rebuild: fingerprint the closed cycles before fetching them, so
+            # that edits made meanwhile invalidate the new segments
+            new_block = {
+                "config_key": config_key(shift_config),
+                "first_cycle": first_cycle,
+                "last_cycle": closed_last,
+                "start_date": start_date,
+                "end_before": calendar.cycle_start(closed_last + 1),
             }
+            fingerprint_plan = FetchPlan(fetch_executor, label=f"member {member_id} fingerprint")
+            add_fingerprint_steps(fingerprint_plan, member_id, start_date, new_block["end_before"])
+            new_block["fingerprint"] = collect_fingerprint(fingerprint_plan.run())
+
+    # Only the cycles after a reused block are fetched
+    slice_start = block["end_before"] if block else start_date
+
+    # Fetch member data concurrently. Shifts, purchases, leaves, counter
+    # events and holidays are independent; exchange registrations only need
+    # the shifts, so they start as soon as those arrive.
+    plan = FetchPlan(fetch_executor, label=f"member {member_id}")
+    page_bounds = {"start_date": start_date}
+    if end_before:
+        page_bounds["before_date"] = end_before
+    plan.add("leaves", odoo.get_member_leaves, member_id, **page_bounds)
+    # Fetch holidays for the date range
+    plan.add("holidays", odoo.get_holidays, start_date=start_date, end_date=end_date, fallback=[])
+    add_history_slice_steps(plan, member_id, slice_start, end_before)
+    segments = {}
+    segment_registrations = {}
+    if block:
+        # Checked alongside the live fetch: stale segments are rare
+        add_fingerprint_steps(plan, member_id, block["start_date"], block["end_before"])
+        segments = history_segment_store.get_segments(member_id, first_cycle, closed_last)
+        segment_registrations = {
+            registration["id"]: registration
+            for segment in segments.values()
+            for registration in segment["registrations"]
+        }
+        # Shift names, weeks and exchanges of the stored shift events
+        segment_shift_ids = [
+            extract_id(registration.get("shift_id")) for registration in segment_registrations.values()
+        ]
+        plan.add(
+            "segment_shifts",
+            odoo.get_shifts,
+            [shift_id for shift_id in segment_shift_ids if shift_id is not None],
+            fallback=None,
+        )
+        plan.add(
+            "segment_exchange_registrations",
+            fetch_exchange_registrations,
+            list(segment_registrations.values()),
+            fallback=None,
+        )
+    fetched = plan.run()
+
+    if block:
+        fingerprint = collect_fingerprint(fetched)
+        if fingerprint is None:
+            logger.warning(f"History segments of member {member_id} not checked, fetching all cycles")
+            return build_member_history(member_id, cycles, before_cycle, use_segments=False)
+        if fingerprint != block["fingerprint"] or len(segments) != closed_last - first_cycle + 1:
+            logger.info(f"History segments of member {member_id} invalidated by Odoo changes")
+            history_segment_store.delete(member_id)
+            return build_member_history(member_id, cycles, before_cycle)
+        logger.info(
+            f"History of member {member_id}: cycles {first_cycle}-{closed_last} from segments, "
+            f"fetched from {slice_start}"
+        )
+
+    history_slice = assemble_history_slice(fetched, slice_start, end_before)
+
+    if new_block and new_block["fingerprint"] is not None:
+        cycle_starts = [(cycle, calendar.cycle_start(cycle)) for cycle in range(first_cycle, closed_last + 2)]
+        cycle_events = split_into_cycles(history_slice["dated_events"], cycle_starts)
+        cycle_registrations = split_into_cycles(
+            [
+                (shift.get("date_begin"), {field: shift.get(field) for field in REGISTRATION_LINK_FIELDS})
+                for shift in fetched["shifts"] or []
+            ],
+            cycle_starts,
+        )
+        history_segment_store.save_block(
+            member_id,
+            new_block,
+            {
+                cycle: {
+                    "opening_totals": counter_balance(
+                        history_slice["opening_totals"], history_slice["counter_events"], cycle_start
+                    ),
+                    "events": [event.to_json() for event in cycle_events[cycle]],
+                    "registrations": cycle_registrations[cycle],
+                }
+                for cycle, cycle_start in cycle_starts[:-1]
+            },
+        )
+        logger.info(f"Stored history segments of member {member_id}, cycles {first_cycle}-{closed_last}")
+
+    streams = {kind: [] for kind in HISTORY_EVENT_STREAMS}
+    for _, event in history_slice["dated_events"]:
+        streams[event.type].append(event)
+    if segments:
+        # Newest cycles first within each kind, as fetched from Odoo
+        for cycle in range(closed_last, first_cycle - 1, -1):
+            for event_data in segments[cycle]["events"]:
+                event = event_from_json(event_data)
+                if event.type == "shift" and event.id in segment_registrations:
+                    refresh_shift_event(
+                        event,
+                        segment_registrations[event.id],
+                        fetched["segment_shifts"],
+                        fetched["segment_exchange_registrations"],
+                    )
+                streams[event.type].append(event)
+        page_opening_totals = segments[first_cycle]["opening_totals"]
+    else:
+        # Balance at the start of the page, for joining up with the older page
+        page_opening_totals = counter_balance(
+            history_slice["opening_totals"], history_slice["counter_events"], start_date
         )
+
+    leave_events, leave_periods = build_leave_events(fetched["leaves"])
+
+    # Merge all events chronologically (most recent first)
+    timeline = Timeline()
+    for kind, ordered in HISTORY_EVENT_STREAMS.items():
+        timeline.add(streams[kind], ordered=ordered)
+    timeline.add(leave_events, ordered=False)
+    events = list(timeline)
+    locate_events(events, calendar)
+
+    closing_totals = history_slice["closing_totals"]
+    return {
+        "member_id": member_id,
+        "events": events,
+        "leaves": leave_periods,
+        "holidays": fetched["holidays"],
+        "counter_totals": {
+            "ftop": int(closing_totals["ftop"]),
+            "standard": int(closing_totals["standard"]),
+        },
+        "page": {
+            "cycles": cycles,
+            "first_cycle": window["first_cycle"],
+            "last_cycle": window["last_cycle"],
+            "start_date": start_date,
+            "end_date": end_date,
+            "opening_totals": page_opening_totals,
+            "next_before_cycle": window["next_before_cycle"],
+        },
+    }
+
+
+def parse_history_page_args() -> Dict[str, int]:
+    """
+    Read the history paging parameters of the request.
+
+    Returns:
+        build_member_history keyword arguments (cycles, before_cycle)
+
+    Raises:
+        ValueError: If a parameter is not a positive integer or cycles
+                    exceeds HISTORY_MAX_CYCLES
+    """
+    page_args = {}
+    cycles = request.args.get("cycles")
+    if cycles is not None:
+        page_args["cycles"] = validate_positive_int(cycles, "cycles")
+        if page_args["cycles"] > HISTORY_MAX_CYCLES:
+            raise ValueError(f"cycles must be at most {HISTORY_MAX_CYCLES}")
+    before_cycle = request.args.get("before_cycle")
+    if before_cycle is not None:
+        page_args["before_cycle"] = validate_positive_int(before_cycle, "before_cycle")
+    return page_args
+
+
+@app.route("/api/member/<int:member_id>/history", methods=["GET"])
+def get_member_history(member_id):
+    """
+    Get a page of member history.
+
+    Query parameters:
+        cycles: Number of cycles per page (default HISTORY_CYCLES,
+                max HISTORY_MAX_CYCLES)
+        before_cycle: Cursor: only cycles before this one (use
+                      page.next_before_cycle of the previous response)
+    """
+    # Validate member_id and paging parameters
+    try:
+        member_id = validate_positive_int(member_id, "member_id")
+        page_args = parse_history_page_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        page_error = history_page_error(page_args)
+        if page_error:
+            return jsonify({"error": page_error}), 400
+        history = cached_member_history(member_id, **page_args)
+        # Streamed: the body is encoded as it is sent, never held whole
+        return Response(iter_json(history, app.json), mimetype=app.json.mimetype)
     except Exception as e:
         logger.error(
             f"Error fetching member history for member {member_id}: {e}", exc_info=True
@@ -800,6 +1513,49 @@ def get_member_history(member_id):
         return jsonify({"error": str(e)}), 500
 
 
+def empty_member_shares(member_id: int) -> Dict:
+    """Share section of a member without any share data."""
+    return {
+        "member_id": member_id,
+        "total_shares": 0,
+        "join_date": None,
+        "first_purchase_date": None,
+        "share_purchases": [],
+    }
+
+
+def build_member_shares(member_id: int) -> Dict:
+    """
+    Build the share section of a member for the frontend.
+
+    Served from the share ledger snapshot when enabled and loaded; members
+    missing from it are read from Odoo.
+
+    Returns:
+        Dictionary with member_id, total_shares, join_date,
+        first_purchase_date and share_purchases
+
+    Raises:
+        Exception: If Odoo cannot be queried
+    """
+    share_data = None
+    if share_ledger is not None and share_ledger.ready:
+        try:
+            share_ledger.ensure_fresh(wait=False)
+        except Exception as e:
+            logger.warning(f"Share ledger refresh failed, serving last snapshot: {e}")
+        share_data = share_ledger.get(member_id)
+    if share_data is None:
+        share_data = odoo.get_member_share_information(member_id)
+    return {
+        "member_id": member_id,
+        "total_shares": share_data.get("total_shares", 0),
+        "join_date": share_data.get("join_date"),
+        "first_purchase_date": share_data.get("first_purchase_date"),
+        "share_purchases": share_data.get("share_purchases", []),
+    }
+
+
 @app.route("/api/member/<int:member_id>/shares", methods=["GET"])
 def get_member_shares(member_id):
     """
@@ -819,18 +1575,7 @@ def get_member_shares(member_id):
         return jsonify({"error": str(e)}), 400
 
     try:
-        # Fetch share information from Odoo
-        share_data = odoo.get_member_share_information(member_id)
-
-        # Format the response for frontend
-        response = {
-            "member_id": member_id,
-            "total_shares": share_data.get("total_shares", 0),
-            "join_date": share_data.get("join_date"),
-            "first_purchase_date": share_data.get("first_purchase_date"),
-            "share_purchases": share_data.get("share_purchases", []),
-        }
-
+        response = cached_member_shares(member_id)
         logger.info(f"Successfully fetched share data for member {member_id}")
         return jsonify(response)
 
@@ -838,16 +1583,183 @@ def get_member_shares(member_id):
         logger.error(
             f"Error fetching share data for member {member_id}: {e}", exc_info=True
         )
-        return jsonify(
-            {
-                "error": str(e),
-                "member_id": member_id,
-                "total_shares": 0,
-                "join_date": None,
-                "first_purchase_date": None,
-                "share_purchases": [],
-            }
-        ), 500
+        return jsonify(dict(empty_member_shares(member_id), error=str(e))), 500
+
+
+@app.route("/api/members/shares", methods=["GET"])
+def get_members_shares():
+    """
+    Get every member's join date and total shares, from the share ledger.
+
+    Returns:
+        JSON object with members (list of member_id, total_shares and
+        join_date), count and synced_at; 503 if the ledger is disabled or
+        not loaded yet
+    """
+    if share_ledger is None:
+        return jsonify({"error": "Share ledger is disabled (SHARE_LEDGER=false)"}), 503
+    if not share_ledger.ready:
+        share_ledger.warm_up()
+        return jsonify({"error": "Share ledger is loading, retry later"}), 503
+    try:
+        share_ledger.ensure_fresh(wait=False)
+    except Exception as e:
+        logger.warning(f"Share ledger refresh failed, serving last snapshot: {e}")
+
+    members = share_ledger.list_members()
+    return jsonify(
+        {"members": members, "count": len(members), "synced_at": share_ledger.stats()["synced_at"]}
+    )
+
+
+def cached_member_history(
+    member_id: int, cycles: int = HISTORY_CYCLES, before_cycle: Optional[int] = None
+) -> Dict:
+    """build_member_history through the response cache, keyed by window."""
+    return response_cache.get(
+        ("history", member_id, cycles, before_cycle),
+        lambda: build_member_history(member_id, cycles=cycles, before_cycle=before_cycle),
+    )
+
+
+def cached_member_status(member_id: int) -> Optional[Dict]:
+    """OdooClient.get_member_status through the response cache."""
+    return response_cache.get(("status", member_id), lambda: odoo.get_member_status(member_id))
+
+
+def cached_member_shares(member_id: int) -> Dict:
+    """build_member_shares through the response cache."""
+    return response_cache.get(("shares", member_id), lambda: build_member_shares(member_id))
+
+
+@app.route("/api/member/<int:member_id>/cache", methods=["DELETE"])
+def purge_member_cache(member_id):
+    """
+    Drop the cached history, status and shares of a member.
+
+    For staff who just edited the member in Odoo: the next views rebuild
+    the responses instead of serving cached ones.
+
+    Returns:
+        JSON object with member_id and purged (number of dropped responses)
+    """
+    try:
+        member_id = validate_positive_int(member_id, "member_id")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    purged = response_cache.purge(member_id)
+    logger.info(f"Purged {purged} cached responses of member {member_id}")
+    return jsonify({"member_id": member_id, "purged": purged})
+
+
+@app.route("/api/member/<int:member_id>/profile", methods=["GET"])
+def get_member_profile(member_id):
+    """
+    Get history, status and shares of a member in one response.
+
+    The three sections are fetched concurrently and fail independently: a
+    failed section carries an "error" message (shares keep their empty
+    structure) while the others are still returned, so the response is 200
+    unless member_id is invalid.
+
+    Accepts the same cycles/before_cycle parameters as the history endpoint.
+
+    Returns:
+        JSON object with member_id and:
+        - history: Same as /api/member/<id>/history
+        - status: Same as /api/member/<id>/status, with counters_match
+          set when the most recent history page was loaded
+        - shares: Same as /api/member/<id>/shares
+        Each section has "error": null on success.
+    """
+    # Validate member_id and paging parameters
+    try:
+        member_id = validate_positive_int(member_id, "member_id")
+        page_args = parse_history_page_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        page_error = history_page_error(page_args)
+    except Exception:
+        # Reported by the history section
+        page_error = None
+    if page_error:
+        return jsonify({"error": page_error}), 400
+
+    def fetch_status():
+        status = cached_member_status(member_id)
+        if not status:
+            raise LookupError("Member not found")
+        return format_member_status(member_id, status)
+
+    # History runs in the request thread: its own FetchPlan already uses
+    # fetch_executor, and waiting on it from a pool worker could starve it
+    status_future = fetch_executor.submit(fetch_status)
+    shares_future = fetch_executor.submit(cached_member_shares, member_id)
+
+    sections = {}
+    for name, fetch, fallback in (
+        ("history", lambda: cached_member_history(member_id, **page_args), {}),
+        ("status", status_future.result, {}),
+        ("shares", shares_future.result, empty_member_shares(member_id)),
+    ):
+        try:
+            sections[name] = dict(fetch(), error=None)
+        except Exception as e:
+            if not isinstance(e, LookupError):
+                logger.error(
+                    f"Error fetching member {name} for member {member_id}: {e}",
+                    exc_info=True,
+                )
+            sections[name] = dict(fallback, error=str(e))
+
+    # The most recent history page ends with the current balance
+    if (
+        page_args.get("before_cycle") is None
+        and not sections["history"]["error"]
+        and not sections["status"]["error"]
+    ):
+        sections["status"]["counters_match"] = counters_match(
+            member_id, sections["status"]["counters"], sections["history"]["counter_totals"]
+        )
+
+    return jsonify(dict(sections, member_id=member_id))
+
+
+_warm_up_lock = threading.Lock()
+_warmed_up = False
+
+
+def warm_up_caches() -> None:
+    """
+    Start loading the background snapshots, once per process.
+
+    Runs before the first request of every worker (see start_warm_up), so
+    it works under any WSGI server and never in the reloader's watcher
+    process, which serves no requests. Loads run in background threads:
+    until the partner snapshot is ready, searches and scans use Odoo.
+    """
+    global _warmed_up
+    with _warm_up_lock:
+        if _warmed_up:
+            return
+        _warmed_up = True
+    if share_ledger is not None:
+        # Load the share snapshot, or catch up with changes since the last run
+        share_ledger.warm_up()
+    # Read the upcoming cycles' shifts before registrations point to them
+    odoo.shift_metadata.warm_up()
+    if MEMBER_SEARCH_INDEX or BARCODE_TABLE:
+        # Load the partner snapshot before the first search or scan needs it
+        partner_sync.warm_up()
+
+
+@app.before_request
+def start_warm_up():
+    """Start the background loads on the first request (not in tests)."""
+    if not _warmed_up and not app.testing:
+        warm_up_caches()
 
 
 @app.route('/', defaults={'path': ''})
@@ -0,0 +1,88 @@
+"""
+Barcode -> member status lookup table for shop-entrance checks.
+
+Scanning a member card must answer "may this member shop?" within a few
+milliseconds. BarcodeTable keeps a compact status record per partner,
+indexed by both the card barcode and barcode_base, and is fed by PartnerSync
+(bulk load, then incremental write_date polls), so a scan is a dict lookup.
+"""
+
+import threading
+from typing import Dict, List, Optional, Set
+
+# res.partner fields kept per member (see OdooClient.get_member_status)
+BARCODE_STATUS_FIELDS = [
+    "name",
+    "barcode",
+    "barcode_base",
+    "cooperative_state",
+    "is_worker_member",
+    "shift_type",
+    "is_unsubscribed",
+    "customer",
+]
+
+
+def barcode_keys(record: Dict) -> List[str]:
+    """Lookup keys of a partner: its card barcode and barcode_base."""
+    keys = []
+    if record.get("barcode"):
+        keys.append(str(record["barcode"]))
+    if record.get("barcode_base"):
+        keys.append(str(record["barcode_base"]))
+    return keys
+
+
+def compact_status(record: Dict) -> Dict:
+    """Status record served for a scanned barcode."""
+    return {
+        "member_id": record["id"],
+        "name": record.get("name"),
+        "barcode": record.get("barcode") or None,
+        "barcode_base": record.get("barcode_base") or None,
+        "cooperative_state": record.get("cooperative_state"),
+        "is_worker_member": record.get("is_worker_member", False),
+        "shift_type": record.get("shift_type"),
+        "is_unsubscribed": record.get("is_unsubscribed", False),
+        "customer": record.get("customer", False),
+    }
+
+
+class BarcodeTable:
+    """In-memory barcode/barcode_base -> compact status table."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_code: Dict[str, Dict] = {}
+        self._keys: Dict[int, List[str]] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def apply_changes(self, records: List[Dict], removed_ids: Set[int], full_reload: bool) -> None:
+        """PartnerSync listener: (re)index changed partners, drop removed ones."""
+        with self._lock:
+            if full_reload:
+                self._by_code, self._keys = {}, {}
+            for partner_id in removed_ids:
+                self._remove(partner_id)
+            for record in records:
+                self._remove(record["id"])
+                keys = barcode_keys(record)
+                if keys:
+                    status = compact_status(record)
+                    for key in keys:
+                        self._by_code[key] = status
+                    self._keys[record["id"]] = keys
+            self.ready = True
+
+    def _remove(self, partner_id: int) -> None:
+        for key in self._keys.pop(partner_id, ()):
+            status = self._by_code.get(key)
+            if status is not None and status["member_id"] == partner_id:
+                del self._by_code[key]
+
+    def lookup(self, code: str) -> Optional[Dict]:
+        """Status record for a barcode or barcode_base, or None."""
+        return self._by_code.get(code)
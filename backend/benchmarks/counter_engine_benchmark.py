@@ -0,0 +1,87 @@
+"""
+Benchmark the counter replay engine.
+
+Compares counter_engine.replay_counters with the previous multi-pass
+replay (tests/counter_replay_reference.py: per-type shift maps, manual
+lists, merged list re-sorted by create_date, totals mapped back) on
+synthetic counter events, after
+checking that both give the same JSON (keys sorted, as in API responses):
+
+    python benchmarks/counter_engine_benchmark.py --events 10000 50000
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import timeit
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from counter_engine import replay_counters  # noqa: E402
+from tests.counter_replay_reference import multi_pass_replay  # noqa: E402
+
+
+def synthetic_events(count: int) -> List[Dict]:
+    """Counter events of a long-standing member: 1-3 events per shift, 10% manual."""
+    rng = random.Random(42)
+    events = []
+    shift_id = 0
+    minute = 0
+    while len(events) < count:
+        minute += rng.randint(1, 5000)
+        counter_type = "ftop" if rng.random() < 0.3 else "standard"
+        if rng.random() < 0.1:
+            shift, repeats = False, 1
+        else:
+            shift_id += 1
+            shift, repeats = [shift_id, f"Shift {shift_id}"], rng.choice((1, 1, 1, 2, 3))
+        for repeat in range(repeats):
+            # Follow-up events (corrections) come later, sometimes in the same second
+            minute += rng.choice((0, 0, 60)) if repeat else 0
+            events.append(
+                {
+                    "id": len(events) + 1,
+                    "create_date": f"{2010 + minute // 525600:04d}-{minute % 525600:06d}",
+                    "point_qty": rng.choice((1, -1, -2, 1)),
+                    "shift_id": shift,
+                    "is_manual": not shift,
+                    "type": counter_type,
+                }
+            )
+    events = events[:count]
+    events.sort(key=lambda x: x.get("create_date") or "1900-01-01")
+    return events
+
+
+def run(replay, events: List[Dict], repeat: int) -> Tuple[float, str]:
+    """Best time of `repeat` replays, and the JSON of one replay's results on a fresh copy."""
+    copies = copy.deepcopy(events)
+    shift_counter_map, closing = replay(copies, {"ftop": 0, "standard": 0})
+    result = json.dumps([shift_counter_map, closing, copies], sort_keys=True, default=lambda o: o.to_json())
+    # Replaying the same events again only rewrites their totals
+    timings = timeit.repeat(lambda: replay(copies, {"ftop": 0, "standard": 0}), number=1, repeat=repeat)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[10000, 50000], help="Event counts")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per count (best is reported)")
+    args = parser.parse_args()
+
+    print(f"  {'events':>8} {'multi-pass ms':>14} {'engine ms':>10} {'speedup':>8}")
+    for count in args.events:
+        events = synthetic_events(count)
+        before, expected = run(multi_pass_replay, events, args.repeat)
+        after, actual = run(replay_counters, events, args.repeat)
+        if actual != expected:
+            sys.exit(f"Results differ for {count} events")
+        print(f"  {count:>8} {before * 1000:>14.1f} {after * 1000:>10.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark cycle/week lookups.
+
+Locates synthetic event dates (datetimes over five years) with the per-call
+calculate_cycle_info (configuration validated and dates parsed on every
+call), then with one CycleCalendar: per date (locate), in batch
+(locate_all, vectorized when NumPy is installed) and with the full NumPy
+labels (label_dates, bounds included):
+
+    python benchmarks/cycle_calendar_benchmark.py --dates 1000 10000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import timeit
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cycle_calculator import NUMPY_AVAILABLE, CycleCalendar, calculate_cycle_info  # noqa: E402
+
+WEEK_A_DATE = "2020-12-28"
+WEEKS_PER_CYCLE = 4
+
+
+def synthetic_dates(count: int) -> List[str]:
+    rng = random.Random(42)
+    return [
+        f"{rng.randint(2021, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+        f"{rng.randint(8, 20):02d}:00:00"
+        for _ in range(count)
+    ]
+
+
+def per_call_lookup(dates: List[str]) -> tuple:
+    """Cycle numbers and week letters through calculate_cycle_info."""
+    infos = [calculate_cycle_info(day[:10], WEEK_A_DATE, WEEKS_PER_CYCLE) for day in dates]
+    return [info["cycle_number"] for info in infos], [info["week_letter"] for info in infos]
+
+
+def best_ms(func, repeat: int) -> float:
+    number = 5
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dates", type=int, nargs="+", default=[1000, 10000], help="Dates per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats (best is reported)")
+    args = parser.parse_args()
+
+    calendar = CycleCalendar(WEEK_A_DATE, WEEKS_PER_CYCLE)
+    print(f"NumPy {'available' if NUMPY_AVAILABLE else 'not installed'}")
+
+    for count in args.dates:
+        dates = synthetic_dates(count)
+        located = [calendar.locate(day) for day in dates]
+        expected = per_call_lookup(dates)
+        assert ([cycle for cycle, _ in located], [letter for _, letter in located]) == expected
+        assert calendar.locate_all(dates) == expected
+
+        timings = {
+            "calculate_cycle_info": best_ms(lambda: per_call_lookup(dates), args.repeat),
+            "CycleCalendar.locate": best_ms(lambda: [calendar.locate(day) for day in dates], args.repeat),
+            "CycleCalendar.locate_all": best_ms(lambda: calendar.locate_all(dates), args.repeat),
+        }
+        if NUMPY_AVAILABLE:
+            timings["CycleCalendar.label_dates"] = best_ms(lambda: calendar.label_dates(dates), args.repeat)
+
+        print(f"\n{count} dates")
+        baseline = timings["calculate_cycle_info"]
+        for name, ms in timings.items():
+            print(f"  {name:<28} {ms:9.2f} ms  ({baseline / ms:5.1f}x)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    main()
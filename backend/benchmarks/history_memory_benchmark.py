@@ -0,0 +1,260 @@
+"""
+Measure the memory allocated to build and serve a member history response.
+
+Builds the history of a synthetic member (purchases, shifts with their
+counter events, manual counter events and leaves over several years) with
+Odoo replaced by in-memory records, and reports with tracemalloc:
+
+- build peak: peak allocation while building the response (build_member_history)
+- request peak: peak allocation of the whole history request, the body
+  being read as it is sent
+- retained: size of the built response (what the response cache keeps)
+
+The Odoo records themselves are created beforehand and not counted. The
+same measurements are taken on a baseline revision (by default the one
+before history events became __slots__ records, when they were dicts),
+checked out in a temporary git worktree:
+
+    python benchmarks/history_memory_benchmark.py --years 5 --purchases-per-week 3
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WEEKS_PER_CYCLE = 4
+
+# Reported measurements
+LABELS = {"peak": "build peak", "peak_request": "request peak", "retained": "retained"}
+
+
+def timestamp(day: datetime) -> str:
+    return day.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class SyntheticOdoo:
+    """Stand-in for OdooClient serving one member's records, newest first."""
+
+    def __init__(self, years: int, purchases_per_week: int):
+        rng = random.Random(42)
+        now = datetime.now().replace(microsecond=0)
+        start = now - timedelta(days=365 * years)
+        self.week_a_date = (start - timedelta(days=start.weekday())).strftime("%Y-%m-%d")
+
+        self.purchases = []
+        for week in range(52 * years):
+            for _ in range(purchases_per_week):
+                day = start + timedelta(weeks=week, days=rng.randint(0, 6), minutes=rng.randint(480, 1200))
+                order_id = len(self.purchases) + 1
+                self.purchases.append(
+                    {
+                        "id": order_id,
+                        "date_order": timestamp(day),
+                        "name": f"Shop/{order_id:06d}",
+                        "pos_reference": f"Order {order_id:05d}-001-0001",
+                    }
+                )
+
+        self.shifts = []
+        self.counter_events = []
+        cycles = 13 * years
+        for cycle in range(cycles):
+            day = start + timedelta(weeks=WEEKS_PER_CYCLE * cycle, days=rng.randint(0, 20), hours=9)
+            shift_id = 1000 + cycle
+            state = rng.choice(("done", "done", "done", "absent", "excused"))
+            self.shifts.append(
+                {
+                    "id": 5000 + cycle,
+                    "date_begin": timestamp(day),
+                    "date_end": timestamp(day + timedelta(hours=3)),
+                    "state": state,
+                    "shift_id": [shift_id, f"Shift {shift_id}"],
+                    "is_late": False,
+                    "is_exchanged": False,
+                    "is_exchange": False,
+                    "exchange_state": False,
+                    "exchange_replacing_reg_id": False,
+                    "exchange_replaced_reg_id": False,
+                    "replaced_reg_id": False,
+                    "shift_name": f"Épicerie - Mardi {9 + cycle % 3}h",
+                    "week_number": cycle % WEEKS_PER_CYCLE + 1,
+                    "week_name": "ABCD"[cycle % WEEKS_PER_CYCLE],
+                    "shift_type_id": [1, "Standard"],
+                }
+            )
+            if state != "excused":
+                self.counter_events.append(
+                    self.counter_event(shift_id, day + timedelta(hours=4), 1 if state == "done" else -2)
+                )
+            if rng.random() < 0.3:
+                self.counter_events.append(self.counter_event(False, day + timedelta(days=2), -1))
+        self.purchases.sort(key=lambda x: x["date_order"], reverse=True)
+        self.shifts.sort(key=lambda x: x["date_begin"], reverse=True)
+        self.counter_events.sort(key=lambda x: x["create_date"], reverse=True)
+
+        self.leaves = []
+        for year in range(years):
+            leave_start = start + timedelta(days=365 * year + 180)
+            self.leaves.append(
+                {
+                    "id": 700 + year,
+                    "start_date": leave_start.strftime("%Y-%m-%d"),
+                    "stop_date": (leave_start + timedelta(days=21)).strftime("%Y-%m-%d"),
+                    "leave_type": "Congé",
+                    "state": "done",
+                }
+            )
+        self.leaves.reverse()
+
+    def counter_event(self, shift_id, day: datetime, point_qty: int) -> Dict:
+        return {
+            "id": len(self.counter_events) + 1,
+            "create_date": timestamp(day),
+            "point_qty": point_qty,
+            "sum_current_qty": 0,
+            "shift_id": [shift_id, f"Shift {shift_id}"] if shift_id else False,
+            "is_manual": not shift_id,
+            "name": "Shift" if shift_id else "Manual adjustment",
+            "type": "standard",
+        }
+
+    def get_shift_config(self) -> Dict:
+        return {"weeks_per_cycle": WEEKS_PER_CYCLE, "week_a_date": self.week_a_date}
+
+    def get_member_purchase_history(self, member_id, **bounds) -> List[Dict]:
+        return self.purchases
+
+    def get_member_shift_history(self, member_id, **bounds) -> List[Dict]:
+        return self.shifts
+
+    def get_member_counter_events(self, member_id, **bounds) -> List[Dict]:
+        return self.counter_events
+
+    def get_member_leaves(self, member_id, **bounds) -> List[Dict]:
+        return self.leaves
+
+    def get_holidays(self, **bounds) -> List[Dict]:
+        return []
+
+
+def measure(history_app, cycles: int) -> Dict[str, int]:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        response = history_app.build_member_history(1, cycles=cycles, use_segments=False)
+        built, build_peak = tracemalloc.get_traced_memory()
+        events = len(response["events"])
+        del response
+
+        # The whole request, the body read chunk by chunk as a server would
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        client = history_app.app.test_client()
+        served = client.get(f"/api/member/1/history?cycles={cycles}", buffered=False)
+        body = 0
+        for chunk in served.response:
+            body += len(chunk)
+        _, request_peak = tracemalloc.get_traced_memory()
+        served.close()
+    finally:
+        tracemalloc.stop()
+    return {
+        "events": events,
+        "peak": build_peak - before,
+        "peak_request": request_peak - start,
+        "retained": built - before,
+        "body": body,
+    }
+
+
+def measure_app(app_dir: str, years: int, purchases_per_week: int, repeat: int) -> Dict[str, int]:
+    """Smallest measurements of `repeat` requests to the app in app_dir."""
+    sys.path.insert(0, app_dir)
+    # Whole history in one page, always built (no response cache or segments)
+    os.environ.update(HISTORY_MAX_CYCLES="1000", RESPONSE_CACHE="false", RESPONSE_CACHE_HARD_TTL="0",
+                      HISTORY_SEGMENTS="false")
+    import app as history_app
+
+    logging.disable(logging.INFO)
+    history_app.app.testing = True
+    history_app.odoo = SyntheticOdoo(years, purchases_per_week)
+    history_app.COUNTER_AGGREGATION_MODE = "full"
+    cycles = 13 * years
+
+    results = [measure(history_app, cycles) for _ in range(repeat)]
+    return {key: min(result[key] for result in results) for key in results[0]}
+
+
+def default_baseline() -> str:
+    """The revision before history events became records (history_events.py added)."""
+    added = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", "history_events.py"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return f"{added[-1]}^"
+
+
+def measure_revision(revision: str, args: argparse.Namespace) -> Dict[str, int]:
+    """Measure the app of another git revision, checked out in a temporary worktree."""
+    with tempfile.TemporaryDirectory() as worktree:
+        subprocess.run(["git", "worktree", "add", "--detach", worktree, revision],
+                       cwd=BACKEND_DIR, capture_output=True, check=True)
+        try:
+            prefix = subprocess.run(["git", "rev-parse", "--show-prefix"], cwd=BACKEND_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip()
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--years", str(args.years),
+                 "--purchases-per-week", str(args.purchases_per_week), "--repeat", str(args.repeat),
+                 "--app-dir", os.path.join(worktree, prefix), "--json"],
+                capture_output=True, text=True, check=True,
+            ).stdout
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=BACKEND_DIR, capture_output=True)
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--years", type=int, default=5, help="Years of history")
+    parser.add_argument("--purchases-per-week", type=int, default=3, help="POS orders per week")
+    parser.add_argument("--repeat", type=int, default=3, help="Measurements (smallest is reported)")
+    parser.add_argument("--baseline", help="Git revision to compare with (default: before the history records)")
+    parser.add_argument("--no-baseline", action="store_true", help="Only measure the current app")
+    parser.add_argument("--app-dir", default=BACKEND_DIR, help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.json:
+        print(json.dumps(measure_app(args.app_dir, args.years, args.purchases_per_week, args.repeat)))
+        return
+
+    current = measure_app(args.app_dir, args.years, args.purchases_per_week, args.repeat)
+    print(f"{current['events']} events over {13 * args.years} cycles, JSON body {current['body'] / 1024:.0f} KiB")
+    if args.no_baseline:
+        for key, label in LABELS.items():
+            print(f"  {label:<14} {current[key] / 1024:>8.0f} KiB")
+        return
+
+    revision = args.baseline or default_baseline()
+    baseline = measure_revision(revision, args)
+    print(f"  {'':<14} {'baseline':>12} {'current':>12}")
+    for key, label in LABELS.items():
+        print(
+            f"  {label:<14} {baseline[key] / 1024:>8.0f} KiB {current[key] / 1024:>8.0f} KiB"
+            f"  ({baseline[key] / current[key]:.1f}x)"
+        )
+    print(f"  baseline: {revision}, body {baseline['body'] / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark the local member name index.
+
+Builds a MemberNameIndex from synthetic French-style member names (or from
+every cooperative member name in Odoo with --odoo, using .env settings) and reports the
+build time and per-query search latency for typical typed queries:
+
+    python benchmarks/member_index_benchmark.py --members 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from member_index import MemberNameIndex  # noqa: E402
+
+QUERIES = ["ma", "mar", "martin", "helene", "hélène", "noel", "tho", "omas", "martn", "dupont marc", "jean luc"]
+
+SYLLABLES = [
+    "ma", "ri", "tin", "du", "pont", "le", "fe", "vre", "bois", "mo", "reau", "lau", "rent",
+    "si", "mon", "mi", "chel", "gar", "cia", "da", "vid", "ber", "trand", "roux", "vin",
+    "cent", "four", "nier", "gi", "rard", "an", "dré", "mer", "cier", "hé", "lè", "ne",
+]
+FIRST_NAMES = [
+    "Marie", "Jean", "Hélène", "Noël", "Paul", "Zoé", "Chloé", "Léa", "Théo", "Lucas",
+    "François", "Amélie", "Sophie", "Nicolas", "Julie", "Thomas", "Camille", "Antoine",
+    "Manon", "Hugo", "Jean-Luc", "Anne-Sophie", "Inès", "Maël", "Benoît",
+]
+
+
+def synthetic_partners(count: int) -> List[Dict]:
+    rng = random.Random(42)
+    return [
+        {
+            "id": i + 1,
+            "name": f"{''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).upper()}, "
+                    f"{rng.choice(FIRST_NAMES)}",
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--members", type=int, default=10000, help="Number of synthetic members")
+    parser.add_argument("--odoo", action="store_true", help="Index real partner names from Odoo")
+    parser.add_argument("--repeat", type=int, default=50, help="Searches per query (mean is reported)")
+    args = parser.parse_args()
+
+    if args.odoo:
+        from odoo_client import COOPERATIVE_MEMBER_DOMAIN, OdooClient
+
+        partners = OdooClient().execute(
+            "res.partner", "search_read", COOPERATIVE_MEMBER_DOMAIN, fields=["id", "name"]
+        )
+    else:
+        partners = synthetic_partners(args.members)
+
+    index = MemberNameIndex()
+    start = time.perf_counter()
+    index.apply_changes(partners, set(), True)
+    print(f"Indexed {len(partners)} names in {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+    print(f"  {'query':14} {'matches':>8} {'ms/search':>10}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            _, total = index.search(query, limit=50)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"  {query:14} {total:>8} {elapsed * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark XML-RPC vs JSON-RPC payload size and decode time.
+
+Compares, for the same search_read results, the size of the Odoo response
+body (raw and gzip) and the client-side decode time of each protocol:
+xmlrpc.client.loads (expat + unmarshalling) versus json.loads.
+
+Responses can be recorded from a live Odoo instance (uses .env settings):
+
+    python benchmarks/transport_benchmark.py --record responses.json \\
+        --member-id 1234 --search ma
+
+and then replayed offline:
+
+    python benchmarks/transport_benchmark.py --responses responses.json
+
+Without --responses, synthetic responses shaped like counter events and
+member search results are used.
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import random
+import sys
+import time
+import xmlrpc.client
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def synthetic_responses(counter_events: int = 5000, members: int = 300) -> Dict[str, List[Dict]]:
+    """Build search_read results shaped like real Odoo responses."""
+    rng = random.Random(42)
+    events = [
+        {
+            "id": 100000 + i,
+            "create_date": f"20{18 + i // 1000:02d}-{1 + i % 12:02d}-{1 + i % 28:02d} 10:00:00",
+            "point_qty": rng.choice([1.0, -1.0, -2.0]),
+            "sum_current_qty": rng.randint(-4, 4),
+            "shift_id": [5000 + i, f"ABCD {i % 4} Mon 09:00"] if i % 5 else False,
+            "is_manual": i % 5 == 0,
+            "name": "Shift attended" if i % 3 else "Manual adjustment",
+            "type": "ftop" if i % 2 else "standard",
+        }
+        for i in range(counter_events)
+    ]
+    partners = [
+        {
+            "id": 2000 + i,
+            "name": f"MEMBER{i}, Marie-Hélène",
+            "barcode_base": 1000 + i,
+            "street": f"{i} rue de Lille",
+            "street2": False,
+            "city": "Villeneuve-d'Ascq",
+            "zip": "59650",
+            "phone": "03 20 00 00 00",
+            "mobile": False,
+            "email": f"member{i}@example.org",
+            "image_small": base64.b64encode(rng.randbytes(3000)).decode(),
+        }
+        for i in range(members)
+    ]
+    return {"shift.counter.event": events, "res.partner (search)": partners}
+
+
+def record_responses(path: str, member_id: int, search: str) -> None:
+    """Record real search_read results from Odoo into a JSON file."""
+    from odoo_client import OdooClient
+
+    odoo = OdooClient()
+    responses = {
+        "shift.counter.event": odoo.get_member_counter_events(member_id),
+        "res.partner (search)": odoo.search_members_by_name(search),
+    }
+    with open(path, "w") as f:
+        json.dump(responses, f)
+    print(f"Recorded {', '.join(f'{k}: {len(v)} rows' for k, v in responses.items())} to {path}")
+
+
+def best_time(func: Callable, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(name: str, rows: List[Dict], repeat: int) -> None:
+    xml_body = xmlrpc.client.dumps((rows,), methodresponse=True).encode("utf-8")
+    json_body = json.dumps({"jsonrpc": "2.0", "id": 1, "result": rows}).encode("utf-8")
+
+    xml_time = best_time(lambda: xmlrpc.client.loads(xml_body), repeat)
+    json_time = best_time(lambda: json.loads(json_body), repeat)
+
+    print(f"\n{name}: {len(rows)} rows")
+    print(f"  {'':10} {'raw bytes':>12} {'gzip bytes':>12} {'decode ms':>10}")
+    for label, body, seconds in (
+        ("xmlrpc", xml_body, xml_time),
+        ("jsonrpc", json_body, json_time),
+    ):
+        print(
+            f"  {label:10} {len(body):>12,} {len(gzip.compress(body)):>12,} "
+            f"{seconds * 1000:>10.2f}"
+        )
+    print(
+        f"  jsonrpc is {len(xml_body) / len(json_body):.1f}x smaller "
+        f"and decodes {xml_time / json_time:.1f}x faster"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--responses", help="JSON file of recorded responses to replay")
+    parser.add_argument("--record", help="Record responses from Odoo into this file and exit")
+    parser.add_argument("--member-id", type=int, help="Member whose counter events to record")
+    parser.add_argument("--search", default="ma", help="Member search query to record")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is kept)")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.member_id:
+            parser.error("--record requires --member-id")
+        record_responses(args.record, args.member_id, args.search)
+        return
+
+    if args.responses:
+        with open(args.responses) as f:
+            responses = json.load(f)
+    else:
+        responses = synthetic_responses()
+
+    for name, rows in responses.items():
+        benchmark(name, rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
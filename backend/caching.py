@@ -0,0 +1,171 @@
+"""
+In-process caches for slow-changing Odoo data.
+
+RefreshingValue keeps one value loaded from Odoo for a TTL. Shortly before
+the TTL expires, a read triggers a background reload so that callers keep
+getting the cached value without waiting. If a reload fails, the last good
+value is kept (stale-on-error) until a later reload succeeds.
+
+Background reloads of every cache run on one small bounded pool, so a burst
+of expiring values queues reloads instead of starting a thread each.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Shared by all RefreshingValue background reloads
+refresh_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("CACHE_REFRESH_WORKERS", 4)),
+    thread_name_prefix="cache-refresh",
+)
+
+
+class RefreshingValue:
+    """
+    Thread-safe single value cache with TTL, refresh-ahead and stale-on-error.
+
+    Args:
+        loader: Callable returning a fresh value; raises on failure
+        ttl: Seconds a loaded value is considered fresh
+        refresh_ahead: Seconds before expiry from which reads trigger a
+                       background reload
+        name: Label used in logs
+        stale_on_error: Serve the last good value when a reload after
+                        expiry fails; if False the error is raised
+        executor: Pool running background reloads (default: the shared
+                  refresh_executor)
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        ttl: float,
+        refresh_ahead: float = 0.0,
+        name: str = "value",
+        stale_on_error: bool = True,
+        executor: Optional[Executor] = None,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.refresh_ahead = min(refresh_ahead, ttl)
+        self.name = name
+        self.stale_on_error = stale_on_error
+        self.executor = executor or refresh_executor
+
+        self._value: Any = _MISSING
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+
+        self._hits = 0
+        self._misses = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self._errors = 0
+
+    def get(self, stale_ok: bool = False) -> Any:
+        """
+        Get the cached value, loading it if missing or expired.
+
+        Args:
+            stale_ok: Return an expired value at once and reload it in the
+                      background (for latency-critical callers)
+
+        Returns:
+            The cached or freshly loaded value
+
+        Raises:
+            Exception: The loader error, if no value was ever loaded
+        """
+        with self._lock:
+            if self._value is not _MISSING:
+                age = time.monotonic() - self._loaded_at
+                if age < self.ttl or stale_ok:
+                    self._hits += 1
+                    if age >= self.ttl - self.refresh_ahead:
+                        self._start_refresh()
+                    return self._value
+            self._misses += 1
+
+        return self._load()
+
+    def _start_refresh(self) -> None:
+        # Called with self._lock held
+        if not self._refreshing:
+            self._refreshing = True
+            self.executor.submit(self._refresh)
+
+    def _load(self) -> Any:
+        # One caller loads at a time; the others then find the fresh value
+        with self._load_lock:
+            with self._lock:
+                if self._value is not _MISSING and time.monotonic() - self._loaded_at < self.ttl:
+                    return self._value
+            try:
+                value = self.loader()
+            except Exception as e:
+                with self._lock:
+                    self._errors += 1
+                    if self._value is _MISSING or not self.stale_on_error:
+                        raise
+                    self._stale_hits += 1
+                    logger.warning(f"Failed to reload {self.name}, serving last good value: {e}")
+                    return self._value
+            self._store(value)
+            return value
+
+    def _refresh(self) -> None:
+        try:
+            value = self.loader()
+        except Exception as e:
+            with self._lock:
+                self._errors += 1
+            logger.warning(f"Background refresh of {self.name} failed, keeping cached value: {e}")
+        else:
+            self._store(value)
+            with self._lock:
+                self._refreshes += 1
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _store(self, value: Any) -> None:
+        with self._lock:
+            self._value = value
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Drop the cached value; the next read reloads it."""
+        with self._lock:
+            self._value = _MISSING
+            self._loaded_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, stale_hits (reload failed, last good
+            value served), refreshes (background reloads), errors, ttl and
+            age (seconds since last load, None if never loaded)
+        """
+        with self._lock:
+            loaded = self._value is not _MISSING
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale_hits": self._stale_hits,
+                "refreshes": self._refreshes,
+                "errors": self._errors,
+                "ttl": self.ttl,
+                "age": round(time.monotonic() - self._loaded_at, 1) if loaded else None,
+            }
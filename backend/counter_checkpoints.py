@@ -0,0 +1,271 @@
+"""
+Persistent per-member counter checkpoints.
+
+A checkpoint records, for one partner, the cumulative ftop/standard counter
+totals of every shift.counter.event created before a boundary date, together
+with the last event folded in (id/create_date), the number of events folded
+and the newest write_date seen. With a checkpoint, the history replay only
+fetches events created on or after the boundary and carries the totals
+forward, so the counter cost no longer grows with membership age.
+
+Checkpoints are stored in SQLite (COUNTER_CHECKPOINT_DB, default
+<CACHE_DIR>/counter_checkpoints.sqlite3) and dropped when Odoo shows that an
+event before the boundary was edited (newer write_date) or deleted (count
+mismatch).
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from counter_sources import CounterWindow, live_shift_ids, zero_totals
+from utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+def default_checkpoint_path() -> str:
+    """Path of the checkpoint database (COUNTER_CHECKPOINT_DB or cache dir)."""
+    return os.getenv(
+        "COUNTER_CHECKPOINT_DB",
+        os.path.join(get_cache_dir(), "counter_checkpoints.sqlite3"),
+    )
+
+
+class CounterCheckpointStore:
+    """SQLite-backed store of one counter checkpoint per partner."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_checkpoint_path()
+        self._lock = threading.Lock()
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS counter_checkpoint (
+                    partner_id INTEGER PRIMARY KEY,
+                    boundary_date TEXT NOT NULL,
+                    last_event_id INTEGER,
+                    last_create_date TEXT,
+                    ftop_total REAL NOT NULL,
+                    standard_total REAL NOT NULL,
+                    event_count INTEGER NOT NULL,
+                    max_write_date TEXT,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, partner_id: int) -> Optional[Dict]:
+        """
+        Get a partner's checkpoint.
+
+        Returns:
+            Dictionary with boundary_date, last_event_id, last_create_date,
+            ftop_total, standard_total, event_count and max_write_date,
+            or None if the partner has no checkpoint
+        """
+        with self._lock, closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT * FROM counter_checkpoint WHERE partner_id = ?", (partner_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def save(self, partner_id: int, checkpoint: Dict) -> None:
+        """Create or replace a partner's checkpoint."""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO counter_checkpoint (
+                    partner_id, boundary_date, last_event_id, last_create_date,
+                    ftop_total, standard_total, event_count, max_write_date, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    partner_id,
+                    checkpoint["boundary_date"],
+                    checkpoint.get("last_event_id"),
+                    checkpoint.get("last_create_date"),
+                    checkpoint["ftop_total"],
+                    checkpoint["standard_total"],
+                    checkpoint["event_count"],
+                    checkpoint.get("max_write_date"),
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                ),
+            )
+
+    def delete(self, partner_id: int) -> None:
+        """Drop a partner's checkpoint."""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM counter_checkpoint WHERE partner_id = ?", (partner_id,))
+
+
+def is_checkpoint_valid(odoo, partner_id: int, checkpoint: Dict) -> bool:
+    """
+    Check that no event folded into a checkpoint changed in Odoo.
+
+    Invalid if an event created before the boundary has a write_date newer
+    than any seen when folding (edited), or if the number of such events
+    differs (deleted or back-dated).
+    """
+    boundary = checkpoint["boundary_date"]
+    edited = odoo.count_member_counter_events(
+        partner_id, before_date=boundary, modified_after=checkpoint.get("max_write_date")
+    ) if checkpoint.get("max_write_date") else 0
+    if edited:
+        logger.info(f"Counter checkpoint for partner {partner_id} invalidated: {edited} edited events")
+        return False
+
+    count = odoo.count_member_counter_events(partner_id, before_date=boundary)
+    if count != checkpoint["event_count"]:
+        logger.info(
+            f"Counter checkpoint for partner {partner_id} invalidated: "
+            f"{count} events before {boundary}, expected {checkpoint['event_count']}"
+        )
+        return False
+    return True
+
+
+def _sum_by_type(events: List[Dict]) -> Dict[str, float]:
+    totals = zero_totals()
+    for event in events:
+        counter_type = "ftop" if event.get("type", "standard") == "ftop" else "standard"
+        totals[counter_type] += event.get("point_qty", 0)
+    return totals
+
+
+def advance_checkpoint(
+    checkpoint: Optional[Dict], events: List[Dict], boundary_date: str
+) -> Tuple[Dict, int]:
+    """
+    Fold events created before a new boundary into a checkpoint.
+
+    Args:
+        checkpoint: Current checkpoint, or None to start from zero
+        events: Events created on or after the current boundary
+        boundary_date: New boundary (events before it are folded)
+
+    Returns:
+        Tuple of (new checkpoint, number of events folded)
+    """
+    folded = [e for e in events if (e.get("create_date") or "") < boundary_date]
+    base = checkpoint or {
+        "ftop_total": 0,
+        "standard_total": 0,
+        "event_count": 0,
+        "last_event_id": None,
+        "last_create_date": None,
+        "max_write_date": None,
+    }
+    sums = _sum_by_type(folded)
+
+    last_event_id = base.get("last_event_id")
+    last_create_date = base.get("last_create_date")
+    max_write_date = base.get("max_write_date")
+    for event in folded:
+        key = (event.get("create_date") or "", event.get("id") or 0)
+        if last_create_date is None or key > (last_create_date, last_event_id or 0):
+            last_create_date, last_event_id = key
+        write_date = event.get("write_date")
+        if write_date and (max_write_date is None or write_date > max_write_date):
+            max_write_date = write_date
+
+    return (
+        {
+            "boundary_date": boundary_date,
+            "last_event_id": last_event_id,
+            "last_create_date": last_create_date,
+            "ftop_total": base["ftop_total"] + sums["ftop"],
+            "standard_total": base["standard_total"] + sums["standard"],
+            "event_count": base["event_count"] + len(folded),
+            "max_write_date": max_write_date,
+        },
+        len(folded),
+    )
+
+
+def fetch_with_checkpoint(
+    odoo,
+    store: CounterCheckpointStore,
+    partner_id: int,
+    start_date: str,
+    shifts: Optional[List[Dict]],
+) -> CounterWindow:
+    """
+    Fetch counter events newer than the partner's checkpoint.
+
+    Without a valid checkpoint, every event is fetched once (as in full mode)
+    and a checkpoint is created at the display window start. Afterwards only
+    events created on or after the checkpoint boundary are fetched, plus the
+    earlier events of shifts live in the window (their aggregate must stay
+    complete, exactly as in the read_group mode). The checkpoint is then
+    advanced to the window start.
+
+    Args:
+        odoo: OdooClient
+        store: Checkpoint store
+        partner_id: Member ID
+        start_date: Start of the display window
+        shifts: Shift registrations displayed in the history
+
+    Returns:
+        Tuple of (opening_totals, counter_events)
+    """
+    checkpoint = store.get(partner_id)
+    if checkpoint and checkpoint["boundary_date"] > start_date:
+        # Window moved back (e.g. paging into older cycles): not usable
+        checkpoint = None
+    if checkpoint and not is_checkpoint_valid(odoo, partner_id, checkpoint):
+        store.delete(partner_id)
+        checkpoint = None
+
+    if checkpoint is None:
+        events = odoo.get_member_counter_events(partner_id)
+        opening = zero_totals()
+    else:
+        boundary = checkpoint["boundary_date"]
+        events = odoo.get_member_counter_events(partner_id, start_date=boundary)
+
+        window_events = [e for e in events if (e.get("create_date") or "") >= start_date]
+        shift_ids = sorted(live_shift_ids(shifts, window_events))
+        earlier_live_events = []
+        if shift_ids:
+            earlier_live_events = odoo.get_member_counter_events(
+                partner_id, before_date=boundary, shift_ids=shift_ids
+            )
+
+        # The checkpoint totals include the earlier live events, which are
+        # replayed again as part of their shift aggregate
+        earlier_sums = _sum_by_type(earlier_live_events)
+        opening = {
+            "ftop": checkpoint["ftop_total"] - earlier_sums["ftop"],
+            "standard": checkpoint["standard_total"] - earlier_sums["standard"],
+        }
+        events = list(events) + list(earlier_live_events)
+        # Only the events after the old boundary are folded below
+        fold_source = [e for e in events if (e.get("create_date") or "") >= boundary]
+
+    if checkpoint is None or start_date > checkpoint["boundary_date"]:
+        new_checkpoint, folded = advance_checkpoint(
+            checkpoint, events if checkpoint is None else fold_source, start_date
+        )
+        store.save(partner_id, new_checkpoint)
+        logger.info(
+            f"Counter checkpoint for partner {partner_id} at {start_date}: "
+            f"folded {folded} events, ftop={new_checkpoint['ftop_total']} "
+            f"standard={new_checkpoint['standard_total']}"
+        )
+
+    logger.info(
+        f"Counter events for partner {partner_id} via checkpoint: {len(events)} events "
+        f"(opening ftop={opening['ftop']} standard={opening['standard']})"
+    )
+    return opening, events
@@ -0,0 +1,147 @@
+"""
+Counter replay engine.
+
+Members have two point counters, ftop and standard (ABCD). Their history
+is the list of shift.counter.event records: events linked to a shift are
+aggregated per shift (and counter type), the others are manual
+adjustments. Every aggregate and manual event is shown with the totals of
+both counters at its time.
+
+replay_counters works in two passes without re-sorting the whole list. The
+first pass goes over the events (sorted by create_date), aggregating
+shifts and recording one compact tuple per item. The second walks those
+tuples, already in create_date order, to add up the running totals. A
+shift's aggregate is counted at the create_date of its last event. Items
+sharing a create_date are counted in a fixed order (ftop shifts, ftop
+manual events, standard shifts, standard manual events, each in order of
+first appearance), as the history always did, so only those runs of tied
+items are sorted.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from history_events import ShiftCounter
+from utils import extract_id
+
+logger = logging.getLogger(__name__)
+
+# Order of items sharing a create_date
+_FTOP_SHIFT, _FTOP_MANUAL, _STANDARD_SHIFT, _STANDARD_MANUAL = range(4)
+# Create date of the sentinel item closing the last run of tied items
+_END = object()
+
+
+def replay_counters(events: List[Dict], opening_totals: Dict) -> Tuple[Dict[int, ShiftCounter], Dict]:
+    """
+    Aggregate counter events per shift and compute the running totals.
+
+    Manual events (without shift_id) are annotated in place with
+    ftop_total, standard_total and sum_current_qty (the total of their own
+    counter) at their time.
+
+    Args:
+        events: shift.counter.event records sorted by create_date (oldest first)
+        opening_totals: Counter totals before the first event ({"ftop", "standard"})
+
+    Returns:
+        Tuple of:
+        - Map of shift_id to its ShiftCounter aggregate, with the running
+          totals when it was counted
+        - Closing totals ({"ftop", "standard"}, not rounded)
+    """
+    ftop_shifts: Dict[int, ShiftCounter] = {}
+    standard_shifts: Dict[int, ShiftCounter] = {}
+    # Slot in `slots` of each shift's latest event, per counter type
+    ftop_slots: Dict[int, int] = {}
+    standard_slots: Dict[int, int] = {}
+    # Compact record per item, in counting order:
+    # (create_date, order, first position, is_ftop, is_shift, aggregate or manual event);
+    # a shift's record moves to its latest event, leaving None behind
+    slots: List[Optional[Tuple]] = []
+    append = slots.append
+
+    for position, event in enumerate(events):
+        counter_type = event.get("type", "standard")
+        create_date = event.get("create_date", "")
+        shift_id = extract_id(event.get("shift_id"))
+
+        if not shift_id:
+            if counter_type == "ftop":
+                append((create_date, _FTOP_MANUAL, position, True, False, event))
+            else:
+                append((create_date, _STANDARD_MANUAL, position, False, False, event))
+            continue
+
+        if counter_type == "ftop":
+            shifts, shift_slots, order, is_ftop = ftop_shifts, ftop_slots, _FTOP_SHIFT, True
+        else:
+            shifts, shift_slots, order, is_ftop = standard_shifts, standard_slots, _STANDARD_SHIFT, False
+
+        aggregate = shifts.get(shift_id)
+        if aggregate is None:
+            aggregate = shifts[shift_id] = ShiftCounter(event.get("point_qty", 0), create_date, counter_type)
+            first = position
+        else:
+            aggregate.point_qty += event.get("point_qty", 0)
+            # Keep the latest create_date for this shift's aggregated events
+            if create_date > aggregate.create_date:
+                aggregate.create_date = create_date
+            previous = shift_slots[shift_id]
+            first = slots[previous][2]
+            slots[previous] = None
+        shift_slots[shift_id] = len(slots)
+        append((create_date, order, first, is_ftop, True, aggregate))
+
+    # Running totals of both counters, starting from the balance before the first event
+    ftop_running_total = opening_totals["ftop"]
+    standard_running_total = opening_totals["standard"]
+
+    items = [slot for slot in slots if slot is not None]
+    items.append((_END,))
+    tied: List[Tuple] = []
+    for index in range(len(items) - 1):
+        item = items[index]
+        if items[index + 1][0] == item[0]:
+            tied.append(item)
+            continue
+        if tied:
+            tied.append(item)
+            tied.sort(key=lambda tied_item: (tied_item[1], tied_item[2]))
+            run, tied = tied, []
+        else:
+            run = (item,)
+
+        for _, _, _, is_ftop, is_shift, target in run:
+            point_qty = target.point_qty if is_shift else target.get("point_qty", 0)
+            if is_ftop:
+                ftop_running_total += point_qty
+            else:
+                standard_running_total += point_qty
+            ftop_total = int(ftop_running_total)
+            standard_total = int(standard_running_total)
+            # For backward compatibility, sum_current_qty is the active counter's total
+            sum_current_qty = ftop_total if is_ftop else standard_total
+            if is_shift:
+                target.ftop_total = ftop_total
+                target.standard_total = standard_total
+                target.sum_current_qty = sum_current_qty
+            else:
+                target["ftop_total"] = ftop_total
+                target["standard_total"] = standard_total
+                target["sum_current_qty"] = sum_current_qty
+
+    shift_counter_map = ftop_shifts
+    for shift_id, data in standard_shifts.items():
+        if shift_id in shift_counter_map:
+            # Shouldn't happen (a shift should only have one counter type), but handle it
+            logger.warning(
+                f"Shift {shift_id} has both ftop and standard counter events - merging data"
+            )
+            shift_counter_map[shift_id].point_qty += data.point_qty
+            if data.create_date > shift_counter_map[shift_id].create_date:
+                shift_counter_map[shift_id].create_date = data.create_date
+        else:
+            shift_counter_map[shift_id] = data
+
+    return shift_counter_map, {"ftop": ftop_running_total, "standard": standard_running_total}
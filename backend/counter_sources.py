@@ -0,0 +1,119 @@
+"""
+Counter event sources for the member history replay.
+
+The history endpoint replays counter events chronologically to compute the
+ftop/standard running totals shown on every event. Each source returns the
+same pair:
+
+    (opening_totals, counter_events)
+
+where ``opening_totals`` are the counter values before the first returned
+event and ``counter_events`` the events still to replay. Seeding the replay
+with ``opening_totals`` yields exactly the same running totals as replaying
+every event the member ever had.
+
+Modes:
+- 'full': fetch every counter event (opening totals are zero)
+- 'read_group': fetch only events inside the display window and get the
+  opening balance with one server-side read_group
+- 'checkpoint': carry the opening balance forward from a persisted
+  per-member checkpoint and only fetch newer events (see counter_checkpoints)
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils import extract_id
+
+logger = logging.getLogger(__name__)
+
+COUNTER_MODES = ("full", "read_group", "checkpoint")
+
+CounterWindow = Tuple[Dict[str, float], List[Dict]]
+
+
+def zero_totals() -> Dict[str, float]:
+    """Opening totals for a member without prior counter events."""
+    return {"ftop": 0, "standard": 0}
+
+
+def live_shift_ids(shifts: Optional[Iterable[Dict]], counter_events: Iterable[Dict]) -> Set[int]:
+    """
+    Collect the shifts whose counter data can appear in the response.
+
+    The replay aggregates a shift's events into one item dated at its latest
+    event, and shift events display that aggregate. Those shifts therefore
+    need all of their events, including ones before the display window.
+
+    Args:
+        shifts: Shift registrations displayed in the history
+        counter_events: Counter events inside the display window
+
+    Returns:
+        Set of shift.shift IDs
+    """
+    shift_ids = set()
+    for shift in shifts or []:
+        shift_id = extract_id(shift.get("shift_id"))
+        if shift_id:
+            shift_ids.add(shift_id)
+    for counter_event in counter_events:
+        shift_id = extract_id(counter_event.get("shift_id"))
+        if shift_id:
+            shift_ids.add(shift_id)
+    return shift_ids
+
+
+def fetch_full(odoo, partner_id: int) -> CounterWindow:
+    """Fetch every counter event of the member (no opening balance)."""
+    return zero_totals(), odoo.get_member_counter_events(partner_id)
+
+
+def fetch_read_group(
+    odoo,
+    partner_id: int,
+    start_date: str,
+    shifts: Optional[List[Dict]],
+    window_events: List[Dict],
+) -> CounterWindow:
+    """
+    Complete window events with a server-side opening balance.
+
+    Events of live shifts created before the window are fetched explicitly
+    (they belong to aggregates that are replayed inside the window); every
+    other event before the window is summed by a single read_group. Live
+    shifts include every displayed shift, so a shift whose counter events
+    all predate the window still gets its counter aggregate, as in full
+    mode.
+
+    Args:
+        odoo: OdooClient
+        partner_id: Member ID
+        start_date: Start of the display window
+        shifts: Shift registrations displayed in the history
+        window_events: Counter events created on or after start_date
+
+    Returns:
+        Tuple of (opening_totals, counter_events)
+    """
+    shift_ids = sorted(live_shift_ids(shifts, window_events))
+
+    earlier_live_events = []
+    if shift_ids:
+        earlier_live_events = odoo.get_member_counter_events(
+            partner_id, before_date=start_date, shift_ids=shift_ids
+        )
+
+    opening = zero_totals()
+    opening.update(
+        odoo.get_member_counter_totals(
+            partner_id, before_date=start_date, exclude_shift_ids=shift_ids
+        )
+    )
+
+    logger.info(
+        f"Counter window for partner {partner_id} from {start_date}: "
+        f"{len(window_events)} events in window, {len(earlier_live_events)} earlier "
+        f"events of live shifts, opening ftop={opening['ftop']} standard={opening['standard']}"
+    )
+    return opening, list(window_events) + list(earlier_live_events)
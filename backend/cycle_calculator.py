@@ -4,12 +4,24 @@ Cycle and week calculation module.
 Provides functions to dynamically calculate shift cycles and weeks based on
 Odoo configuration (shift_week_a_date and shift_weeks_per_cycle) rather than
 using hardcoded JSON files.
+
+CycleCalendar validates a configuration once and then locates dates with
+integer arithmetic on day ordinals; the module functions are one-off
+shortcuts built on it. NumPy is optional: with it, CycleCalendar.label_dates
+labels a whole array of dates in one call.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import logging
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
 logger = logging.getLogger(__name__)
 
 # Week letter mapping
@@ -51,6 +63,237 @@ def validate_shift_config(week_a_date: str, weeks_per_cycle: int) -> bool:
     return True
 
 
+class CycleCalendar:
+    """
+    Cycle calendar of one shift configuration.
+
+    The configuration is validated and parsed once; dates are then located
+    with integer arithmetic on day ordinals, in O(1) per date.
+
+    Args:
+        week_a_date: Week A start date in ISO format (YYYY-MM-DD)
+        weeks_per_cycle: Number of weeks per cycle
+
+    Raises:
+        ValueError: If the configuration is invalid
+    """
+
+    def __init__(self, week_a_date: str, weeks_per_cycle: int):
+        validate_shift_config(week_a_date, weeks_per_cycle)
+        self.week_a_date = week_a_date
+        self.weeks_per_cycle = weeks_per_cycle
+        self._week_a = datetime.strptime(week_a_date, "%Y-%m-%d").toordinal()
+        self._cycle_days = weeks_per_cycle * 7
+        if np is not None:
+            self._week_a_day = np.datetime64(date.fromordinal(self._week_a), "D")
+            self._week_letters = np.array(WEEK_LETTERS[:weeks_per_cycle])
+
+    def _iso(self, days: int) -> str:
+        # Date `days` days after Week A start (YYYY-MM-DD)
+        return date.fromordinal(self._week_a + days).isoformat()
+
+    def locate(self, day: Any) -> Optional[Tuple[int, str]]:
+        """
+        Locate a date in the calendar.
+
+        Args:
+            day: Date or datetime in ISO format (the time is ignored), or an
+                 empty value
+
+        Returns:
+            (cycle_number, week_letter), or None if the date is empty or
+            before Week A
+        """
+        if not day:
+            return None
+        days = date.fromisoformat(day[:10]).toordinal() - self._week_a
+        if days < 0:
+            return None
+        cycle_index, cycle_day = divmod(days, self._cycle_days)
+        return cycle_index + 1, WEEK_LETTERS[cycle_day // 7]
+
+    def locate_all(self, dates: Sequence[Any]) -> Tuple[List[Optional[int]], List[Optional[str]]]:
+        """
+        Locate many dates (vectorized with NumPy when it is installed).
+
+        Args:
+            dates: Dates or datetimes in ISO format, or empty values
+
+        Returns:
+            Tuple of (cycle numbers, week letters) lists, one item per date,
+            None where the date is empty or before Week A
+        """
+        if np is None:
+            located = [self.locate(day) or (None, None) for day in dates]
+            return [cycle for cycle, _ in located], [letter for _, letter in located]
+        weeks, valid = self._weeks(dates)
+        cycle_index, week_number = np.divmod(weeks, self.weeks_per_cycle)
+        # Dates not located get cycle 0 and the extra None letter
+        week_letters = WEEK_LETTERS[:self.weeks_per_cycle] + [None]
+        week_number[~valid] = self.weeks_per_cycle
+        return (
+            [cycle or None for cycle in np.where(valid, cycle_index + 1, 0).tolist()],
+            [week_letters[week] for week in week_number.tolist()],
+        )
+
+    def _weeks(self, dates: Any) -> Tuple[Any, Any]:
+        # Weeks since Week A (0 where not valid) and valid mask, as numpy arrays
+        if isinstance(dates, np.ndarray) and dates.dtype.kind == "M":
+            days = dates.astype("datetime64[D]")
+        else:
+            # Parsed with their time (no string slicing), then floored to days
+            days = np.array([day or "NaT" for day in dates], dtype="datetime64[s]").astype("datetime64[D]")
+
+        offsets = (days - self._week_a_day).astype(np.int64)
+        valid = ~np.isnat(days) & (offsets >= 0)
+        return np.where(valid, offsets, 0) // 7, valid
+
+    def label_dates(self, dates: Any) -> Dict[str, Any]:
+        """
+        Label an array of dates with their cycle and week in one call.
+
+        Args:
+            dates: numpy datetime64 array, or sequence of ISO dates or
+                   datetimes (the time is ignored) with empty values allowed
+
+        Returns:
+            Dictionary of numpy arrays, one item per date:
+            {
+                'valid': bool,          # False if empty or before Week A
+                'cycle_number': int64,  # 1-indexed, 0 where not valid
+                'week_number': int64,   # 0-indexed week within cycle
+                'week_letter': str,     # 'A', 'B', ..., '' where not valid
+                'week_start': datetime64[D],   # NaT where not valid
+                'week_end': datetime64[D],
+                'cycle_start': datetime64[D],
+                'cycle_end': datetime64[D]
+            }
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required to label dates in batch")
+        weeks, valid = self._weeks(dates)
+        cycle_index, week_number = np.divmod(weeks, self.weeks_per_cycle)
+        week_start = self._week_a_day + weeks * 7
+        cycle_start = self._week_a_day + cycle_index * self._cycle_days
+        not_a_time = np.datetime64("NaT", "D")
+
+        return {
+            'valid': valid,
+            'cycle_number': np.where(valid, cycle_index + 1, 0),
+            'week_number': week_number,
+            'week_letter': np.where(valid, self._week_letters[week_number], ""),
+            'week_start': np.where(valid, week_start, not_a_time),
+            'week_end': np.where(valid, week_start + 6, not_a_time),
+            'cycle_start': np.where(valid, cycle_start, not_a_time),
+            'cycle_end': np.where(valid, cycle_start + (self._cycle_days - 1), not_a_time),
+        }
+
+    def cycle_info(self, target_date: str) -> Dict[str, Any]:
+        """
+        Calculate cycle number, week letter and bounds for a given date.
+
+        See calculate_cycle_info for the returned dictionary.
+
+        Raises:
+            ValueError: If target_date is before Week A start
+        """
+        days = datetime.strptime(target_date, "%Y-%m-%d").toordinal() - self._week_a
+
+        if days < 0:
+            raise ValueError(
+                f"Target date {target_date} is before Week A start date {self.week_a_date}"
+            )
+
+        total_weeks = days // 7
+        cycle_index, week_number = divmod(total_weeks, self.weeks_per_cycle)
+        week_start = total_weeks * 7
+        cycle_start = cycle_index * self._cycle_days
+
+        return {
+            'cycle_number': cycle_index + 1,
+            'week_letter': WEEK_LETTERS[week_number],
+            'week_number': week_number,
+            'week_start': self._iso(week_start),
+            'week_end': self._iso(week_start + 6),
+            'cycle_start': self._iso(cycle_start),
+            'cycle_end': self._iso(cycle_start + self._cycle_days - 1)
+        }
+
+    def cycle_start(self, cycle_number: int) -> str:
+        """
+        Get the start date of a specific cycle.
+
+        Args:
+            cycle_number: Cycle number (1-indexed)
+
+        Returns:
+            Cycle start date in ISO format (YYYY-MM-DD)
+        """
+        if cycle_number < 1:
+            raise ValueError(f"cycle_number must be >= 1, got {cycle_number}")
+
+        return self._iso((cycle_number - 1) * self._cycle_days)
+
+    def current_cycle(self, today: Optional[str] = None) -> int:
+        """
+        Get the cycle number of today.
+
+        Args:
+            today: Today's date (defaults to actual today)
+
+        Raises:
+            ValueError: If today is before Week A start
+        """
+        if today is None:
+            today = datetime.now().strftime("%Y-%m-%d")
+        return self.cycle_info(today)['cycle_number']
+
+    def window(
+        self,
+        n_cycles: int,
+        before_cycle: Optional[int] = None,
+        today: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate a page of N cycles for cursor-based history paging.
+
+        See get_cycle_window for the arguments and returned dictionary.
+        """
+        if n_cycles < 1:
+            raise ValueError(f"n_cycles must be >= 1, got {n_cycles}")
+
+        if today is None:
+            today = datetime.now().strftime("%Y-%m-%d")
+        current_cycle = self.current_cycle(today)
+
+        if before_cycle is None:
+            last_cycle = current_cycle
+            end_date = today
+            end_before = None
+        else:
+            if not 2 <= before_cycle <= current_cycle + 1:
+                raise ValueError(
+                    f"before_cycle must be between 2 and {current_cycle + 1}, got {before_cycle}"
+                )
+            last_cycle = before_cycle - 1
+            end_before = self.cycle_start(before_cycle)
+            end_date = self._iso((last_cycle * self._cycle_days) - 1)
+
+        first_cycle = max(1, last_cycle - n_cycles + 1)
+
+        return {
+            'first_cycle': first_cycle,
+            'last_cycle': last_cycle,
+            'start_date': self.cycle_start(first_cycle),
+            'end_date': end_date,
+            'end_before': end_before,
+            'next_before_cycle': first_cycle if first_cycle > 1 else None,
+        }
+
+
 def calculate_cycle_info(
     target_date: str,
     week_a_start: str,
@@ -59,6 +302,9 @@ def calculate_cycle_info(
     """
     Calculate cycle number and week letter for a given date.
 
+    Validates the configuration on every call: to locate many dates, build
+    a CycleCalendar once.
+
     Args:
         target_date: Date to check (YYYY-MM-DD)
         week_a_start: Initial Week A start date (YYYY-MM-DD)
@@ -79,51 +325,7 @@ def calculate_cycle_info(
     Raises:
         ValueError: If target_date is before week_a_start
     """
-    # Validate configuration
-    validate_shift_config(week_a_start, weeks_per_cycle)
-
-    target = datetime.strptime(target_date, "%Y-%m-%d")
-    week_a = datetime.strptime(week_a_start, "%Y-%m-%d")
-
-    # Calculate days since Week A start
-    days_diff = (target - week_a).days
-
-    if days_diff < 0:
-        raise ValueError(
-            f"Target date {target_date} is before Week A start date {week_a_start}"
-        )
-
-    # Calculate total weeks since Week A
-    total_weeks = days_diff // 7
-
-    # Calculate cycle number (1-indexed)
-    cycle_number = (total_weeks // weeks_per_cycle) + 1
-
-    # Calculate week within cycle (0-indexed)
-    week_number = total_weeks % weeks_per_cycle
-
-    # Map to week letter
-    week_letter = WEEK_LETTERS[week_number]
-
-    # Calculate week boundaries
-    week_offset_days = total_weeks * 7
-    week_start = week_a + timedelta(days=week_offset_days)
-    week_end = week_start + timedelta(days=6)
-
-    # Calculate cycle boundaries
-    cycle_week_offset = (cycle_number - 1) * weeks_per_cycle * 7
-    cycle_start = week_a + timedelta(days=cycle_week_offset)
-    cycle_end = cycle_start + timedelta(days=(weeks_per_cycle * 7) - 1)
-
-    return {
-        'cycle_number': cycle_number,
-        'week_letter': week_letter,
-        'week_number': week_number,
-        'week_start': week_start.strftime("%Y-%m-%d"),
-        'week_end': week_end.strftime("%Y-%m-%d"),
-        'cycle_start': cycle_start.strftime("%Y-%m-%d"),
-        'cycle_end': cycle_end.strftime("%Y-%m-%d")
-    }
+    return CycleCalendar(week_a_start, weeks_per_cycle).cycle_info(target_date)
 
 
 def get_cycle_start_date(
@@ -148,16 +350,7 @@ def get_cycle_start_date(
         >>> get_cycle_start_date(2, "2025-01-13", 4)
         "2025-02-10"
     """
-    validate_shift_config(week_a_start, weeks_per_cycle)
-
-    if cycle_number < 1:
-        raise ValueError(f"cycle_number must be >= 1, got {cycle_number}")
-
-    week_a = datetime.strptime(week_a_start, "%Y-%m-%d")
-    cycle_offset_days = (cycle_number - 1) * weeks_per_cycle * 7
-    cycle_start = week_a + timedelta(days=cycle_offset_days)
-
-    return cycle_start.strftime("%Y-%m-%d")
+    return CycleCalendar(week_a_start, weeks_per_cycle).cycle_start(cycle_number)
 
 
 def get_cycle_date_range(
@@ -183,7 +376,7 @@ def get_cycle_date_range(
         >>> get_cycle_date_range(13, "2025-01-13", 4)
         ('2025-01-13', '2025-11-24')
     """
-    validate_shift_config(week_a_start, weeks_per_cycle)
+    calendar = CycleCalendar(week_a_start, weeks_per_cycle)
 
     if n_cycles < 1:
         raise ValueError(f"n_cycles must be >= 1, got {n_cycles}")
@@ -193,14 +386,14 @@ def get_cycle_date_range(
         end_date = datetime.now().strftime("%Y-%m-%d")
 
     # Calculate what cycle we're currently in
-    current_cycle_info = calculate_cycle_info(end_date, week_a_start, weeks_per_cycle)
+    current_cycle_info = calendar.cycle_info(end_date)
     current_cycle_number = current_cycle_info['cycle_number']
 
     # Calculate start cycle number (n cycles back)
     start_cycle_number = max(1, current_cycle_number - n_cycles + 1)
 
     # Get start date of the start cycle
-    start_date = get_cycle_start_date(start_cycle_number, week_a_start, weeks_per_cycle)
+    start_date = calendar.cycle_start(start_cycle_number)
 
     logger.info(
         f"Calculated {n_cycles}-cycle range: {start_date} to {end_date} "
@@ -208,3 +401,47 @@ def get_cycle_date_range(
     )
 
     return (start_date, end_date)
+
+
+def get_cycle_window(
+    n_cycles: int,
+    week_a_start: str,
+    weeks_per_cycle: int,
+    before_cycle: Optional[int] = None,
+    today: Optional[str] = None
+) -> Dict[str, any]:
+    """
+    Calculate a page of N cycles for cursor-based history paging.
+
+    The most recent page ends today (current cycle included); with a
+    before_cycle cursor, the page ends with the cycle just before it.
+
+    Args:
+        n_cycles: Number of cycles in the page
+        week_a_start: Initial Week A start date (YYYY-MM-DD)
+        weeks_per_cycle: Number of weeks per cycle
+        before_cycle: Optional cursor: only cycles before this one
+        today: Today's date (defaults to actual today)
+
+    Returns:
+        Dictionary with the page bounds:
+        {
+            'first_cycle': int,         # Oldest cycle of the page
+            'last_cycle': int,          # Most recent cycle of the page
+            'start_date': str,          # First day of first_cycle (YYYY-MM-DD)
+            'end_date': str,            # Last day shown: today or last day of last_cycle
+            'end_before': str or None,  # Exclusive end (start of the next cycle),
+                                        # None for the most recent page
+            'next_before_cycle': int or None  # Cursor of the previous page,
+                                              # None when cycle 1 is reached
+        }
+
+    Raises:
+        ValueError: If n_cycles < 1 or before_cycle is not in 2..current+1
+
+    Examples:
+        >>> # If today is 2025-11-24 (Cycle 12)
+        >>> get_cycle_window(3, "2025-01-13", 4, before_cycle=10)["start_date"]
+        '2025-06-30'
+    """
+    return CycleCalendar(week_a_start, weeks_per_cycle).window(n_cycles, before_cycle, today)
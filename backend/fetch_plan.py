@@ -0,0 +1,176 @@
+"""
+Dependency-aware concurrent fetch plan.
+
+Runs a set of named Odoo fetch steps on a shared, bounded thread pool. Steps
+without dependencies start immediately; a step that depends on others is
+submitted as soon as all of its dependencies have resolved, receiving their
+results as leading positional arguments. No worker thread ever blocks waiting
+for another step, so a small shared pool cannot deadlock under load.
+
+Each step is either required (its error is re-raised by ``run()``) or has a
+fallback value that is used, with a warning, when it fails. This mirrors the
+per-source error tolerance of the member history endpoint.
+"""
+
+import logging
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Sentinel marking a step without fallback (errors propagate)
+REQUIRED = object()
+
+
+class _Step:
+    __slots__ = ("name", "func", "args", "kwargs", "depends_on", "fallback", "future")
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        depends_on: Sequence[str],
+        fallback: Any,
+    ):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.depends_on = tuple(depends_on)
+        self.fallback = fallback
+        self.future: Future = Future()
+
+
+class FetchPlan:
+    """
+    A small DAG of fetch steps executed concurrently.
+
+    Example:
+        >>> plan = FetchPlan(executor, label="member 42")
+        >>> plan.add("shifts", odoo.get_member_shift_history, 42)
+        >>> plan.add("holidays", odoo.get_holidays, fallback=[])
+        >>> plan.add("exchanges", fetch_exchanges, depends_on=["shifts"], fallback={})
+        >>> results = plan.run()
+        >>> results["exchanges"]
+    """
+
+    def __init__(self, executor: Executor, label: Optional[str] = None):
+        self.executor = executor
+        self.label = label
+        self._steps: Dict[str, _Step] = {}
+        self._order: List[str] = []
+
+    def add(
+        self,
+        name: str,
+        func: Callable,
+        *args,
+        depends_on: Sequence[str] = (),
+        fallback: Any = REQUIRED,
+        **kwargs,
+    ) -> "FetchPlan":
+        """
+        Register a step.
+
+        Args:
+            name: Unique step name, used as key in the results
+            func: Callable to run; results of ``depends_on`` steps are passed
+                  first, followed by ``args``
+            depends_on: Names of steps that must resolve before this one starts
+            fallback: Value used if the step (or a dependency) fails.
+                      Omit to make the step required.
+
+        Returns:
+            The plan itself, for chaining
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate fetch step: {name}")
+        for dependency in depends_on:
+            if dependency not in self._steps:
+                raise ValueError(
+                    f"Step {name} depends on unknown step {dependency} "
+                    f"(dependencies must be added first)"
+                )
+        self._steps[name] = _Step(name, func, args, kwargs, depends_on, fallback)
+        self._order.append(name)
+        return self
+
+    def run(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute all steps and wait for them.
+
+        Returns:
+            Dictionary mapping step name to its result (or fallback)
+
+        Raises:
+            Exception: The error of the first failing required step, in
+                       registration order
+        """
+        for name in self._order:
+            self._schedule(self._steps[name])
+
+        results = {}
+        for name in self._order:
+            results[name] = self._steps[name].future.result(timeout=timeout)
+        return results
+
+    def _schedule(self, step: _Step) -> None:
+        dependencies = [self._steps[d].future for d in step.depends_on]
+        if not dependencies:
+            self._submit(step, [])
+            return
+
+        remaining = [len(dependencies)]
+        lock = threading.Lock()
+
+        def on_dependency_done(_future: Future) -> None:
+            with lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                self._submit(step, dependencies)
+
+        for dependency in dependencies:
+            dependency.add_done_callback(on_dependency_done)
+
+    def _submit(self, step: _Step, dependencies: List[Future]) -> None:
+        dependency_results = []
+        for dependency in dependencies:
+            error = dependency.exception()
+            if error is not None:
+                self._resolve_error(step, error)
+                return
+            dependency_results.append(dependency.result())
+
+        try:
+            inner = self.executor.submit(
+                step.func, *dependency_results, *step.args, **step.kwargs
+            )
+        except Exception as e:
+            # Executor shut down or saturated beyond recovery
+            self._resolve_error(step, e)
+            return
+
+        def on_done(future: Future) -> None:
+            error = future.exception()
+            if error is not None:
+                self._resolve_error(step, error)
+            else:
+                step.future.set_result(future.result())
+
+        inner.add_done_callback(on_done)
+
+    def _resolve_error(self, step: _Step, error: BaseException) -> None:
+        if step.fallback is REQUIRED:
+            step.future.set_exception(error)
+            return
+
+        target = f" for {self.label}" if self.label else ""
+        logger.warning(
+            f"Error fetching {step.name}{target} (continuing without): {error}",
+            exc_info=(type(error), error, error.__traceback__),
+        )
+        step.future.set_result(step.fallback)
@@ -0,0 +1,306 @@
+"""
+Compact records of the member history timeline.
+
+A history page holds hundreds to thousands of events (purchases, shifts,
+counter events, leaves). They are built as __slots__ records instead of
+dicts (about a fifth of the memory each), and shift events share their
+ShiftCounter aggregate with the counter replay instead of copying it. They
+are converted to JSON only at the edge:
+
+- HistoryJSONProvider lets Flask's default JSON encoding convert them
+  through to_json
+- iter_json encodes the history response as it is sent, a few KB at a
+  time, instead of materializing the whole body first
+- to_json / event_from_json convert events for the history segment store
+
+to_json gives the same dict, key for key, as the history always returned,
+plus the event's cycle_number and week_letter once it has been placed on
+the cycle calendar (see locate_events).
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+from flask.json.provider import DefaultJSONProvider
+
+from cycle_calculator import CycleCalendar
+
+
+class ShiftCounter:
+    """
+    Counter events of one shift, aggregated by the counter replay.
+
+    Args:
+        point_qty: Sum of the shift's counter event points
+        create_date: Create date of its latest counter event
+        type: Counter type ('ftop' or 'standard')
+    """
+
+    __slots__ = ("point_qty", "create_date", "type", "ftop_total", "standard_total", "sum_current_qty")
+
+    def __init__(self, point_qty: float, create_date: str, type: str):
+        self.point_qty = point_qty
+        self.create_date = create_date
+        self.type = type
+        # Running totals when the aggregate was counted (set by the replay)
+        self.ftop_total = 0
+        self.standard_total = 0
+        self.sum_current_qty = 0
+
+    def to_json(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "ShiftCounter":
+        counter = cls(data["point_qty"], data["create_date"], data["type"])
+        counter.ftop_total = data.get("ftop_total", 0)
+        counter.standard_total = data.get("standard_total", 0)
+        counter.sum_current_qty = data.get("sum_current_qty", 0)
+        return counter
+
+    def __repr__(self) -> str:
+        return f"ShiftCounter({self.to_json()})"
+
+
+class HistoryEvent:
+    """
+    Base class of timeline events.
+
+    Subclasses list their JSON fields, in response order, in __slots__;
+    fields set to None in _optional are left out of the JSON. cycle_number
+    and week_letter are only set (and output) once the event is located.
+    """
+
+    __slots__ = ("id", "date", "cycle_number", "week_letter")
+    type = ""
+    _optional: frozenset = frozenset()
+
+    def to_json(self) -> Dict[str, Any]:
+        data = {"type": self.type, "id": self.id, "date": self.date}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            if value is None and field in self._optional:
+                continue
+            data[field] = value.to_json() if isinstance(value, ShiftCounter) else value
+        if hasattr(self, "cycle_number"):
+            data["cycle_number"] = self.cycle_number
+            data["week_letter"] = self.week_letter
+        return data
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "HistoryEvent":
+        event = cls.__new__(cls)
+        event.id = data.get("id")
+        event.date = data.get("date")
+        for field in cls.__slots__:
+            setattr(event, field, data.get(field))
+        if "cycle_number" in data:
+            event.cycle_number = data["cycle_number"]
+            event.week_letter = data.get("week_letter")
+        return event
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_json()})"
+
+
+class PurchaseEvent(HistoryEvent):
+    """POS order of the member."""
+
+    __slots__ = ("reference",)
+    type = "purchase"
+
+    def __init__(self, id: int, date: str, reference: Optional[str]):
+        self.id = id
+        self.date = date
+        self.reference = reference
+
+
+class ShiftEvent(HistoryEvent):
+    """
+    Shift registration of the member.
+
+    counter is the shift's ShiftCounter (shared with the replay) and
+    exchange_details the exchange information, both left out when None.
+    """
+
+    __slots__ = (
+        "shift_name",
+        "state",
+        "is_late",
+        "week_number",
+        "week_name",
+        "shift_type",
+        "shift_type_id",
+        "counter",
+        "exchange_details",
+        "is_exchanged",
+        "is_exchange",
+    )
+    type = "shift"
+    _optional = frozenset(("counter", "exchange_details"))
+
+    def __init__(
+        self,
+        id: int,
+        date: str,
+        shift_name: Optional[str],
+        state: Optional[str],
+        is_late: bool,
+        week_number: Any,
+        week_name: Any,
+        shift_type: str,
+        shift_type_id: Any,
+        counter: Optional[ShiftCounter] = None,
+        exchange_details: Optional[Dict] = None,
+        is_exchanged: bool = False,
+        is_exchange: bool = False,
+    ):
+        self.id = id
+        self.date = date
+        self.shift_name = shift_name
+        self.state = state
+        self.is_late = is_late
+        self.week_number = week_number
+        self.week_name = week_name
+        self.shift_type = shift_type
+        self.shift_type_id = shift_type_id
+        self.counter = counter
+        self.exchange_details = exchange_details
+        self.is_exchanged = is_exchanged
+        self.is_exchange = is_exchange
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "ShiftEvent":
+        event = super().from_json(data)
+        if event.counter is not None:
+            event.counter = ShiftCounter.from_json(event.counter)
+        return event
+
+
+class CounterEvent(HistoryEvent):
+    """Manual counter event, with both counter totals at its time."""
+
+    __slots__ = ("point_qty", "sum_current_qty", "ftop_total", "standard_total", "name", "counter_type")
+    type = "counter"
+
+    def __init__(
+        self,
+        id: int,
+        date: str,
+        point_qty: float,
+        sum_current_qty: int,
+        ftop_total: int,
+        standard_total: int,
+        name: str,
+        counter_type: str,
+    ):
+        self.id = id
+        self.date = date
+        self.point_qty = point_qty
+        self.sum_current_qty = sum_current_qty
+        self.ftop_total = ftop_total
+        self.standard_total = standard_total
+        self.name = name
+        self.counter_type = counter_type
+
+
+class LeaveStartEvent(HistoryEvent):
+    """Start of a leave, with the date it ends (None if open-ended)."""
+
+    __slots__ = ("leave_type", "leave_end", "leave_id")
+    type = "leave_start"
+
+    def __init__(self, id: int, date: str, leave_type: str, leave_end: Any):
+        self.id = id
+        self.date = date
+        self.leave_type = leave_type
+        self.leave_end = leave_end
+        self.leave_id = id
+
+
+class LeaveEndEvent(HistoryEvent):
+    """End of a leave, with the date it started."""
+
+    __slots__ = ("leave_type", "leave_start", "leave_id")
+    type = "leave_end"
+
+    def __init__(self, id: int, date: str, leave_type: str, leave_start: Any):
+        self.id = id
+        self.date = date
+        self.leave_type = leave_type
+        self.leave_start = leave_start
+        self.leave_id = id
+
+
+EVENT_TYPES = {
+    cls.type: cls for cls in (PurchaseEvent, ShiftEvent, CounterEvent, LeaveStartEvent, LeaveEndEvent)
+}
+
+
+def event_from_json(data: Dict) -> HistoryEvent:
+    """
+    Rebuild a history event from its JSON dict (see HistoryEvent.to_json).
+
+    Raises:
+        KeyError: If the event type is unknown
+    """
+    return EVENT_TYPES[data["type"]].from_json(data)
+
+
+def locate_events(events: List[HistoryEvent], calendar: CycleCalendar) -> None:
+    """
+    Set the cycle_number and week_letter of events, by date.
+
+    Events without date or dated before Week A get None for both.
+
+    Args:
+        events: History events (updated in place)
+        calendar: Cycle calendar of the shift configuration
+    """
+    cycle_numbers, week_letters = calendar.locate_all([event.date for event in events])
+    for event, cycle_number, week_letter in zip(events, cycle_numbers, week_letters):
+        event.cycle_number = cycle_number
+        event.week_letter = week_letter
+
+
+class HistoryJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding history records through their to_json."""
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        if isinstance(o, (HistoryEvent, ShiftCounter)):
+            return o.to_json()
+        return DefaultJSONProvider.default(o)
+
+
+def iter_json(obj: Any, provider: DefaultJSONProvider, chunk_size: int = 16384) -> Iterator[bytes]:
+    """
+    Encode a response body as compact JSON, chunk by chunk.
+
+    Gives the same bytes as the provider's compact responses (its default,
+    ensure_ascii and sort_keys, then a newline), for a streamed Response.
+
+    Args:
+        obj: Response object
+        provider: The app's JSON provider
+        chunk_size: Characters encoded before a chunk is yielded
+
+    Returns:
+        Iterator of UTF-8 encoded chunks
+    """
+    encoder = json.JSONEncoder(
+        separators=(",", ":"),
+        default=provider.default,
+        ensure_ascii=provider.ensure_ascii,
+        sort_keys=provider.sort_keys,
+    )
+    parts: List[str] = []
+    size = 0
+    for part in encoder.iterencode(obj):
+        parts.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(parts).encode("utf-8")
+            parts, size = [], 0
+    parts.append("\n")
+    yield "".join(parts).encode("utf-8")
@@ -0,0 +1,269 @@
+"""
+Persistent per-member, per-cycle history segments.
+
+Once a cycle has closed and its counter events are settled, its purchase,
+shift and counter events no longer change. The history endpoint stores the
+assembled events of closed cycles (all but the current and previous one) as
+segments and, while they are valid, only fetches the last two cycles from
+Odoo.
+
+A member's segments form one block of consecutive cycles, stored with a
+fingerprint of the Odoo rows it was built from: for purchases, shift
+registrations and counter events, the number of rows and their newest
+write_date, obtained with a search_count and a one-row search_read. The
+fingerprint is taken before the block's rows are fetched, so an edit made
+during the build is seen at the next check; a late edit, a deletion or a back-dated row changes
+the fingerprint and the block is rebuilt.
+
+Shift events also show data from rows the fingerprint does not cover: the
+shift.shift names and weeks, and the registrations on the other side of the
+member's exchanges. The segments keep the member's registrations' links to
+them (REGISTRATION_LINK_FIELDS), from which those fields are rebuilt on
+read, so a later rename or exchange is shown without invalidating the block.
+
+Segments are stored in SQLite (HISTORY_SEGMENT_DB, default
+<CACHE_DIR>/history_segments.sqlite3).
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Fingerprinted Odoo sources: name -> (model, date field)
+FINGERPRINT_SOURCES = {
+    "purchases": ("pos.order", "date_order"),
+    "shifts": ("shift.registration", "date_begin"),
+    "counters": ("shift.counter.event", "create_date"),
+}
+
+# Fields of the member's registrations kept with the segments, to rebuild the
+# shift names, weeks and exchange details of stored shift events
+REGISTRATION_LINK_FIELDS = (
+    "id",
+    "shift_id",
+    "state",
+    "is_exchanged",
+    "is_exchange",
+    "exchange_state",
+    "exchange_replacing_reg_id",
+    "exchange_replaced_reg_id",
+    "replaced_reg_id",
+)
+
+
+def default_segment_path() -> str:
+    """Path of the segment database (HISTORY_SEGMENT_DB or cache dir)."""
+    return os.getenv(
+        "HISTORY_SEGMENT_DB",
+        os.path.join(get_cache_dir(), "history_segments.sqlite3"),
+    )
+
+
+def config_key(shift_config: Dict) -> str:
+    """Cycle numbering a block was built with (segments of another one are unusable)."""
+    return f"{shift_config['week_a_date']}/{shift_config['weeks_per_cycle']}"
+
+
+def fingerprint_domain(
+    source: str, partner_id: int, start_date: str, end_before: str, shift_states: List[str]
+) -> List:
+    """
+    Domain of the Odoo rows a block covering [start_date, end_before) depends on.
+
+    Counter events are not limited to the block: the running totals depend
+    on every earlier event, and an event created later for a shift of the
+    block changes that shift's counter aggregate.
+
+    Args:
+        source: Key of FINGERPRINT_SOURCES
+        partner_id: Member ID
+        start_date: First day of the block
+        end_before: First day after the block
+        shift_states: Registration states shown in the history
+
+    Returns:
+        Odoo domain
+    """
+    if source == "purchases":
+        return [
+            ("partner_id", "=", partner_id),
+            ("state", "=", "done"),
+            ("date_order", ">=", start_date),
+            ("date_order", "<", end_before),
+        ]
+    if source == "shifts":
+        return [
+            ("partner_id", "=", partner_id),
+            ("state", "in", list(shift_states)),
+            ("date_begin", ">=", start_date),
+            ("date_begin", "<", end_before),
+        ]
+    return [
+        ("partner_id", "=", partner_id),
+        "|",
+        ("create_date", "<", end_before),
+        ("shift_id.date_begin", "<", end_before),
+    ]
+
+
+def split_into_cycles(
+    dated_events: List[Tuple[str, Dict]], cycle_starts: List[Tuple[int, str]]
+) -> Dict[int, List[Dict]]:
+    """
+    Assign events to cycles by the date they were fetched by.
+
+    Args:
+        dated_events: (source date, event) pairs, in response order
+        cycle_starts: (cycle number, start date) of consecutive cycles, oldest
+                      first; the last entry is the first day after them
+
+    Returns:
+        Map of cycle number to its events (response order kept); events
+        outside the cycles are left out
+    """
+    segments = {cycle: [] for cycle, _ in cycle_starts[:-1]}
+    for source_date, event in dated_events:
+        source_date = source_date or ""
+        for (cycle, start), (_, next_start) in zip(cycle_starts, cycle_starts[1:]):
+            if start <= source_date < next_start:
+                segments[cycle].append(event)
+                break
+    return segments
+
+
+class HistorySegmentStore:
+    """SQLite-backed store of one block of cycle segments per partner."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_segment_path()
+        self._lock = threading.Lock()
+        with self._lock, closing(self._connect()) as conn, conn:
+            columns = [row["name"] for row in conn.execute("PRAGMA table_info(history_segment)")]
+            if columns and "registrations" not in columns:
+                # Segments stored without registration links: rebuilt from Odoo
+                conn.execute("DROP TABLE history_segment")
+                conn.execute("DROP TABLE IF EXISTS history_segment_block")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS history_segment_block (
+                    partner_id INTEGER PRIMARY KEY,
+                    config_key TEXT NOT NULL,
+                    first_cycle INTEGER NOT NULL,
+                    last_cycle INTEGER NOT NULL,
+                    start_date TEXT NOT NULL,
+                    end_before TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS history_segment (
+                    partner_id INTEGER NOT NULL,
+                    cycle_number INTEGER NOT NULL,
+                    opening_totals TEXT NOT NULL,
+                    events TEXT NOT NULL,
+                    registrations TEXT NOT NULL,
+                    PRIMARY KEY (partner_id, cycle_number)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get_block(self, partner_id: int) -> Optional[Dict]:
+        """
+        Get a partner's block (without its segments).
+
+        Returns:
+            Dictionary with config_key, first_cycle, last_cycle, start_date,
+            end_before and fingerprint, or None if the partner has no block
+        """
+        with self._lock, closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT * FROM history_segment_block WHERE partner_id = ?", (partner_id,)
+            ).fetchone()
+        if not row:
+            return None
+        block = dict(row)
+        block["fingerprint"] = json.loads(block["fingerprint"])
+        return block
+
+    def get_segments(self, partner_id: int, first_cycle: int, last_cycle: int) -> Dict[int, Dict]:
+        """
+        Get a partner's segments of cycles first_cycle..last_cycle.
+
+        Returns:
+            Map of cycle number to {"opening_totals", "events", "registrations"}
+        """
+        with self._lock, closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM history_segment "
+                "WHERE partner_id = ? AND cycle_number BETWEEN ? AND ?",
+                (partner_id, first_cycle, last_cycle),
+            ).fetchall()
+        return {
+            row["cycle_number"]: {
+                "opening_totals": json.loads(row["opening_totals"]),
+                "events": json.loads(row["events"]),
+                "registrations": json.loads(row["registrations"]),
+            }
+            for row in rows
+        }
+
+    def save_block(self, partner_id: int, block: Dict, segments: Dict[int, Dict]) -> None:
+        """Replace a partner's block and segments."""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM history_segment WHERE partner_id = ?", (partner_id,))
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO history_segment_block (
+                    partner_id, config_key, first_cycle, last_cycle,
+                    start_date, end_before, fingerprint, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    partner_id,
+                    block["config_key"],
+                    block["first_cycle"],
+                    block["last_cycle"],
+                    block["start_date"],
+                    block["end_before"],
+                    json.dumps(block["fingerprint"], sort_keys=True),
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO history_segment "
+                "(partner_id, cycle_number, opening_totals, events, registrations) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        partner_id,
+                        cycle,
+                        json.dumps(segment["opening_totals"]),
+                        json.dumps(segment["events"]),
+                        json.dumps(segment["registrations"]),
+                    )
+                    for cycle, segment in segments.items()
+                ],
+            )
+
+    def delete(self, partner_id: int) -> None:
+        """Drop a partner's block and segments."""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM history_segment WHERE partner_id = ?", (partner_id,))
+            conn.execute("DELETE FROM history_segment_block WHERE partner_id = ?", (partner_id,))
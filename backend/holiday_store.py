@@ -0,0 +1,150 @@
+"""
+In-memory interval store for shift.holiday records.
+
+Holidays are cooperative-wide and change rarely, so every confirmed/done
+holiday is loaded once and range/point lookups are answered from a sorted
+interval index instead of one search_read per request (or per date).
+
+The store refreshes itself every HOLIDAY_REFRESH_INTERVAL seconds, in the
+background when possible (see caching.RefreshingValue): records with a newer
+write_date are re-read and merged, and a count check catches deletions, in
+which case everything is reloaded.
+"""
+
+import bisect
+import logging
+from typing import Dict, List, Optional
+
+from caching import RefreshingValue
+
+logger = logging.getLogger(__name__)
+
+HOLIDAY_STATES = ["confirmed", "done"]
+
+# Fields returned by OdooClient.get_holidays / get_holiday_for_date
+HOLIDAY_FIELDS = ["id", "name", "holiday_type", "date_begin", "date_end", "state", "make_up_type"]
+HOLIDAY_FOR_DATE_FIELDS = ["id", "name", "holiday_type", "date_begin", "date_end", "make_up_type"]
+
+
+class HolidayIndex:
+    """
+    Immutable sorted interval index over holiday records.
+
+    Records are sorted by date_begin; a running maximum of date_end lets a
+    range query skip every interval that ends before the range starts, so
+    lookups cost O(log n + k) for k matching holidays.
+    """
+
+    def __init__(self, records: List[Dict]):
+        self.records = sorted(records, key=lambda r: (r["date_begin"], r["id"]))
+        self.begins = [r["date_begin"] for r in self.records]
+        self.max_ends = []
+        running_max = ""
+        for record in self.records:
+            running_max = max(running_max, record["date_end"])
+            self.max_ends.append(running_max)
+        self.max_write_date = max((r.get("write_date") or "" for r in records), default="") or None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def overlapping(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict]:
+        """
+        Get holidays with date_end >= start_date and date_begin <= end_date.
+
+        Args:
+            start_date: Range start (ISO format), None for unbounded
+            end_date: Range end (ISO format), None for unbounded
+
+        Returns:
+            Matching records, sorted by date_begin
+        """
+        hi = bisect.bisect_right(self.begins, end_date) if end_date else len(self.records)
+        lo = bisect.bisect_left(self.max_ends, start_date, 0, hi) if start_date else 0
+        return [
+            r for r in self.records[lo:hi] if not start_date or r["date_end"] >= start_date
+        ]
+
+
+class HolidayStore:
+    """
+    Holiday interval store kept in sync with Odoo.
+
+    Args:
+        odoo: OdooClient used to load shift.holiday records
+        refresh_interval: Seconds between refreshes from Odoo
+    """
+
+    def __init__(self, odoo, refresh_interval: float = 300):
+        self.odoo = odoo
+        self._index: Optional[HolidayIndex] = None
+        self._cache = RefreshingValue(
+            self._refresh,
+            ttl=refresh_interval,
+            refresh_ahead=refresh_interval / 2,
+            name="holidays",
+        )
+
+    def _read(self, domain: List) -> List[Dict]:
+        return self.odoo.execute(
+            "shift.holiday",
+            "search_read",
+            domain,
+            fields=HOLIDAY_FIELDS + ["write_date"],
+        )
+
+    def _refresh(self) -> HolidayIndex:
+        index = self._index
+        if index is None:
+            index = HolidayIndex(self._read([("state", "in", HOLIDAY_STATES)]))
+            logger.info(f"Loaded {len(index)} holidays")
+        else:
+            index = self._merge_changes(index)
+        self._index = index
+        return index
+
+    def _merge_changes(self, index: HolidayIndex) -> HolidayIndex:
+        records = {r["id"]: r for r in index.records}
+
+        # Any state: a holiday leaving confirmed/done must leave the index
+        if index.max_write_date:
+            changed = self._read([("write_date", ">", index.max_write_date)])
+            for record in changed:
+                if record["state"] in HOLIDAY_STATES:
+                    records[record["id"]] = record
+                else:
+                    records.pop(record["id"], None)
+            if changed:
+                logger.info(f"Merged {len(changed)} changed holidays")
+
+        count = self.odoo.execute("shift.holiday", "search_count", [("state", "in", HOLIDAY_STATES)])
+        if count != len(records):
+            # Deleted records leave no write_date trace: reload everything
+            logger.info(f"Holiday count changed ({len(records)} -> {count}), reloading")
+            return HolidayIndex(self._read([("state", "in", HOLIDAY_STATES)]))
+
+        return HolidayIndex(list(records.values()))
+
+    def get_holidays(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict]:
+        """
+        Get holidays overlapping a date range, most recent first.
+
+        Same filter and order as the shift.holiday search_read it replaces
+        (date_end >= start_date, date_begin <= end_date, date_begin desc).
+        """
+        matches = self._cache.get().overlapping(start_date, end_date)
+        return [
+            {field: record.get(field) for field in HOLIDAY_FIELDS}
+            for record in sorted(matches, key=lambda r: r["date_begin"], reverse=True)
+        ]
+
+    def get_holiday_for_date(self, date: str) -> Optional[Dict]:
+        """Get the first holiday (by start date) covering a date, or None."""
+        matches = self._cache.get().overlapping(date, date)
+        if not matches:
+            return None
+        return {field: matches[0].get(field) for field in HOLIDAY_FOR_DATE_FIELDS}
+
+    def stats(self):
+        """Cache statistics (see RefreshingValue.stats) plus the holiday count."""
+        return dict(self._cache.stats(), size=len(self._index) if self._index else 0)
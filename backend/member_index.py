@@ -0,0 +1,204 @@
+"""
+Accent-insensitive in-memory member name index.
+
+Names are folded (accents stripped, lowercased, punctuation removed) so that
+"Hélène" and "helene" are the same key. A query is matched, in rank order:
+
+1. name starting with the query ("mar" -> "MARTIN, Marie")
+2. every query word prefixing a name word ("mar mart" -> "MARTIN, Marie")
+3. query contained in the name ("tin" -> "MARTIN") - queries of
+   SUBSTRING_MIN_LENGTH+ chars
+4. fuzzy: at least FUZZY_THRESHOLD of the query trigrams found in the
+   name ("martn" -> "MARTIN") - queries of FUZZY_MIN_LENGTH+ chars without
+   any match of ranks 1-3
+
+Fuzzy matches sharing more trigrams come first; otherwise name order wins
+within a rank. Prefix lookups use a sorted word list (bisect) and
+substring/fuzzy lookups a trigram posting index, so searches only touch
+candidate names.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Shorter queries only get prefix matches (ranks 1-2): not every name
+# containing them
+SUBSTRING_MIN_LENGTH = 3
+
+FUZZY_THRESHOLD = 0.5
+# Shorter queries are too ambiguous for fuzzy matching
+FUZZY_MIN_LENGTH = 4
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Fold a name for matching: strip accents, lowercase, keep [a-z0-9 ]."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped.lower()).strip()
+
+
+def trigrams(folded: str) -> Set[str]:
+    """Word trigrams, padded like pg_trgm ('  w', ' wo', ..., 'rd ')."""
+    result = set()
+    for word in folded.split():
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class MemberNameIndex:
+    """
+    Searchable index of partner names.
+
+    Entries are added/updated/removed incrementally (see apply_changes, a
+    PartnerSync listener); searches and updates are serialized by a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names: Dict[int, str] = {}
+        self._folded: Dict[int, str] = {}
+        self._trigrams: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._words: List[Tuple[str, int]] = []
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def apply_changes(self, records: List[Dict], removed_ids: Set[int], full_reload: bool) -> None:
+        """PartnerSync listener: index changed partners, drop removed ones."""
+        with self._lock:
+            if full_reload:
+                self._names, self._folded, self._trigrams, self._postings = {}, {}, {}, {}
+                self._words = []
+                for record in records:
+                    self._add(record, sort_words=False)
+                self._words.sort()
+            else:
+                for partner_id in removed_ids:
+                    self._remove(partner_id)
+                for record in records:
+                    self._remove(record["id"])
+                    self._add(record, sort_words=True)
+            self.ready = True
+
+    def _add(self, record: Dict, sort_words: bool) -> None:
+        partner_id = record["id"]
+        name = record.get("name") or ""
+        folded = fold(name)
+        grams = trigrams(folded)
+        self._names[partner_id] = name
+        self._folded[partner_id] = folded
+        self._trigrams[partner_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(partner_id)
+        for word in set(folded.split()):
+            if sort_words:
+                bisect.insort(self._words, (word, partner_id))
+            else:
+                self._words.append((word, partner_id))
+
+    def _remove(self, partner_id: int) -> None:
+        folded = self._folded.pop(partner_id, None)
+        if folded is None:
+            return
+        self._names.pop(partner_id)
+        for gram in self._trigrams.pop(partner_id):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(partner_id)
+                if not posting:
+                    del self._postings[gram]
+        for word in set(folded.split()):
+            i = bisect.bisect_left(self._words, (word, partner_id))
+            if i < len(self._words) and self._words[i] == (word, partner_id):
+                del self._words[i]
+
+    def _word_prefix_ids(self, prefix: str) -> Set[int]:
+        i = bisect.bisect_left(self._words, (prefix,))
+        ids = set()
+        while i < len(self._words) and self._words[i][0].startswith(prefix):
+            ids.add(self._words[i][1])
+            i += 1
+        return ids
+
+    def search(self, query: str, limit: Optional[int] = None, offset: int = 0) -> Tuple[List[int], int]:
+        """
+        Find partners matching a name query, best matches first.
+
+        Args:
+            query: Name fragment as typed by the user
+            limit: Optional page size
+            offset: Number of ranked matches to skip
+
+        Returns:
+            Tuple of (page of ranked partner IDs, total number of matches)
+        """
+        folded_query = fold(query)
+        words = folded_query.split()
+        if not words:
+            return [], 0
+
+        with self._lock:
+            # Ranks 1-2: word prefixes
+            prefix_ids = self._word_prefix_ids(words[0])
+            for word in words[1:]:
+                prefix_ids &= self._word_prefix_ids(word)
+
+            ranked = []
+            folded_names = self._folded
+            for partner_id in prefix_ids:
+                folded = folded_names[partner_id]
+                ranked.append((1 if folded.startswith(folded_query) else 2, 0, folded, partner_id))
+            seen = set(prefix_ids)
+
+            # Rank 3: a name containing the query has all its inner trigrams
+            inner_grams = sorted(
+                {w[i:i + 3] for w in words for i in range(len(w) - 2)},
+                key=lambda g: len(self._postings.get(g, ())),
+            )
+            if len(folded_query) >= SUBSTRING_MIN_LENGTH and inner_grams:
+                candidates = set(self._postings.get(inner_grams[0], ()))
+                for gram in inner_grams[1:]:
+                    candidates &= self._postings.get(gram, set())
+                for partner_id in candidates - seen:
+                    folded = folded_names[partner_id]
+                    if folded_query in folded:
+                        ranked.append((3, 0, folded, partner_id))
+                        seen.add(partner_id)
+
+            # Rank 4, only when nothing matched exactly (typos): a name
+            # sharing at least `required` of the n query trigrams appears in
+            # one of the (n - required + 1) rarest postings; the common ones
+            # only serve to verify candidates
+            if not ranked and len(folded_query) >= FUZZY_MIN_LENGTH:
+                query_grams = sorted(trigrams(folded_query), key=lambda g: len(self._postings.get(g, ())))
+                required = max(1, math.ceil(FUZZY_THRESHOLD * len(query_grams)))
+                candidates = set()
+                for gram in query_grams[: len(query_grams) - required + 1]:
+                    candidates.update(self._postings.get(gram, ()))
+                query_gram_set = set(query_grams)
+                for partner_id in candidates - seen:
+                    shared = len(query_gram_set & self._trigrams[partner_id])
+                    if shared >= required:
+                        ranked.append((4, -shared, folded_names[partner_id], partner_id))
+
+        total = len(ranked)
+        if limit is not None:
+            ranked = heapq.nsmallest(offset + limit, ranked)[offset:]
+        else:
+            ranked = sorted(ranked)[offset:]
+        return [entry[3] for entry in ranked], total
+
+    def names(self, ids: Iterable[int]) -> Dict[int, str]:
+        """Original names of indexed partners."""
+        with self._lock:
+            return {i: self._names[i] for i in ids if i in self._names}
@@ -1,7 +1,13 @@
-import xmlrpc.client
 import os
 import logging
+import threading
+import xmlrpc.client
 from typing import Optional, Dict, List, Any, cast
+from caching import RefreshingValue
+from holiday_store import HolidayStore
+from odoo_transport import PROTOCOLS, ConnectionPool, create_service_proxies
+from rpc_cache import RpcCache, parse_model_ttls
+from shift_metadata import ShiftMetadataCache
 from utils import extract_id, extract_name
 
 # Load environment variables from .env file
@@ -15,6 +21,123 @@ except ImportError:
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# res.partner fields returned by member searches
+MEMBER_SEARCH_FIELDS = [
+    "id",
+    "name",
+    "barcode_base",
+    "street",
+    "street2",
+    "city",
+    "zip",
+    "phone",
+    "mobile",
+    "email",
+    "write_date",
+]
+MEMBER_IMAGE_FIELDS = ["image", "image_small", "image_medium"]
+
+# Cooperative members: share owners and their associated people (partners
+# with a member card), as opposed to suppliers, contacts and companies
+COOPERATIVE_MEMBER_DOMAIN = ["|", ("is_member", "=", True), ("is_associated_people", "=", True)]
+
+# res.partner fields describing a member's standing, including the counters
+# and deadlines Odoo stores on the partner
+MEMBER_STATUS_FIELDS = [
+    "id",
+    "name",
+    "cooperative_state",
+    "is_worker_member",
+    "shift_type",
+    "is_unsubscribed",
+    "customer",
+    "final_standard_point",
+    "final_ftop_point",
+    "date_alert_stop",
+    "date_delay_stop",
+]
+
+# shift.registration states shown in the member history
+SHIFT_HISTORY_STATES = ["done", "absent", "excused", "open", "waiting", "replaced"]
+
+# res.partner.owned.share and account.invoice fields behind the share history
+SHARE_RECORD_FIELDS = ["id", "owned_share", "create_date", "related_invoice_ids"]
+SHARE_INVOICE_FIELDS = ["id", "date", "number", "state", "amount_total"]
+
+
+def share_invoice_ids(share_record: Dict) -> List[int]:
+    """Invoice IDs of a share record (related_invoice_ids, as IDs or [id, name])."""
+    invoice_ids = []
+    for inv in share_record.get("related_invoice_ids") or []:
+        if isinstance(inv, list) and len(inv) > 0:
+            invoice_ids.append(inv[0])
+        elif isinstance(inv, int):
+            invoice_ids.append(inv)
+    return invoice_ids
+
+
+def build_share_information(
+    total_shares: Any, share_records: List[Dict], invoices: Optional[Dict[int, Dict]]
+) -> Dict:
+    """
+    Assemble a member's share information from fetched records.
+
+    Args:
+        total_shares: total_partner_owned_share of the partner
+        share_records: res.partner.owned.share records, oldest first
+        invoices: Map of invoice ID to account.invoice record, or None if
+                  the invoices could not be fetched (share records with
+                  invoices are then left out)
+
+    Returns:
+        Dictionary with total_shares, first_purchase_date, join_date and
+        share_purchases (see OdooClient.get_member_share_information)
+    """
+    share_purchases = []
+    first_purchase_date = None
+
+    for share_record in share_records:
+        create_date = share_record.get("create_date")
+        invoice_ids = share_invoice_ids(share_record)
+        if invoice_ids and invoices is None:
+            continue
+
+        invoice_details = []
+        for invoice_id in invoice_ids:
+            inv = invoices.get(invoice_id)
+            if inv is None:
+                continue
+            invoice_details.append({
+                "invoice_id": inv.get("id"),
+                "invoice_number": inv.get("number"),
+                "invoice_date": inv.get("date"),
+                "state": inv.get("state"),
+                "amount": inv.get("amount_total"),
+            })
+
+            # Track earliest invoice date as first purchase date
+            inv_date = inv.get("date")
+            if inv_date and (first_purchase_date is None or inv_date < first_purchase_date):
+                first_purchase_date = inv_date
+
+        share_purchases.append({
+            "share_id": share_record.get("id"),
+            "shares_purchased": share_record.get("owned_share", 0),
+            "purchase_date": create_date,
+            "invoices": invoice_details,
+        })
+
+        # If no invoices found, use share create_date as fallback for first purchase
+        if not first_purchase_date and create_date:
+            first_purchase_date = create_date
+
+    return {
+        "total_shares": int(total_shares),
+        "first_purchase_date": first_purchase_date,
+        "join_date": first_purchase_date,  # Alias for UI consistency
+        "share_purchases": share_purchases,
+    }
+
 
 class OdooClient:
     def __init__(self):
@@ -26,6 +149,50 @@ class OdooClient:
         self.common: Optional[Any] = None
         self.models: Optional[Any] = None
 
+        # RPC protocol: 'xmlrpc' (default) or 'jsonrpc'
+        self.protocol = os.getenv("ODOO_PROTOCOL", "xmlrpc").lower()
+        if self.protocol not in PROTOCOLS:
+            raise ValueError(
+                f"ODOO_PROTOCOL must be one of {', '.join(PROTOCOLS)}, got {self.protocol}"
+            )
+
+        # Pooled keep-alive connections shared by both proxies, so a single
+        # proxy can safely serve every request thread.
+        self.pool_size = int(os.getenv("ODOO_POOL_SIZE", 10))
+        self.pool_idle_timeout = float(os.getenv("ODOO_POOL_IDLE_TIMEOUT", 60))
+        self.pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
+
+        # Shift cycle settings change about once a year: cache them and
+        # refresh in the background shortly before the TTL expires
+        self.shift_config_cache = RefreshingValue(
+            self._fetch_shift_config,
+            ttl=float(os.getenv("SHIFT_CONFIG_TTL", 3600)),
+            refresh_ahead=float(os.getenv("SHIFT_CONFIG_REFRESH_AHEAD", 300)),
+            name="shift config",
+        )
+
+        # Read RPCs answered from memory for a per-model TTL (writes never)
+        self.rpc_cache = RpcCache(
+            parse_model_ttls(os.getenv("ODOO_RPC_CACHE_TTLS")),
+            max_entries=int(os.getenv("ODOO_RPC_CACHE_MAX_ENTRIES", 5000)),
+            max_bytes=int(float(os.getenv("ODOO_RPC_CACHE_MAX_MB", 32)) * 1024 * 1024),
+        )
+
+        # Shift names, weeks and types, shared by every registration lookup
+        self.shift_metadata = ShiftMetadataCache(
+            self,
+            ttl=float(os.getenv("SHIFT_METADATA_TTL", 86400)),
+            max_entries=int(os.getenv("SHIFT_METADATA_MAX_ENTRIES", 20000)),
+            prefetch_cycles=int(os.getenv("SHIFT_METADATA_PREFETCH_CYCLES", 2)),
+            prefetch_interval=float(os.getenv("SHIFT_METADATA_PREFETCH_INTERVAL", 3600)),
+        )
+
+        # Cooperative-wide holidays, answered from an in-memory interval index
+        self.holiday_store = HolidayStore(
+            self, refresh_interval=float(os.getenv("HOLIDAY_REFRESH_INTERVAL", 300))
+        )
+
         # Extract URL without credentials for XML-RPC
         if raw_url and "@" in raw_url:
             # Remove credentials from URL for XML-RPC endpoints
@@ -40,14 +207,51 @@ class OdooClient:
         else:
             self.url = raw_url
 
+    def _get_pool(self) -> ConnectionPool:
+        with self._pool_lock:
+            if self.pool is None:
+                self.pool = ConnectionPool(
+                    self.url,
+                    max_size=self.pool_size,
+                    idle_timeout=self.pool_idle_timeout,
+                )
+            return self.pool
+
+    def get_transport_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool usage statistics.
+
+        Returns:
+            Pool statistics (see ConnectionPool.stats), or an empty dict if
+            no connection has been made yet
+        """
+        if self.pool is None:
+            return {}
+        return dict(self.pool.stats(), protocol=self.protocol)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get in-process cache statistics.
+
+        Returns:
+            Dictionary keyed by cache name (see RefreshingValue.stats)
+        """
+        return {
+            "shift_config": self.shift_config_cache.stats(),
+            "holidays": self.holiday_store.stats(),
+            "rpc": self.rpc_cache.stats(),
+            "shift_metadata": self.shift_metadata.stats(),
+        }
+
     def authenticate(self) -> bool:
         try:
             # Ensure URL has proper protocol
             if self.url and not self.url.startswith("http"):
                 self.url = "https://" + self.url
 
-            self.common = xmlrpc.client.ServerProxy(f"{self.url}/xmlrpc/2/common")
-            self.models = xmlrpc.client.ServerProxy(f"{self.url}/xmlrpc/2/object")
+            self.common, self.models = create_service_proxies(
+                self.url, self._get_pool(), self.protocol
+            )
 
             self.uid = self.common.authenticate(
                 self.db, self.username, self.password, {}
@@ -58,7 +262,19 @@ class OdooClient:
             logger.error(f"Authentication failed: {e}", exc_info=True)
             return False
 
-    def execute(self, model: str, method: str, *args, **kwargs) -> Any:
+    def _execute_kw(self, model: str, method: str, args: List, kwargs: Optional[Dict] = None) -> Any:
+        """
+        Call a model method, through the RPC memo (see rpc_cache).
+
+        Args:
+            model: Odoo model name
+            method: Model method
+            args: Positional arguments
+            kwargs: Options
+
+        Returns:
+            The method result
+        """
         if not self.uid:
             if not self.authenticate():
                 raise Exception("Failed to authenticate with Odoo")
@@ -66,49 +282,119 @@ class OdooClient:
         if self.models is None:
             raise Exception("Models proxy not initialized")
 
-        return self.models.execute_kw(
-            self.db, self.uid, self.password, model, method, list(args), kwargs
+        kwargs = kwargs or {}
+        return self.rpc_cache.call(
+            model,
+            method,
+            args,
+            kwargs,
+            lambda: self.models.execute_kw(
+                self.db, self.uid, self.password, model, method, args, kwargs
+            ),
         )
 
-    def search_read(self, model: str, domain: List, fields: List[str]) -> List[Dict]:
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
-
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
+    def execute(self, model: str, method: str, *args, **kwargs) -> Any:
+        return self._execute_kw(model, method, list(args), kwargs)
 
-        return self.models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
+    def search_read(self, model: str, domain: List, fields: List[str]) -> List[Dict]:
+        return self._execute_kw(
             model,
             "search_read",
             [domain],
             {"fields": fields},
         )
 
-    def search_members_by_name(self, name: str) -> List[Dict]:
-        domain = [("name", "ilike", name)]
-        fields = [
-            "id",
-            "name",
-            "barcode_base",
-            "street",
-            "street2",
-            "city",
-            "zip",
-            "phone",
-            "mobile",
-            "email",
-            "image",
-            "image_small",
-            "image_medium",
-        ]
-        results = self.search_read("res.partner", domain, fields)
+    def search_members_by_name(
+        self,
+        name: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        with_images: bool = True,
+    ) -> List[Dict]:
+        """
+        Search members by name (case-insensitive substring).
+
+        Only cooperative members are searched (COOPERATIVE_MEMBER_DOMAIN), as
+        in the member name index.
+
+        Args:
+            name: Name fragment to search for
+            limit: Optional maximum number of results
+            offset: Number of results to skip (for paging)
+            with_images: Include the image/image_medium/image_small fields
+                         (base64, several KB to MB per member)
+
+        Returns:
+            List of partner records. Paged searches (limit set) are ordered
+            by name then id so that consecutive pages never overlap.
+        """
+        domain = COOPERATIVE_MEMBER_DOMAIN + [("name", "ilike", name)]
+        fields = MEMBER_SEARCH_FIELDS + (MEMBER_IMAGE_FIELDS if with_images else [])
+
+        if limit is None and not offset:
+            results = self.search_read("res.partner", domain, fields)
+        else:
+            options = {"fields": fields, "offset": offset, "order": "name, id"}
+            if limit is not None:
+                options["limit"] = limit
+            results = self.execute("res.partner", "search_read", domain, **options)
         logger.info(f"Search members by name '{name}': found {len(results)} results")
         return results
 
+    def get_partner_photo(self, partner_id: int, image_field: Optional[str] = None) -> Optional[Dict]:
+        """
+        Get a partner's photo version, and optionally the image itself.
+
+        Args:
+            partner_id: Partner ID
+            image_field: Image field to read ('image', 'image_medium' or
+                         'image_small'); None to only read write_date
+
+        Returns:
+            Dictionary with id, write_date (and image_field), or None if the
+            partner does not exist
+        """
+        fields = ["write_date"] + ([image_field] if image_field else [])
+        # search_read rather than read, which fails on unknown partners
+        results = self.execute(
+            "res.partner",
+            "search_read",
+            [("id", "=", partner_id), ("active", "in", [True, False])],
+            fields=fields,
+        )
+        return results[0] if results else None
+
+    def read_members(self, partner_ids: List[int], with_images: bool = False) -> List[Dict]:
+        """
+        Read search result fields of partners, in the order of partner_ids.
+
+        Args:
+            partner_ids: Partner IDs (e.g. a ranked page from the name index)
+            with_images: Include the image fields
+
+        Returns:
+            List of partner records (partners deleted since the index was
+            polled are skipped)
+        """
+        if not partner_ids:
+            return []
+        fields = MEMBER_SEARCH_FIELDS + (MEMBER_IMAGE_FIELDS if with_images else [])
+        # search_read rather than read, which fails on deleted partners
+        results = self.execute(
+            "res.partner",
+            "search_read",
+            [("id", "in", list(partner_ids)), ("active", "in", [True, False])],
+            fields=fields,
+        )
+        records = {r["id"]: r for r in results}
+        return [records[i] for i in partner_ids if i in records]
+
+    def count_members_by_name(self, name: str) -> int:
+        """Count members matching a search_members_by_name query."""
+        return self.execute(
+            "res.partner", "search_count", COOPERATIVE_MEMBER_DOMAIN + [("name", "ilike", name)]
+        )
+
     def get_member_status(self, partner_id: int) -> Dict:
         """
         Get member status and state information.
@@ -122,31 +408,11 @@ class OdooClient:
         Returns:
             Dictionary with status fields
         """
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
-
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
-
-        fields = [
-            "id",
-            "name",
-            "cooperative_state",
-            "is_worker_member",
-            "shift_type",
-            "is_unsubscribed",
-            "customer",
-        ]
-
-        results = self.models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
+        results = self._execute_kw(
             "res.partner",
             "read",
             [[partner_id]],
-            {"fields": fields},
+            {"fields": MEMBER_STATUS_FIELDS},
         )
 
         if results:
@@ -156,21 +422,69 @@ class OdooClient:
         logger.warning(f"Member {partner_id} not found")
         return {}
 
-    def get_member_purchase_history(
-        self, partner_id: int, limit: Optional[int] = None, start_date: Optional[str] = None
-    ) -> List[Dict]:
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
+    def get_members_status(self, partner_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Get status fields of many members in one round trip.
 
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
+        Same fields as get_member_status. Archived partners are included,
+        as with read; unknown IDs are simply absent from the result.
+
+        Args:
+            partner_ids: Member IDs
+
+        Returns:
+            Dictionary mapping partner ID to its status fields
+        """
+        if not partner_ids:
+            return {}
+        results = self.execute(
+            "res.partner",
+            "search_read",
+            [("id", "in", list(partner_ids)), ("active", "in", [True, False])],
+            fields=MEMBER_STATUS_FIELDS,
+        )
+        logger.info(f"Member status for {len(results)}/{len(partner_ids)} partners")
+        return {r["id"]: r for r in results}
 
+    def get_member_status_by_barcode(self, code: str) -> Optional[Dict]:
+        """
+        Find a member by card barcode or barcode_base and read its status.
+
+        Args:
+            code: Scanned barcode, or barcode_base typed by hand
+
+        Returns:
+            Dictionary with status fields plus barcode and barcode_base,
+            or None if no partner has this code
+        """
+        domain = [("barcode", "=", code)]
+        # barcode_base is an integer field: card barcodes (13-digit EANs)
+        # exceed XML-RPC's 32-bit ints and can only match barcode
+        if code.isdigit() and int(code) <= xmlrpc.client.MAXINT:
+            domain = ["|", ("barcode", "=", code), ("barcode_base", "=", int(code))]
+        results = self.execute(
+            "res.partner",
+            "search_read",
+            domain,
+            fields=MEMBER_STATUS_FIELDS + ["barcode", "barcode_base"],
+            limit=1,
+        )
+        return results[0] if results else None
+
+    def get_member_purchase_history(
+        self,
+        partner_id: int,
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        before_date: Optional[str] = None,
+    ) -> List[Dict]:
         domain = [("partner_id", "=", partner_id), ("state", "=", "done")]
 
         # Add date filter if start_date is provided
         if start_date:
             domain.append(("date_order", ">=", start_date))
+        if before_date:
+            domain.append(("date_order", "<", before_date))
 
         fields = ["id", "date_order", "name", "pos_reference"]
 
@@ -178,10 +492,7 @@ class OdooClient:
         if limit:
             query_options["limit"] = limit
 
-        results = self.models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
+        results = self._execute_kw(
             "pos.order",
             "search_read",
             [domain],
@@ -192,23 +503,22 @@ class OdooClient:
         return results
 
     def get_member_shift_history(
-        self, partner_id: int, limit: Optional[int] = None, start_date: Optional[str] = None
+        self,
+        partner_id: int,
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        before_date: Optional[str] = None,
     ) -> List[Dict]:
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
-
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
-
         domain = [
             ("partner_id", "=", partner_id),
-            ("state", "in", ["done", "absent", "excused", "open", "waiting", "replaced"]),
+            ("state", "in", SHIFT_HISTORY_STATES),
         ]
 
         # Add date filter if start_date is provided
         if start_date:
             domain.append(("date_begin", ">=", start_date))
+        if before_date:
+            domain.append(("date_begin", "<", before_date))
 
         fields = [
             "id",
@@ -229,10 +539,7 @@ class OdooClient:
         if limit:
             query_options["limit"] = limit
 
-        results = self.models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
+        results = self._execute_kw(
             "shift.registration",
             "search_read",
             [domain],
@@ -247,26 +554,7 @@ class OdooClient:
         # Filter out None values
         shift_ids = [sid for sid in shift_ids if sid is not None]
 
-        shifts = {}
-        if shift_ids:
-            shift_fields = [
-                "id",
-                "name",
-                "date_begin",
-                "week_number",
-                "week_name",
-                "shift_type_id",
-            ]
-            shift_results = self.models.execute_kw(
-                self.db,
-                self.uid,
-                self.password,
-                "shift.shift",
-                "read",
-                [shift_ids],
-                {"fields": shift_fields},
-            )
-            shifts = {s["id"]: s for s in shift_results}
+        shifts = self.get_shifts(shift_ids) if shift_ids else {}
 
         for registration in results:
             shift_id = extract_id(registration.get("shift_id"))
@@ -284,27 +572,37 @@ class OdooClient:
         logger.info(f"Shift history for partner {partner_id}: {len(results)} registrations")
         return results
 
-    def get_member_leaves(self, partner_id: int, start_date: Optional[str] = None) -> List[Dict]:
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
+    def get_shifts(self, shift_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Get shift.shift metadata (name, date_begin, week, shift type) by ID.
 
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
+        Served from the shift metadata cache; only unknown shifts are read
+        from Odoo.
+
+        Args:
+            shift_ids: shift.shift IDs
 
+        Returns:
+            Map of shift ID to its metadata
+        """
+        return self.shift_metadata.get_shifts(shift_ids)
+
+    def get_member_leaves(
+        self, partner_id: int, start_date: Optional[str] = None, before_date: Optional[str] = None
+    ) -> List[Dict]:
         domain = [("partner_id", "=", partner_id), ("state", "=", "done")]
 
         # Add date filter if start_date is provided
         # Include leaves that were active during or after the start_date
         if start_date:
             domain.append(("stop_date", ">=", start_date))
+        # ... and that started before before_date
+        if before_date:
+            domain.append(("start_date", "<", before_date))
 
         fields = ["id", "start_date", "stop_date", "type_id", "state"]
 
-        results = self.models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
+        results = self._execute_kw(
             "shift.leave",
             "search_read",
             [domain],
@@ -317,15 +615,38 @@ class OdooClient:
         logger.info(f"Leave history for partner {partner_id}: {len(results)} leaves")
         return results
 
-    def get_member_counter_events(self, partner_id: int, limit: int = 50) -> List[Dict]:
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
+    def get_member_counter_events(
+        self,
+        partner_id: int,
+        limit: int = 50,
+        start_date: Optional[str] = None,
+        before_date: Optional[str] = None,
+        shift_ids: Optional[List[int]] = None,
+    ) -> List[Dict]:
+        """
+        Get a member's counter events (shift.counter.event), newest first.
 
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
+        Without filters, ALL events are fetched so running totals can be
+        replayed from the beginning.
 
+        Args:
+            partner_id: Member ID
+            limit: Ignored - running totals need every matching event
+            start_date: Only events created on or after this date
+            before_date: Only events created strictly before this date
+            shift_ids: Only events attached to these shifts
+
+        Returns:
+            List of counter event records
+        """
         domain = [("partner_id", "=", partner_id)]
+        if start_date:
+            domain.append(("create_date", ">=", start_date))
+        if before_date:
+            domain.append(("create_date", "<", before_date))
+        if shift_ids is not None:
+            domain.append(("shift_id", "in", list(shift_ids)))
+
         fields = [
             "id",
             "create_date",
@@ -335,14 +656,12 @@ class OdooClient:
             "is_manual",
             "name",
             "type",
+            "write_date",
         ]
 
         # Fetch ALL counter events (no limit) to calculate running totals correctly
         # The limit parameter is ignored here - we need all historical events for accurate totals
-        results = self.models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
+        results = self._execute_kw(
             "shift.counter.event",
             "search_read",
             [domain],
@@ -352,55 +671,129 @@ class OdooClient:
         logger.info(f"Counter events for partner {partner_id}: {len(results)} events")
         return results
 
-    def get_holidays(self, start_date: str = None, end_date: str = None) -> List[Dict]:
+    def count_member_counter_events(
+        self,
+        partner_id: int,
+        before_date: Optional[str] = None,
+        modified_after: Optional[str] = None,
+    ) -> int:
         """
-        Get holiday periods (shift.holiday - "Assouplissement de présence").
-
-        These holidays provide penalty relief for missed shifts.
+        Count a member's counter events without fetching them.
 
         Args:
-            start_date: Optional start date filter (ISO format)
-            end_date: Optional end date filter (ISO format)
+            partner_id: Member ID
+            before_date: Only events created strictly before this date
+            modified_after: Only events whose write_date is after this timestamp
 
         Returns:
-            List of holiday records with relief information
+            Number of matching events
         """
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
+        domain = [("partner_id", "=", partner_id)]
+        if before_date:
+            domain.append(("create_date", "<", before_date))
+        if modified_after:
+            domain.append(("write_date", ">", modified_after))
 
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
+        return self._execute_kw(
+            "shift.counter.event",
+            "search_count",
+            [domain],
+        )
 
-        # Fetch active/confirmed holidays
-        domain = [("state", "in", ["confirmed", "done"])]
+    def get_member_counter_totals(
+        self,
+        partner_id: int,
+        before_date: str,
+        exclude_shift_ids: Optional[List[int]] = None,
+    ) -> Dict[str, float]:
+        """
+        Sum a member's counter points before a date, server-side.
 
-        # Add date filters if provided
-        if start_date:
-            domain.append(("date_end", ">=", start_date))
-        if end_date:
-            domain.append(("date_begin", "<=", end_date))
+        Uses a single read_group (sum of point_qty grouped by type) instead of
+        fetching every event. Types other than 'ftop' count towards the
+        standard counter, as in the history replay.
 
-        fields = [
-            "id",
-            "name",
-            "holiday_type",
-            "date_begin",
-            "date_end",
-            "state",
-            "make_up_type",
+        Args:
+            partner_id: Member ID
+            before_date: Only events created strictly before this date
+            exclude_shift_ids: Leave out events attached to these shifts
+                               (manual events without shift are always kept)
+
+        Returns:
+            Dictionary with 'ftop' and 'standard' point sums
+        """
+        domain = [
+            ("partner_id", "=", partner_id),
+            ("create_date", "<", before_date),
         ]
+        if exclude_shift_ids:
+            domain += [
+                "|",
+                ("shift_id", "=", False),
+                ("shift_id", "not in", list(exclude_shift_ids)),
+            ]
+
+        groups = self._execute_kw(
+            "shift.counter.event",
+            "read_group",
+            [domain, ["point_qty", "type"], ["type"]],
+            {"lazy": False},
+        )
+
+        totals = {"ftop": 0, "standard": 0}
+        for group in groups:
+            counter_type = "ftop" if group.get("type") == "ftop" else "standard"
+            totals[counter_type] += group.get("point_qty") or 0
+
+        logger.info(
+            f"Counter totals for partner {partner_id} before {before_date}: "
+            f"ftop={totals['ftop']}, standard={totals['standard']}"
+        )
+        return totals
+
+    def get_records_fingerprint(self, model: str, domain: List) -> Dict[str, Any]:
+        """
+        Count records and get their newest write_date, server-side.
+
+        Uses a search_count and a search_read of the most recently written
+        record, so that a change to any matching record (edit, creation,
+        deletion) can be detected without fetching the records.
+
+        Args:
+            model: Odoo model name
+            domain: Odoo domain
 
-        results = self.models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
-            "shift.holiday",
+        Returns:
+            Dictionary with count and max_write_date (None without records)
+        """
+        latest = self._execute_kw(
+            model,
             "search_read",
             [domain],
-            {"fields": fields, "order": "date_begin desc"},
+            {"fields": ["write_date"], "order": "write_date desc", "limit": 1},
         )
+        count = self._execute_kw(model, "search_count", [domain])
+        return {
+            "count": count,
+            "max_write_date": (latest[0].get("write_date") or None) if latest else None,
+        }
+
+    def get_holidays(self, start_date: str = None, end_date: str = None) -> List[Dict]:
+        """
+        Get holiday periods (shift.holiday - "Assouplissement de présence").
 
+        These holidays provide penalty relief for missed shifts. Served from
+        the in-memory holiday store (see holiday_store), refreshed from Odoo
+        every HOLIDAY_REFRESH_INTERVAL seconds.
+
+        Args:
+            start_date: Optional start date filter (ISO format)
+            end_date: Optional end date filter (ISO format)
+
+        Returns:
+            List of holiday records with relief information
+        """
+        results = self.holiday_store.get_holidays(start_date, end_date)
         logger.info(f"Found {len(results)} holidays")
         return results
 
@@ -414,41 +807,7 @@ class OdooClient:
         Returns:
             Holiday record if date is within a holiday, None otherwise
         """
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
-
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
-
-        domain = [
-            ("state", "in", ["confirmed", "done"]),
-            ("date_begin", "<=", date),
-            ("date_end", ">=", date),
-        ]
-
-        fields = [
-            "id",
-            "name",
-            "holiday_type",
-            "date_begin",
-            "date_end",
-            "make_up_type",
-        ]
-
-        results = self.models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
-            "shift.holiday",
-            "search_read",
-            [domain],
-            {"fields": fields, "limit": 1},
-        )
-
-        if results:
-            return results[0]
-        return None
+        return self.holiday_store.get_holiday_for_date(date)
 
     def get_worker_members_addresses(self) -> List[Dict]:
         """Fetch addresses of worker members only (no personal data)"""
@@ -468,58 +827,65 @@ class OdooClient:
         Fetches shift_weeks_per_cycle and shift_week_a_date from res.config.settings.
         These values define the cycle calculation parameters.
 
+        Values are cached for SHIFT_CONFIG_TTL seconds and refreshed in the
+        background before they expire. If Odoo is unavailable the last good
+        value is kept; the hardcoded defaults are only used when no value
+        could ever be fetched.
+
         Returns:
             Dictionary with:
             - weeks_per_cycle (int): Number of weeks per cycle (typically 4)
             - week_a_date (str): Start date of initial Week A (YYYY-MM-DD)
+        """
+        try:
+            return dict(self.shift_config_cache.get())
+        except Exception as e:
+            logger.warning(
+                f"Failed to fetch shift config from Odoo: {e}. Using defaults."
+            )
 
-        Raises:
-            Exception: If authentication fails or models proxy not initialized
+        # Fallback to hardcoded defaults on a cold start without Odoo
+        logger.warning("Using default shift configuration (4 weeks, starting 2025-01-13)")
+        return {
+            "weeks_per_cycle": 4,
+            "week_a_date": "2025-01-13",
+        }
+
+    def _fetch_shift_config(self) -> Dict[str, any]:
         """
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
+        Fetch shift cycle configuration from res.config.settings.
 
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
+        Returns:
+            Dictionary with weeks_per_cycle and week_a_date
 
+        Raises:
+            Exception: If authentication fails, models proxy not initialized
+                      or no configuration record exists
+        """
         # res.config.settings is typically a singleton
         # Get the most recent configuration record
         domain = []
         fields = ["shift_weeks_per_cycle", "shift_week_a_date"]
 
-        try:
-            results = self.models.execute_kw(
-                self.db,
-                self.uid,
-                self.password,
-                "res.config.settings",
-                "search_read",
-                [domain],
-                {"fields": fields, "limit": 1, "order": "id desc"},
-            )
+        results = self._execute_kw(
+            "res.config.settings",
+            "search_read",
+            [domain],
+            {"fields": fields, "limit": 1, "order": "id desc"},
+        )
 
-            if results and len(results) > 0:
-                config = results[0]
-                logger.info(
-                    f"Fetched shift config from Odoo: "
-                    f"weeks_per_cycle={config.get('shift_weeks_per_cycle')}, "
-                    f"week_a_date={config.get('shift_week_a_date')}"
-                )
-                return {
-                    "weeks_per_cycle": config.get("shift_weeks_per_cycle"),
-                    "week_a_date": config.get("shift_week_a_date"),
-                }
-        except Exception as e:
-            logger.warning(
-                f"Failed to fetch shift config from Odoo: {e}. Using defaults."
-            )
+        if not results:
+            raise Exception("No res.config.settings record found")
 
-        # Fallback to hardcoded defaults if config not found or error
-        logger.warning("Using default shift configuration (4 weeks, starting 2025-01-13)")
+        config = results[0]
+        logger.info(
+            f"Fetched shift config from Odoo: "
+            f"weeks_per_cycle={config.get('shift_weeks_per_cycle')}, "
+            f"week_a_date={config.get('shift_week_a_date')}"
+        )
         return {
-            "weeks_per_cycle": 4,
-            "week_a_date": "2025-01-13",
+            "weeks_per_cycle": config.get("shift_weeks_per_cycle"),
+            "week_a_date": config.get("shift_week_a_date"),
         }
 
     def get_member_share_information(self, partner_id: int) -> Dict:
@@ -529,6 +895,9 @@ class OdooClient:
         Fetches the member's total shares owned and the date of their first share purchase
         by examining share ownership records and related subscription invoices.
 
+        At most 3 round trips whatever the number of share records: the
+        partner, its share records, and all their invoices in one read.
+
         Args:
             partner_id: Member ID
 
@@ -542,123 +911,58 @@ class OdooClient:
         Raises:
             Exception: If authentication fails or models proxy not initialized
         """
-        if not self.uid:
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with Odoo")
-
-        if self.models is None:
-            raise Exception("Models proxy not initialized")
-
         try:
             # Step 1: Get total shares from res.partner
-            partner_fields = ["total_partner_owned_share"]
-            partner_data = self.models.execute_kw(
-                self.db,
-                self.uid,
-                self.password,
+            partner_data = self._execute_kw(
                 "res.partner",
                 "read",
                 [[partner_id]],
-                {"fields": partner_fields},
+                {"fields": ["total_partner_owned_share"]},
             )
-
             total_shares = 0
             if partner_data and len(partner_data) > 0:
                 total_shares = partner_data[0].get("total_partner_owned_share", 0)
-            
+
             # Step 2: Get all share ownership records for this member
-            share_domain = [("partner_id", "=", partner_id)]
-            share_fields = [
-                "id",
-                "owned_share",
-                "create_date",
-                "related_invoice_ids"
-            ]
-            
-            share_records = self.models.execute_kw(
-                self.db,
-                self.uid,
-                self.password,
+            share_records = self._execute_kw(
                 "res.partner.owned.share",
                 "search_read",
-                [share_domain],
-                {"fields": share_fields, "order": "create_date asc"},
+                [[("partner_id", "=", partner_id)]],
+                {"fields": SHARE_RECORD_FIELDS, "order": "create_date asc"},
             )
 
-            # Step 3: Process share records and related invoices
-            share_purchases = []
-            first_purchase_date = None
-            
+            # Step 3: Get the invoices of every share record in one read
+            invoice_ids = []
             for share_record in share_records:
-                share_id = share_record.get("id")
-                owned_shares = share_record.get("owned_share", 0)
-                create_date = share_record.get("create_date")
-                invoice_ids = share_record.get("related_invoice_ids", [])
-                
-                # Extract invoice IDs (they come as [id, name] tuples)
-                invoice_id_list = []
-                if invoice_ids:
-                    for inv in invoice_ids:
-                        if isinstance(inv, list) and len(inv) > 0:
-                            invoice_id_list.append(inv[0])
-                        elif isinstance(inv, int):
-                            invoice_id_list.append(inv)
-                
-                # Get invoice details for this share record
-                invoice_details = []
-                if invoice_id_list:
-                    try:
-                        invoice_data = self.models.execute_kw(
-                            self.db,
-                            self.uid,
-                            self.password,
+                invoice_ids.extend(share_invoice_ids(share_record))
+            invoice_ids = list(dict.fromkeys(invoice_ids))
+
+            invoices = None
+            if invoice_ids:
+                try:
+                    invoices = {
+                        inv["id"]: inv
+                        for inv in self._execute_kw(
                             "account.invoice",
                             "read",
-                            [invoice_id_list],
-                            {"fields": ["id", "date", "number", "state", "amount_total"]},
+                            [invoice_ids],
+                            {"fields": SHARE_INVOICE_FIELDS},
                         )
-                        
-                        for inv in invoice_data:
-                            invoice_details.append({
-                                "invoice_id": inv.get("id"),
-                                "invoice_number": inv.get("number"),
-                                "invoice_date": inv.get("date"),
-                                "state": inv.get("state"),
-                                "amount": inv.get("amount_total"),
-                            })
-                            
-                            # Track earliest invoice date as first purchase date
-                            inv_date = inv.get("date")
-                            if inv_date and (first_purchase_date is None or inv_date < first_purchase_date):
-                                first_purchase_date = inv_date
-                                
-                    except Exception as invoice_error:
-                        logger.warning(f"Error fetching invoice details for share {share_id}: {invoice_error}")
-                        continue
-                
-                # Add share purchase event
-                share_purchases.append({
-                    "share_id": share_id,
-                    "shares_purchased": owned_shares,
-                    "purchase_date": create_date,
-                    "invoices": invoice_details,
-                })
-                
-                # If no invoices found, use share create_date as fallback for first purchase
-                if not first_purchase_date and create_date:
-                    first_purchase_date = create_date
-
-            # Step 4: Return structured data
-            result = {
-                "total_shares": int(total_shares),
-                "first_purchase_date": first_purchase_date,
-                "join_date": first_purchase_date,  # Alias for UI consistency
-                "share_purchases": share_purchases,
-            }
-            
-            logger.info(f"Fetched share information for member {partner_id}: {total_shares} shares, first purchase: {first_purchase_date}")
+                    }
+                except Exception as invoice_error:
+                    logger.warning(
+                        f"Error fetching share invoices for member {partner_id}: {invoice_error}"
+                    )
+
+            # Step 4: Distribute the invoices back to their share records
+            result = build_share_information(total_shares, share_records, invoices)
+
+            logger.info(
+                f"Fetched share information for member {partner_id}: {total_shares} shares, "
+                f"first purchase: {result['first_purchase_date']}"
+            )
             return result
-            
+
         except Exception as e:
             logger.error(f"Error fetching share information for member {partner_id}: {e}", exc_info=True)
             raise Exception(f"Failed to fetch share information: {str(e)}")
@@ -0,0 +1,408 @@
+"""
+Thread-safe, keep-alive HTTP transports for the Odoo client.
+
+``xmlrpc.client.ServerProxy`` keeps a single HTTP connection in its default
+transport, which cannot be used by several threads at once and is re-opened
+(TCP + TLS handshake) whenever it is dropped. This module provides a bounded
+pool of persistent HTTP(S) connections and two protocol backends on top of it:
+
+- ``xmlrpc``: a ServerProxy using PooledTransport (Odoo's /xmlrpc/2 endpoints)
+- ``jsonrpc``: JsonRpcProxy, a ServerProxy look-alike for Odoo's /jsonrpc
+  endpoint, which avoids XML marshalling and expat parsing of large results
+
+Both expose the same ``proxy.method(*args)`` calling convention and raise
+``xmlrpc.client.Fault`` for server-side errors, so OdooClient does not care
+which one it talks to.
+"""
+
+import gzip
+import http.client
+import itertools
+import json
+import logging
+import ssl
+import threading
+import time
+import xmlrpc.client
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean a kept-alive connection was closed by the server
+# between two requests; the call is retried once on a fresh connection.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of persistent HTTP(S) connections to a single host.
+
+    Connections are handed out one caller at a time. Idle connections are
+    reused most-recently-used first and closed once they have been idle
+    longer than ``idle_timeout``. When ``max_size`` connections are checked
+    out, callers wait up to ``checkout_timeout`` seconds for one to be
+    released.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_size: int = 10,
+        idle_timeout: float = 60.0,
+        checkout_timeout: Optional[float] = 30.0,
+        timeout: Optional[float] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        if max_size < 1:
+            raise ValueError(f"max_size must be >= 1, got {max_size}")
+
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme for connection pool: {url}")
+
+        self.scheme = parts.scheme
+        self.host = parts.netloc.rsplit("@", 1)[-1]
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+
+        self._idle: Deque[Tuple[http.client.HTTPConnection, float]] = deque()
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "created": 0,
+            "reused": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "closed_idle": 0,
+            "closed_broken": 0,
+            "peak_in_use": 0,
+        }
+
+    def acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Check a connection out of the pool.
+
+        Returns:
+            Tuple of (connection, reused) where reused is True if the
+            connection has already served a request
+
+        Raises:
+            TimeoutError: If no connection became available within
+                          checkout_timeout seconds
+        """
+        with self._condition:
+            waited_since = None
+            while True:
+                self._close_expired()
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                    reused = True
+                    break
+                if self._in_use < self.max_size:
+                    connection = None
+                    reused = False
+                    break
+
+                if waited_since is None:
+                    waited_since = time.monotonic()
+                    self._stats["waits"] += 1
+                remaining = None
+                if self.checkout_timeout is not None:
+                    remaining = self.checkout_timeout - (time.monotonic() - waited_since)
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No Odoo connection available after {self.checkout_timeout}s "
+                            f"(pool size {self.max_size})"
+                        )
+                self._condition.wait(remaining)
+
+            if waited_since is not None:
+                self._stats["wait_time"] += time.monotonic() - waited_since
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["reused" if reused else "created"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._in_use)
+
+        if connection is None:
+            # The socket itself is opened lazily on the first request
+            try:
+                connection = self._new_connection()
+            except Exception:
+                with self._condition:
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+        return connection, reused
+
+    def release(self, connection: http.client.HTTPConnection, reusable: bool = True) -> None:
+        """
+        Return a connection to the pool.
+
+        Args:
+            connection: Connection obtained from acquire()
+            reusable: False if the connection is in an unknown state (error
+                      mid-request, server asked to close) and must be dropped
+        """
+        if not reusable:
+            connection.close()
+        with self._condition:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._stats["closed_broken"] += 1
+            self._condition.notify()
+
+    def call(self, send: Callable[[http.client.HTTPConnection], Tuple[Any, bool]]) -> Any:
+        """
+        Run one HTTP exchange on a pooled connection.
+
+        Retries once on a fresh connection if a kept-alive one turns out to
+        have been closed by the server, as xmlrpc.client.Transport does.
+
+        Args:
+            send: Callable performing the request on the given connection and
+                  returning (result, reusable). Exceptions carrying a truthy
+                  ``reusable`` attribute leave the connection in the pool.
+
+        Returns:
+            The result returned by send
+        """
+        for attempt in (0, 1):
+            connection, reused = self.acquire()
+            reusable = False
+            try:
+                result, reusable = send(connection)
+                return result
+            except STALE_CONNECTION_ERRORS:
+                if attempt or not reused:
+                    raise
+                logger.debug(f"Stale Odoo connection to {self.host}, retrying")
+            except Exception as e:
+                reusable = getattr(e, "reusable", False)
+                raise
+            finally:
+                self.release(connection, reusable)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.popleft()
+                connection.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool usage statistics.
+
+        Returns:
+            Dictionary with configuration, current in_use/idle counts and
+            cumulative counters (checkouts, created, reused, waits, ...)
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats["wait_time"] = round(stats["wait_time"], 6)
+            stats.update(
+                {
+                    "host": self.host,
+                    "max_size": self.max_size,
+                    "idle_timeout": self.idle_timeout,
+                    "in_use": self._in_use,
+                    "idle": len(self._idle),
+                }
+            )
+        return stats
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.scheme == "https":
+            context = self.ssl_context or ssl.create_default_context()
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout, context=context)
+        return http.client.HTTPConnection(self.host, timeout=self.timeout)
+
+    def _close_expired(self) -> None:
+        # Oldest idle connections sit at the left of the deque
+        if self.idle_timeout is None:
+            return
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            connection, _ = self._idle.popleft()
+            connection.close()
+            self._stats["closed_idle"] += 1
+
+
+class PooledTransport(xmlrpc.client.Transport):
+    """
+    XML-RPC transport that checks a pooled connection out for every call.
+
+    Unlike the default transport, it is safe to share between threads.
+    """
+
+    def __init__(self, pool: ConnectionPool, **kwargs):
+        super().__init__(**kwargs)
+        self.pool = pool
+
+    def request(self, host, handler, request_body, verbose=False):
+        return self.pool.call(
+            lambda connection: self._single_request(
+                connection, host, handler, request_body, verbose
+            )
+        )
+
+    def _single_request(
+        self,
+        connection: http.client.HTTPConnection,
+        host: str,
+        handler: str,
+        request_body: bytes,
+        verbose: bool,
+    ) -> Tuple[Any, bool]:
+        _, extra_headers, _ = self.get_host_info(host)
+        headers = list(self._headers) + list(extra_headers or [])
+        if verbose:
+            connection.set_debuglevel(1)
+        if self.accept_gzip_encoding:
+            connection.putrequest("POST", handler, skip_accept_encoding=True)
+            headers.append(("Accept-Encoding", "gzip"))
+        else:
+            connection.putrequest("POST", handler)
+        headers.append(("Content-Type", "text/xml"))
+        headers.append(("User-Agent", self.user_agent))
+        self.send_headers(connection, headers)
+        self.send_content(connection, request_body)
+
+        response = connection.getresponse()
+        if response.status == 200:
+            self.verbose = verbose
+            try:
+                result = self.parse_response(response)
+            except xmlrpc.client.Fault as fault:
+                # Fault responses are complete, well-formed HTTP 200 responses
+                fault.reusable = not response.will_close
+                raise
+            return result, not response.will_close
+
+        # Drain the body so the connection can be reused
+        response.read()
+        error = xmlrpc.client.ProtocolError(
+            host + handler, response.status, response.reason, dict(response.getheaders())
+        )
+        error.reusable = not response.will_close
+        raise error
+
+    def close(self):
+        self.pool.close()
+
+
+class JsonRpcProxy:
+    """
+    ServerProxy look-alike for one service of Odoo's /jsonrpc endpoint.
+
+    ``JsonRpcProxy(pool, "object").execute_kw(db, uid, password, ...)`` posts
+    the same call as the XML-RPC ``object`` endpoint, encoded as JSON-RPC 2.0.
+    Server errors are raised as xmlrpc.client.Fault so callers see the same
+    exception type whichever protocol is configured.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, pool: ConnectionPool, service: str, handler: str = "/jsonrpc"):
+        self.pool = pool
+        self.service = service
+        self.handler = handler
+
+    def __getattr__(self, method: str) -> Callable:
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return lambda *args: self._call(method, args)
+
+    def _call(self, method: str, args: tuple) -> Any:
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "call",
+            "params": {"service": self.service, "method": method, "args": list(args)},
+            "id": next(self._ids),
+        }
+        body = json.dumps(payload).encode("utf-8")
+        reply = self.pool.call(lambda connection: self._single_request(connection, body))
+
+        error = reply.get("error")
+        if error:
+            data = error.get("data") or {}
+            fault = xmlrpc.client.Fault(
+                error.get("code", 0),
+                data.get("debug") or data.get("message") or error.get("message", ""),
+            )
+            raise fault
+        return reply.get("result")
+
+    def _single_request(
+        self, connection: http.client.HTTPConnection, body: bytes
+    ) -> Tuple[Dict, bool]:
+        connection.putrequest("POST", self.handler, skip_accept_encoding=True)
+        connection.putheader("Accept-Encoding", "gzip")
+        connection.putheader("Content-Type", "application/json")
+        connection.putheader("Content-Length", str(len(body)))
+        connection.endheaders(body)
+
+        response = connection.getresponse()
+        content = response.read()
+        reusable = not response.will_close
+        if response.status != 200:
+            error = xmlrpc.client.ProtocolError(
+                self.pool.host + self.handler,
+                response.status,
+                response.reason,
+                dict(response.getheaders()),
+            )
+            error.reusable = reusable
+            raise error
+
+        if response.getheader("Content-Encoding", "") == "gzip":
+            content = gzip.decompress(content)
+        return json.loads(content), reusable
+
+
+# Supported values of the ODOO_PROTOCOL setting
+PROTOCOLS = ("xmlrpc", "jsonrpc")
+
+
+def create_service_proxies(
+    url: str, pool: ConnectionPool, protocol: str = "xmlrpc"
+) -> Tuple[Any, Any]:
+    """
+    Create the ``common`` and ``object`` service proxies for a protocol.
+
+    Args:
+        url: Odoo base URL (without credentials)
+        pool: Connection pool shared by both proxies
+        protocol: 'xmlrpc' or 'jsonrpc'
+
+    Returns:
+        Tuple of (common, models) proxies
+
+    Raises:
+        ValueError: If protocol is not supported
+    """
+    if protocol == "xmlrpc":
+        transport = PooledTransport(pool)
+        return (
+            xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common", transport=transport),
+            xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object", transport=transport),
+        )
+    if protocol == "jsonrpc":
+        return JsonRpcProxy(pool, "common"), JsonRpcProxy(pool, "object")
+    raise ValueError(
+        f"Unsupported Odoo protocol: {protocol} (expected one of {', '.join(PROTOCOLS)})"
+    )
@@ -0,0 +1,171 @@
+"""
+Local snapshot of res.partner fields, kept fresh by polling write_date.
+
+Several fast paths (member name search, barcode lookups) only need a few
+small fields of every partner. PartnerSync bulk-loads those fields once,
+then every PARTNER_SYNC_INTERVAL seconds re-reads only the partners written
+since the last poll, and notifies its listeners so they can update derived
+indexes incrementally. Archived partners, and partners that stop matching
+the snapshot's domain, are dropped; a count check detects deleted
+partners, in which case everything is reloaded.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from caching import RefreshingValue
+
+logger = logging.getLogger(__name__)
+
+# listener(changed_records, removed_ids, full_reload)
+PartnerListener = Callable[[List[Dict], Set[int], bool], None]
+
+
+class PartnerSync:
+    """
+    In-memory copy of selected res.partner fields.
+
+    Args:
+        odoo: OdooClient
+        fields: res.partner fields to keep (id and write_date are added)
+        refresh_interval: Seconds between write_date polls
+        domain: Odoo domain of the partners to keep (default: all partners)
+    """
+
+    def __init__(
+        self,
+        odoo,
+        fields: Iterable[str],
+        refresh_interval: float = 60,
+        domain: Optional[Sequence] = None,
+    ):
+        self.odoo = odoo
+        self.fields = sorted(set(fields) | {"id", "write_date"})
+        self.domain = list(domain or [])
+        self.records: Dict[int, Dict] = {}
+        self.max_write_date: Optional[str] = None
+        self._loaded = False
+        self._warming = False
+        self._listeners: List[PartnerListener] = []
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+        self._cache = RefreshingValue(
+            self._refresh,
+            ttl=refresh_interval,
+            refresh_ahead=refresh_interval / 2,
+            name="partner sync",
+        )
+
+    def subscribe(self, listener: PartnerListener) -> None:
+        """Register a listener called after every load or incremental update."""
+        self._listeners.append(listener)
+
+    def add_fields(self, fields: Iterable[str]) -> None:
+        """Track more fields (before the first load)."""
+        self.fields = sorted(set(self.fields) | set(fields))
+
+    def ensure_fresh(self, wait: bool = True) -> None:
+        """
+        Load or refresh the snapshot if due.
+
+        Args:
+            wait: If False and a snapshot exists, an overdue refresh runs in
+                  the background instead of delaying the caller
+
+        Raises:
+            Exception: If the initial load fails (later failures keep the
+                       last good snapshot)
+        """
+        self._cache.get(stale_ok=not wait)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the initial load has completed."""
+        return self._loaded
+
+    def warm_up(self) -> None:
+        """Start the initial load in the background (e.g. at startup)."""
+        with self._warm_lock:
+            if self._loaded or self._warming:
+                return
+            self._warming = True
+
+        def load():
+            try:
+                self.ensure_fresh()
+            except Exception as e:
+                logger.error(f"Initial partner load failed: {e}")
+            finally:
+                self._warming = False
+
+        threading.Thread(target=load, name="partner-sync-warm-up", daemon=True).start()
+
+    def _refresh(self) -> bool:
+        with self._lock:
+            if not self._loaded:
+                self._full_load()
+            else:
+                self._poll_changes()
+        return True
+
+    def _full_load(self) -> None:
+        records = self.odoo.execute("res.partner", "search_read", self.domain, fields=self.fields)
+        self.records = {r["id"]: r for r in records}
+        self.max_write_date = max((r.get("write_date") or "" for r in records), default="") or None
+        self._loaded = True
+        logger.info(f"Loaded {len(records)} partners")
+        self._notify(records, set(), True)
+
+    def _poll_changes(self) -> None:
+        changed = []
+        if self.max_write_date:
+            # >= so that partners written in the same second as the last poll
+            # are not missed; re-reading them is harmless
+            changed = self.odoo.execute(
+                "res.partner",
+                "search_read",
+                [("write_date", ">=", self.max_write_date), ("active", "in", [True, False])],
+                fields=self.fields + ["active"],
+            )
+
+        matching = None
+        if changed and self.domain:
+            # Changed partners that still belong to the snapshot
+            matching = set(self.odoo.execute(
+                "res.partner",
+                "search",
+                [("id", "in", [record["id"] for record in changed])] + self.domain,
+            ))
+
+        updated, removed = [], set()
+        for record in changed:
+            active = record.pop("active", True)
+            if active and (matching is None or record["id"] in matching):
+                if self.records.get(record["id"]) != record:
+                    self.records[record["id"]] = record
+                    updated.append(record)
+            elif self.records.pop(record["id"], None) is not None:
+                removed.add(record["id"])
+            write_date = record.get("write_date")
+            if write_date and write_date > (self.max_write_date or ""):
+                self.max_write_date = write_date
+
+        count = self.odoo.execute("res.partner", "search_count", self.domain)
+        if count != len(self.records):
+            # Deleted partners leave no write_date trace: reload everything
+            logger.info(f"Partner count changed ({len(self.records)} -> {count}), reloading")
+            self._full_load()
+            return
+
+        if updated or removed:
+            logger.info(f"Partner sync: {len(updated)} updated, {len(removed)} removed")
+            self._notify(updated, removed, False)
+
+    def _notify(self, records: List[Dict], removed: Set[int], full: bool) -> None:
+        for listener in self._listeners:
+            listener(records, removed, full)
+
+    def stats(self) -> Dict:
+        """Cache statistics (see RefreshingValue.stats) plus the partner count."""
+        return dict(self._cache.stats(), size=len(self.records))
@@ -0,0 +1,139 @@
+"""
+Resized member photo cache.
+
+Partner images are stored in Odoo as base64 (image ~1024px, image_medium
+128px, image_small 64px). The photo endpoint fetches the source image once,
+resizes it to the requested size variant in WebP or JPEG, and keeps the
+result on disk under <CACHE_DIR>/photos, keyed by partner id and a version
+derived from the partner's write_date. A new write_date yields a new version
+(and new URLs), so cached files never need invalidation.
+
+Pillow is optional: without it the Odoo image is served unchanged.
+"""
+
+import base64
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+from typing import Optional, Tuple
+
+from utils import get_cache_dir
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - exercised only without Pillow
+    Image = None
+
+# Without Pillow, photos are cached and served in their original format
+PILLOW_AVAILABLE = Image is not None
+ORIGINAL_FORMAT = "orig"
+
+logger = logging.getLogger(__name__)
+
+# Size variant -> (max edge in pixels, Odoo field to resize from)
+PHOTO_SIZES = {
+    "small": (128, "image_medium"),
+    "medium": (256, "image"),
+    "large": (512, "image"),
+}
+
+PHOTO_FORMATS = {
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+}
+
+
+# Versions are the first 12 hex digits of a SHA-1 (see photo_version)
+PHOTO_VERSION_PATTERN = re.compile(r"[0-9a-f]{12}")
+
+
+def photo_version(write_date: Optional[str]) -> str:
+    """Short stable version string for a partner write_date."""
+    return hashlib.sha1(str(write_date or "").encode()).hexdigest()[:12]
+
+
+def is_photo_version(value: str) -> bool:
+    """Whether a client-supplied value has the format of photo_version."""
+    return PHOTO_VERSION_PATTERN.fullmatch(value) is not None
+
+
+def sniff_format(data: bytes) -> str:
+    """Guess the format of an unresized image (used without Pillow)."""
+    if data.startswith(b"\x89PNG"):
+        return "png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return "jpeg"
+
+
+def render_photo(image_b64: str, max_edge: int, image_format: str) -> Tuple[bytes, str]:
+    """
+    Decode an Odoo base64 image and resize it.
+
+    Args:
+        image_b64: Base64 image from res.partner
+        max_edge: Maximum width/height of the result
+        image_format: 'webp' or 'jpeg'
+
+    Returns:
+        Tuple of (image bytes, actual format)
+    """
+    data = base64.b64decode(image_b64)
+    if Image is None:
+        return data, sniff_format(data)
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        if image.mode not in ("RGB", "RGBA") or image_format == "jpeg":
+            image = image.convert("RGB")
+        output = io.BytesIO()
+        if image_format == "webp":
+            image.save(output, "WEBP", quality=80, method=4)
+        else:
+            image.save(output, "JPEG", quality=85, optimize=True, progressive=True)
+    return output.getvalue(), image_format
+
+
+class PhotoCache:
+    """On-disk cache of resized photos, one directory per partner."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(get_cache_dir(), "photos")
+
+    def _path(self, partner_id: int, version: str, size: str, image_format: str) -> str:
+        # The version ends up in a file name: never let it leave the cache
+        if not is_photo_version(version):
+            raise ValueError(f"Invalid photo version: {version!r}")
+        return os.path.join(self.directory, str(partner_id), f"{version}-{size}.{image_format}")
+
+    def get(self, partner_id: int, version: str, size: str, image_format: str) -> Optional[bytes]:
+        """Get a cached photo variant, or None."""
+        try:
+            with open(self._path(partner_id, version, size, image_format), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, partner_id: int, version: str, size: str, image_format: str, data: bytes) -> None:
+        """Store a photo variant and drop variants of older versions."""
+        path = self._path(partner_id, version, size, image_format)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Atomic write: concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        for name in os.listdir(directory):
+            if not name.startswith(f"{version}-") and not name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,137 @@
+"""
+Stale-while-revalidate cache of per-member API responses.
+
+Member lookups come in bursts (the same member is opened several times while
+talking to them at the desk). ResponseCache keeps built responses keyed by
+(kind, member_id, *window) with two TTLs:
+
+- younger than soft_ttl: served as is
+- between soft_ttl and hard_ttl: served at once, refreshed in the background
+- older than hard_ttl: rebuilt before answering
+
+Each entry is a RefreshingValue (ttl=hard_ttl, refresh-ahead from soft_ttl),
+so a failed background refresh keeps serving the last good response until
+hard_ttl; past it, a failed rebuild is an error, never an older response. Entries
+are evicted least recently used beyond max_entries, and purge() drops a
+member's entries after staff edited it in Odoo.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from caching import RefreshingValue
+
+
+class ResponseCache:
+    """
+    Bounded map of cache keys to RefreshingValue entries.
+
+    Args:
+        soft_ttl: Seconds a response is served without refreshing it
+        hard_ttl: Seconds after which a response is rebuilt before serving
+                  (0 disables the cache)
+        max_entries: Maximum number of cached responses
+    """
+
+    def __init__(self, soft_ttl: float, hard_ttl: float, max_entries: int = 1000):
+        self.soft_ttl = min(soft_ttl, hard_ttl)
+        self.hard_ttl = hard_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, RefreshingValue]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._purges = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.hard_ttl > 0 and self.max_entries > 0
+
+    def get(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        """
+        Get the response cached under key, building it with loader if needed.
+
+        Args:
+            key: (kind, member_id, ...) tuple
+            loader: Callable building the response; raises on failure
+
+        Returns:
+            The cached or freshly built response (not to be mutated)
+
+        Raises:
+            Exception: The loader error, if no response was cached
+        """
+        if not self.enabled:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = RefreshingValue(
+                    loader,
+                    ttl=self.hard_ttl,
+                    refresh_ahead=self.hard_ttl - self.soft_ttl,
+                    name=f"response {key}",
+                    stale_on_error=False,
+                )
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+            else:
+                self._entries.move_to_end(key)
+                # A background refresh must rebuild with the latest loader
+                entry.loader = loader
+        try:
+            return entry.get()
+        except Exception:
+            # Nothing to serve: do not keep an empty entry around
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            raise
+
+    def purge(self, member_id: int) -> int:
+        """
+        Drop every cached response of a member.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[1] == member_id]
+            for key in keys:
+                del self._entries[key]
+            self._purges += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, hits, misses, stale_hits, refreshes and
+            errors (summed over the cached entries, see RefreshingValue.stats),
+            evictions, purges and both TTLs
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+            evictions, purges = self._evictions, self._purges
+        totals = {"hits": 0, "misses": 0, "stale_hits": 0, "refreshes": 0, "errors": 0}
+        for entry in entries:
+            entry_stats = entry.stats()
+            for name in totals:
+                totals[name] += entry_stats[name]
+        return dict(
+            totals,
+            entries=len(entries),
+            evictions=evictions,
+            purges=purges,
+            soft_ttl=self.soft_ttl,
+            hard_ttl=self.hard_ttl,
+        )
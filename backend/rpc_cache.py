@@ -0,0 +1,229 @@
+"""
+Memoization of read-only Odoo RPC calls.
+
+Every OdooClient model call goes through RpcCache.call(). Read methods
+(search_read, read, read_group, ...) on models with a TTL policy are answered
+from memory while the TTL runs; other models, and every write, always go to
+Odoo. A write (any method that is not a known read) drops the cached results
+of its model.
+
+Calls are keyed by (model, method, arguments, options), normalized so that
+equivalent calls share an entry: domain terms given as lists or tuples,
+options in any order and the same fields in any order give the same key.
+
+Results are stored pickled: their size is bounded (max_bytes, on top of
+max_entries, least recently used evicted first) and each caller gets its own
+copy, so helpers can decorate fetched records in place.
+"""
+
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Methods that do not change data; anything else counts as a write
+READ_METHODS = frozenset(
+    {
+        "search_read",
+        "read",
+        "read_group",
+        "search",
+        "search_count",
+        "name_get",
+        "name_search",
+        "fields_get",
+    }
+)
+
+# Seconds results are kept per model (models not listed are not cached).
+# Models are opted in one by one: shift configuration (res.config.settings)
+# and shift.shift metadata already have their own caches in OdooClient, under
+# which a memo would only add staleness and a second copy of the results.
+DEFAULT_MODEL_TTLS = {
+    "shift.counter.event": 5,
+}
+
+
+def parse_model_ttls(spec: Optional[str]) -> Dict[str, float]:
+    """
+    Parse a per-model TTL policy, on top of DEFAULT_MODEL_TTLS.
+
+    Args:
+        spec: Comma-separated model=seconds pairs, e.g.
+              "shift.shift=600,shift.counter.event=0" (0 disables a model)
+
+    Returns:
+        Map of model name to TTL in seconds
+
+    Raises:
+        ValueError: If a pair is malformed
+    """
+    ttls = dict(DEFAULT_MODEL_TTLS)
+    for pair in (spec or "").split(","):
+        if not pair.strip():
+            continue
+        model, sep, seconds = pair.partition("=")
+        if not sep or not model.strip():
+            raise ValueError(f"Invalid RPC cache TTL {pair!r}, expected model=seconds")
+        ttls[model.strip()] = float(seconds)
+    return ttls
+
+
+def freeze(value: Any) -> Hashable:
+    """Turn lists, tuples and dicts into hashable tuples, recursively."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def make_key(model: str, method: str, args: List, kwargs: Dict) -> Tuple:
+    """
+    Cache key of an RPC call.
+
+    Args:
+        model: Odoo model name
+        method: Model method
+        args: Positional arguments (domain, ids, ...)
+        kwargs: Options (fields, order, limit, ...)
+
+    Returns:
+        Hashable key; the fields option is order-insensitive
+    """
+    options = dict(kwargs)
+    if isinstance(options.get("fields"), (list, tuple)):
+        options["fields"] = sorted(options["fields"])
+    return (model, method, freeze(args), freeze(options))
+
+
+class RpcCache:
+    """
+    LRU memo of read RPC results with per-model TTLs.
+
+    Args:
+        model_ttls: Seconds results are kept per model
+        max_entries: Maximum number of cached results (0 disables the cache)
+        max_bytes: Maximum total size of the pickled results
+    """
+
+    def __init__(
+        self,
+        model_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 5000,
+        max_bytes: int = 32 * 1024 * 1024,
+    ):
+        self.model_ttls = dict(DEFAULT_MODEL_TTLS if model_ttls is None else model_ttls)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (model, expires_at, pickled result)
+        self._entries: "OrderedDict[Tuple, Tuple[str, float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def call(
+        self, model: str, method: str, args: List, kwargs: Dict, rpc: Callable[[], Any]
+    ) -> Any:
+        """
+        Run an RPC, or answer it from the cache.
+
+        Args:
+            model: Odoo model name
+            method: Model method
+            args: Positional arguments
+            kwargs: Options
+            rpc: Callable performing the call; raises on failure
+
+        Returns:
+            The RPC result (a private copy when cached)
+        """
+        if method not in READ_METHODS:
+            try:
+                return rpc()
+            finally:
+                self.invalidate(model)
+
+        ttl = self.model_ttls.get(model, 0)
+        if ttl <= 0 or self.max_entries <= 0:
+            return rpc()
+
+        key = make_key(model, method, args, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                payload = entry[2]
+            else:
+                self._misses += 1
+                payload = None
+        if payload is not None:
+            return pickle.loads(payload)
+
+        result = rpc()
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self._store(key, model, time.monotonic() + ttl, payload)
+        return result
+
+    def _store(self, key: Tuple, model: str, expires_at: float, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._entries[key] = (model, expires_at, payload)
+            self._bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def invalidate(self, model: Optional[str] = None) -> int:
+        """
+        Drop cached results.
+
+        Args:
+            model: Only drop the results of this model (default: all)
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if model is None or entry[0] == model]
+            for key in keys:
+                self._bytes -= len(self._entries.pop(key)[2])
+            self._invalidations += len(keys)
+        if keys:
+            logger.debug(f"Dropped {len(keys)} cached RPC results of {model or 'all models'}")
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, bytes, hits, misses, evictions,
+            invalidations and the per-model TTLs
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "model_ttls": dict(self.model_ttls),
+            }
@@ -0,0 +1,369 @@
+"""
+Cooperative-wide snapshot of members' share information.
+
+Reporting needs the join date and total shares of every member, and
+/api/member/<id>/shares costs 3 RPCs per member. ShareLedger bulk-loads all
+res.partner.owned.share records, their invoices and the partners' share
+totals in a few paged RPCs, computes each partner's share information with
+the same rules as OdooClient.get_member_share_information
+(build_share_information), and persists it in SQLite (SHARE_LEDGER_DB,
+default <CACHE_DIR>/share_ledger.sqlite3).
+
+Every SHARE_LEDGER_REFRESH_INTERVAL seconds the snapshot is refreshed
+incrementally: share records and known invoices with a newer write_date are
+looked up and only their partners are rebuilt; a count check catches deleted
+share records, in which case everything is reloaded.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from caching import RefreshingValue
+from odoo_client import SHARE_INVOICE_FIELDS, SHARE_RECORD_FIELDS, build_share_information, share_invoice_ids
+from utils import extract_id, get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+SHARE_MODEL = "res.partner.owned.share"
+
+
+def default_ledger_path() -> str:
+    """Path of the share ledger database (SHARE_LEDGER_DB or cache dir)."""
+    return os.getenv(
+        "SHARE_LEDGER_DB",
+        os.path.join(get_cache_dir(), "share_ledger.sqlite3"),
+    )
+
+
+def max_write_date(records: Iterable[Dict], *dates: Optional[str]) -> Optional[str]:
+    """Newest of the records' write_date and the given dates (None if none)."""
+    candidates = [r.get("write_date") for r in records] + list(dates)
+    return max((d for d in candidates if d), default=None)
+
+
+class ShareLedger:
+    """
+    SQLite-backed share information of every member, kept in sync with Odoo.
+
+    Args:
+        odoo: OdooClient
+        path: SQLite database path (default: default_ledger_path())
+        refresh_interval: Seconds between incremental refreshes
+        page_size: Records per paged RPC
+    """
+
+    def __init__(
+        self,
+        odoo,
+        path: Optional[str] = None,
+        refresh_interval: float = 900,
+        page_size: int = 2000,
+    ):
+        self.odoo = odoo
+        self.path = path or default_ledger_path()
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._warming = False
+        self._cache = RefreshingValue(
+            self._refresh,
+            ttl=refresh_interval,
+            refresh_ahead=refresh_interval / 2,
+            name="share ledger",
+        )
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS share_ledger (
+                    partner_id INTEGER PRIMARY KEY,
+                    total_shares INTEGER NOT NULL,
+                    first_purchase_date TEXT,
+                    share_info TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS share_ledger_invoice (
+                    invoice_id INTEGER PRIMARY KEY,
+                    partner_id INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS share_ledger_sync (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    share_write_date TEXT,
+                    invoice_write_date TEXT,
+                    share_count INTEGER NOT NULL,
+                    synced_at TEXT NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @property
+    def ready(self) -> bool:
+        """Whether a snapshot was ever loaded (possibly by an earlier run)."""
+        return self._sync_state() is not None
+
+    def _sync_state(self) -> Optional[Dict]:
+        with self._lock, closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM share_ledger_sync WHERE id = 1").fetchone()
+        return dict(row) if row else None
+
+    def ensure_fresh(self, wait: bool = True) -> None:
+        """
+        Load or refresh the snapshot if due.
+
+        Args:
+            wait: If False and a snapshot exists, an overdue refresh runs in
+                  the background instead of delaying the caller
+
+        Raises:
+            Exception: If the refresh fails and the caller waited for it
+        """
+        self._cache.get(stale_ok=not wait)
+
+    def warm_up(self) -> None:
+        """Load or catch up the snapshot in the background (e.g. at startup)."""
+
+        with self._lock:
+            if self._warming:
+                return
+            self._warming = True
+
+        def load():
+            try:
+                self.ensure_fresh()
+            except Exception as e:
+                logger.error(f"Share ledger load failed: {e}")
+            finally:
+                with self._lock:
+                    self._warming = False
+
+        threading.Thread(target=load, name="share-ledger-warm-up", daemon=True).start()
+
+    def get(self, partner_id: int) -> Optional[Dict]:
+        """
+        Get a member's share information from the snapshot.
+
+        Returns:
+            Same dictionary as OdooClient.get_member_share_information, or
+            None if the member has no share record in the snapshot
+        """
+        with self._lock, closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT share_info FROM share_ledger WHERE partner_id = ?", (partner_id,)
+            ).fetchone()
+        return json.loads(row["share_info"]) if row else None
+
+    def list_members(self) -> List[Dict]:
+        """
+        Get every member's join date and total shares.
+
+        Returns:
+            List of {member_id, total_shares, join_date}, by member ID
+        """
+        with self._lock, closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT partner_id, total_shares, first_purchase_date FROM share_ledger ORDER BY partner_id"
+            ).fetchall()
+        return [
+            {
+                "member_id": row["partner_id"],
+                "total_shares": row["total_shares"],
+                "join_date": row["first_purchase_date"],
+            }
+            for row in rows
+        ]
+
+    def _refresh(self) -> bool:
+        with self._sync_lock:
+            state = self._sync_state()
+            if state is None:
+                self._full_load()
+            else:
+                self._poll_changes(state)
+        return True
+
+    def _search_read_paged(self, model: str, domain: List, fields: List[str], order: str) -> List[Dict]:
+        records = []
+        while True:
+            page = self.odoo.execute(
+                model, "search_read", domain,
+                fields=fields, order=order, limit=self.page_size, offset=len(records),
+            )
+            records.extend(page)
+            if len(page) < self.page_size:
+                return records
+
+    def _read_chunked(self, model: str, ids: List[int], fields: List[str]) -> List[Dict]:
+        records = []
+        for i in range(0, len(ids), self.page_size):
+            records.extend(self.odoo.execute(model, "read", ids[i:i + self.page_size], fields=fields))
+        return records
+
+    def _build(self, share_records: List[Dict]) -> Dict:
+        """Fetch invoices and partner totals of share records and assemble them per partner."""
+        by_partner: Dict[int, List[Dict]] = {}
+        for record in sorted(share_records, key=lambda r: (r.get("create_date") or "", r["id"])):
+            by_partner.setdefault(extract_id(record.get("partner_id")), []).append(record)
+        by_partner.pop(None, None)
+
+        invoice_ids = list(dict.fromkeys(i for r in share_records for i in share_invoice_ids(r)))
+        invoices = {
+            inv["id"]: inv
+            for inv in self._read_chunked("account.invoice", invoice_ids, SHARE_INVOICE_FIELDS + ["write_date"])
+        }
+        totals = {
+            p["id"]: p.get("total_partner_owned_share", 0)
+            for p in self._read_chunked("res.partner", list(by_partner), ["total_partner_owned_share"])
+        }
+
+        infos = {
+            partner_id: build_share_information(totals.get(partner_id, 0), records, invoices)
+            for partner_id, records in by_partner.items()
+        }
+        invoice_partners = {
+            invoice_id: partner_id
+            for partner_id, records in by_partner.items()
+            for record in records
+            for invoice_id in share_invoice_ids(record)
+        }
+        return {
+            "infos": infos,
+            "invoice_partners": invoice_partners,
+            "invoice_write_date": max_write_date(invoices.values()),
+        }
+
+    def _full_load(self) -> None:
+        records = self._search_read_paged(
+            SHARE_MODEL, [], SHARE_RECORD_FIELDS + ["partner_id", "write_date"], "id"
+        )
+        built = self._build(records)
+        self._save(
+            built,
+            replace=True,
+            share_write_date=max_write_date(records),
+            invoice_write_date=built["invoice_write_date"],
+            share_count=len(records),
+        )
+        logger.info(f"Loaded share ledger: {len(built['infos'])} members, {len(records)} share records")
+
+    def _poll_changes(self, state: Dict) -> None:
+        count = self.odoo.execute(SHARE_MODEL, "search_count", [])
+        if count != state["share_count"]:
+            # Deleted records leave no write_date trace: reload everything
+            logger.info(f"Share record count changed ({state['share_count']} -> {count}), reloading")
+            self._full_load()
+            return
+
+        changed = []
+        if state["share_write_date"]:
+            # >= so that records written in the same second as the last poll
+            # are not missed; rebuilding them is harmless
+            changed = self.odoo.execute(
+                SHARE_MODEL, "search_read", [("write_date", ">=", state["share_write_date"])],
+                fields=["id", "partner_id", "write_date"],
+            )
+        partner_ids = {extract_id(r.get("partner_id")) for r in changed}
+
+        changed_invoices = []
+        known_invoices = self._invoice_partners()
+        if known_invoices and state["invoice_write_date"]:
+            changed_invoices = self.odoo.execute(
+                "account.invoice", "search_read",
+                [("id", "in", list(known_invoices)), ("write_date", ">=", state["invoice_write_date"])],
+                fields=["id", "write_date"],
+            )
+        partner_ids |= {known_invoices[inv["id"]] for inv in changed_invoices if inv["id"] in known_invoices}
+        partner_ids.discard(None)
+
+        built = None
+        if partner_ids:
+            records = self.odoo.execute(
+                SHARE_MODEL, "search_read", [("partner_id", "in", sorted(partner_ids))],
+                fields=SHARE_RECORD_FIELDS + ["partner_id", "write_date"],
+            )
+            built = self._build(records)
+            # Partners whose last share record moved to another partner
+            for partner_id in partner_ids - set(built["infos"]):
+                built["infos"][partner_id] = None
+            logger.info(f"Share ledger: {len(partner_ids)} members updated")
+
+        self._save(
+            built or {"infos": {}, "invoice_partners": {}},
+            replace=False,
+            share_write_date=max_write_date(changed, state["share_write_date"]),
+            invoice_write_date=max_write_date(
+                changed_invoices, state["invoice_write_date"], (built or {}).get("invoice_write_date")
+            ),
+            share_count=count,
+        )
+
+    def _invoice_partners(self) -> Dict[int, int]:
+        with self._lock, closing(self._connect()) as conn:
+            rows = conn.execute("SELECT invoice_id, partner_id FROM share_ledger_invoice").fetchall()
+        return {row["invoice_id"]: row["partner_id"] for row in rows}
+
+    def _save(
+        self,
+        built: Dict,
+        replace: bool,
+        share_write_date: Optional[str],
+        invoice_write_date: Optional[str],
+        share_count: int,
+    ) -> None:
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        infos = built["infos"]
+        with self._lock, closing(self._connect()) as conn, conn:
+            if replace:
+                conn.execute("DELETE FROM share_ledger")
+                conn.execute("DELETE FROM share_ledger_invoice")
+            else:
+                conn.executemany(
+                    "DELETE FROM share_ledger_invoice WHERE partner_id = ?", [(p,) for p in infos]
+                )
+                conn.executemany(
+                    "DELETE FROM share_ledger WHERE partner_id = ?",
+                    [(p,) for p, info in infos.items() if info is None],
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO share_ledger "
+                "(partner_id, total_shares, first_purchase_date, share_info, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (partner_id, info["total_shares"], info["first_purchase_date"], json.dumps(info), now)
+                    for partner_id, info in infos.items()
+                    if info is not None
+                ],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO share_ledger_invoice (invoice_id, partner_id) VALUES (?, ?)",
+                list(built["invoice_partners"].items()),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO share_ledger_sync "
+                "(id, share_write_date, invoice_write_date, share_count, synced_at) VALUES (1, ?, ?, ?, ?)",
+                (share_write_date, invoice_write_date, share_count, now),
+            )
+
+    def stats(self) -> Dict:
+        """Cache statistics (see RefreshingValue.stats) plus the member count and last sync."""
+        with self._lock, closing(self._connect()) as conn:
+            size = conn.execute("SELECT COUNT(*) FROM share_ledger").fetchone()[0]
+            state = conn.execute("SELECT synced_at FROM share_ledger_sync WHERE id = 1").fetchone()
+        return dict(self._cache.stats(), size=size, synced_at=state["synced_at"] if state else None)
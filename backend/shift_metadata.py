@@ -0,0 +1,193 @@
+"""
+In-memory cache of shift.shift metadata.
+
+Shift registrations only carry a shift_id; the shift name, week and shift
+type shown in the history come from shift.shift, which is read by both the
+member's shift history and the exchange registrations. Shifts do not change
+once created, so their metadata is kept per shift ID (least recently used
+evicted beyond max_entries, re-read after ttl) and only unknown IDs are read
+from Odoo, in one batch.
+
+The shifts of the current and upcoming cycles, where open registrations
+point, are prefetched with one search_read, at startup (warm_up) and then in
+the background every prefetch_interval seconds.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from caching import RefreshingValue
+
+logger = logging.getLogger(__name__)
+
+# shift.shift fields used to enrich registrations
+SHIFT_METADATA_FIELDS = ["id", "name", "date_begin", "week_number", "week_name", "shift_type_id"]
+
+
+@lru_cache(maxsize=256)
+def _classify_shift_type_name(type_name: str) -> str:
+    name = type_name.lower()
+    return "ftop" if "ftop" in name or "volant" in name else "standard"
+
+
+def shift_type_kind(shift_type_id: Any) -> Optional[str]:
+    """
+    Classify a shift_type_id as an FTOP or standard shift type.
+
+    FTOP ("volant") shift types are recognized by name; the classification
+    is computed once per shift type name.
+
+    Args:
+        shift_type_id: Odoo Many2one value ([id, name], an ID, or False)
+
+    Returns:
+        'ftop' or 'standard', or None without shift type
+    """
+    if not shift_type_id:
+        return None
+    if isinstance(shift_type_id, list) and len(shift_type_id) > 1:
+        return _classify_shift_type_name(shift_type_id[1])
+    # Without its name, a shift type is assumed standard
+    return "standard"
+
+
+class ShiftMetadataCache:
+    """
+    Bounded shift.shift metadata cache with background prefetch.
+
+    Args:
+        odoo: OdooClient used to read shift.shift records
+        ttl: Seconds a shift's metadata is kept before being re-read
+        max_entries: Maximum number of cached shifts
+        prefetch_cycles: Number of cycles, from the current one, whose
+                         shifts are prefetched (0 disables prefetching)
+        prefetch_interval: Seconds between prefetches
+    """
+
+    def __init__(
+        self,
+        odoo,
+        ttl: float = 86400,
+        max_entries: int = 20000,
+        prefetch_cycles: int = 2,
+        prefetch_interval: float = 3600,
+    ):
+        self.odoo = odoo
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prefetch_cycles = prefetch_cycles
+        # shift ID -> (loaded_at, metadata)
+        self._entries: "OrderedDict[int, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._prefetch = RefreshingValue(
+            self._prefetch_upcoming,
+            ttl=prefetch_interval,
+            refresh_ahead=prefetch_interval / 2,
+            name="upcoming shifts",
+        )
+        self._prefetched = False
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_shifts(self, shift_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Get the metadata of shifts, reading unknown ones in one batch.
+
+        Args:
+            shift_ids: shift.shift IDs (duplicates and None are ignored)
+
+        Returns:
+            Map of shift ID to its SHIFT_METADATA_FIELDS; IDs unknown to Odoo
+            are absent
+        """
+        if self._prefetched:
+            # Keep the upcoming cycles warm without delaying the caller
+            self._prefetch.get(stale_ok=True)
+
+        wanted = list(dict.fromkeys(sid for sid in shift_ids if sid is not None))
+        found: Dict[int, Dict] = {}
+        now = time.monotonic()
+        with self._lock:
+            for shift_id in wanted:
+                entry = self._entries.get(shift_id)
+                if entry is not None and now - entry[0] < self.ttl:
+                    self._entries.move_to_end(shift_id)
+                    found[shift_id] = dict(entry[1])
+            self._hits += len(found)
+            self._misses += len(wanted) - len(found)
+
+        missing = [sid for sid in wanted if sid not in found]
+        if missing:
+            records = self.odoo.execute("shift.shift", "read", missing, fields=SHIFT_METADATA_FIELDS)
+            self._store(records)
+            found.update((r["id"], dict(r)) for r in records)
+        return found
+
+    def _store(self, records: List[Dict]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for record in records:
+                self._entries[record["id"]] = (
+                    now,
+                    {field: record.get(field) for field in SHIFT_METADATA_FIELDS},
+                )
+                self._entries.move_to_end(record["id"])
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _prefetch_upcoming(self) -> int:
+        config = self.odoo.get_shift_config()
+        cycle_days = 7 * int(config["weeks_per_cycle"])
+        today = datetime.now()
+        # Registrations of the cycle in progress may have started a cycle ago
+        start = (today - timedelta(days=cycle_days)).strftime("%Y-%m-%d")
+        end = (today + timedelta(days=cycle_days * self.prefetch_cycles)).strftime("%Y-%m-%d")
+        records = self.odoo.execute(
+            "shift.shift",
+            "search_read",
+            [("date_begin", ">=", start), ("date_begin", "<", end)],
+            fields=SHIFT_METADATA_FIELDS,
+        )
+        self._store(records)
+        self._prefetched = True
+        logger.info(f"Prefetched {len(records)} shifts from {start} to {end}")
+        return len(records)
+
+    def warm_up(self) -> None:
+        """Prefetch the upcoming cycles' shifts in the background (e.g. at startup)."""
+        if self.prefetch_cycles <= 0:
+            return
+
+        def load():
+            try:
+                self._prefetch.get()
+            except Exception as e:
+                logger.error(f"Shift metadata prefetch failed: {e}")
+
+        threading.Thread(target=load, name="shift-metadata-warm-up", daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, hits and misses (per shift ID),
+            evictions, ttl and prefetch (see RefreshingValue.stats)
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "ttl": self.ttl,
+                "prefetch": self._prefetch.stats(),
+            }
@@ -2,10 +2,18 @@
 Pytest configuration and shared fixtures for backend tests.
 """
 import pytest
-from app import app as flask_app
+from app import app as flask_app, response_cache
 from odoo_client import OdooClient
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Tests reuse member IDs with different Odoo mocks: start uncached."""
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
 @pytest.fixture
 def app():
     """Create and configure a test Flask app instance."""
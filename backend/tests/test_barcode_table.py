@@ -0,0 +1,154 @@
+"""
+Tests for barcode_table module and the /api/members/by-barcode endpoint.
+"""
+
+import json
+import xmlrpc.client
+
+import pytest
+from barcode_table import BARCODE_STATUS_FIELDS, BarcodeTable
+from odoo_client import OdooClient
+from partner_sync import PartnerSync
+from tests.test_member_index import FakePartnerOdoo
+
+
+def member(partner_id, barcode, barcode_base, state="up_to_date", write_date="2025-01-01 00:00:00"):
+    return {
+        "id": partner_id,
+        "name": f"Member {partner_id}",
+        "barcode": barcode,
+        "barcode_base": barcode_base,
+        "cooperative_state": state,
+        "is_worker_member": True,
+        "shift_type": "standard",
+        "is_unsubscribed": False,
+        "customer": True,
+        "write_date": write_date,
+    }
+
+
+@pytest.fixture
+def members():
+    return [
+        member(1, "0420000001234", 1234),
+        member(2, "0420000005678", 5678, state="suspended"),
+        member(3, False, False),
+    ]
+
+
+class TestBarcodeTable:
+    """Test suite for BarcodeTable."""
+
+    def test_lookup_by_barcode_and_base(self, members):
+        table = BarcodeTable()
+        table.apply_changes(members, set(), True)
+
+        assert table.lookup("0420000001234")["member_id"] == 1
+        assert table.lookup("5678")["cooperative_state"] == "suspended"
+        assert table.lookup("9999") is None
+        assert len(table) == 2
+
+    def test_incremental_changes(self, members):
+        table = BarcodeTable()
+        table.apply_changes(members, set(), True)
+
+        table.apply_changes([member(1, "0420000009999", 9999, state="unsubscribed")], {2}, False)
+
+        assert table.lookup("0420000001234") is None
+        assert table.lookup("1234") is None
+        assert table.lookup("9999")["cooperative_state"] == "unsubscribed"
+        assert table.lookup("5678") is None
+
+
+class TestBarcodeEndpoint:
+    """Test suite for /api/members/by-barcode/<code>."""
+
+    @pytest.fixture
+    def table_odoo(self, mocker, mock_odoo_client, members):
+        sync = PartnerSync(FakePartnerOdoo(members), BARCODE_STATUS_FIELDS)
+        table = BarcodeTable()
+        sync.subscribe(table.apply_changes)
+        sync.ensure_fresh()
+        mocker.patch("app.odoo", mock_odoo_client)
+        mocker.patch("app.BARCODE_TABLE", True)
+        mocker.patch("app.partner_sync", sync)
+        mocker.patch("app.barcode_table", table)
+        return mock_odoo_client
+
+    def test_served_from_table(self, client, table_odoo):
+        response = client.get("/api/members/by-barcode/0420000001234")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["member_id"] == 1
+        assert data["cooperative_state"] == "up_to_date"
+        assert data["customer"] is True
+        assert data["source"] == "table"
+        table_odoo.get_member_status_by_barcode.assert_not_called()
+
+    def test_barcode_base_with_leading_zeros(self, client, table_odoo):
+        response = client.get("/api/members/by-barcode/005678")
+
+        assert json.loads(response.data)["member_id"] == 2
+
+    def test_miss_falls_back_to_odoo(self, client, table_odoo):
+        table_odoo.get_member_status_by_barcode.return_value = member(7, "0420000007777", 7777)
+
+        response = client.get("/api/members/by-barcode/0420000007777")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["member_id"] == 7
+        assert data["source"] == "odoo"
+        table_odoo.get_member_status_by_barcode.assert_called_once_with("0420000007777")
+
+    def test_table_not_loaded_answers_from_odoo(self, client, table_odoo, mocker):
+        sync = PartnerSync(FakePartnerOdoo([]), BARCODE_STATUS_FIELDS)
+        warm_up = mocker.patch.object(sync, "warm_up")
+        mocker.patch("app.partner_sync", sync)
+        table_odoo.get_member_status_by_barcode.return_value = member(1, "0420000001234", 1234)
+
+        response = client.get("/api/members/by-barcode/0420000001234")
+
+        assert json.loads(response.data)["source"] == "odoo"
+        warm_up.assert_called_once()
+
+    def test_unknown_barcode(self, client, table_odoo):
+        table_odoo.get_member_status_by_barcode.return_value = None
+
+        response = client.get("/api/members/by-barcode/123")
+
+        assert response.status_code == 404
+
+    def test_invalid_barcode(self, client, table_odoo):
+        response = client.get("/api/members/by-barcode/12;drop")
+
+        assert response.status_code == 400
+
+
+class TestBarcodeOdooLookup:
+    """Test suite for OdooClient.get_member_status_by_barcode()."""
+
+    @pytest.fixture
+    def client(self, mocker):
+        client = OdooClient()
+        client.uid = 1
+        client.models = mocker.MagicMock()
+        client.models.execute_kw.return_value = [member(7, "0420000007777", 7777)]
+        return client
+
+    def sent_domain(self, client):
+        domain = client.models.execute_kw.call_args.args[5][0]
+        # Must be encodable by the XML-RPC transport
+        xmlrpc.client.dumps((domain,))
+        return domain
+
+    def test_card_barcode_searched_on_barcode_only(self, client):
+        assert client.get_member_status_by_barcode("0420000007777")["id"] == 7
+
+        assert self.sent_domain(client) == [("barcode", "=", "0420000007777")]
+
+    def test_typed_barcode_base_searched_on_both(self, client):
+        client.get_member_status_by_barcode("7777")
+
+        assert self.sent_domain(client) == ["|", ("barcode", "=", "7777"), ("barcode_base", "=", 7777)]
@@ -0,0 +1,122 @@
+"""
+Tests for caching module and the cached OdooClient.get_shift_config().
+"""
+
+import threading
+import time
+
+import pytest
+from caching import RefreshingValue
+from odoo_client import OdooClient
+
+
+class Loader:
+    """Loader returning successive values, or raising when told to fail."""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self.called = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.called.set()
+        if self.fail:
+            raise ConnectionError("Odoo down")
+        return {"version": self.calls}
+
+
+class TestRefreshingValue:
+    """Test suite for RefreshingValue."""
+
+    def test_hits_within_ttl(self):
+        loader = Loader()
+        cache = RefreshingValue(loader, ttl=60)
+
+        assert cache.get() == {"version": 1}
+        assert cache.get() == {"version": 1}
+
+        stats = cache.stats()
+        assert loader.calls == 1
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_reloads_after_expiry(self):
+        loader = Loader()
+        cache = RefreshingValue(loader, ttl=0.01)
+
+        cache.get()
+        time.sleep(0.02)
+
+        assert cache.get() == {"version": 2}
+        assert cache.stats()["misses"] == 2
+
+    def test_background_refresh_before_expiry(self):
+        """Reads inside the refresh-ahead window return at once and reload async."""
+        loader = Loader()
+        cache = RefreshingValue(loader, ttl=60, refresh_ahead=60)
+
+        cache.get()
+        loader.called.clear()
+        assert cache.get() == {"version": 1}
+
+        assert loader.called.wait(1)
+        for _ in range(100):
+            if cache.stats()["refreshes"] == 1:
+                break
+            time.sleep(0.01)
+        assert cache.get() == {"version": 2}
+
+    def test_keeps_last_good_value_on_error(self):
+        loader = Loader()
+        cache = RefreshingValue(loader, ttl=0.01)
+
+        cache.get()
+        loader.fail = True
+        time.sleep(0.02)
+
+        assert cache.get() == {"version": 1}
+        stats = cache.stats()
+        assert stats["stale_hits"] == 1
+        assert stats["errors"] == 1
+
+    def test_cold_start_error_propagates(self):
+        loader = Loader()
+        loader.fail = True
+        cache = RefreshingValue(loader, ttl=60)
+
+        with pytest.raises(ConnectionError):
+            cache.get()
+        assert cache.stats()["age"] is None
+
+
+class TestCachedShiftConfig:
+    """Test suite for OdooClient.get_shift_config() caching."""
+
+    @pytest.fixture
+    def client(self, mocker):
+        client = OdooClient()
+        client.uid = 1
+        client.models = mocker.MagicMock()
+        client.models.execute_kw.return_value = [
+            {"shift_weeks_per_cycle": 4, "shift_week_a_date": "2024-12-16"}
+        ]
+        return client
+
+    def test_one_round_trip_for_repeated_calls(self, client):
+        for _ in range(5):
+            assert client.get_shift_config() == {"weeks_per_cycle": 4, "week_a_date": "2024-12-16"}
+
+        assert client.models.execute_kw.call_count == 1
+        assert client.get_cache_stats()["shift_config"]["hits"] == 4
+
+    def test_defaults_only_on_cold_start(self, client):
+        client.models.execute_kw.side_effect = Exception("Odoo down")
+        assert client.get_shift_config()["week_a_date"] == "2025-01-13"
+
+        client.models.execute_kw.side_effect = None
+        assert client.get_shift_config()["week_a_date"] == "2024-12-16"
+
+        client.shift_config_cache.ttl = 0
+        client.models.execute_kw.side_effect = Exception("Odoo down")
+        assert client.get_shift_config()["week_a_date"] == "2024-12-16"
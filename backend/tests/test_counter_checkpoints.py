@@ -0,0 +1,116 @@
+"""
+Tests for counter_checkpoints module.
+
+Checks that the checkpoint counter mode produces exactly the same history
+response as replaying every counter event, that warm requests only fetch
+events after the checkpoint, and that edited or deleted events invalidate it.
+"""
+
+import pytest
+from counter_checkpoints import CounterCheckpointStore, advance_checkpoint, fetch_with_checkpoint
+from tests.test_counter_sources import (
+    FakeCounterOdoo,
+    counter_event,
+    get_history,
+    offset,
+    straddling_history,  # noqa: F401 (fixture)
+    window_start,
+)
+
+
+@pytest.fixture
+def store(tmp_path, mocker):
+    store = CounterCheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    mocker.patch("app.checkpoint_store", store)
+    return store
+
+
+class TestCheckpointMode:
+    """Test suite for the checkpoint counter mode."""
+
+    def test_cold_and_warm_identical_to_full_replay(self, client, mock_odoo_client, mocker, store, straddling_history):
+        """Both the request creating the checkpoint and the next one match full mode."""
+        events, shifts = straddling_history
+
+        full, _ = get_history(client, mock_odoo_client, mocker, events, shifts, "full")
+        cold, _ = get_history(client, mock_odoo_client, mocker, events, shifts, "checkpoint")
+        warm, fake = get_history(client, mock_odoo_client, mocker, events, shifts, "checkpoint")
+
+        assert cold == full
+        assert warm == full
+        checkpoint = store.get(140)
+        assert checkpoint["boundary_date"] == window_start()
+        assert checkpoint["event_count"] == len([e for e in events if e["create_date"] < window_start()])
+
+    def test_warm_request_fetches_only_new_events(self, client, mock_odoo_client, mocker, store, straddling_history):
+        """After the first request, old events are never fetched row by row again."""
+        events, shifts = straddling_history
+        start = window_start()
+
+        get_history(client, mock_odoo_client, mocker, events, shifts, "checkpoint")
+        _, fake = get_history(client, mock_odoo_client, mocker, events, shifts, "checkpoint")
+
+        event_calls = [c for c in fake.calls if c[0] == "events"]
+        assert event_calls[0] == ("events", start, None, None)
+        # Earlier events are only fetched for shifts live in the window
+        assert event_calls[1] == ("events", None, start, [900, 901, 902, 903])
+        assert len(event_calls) == 2
+
+    def test_checkpoint_advances_to_new_window(self, client, mock_odoo_client, mocker, store, straddling_history):
+        """An older checkpoint is carried forward by folding the events in between."""
+        events, shifts = straddling_history
+        start = window_start()
+        older_boundary = offset(start, -60).split(" ")[0]
+        fetch_with_checkpoint(FakeCounterOdoo(events), store, 140, older_boundary, shifts)
+        assert store.get(140)["boundary_date"] == older_boundary
+
+        full, _ = get_history(client, mock_odoo_client, mocker, events, shifts, "full")
+        advanced, fake = get_history(client, mock_odoo_client, mocker, events, shifts, "checkpoint")
+
+        assert advanced == full
+        assert [c for c in fake.calls if c[0] == "events"][0] == ("events", older_boundary, None, None)
+        assert store.get(140)["boundary_date"] == start
+
+    def test_edited_event_invalidates_checkpoint(self, client, mock_odoo_client, mocker, store, straddling_history):
+        """A newer write_date on an old event forces a full rebuild."""
+        events, shifts = straddling_history
+        get_history(client, mock_odoo_client, mocker, events, shifts, "checkpoint")
+
+        events[10] = dict(events[10], point_qty=events[10]["point_qty"] + 5, write_date="2099-01-01 00:00:00")
+        full, _ = get_history(client, mock_odoo_client, mocker, events, shifts, "full")
+        rebuilt, fake = get_history(client, mock_odoo_client, mocker, events, shifts, "checkpoint")
+
+        assert rebuilt == full
+        assert ("events", None, None, None) in fake.calls
+
+    def test_deleted_event_invalidates_checkpoint(self, client, mock_odoo_client, mocker, store, straddling_history):
+        """Fewer events before the boundary than were folded forces a full rebuild."""
+        events, shifts = straddling_history
+        get_history(client, mock_odoo_client, mocker, events, shifts, "checkpoint")
+
+        del events[10]
+        full, _ = get_history(client, mock_odoo_client, mocker, events, shifts, "full")
+        rebuilt, fake = get_history(client, mock_odoo_client, mocker, events, shifts, "checkpoint")
+
+        assert rebuilt == full
+        assert ("events", None, None, None) in fake.calls
+
+
+class TestAdvanceCheckpoint:
+    """Test suite for advance_checkpoint()."""
+
+    def test_folds_only_events_before_boundary(self):
+        events = [
+            counter_event(1, "2025-01-01 10:00:00", 1, "ftop"),
+            counter_event(2, "2025-01-02 10:00:00", -1, "standard"),
+            counter_event(3, "2025-02-01 10:00:00", 1, "standard"),
+        ]
+
+        checkpoint, folded = advance_checkpoint(None, events, "2025-01-15")
+
+        assert folded == 2
+        assert checkpoint["ftop_total"] == 1
+        assert checkpoint["standard_total"] == -1
+        assert checkpoint["event_count"] == 2
+        assert checkpoint["last_event_id"] == 2
+        assert checkpoint["max_write_date"] == "2025-01-02 10:00:00"
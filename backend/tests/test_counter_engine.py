@@ -0,0 +1,109 @@
+"""
+Tests for counter_engine module.
+
+Checks replay_counters against the previous multi-pass replay (kept in
+counter_replay_reference) on random events, byte for byte, and the
+ordering rules it has to preserve.
+"""
+
+import copy
+import json
+import random
+
+import pytest
+from counter_engine import replay_counters
+from tests.counter_replay_reference import multi_pass_replay
+
+OPENING = {"ftop": 2, "standard": -1}
+
+
+def counter_event(event_id, create_date, point_qty, counter_type, shift_id=None):
+    return {
+        "id": event_id,
+        "create_date": create_date,
+        "point_qty": point_qty,
+        "shift_id": [shift_id, f"Shift {shift_id}"] if shift_id else False,
+        "type": counter_type,
+    }
+
+
+def random_events(seed, count):
+    """Events with few distinct dates (many ties) and shifts spread over time."""
+    rng = random.Random(seed)
+    events = [
+        counter_event(
+            i,
+            f"2024-01-{rng.randint(1, 9):02d} 10:00:00",
+            rng.choice((1, -1, -2, 0.5)),
+            rng.choice(("ftop", "standard", "standard")),
+            rng.choice((None, rng.randint(1, count // 3 + 1))),
+        )
+        for i in range(count)
+    ]
+    return sorted(events, key=lambda x: x.get("create_date") or "1900-01-01")
+
+
+def replay_json(replay, events):
+    events = copy.deepcopy(events)
+    shift_counter_map, closing_totals = replay(events, dict(OPENING))
+    # Keys sorted, as in API responses
+    return json.dumps(
+        [shift_counter_map, closing_totals, events], sort_keys=True, default=lambda o: o.to_json()
+    )
+
+
+class TestCounterEngine:
+    """Test suite for replay_counters."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_same_output_as_multi_pass_replay(self, seed):
+        events = random_events(seed, 60)
+
+        assert replay_json(replay_counters, events) == replay_json(multi_pass_replay, events)
+
+    def test_shift_counted_at_its_last_event(self):
+        events = [
+            counter_event(1, "2024-01-01 10:00:00", -1, "standard", shift_id=7),
+            counter_event(2, "2024-01-02 10:00:00", 1, "standard"),
+            counter_event(3, "2024-01-03 10:00:00", 2, "standard", shift_id=7),
+        ]
+
+        shift_counter_map, closing_totals = replay_counters(events, dict(OPENING))
+
+        assert events[1]["standard_total"] == 0
+        assert shift_counter_map[7].point_qty == 1
+        assert shift_counter_map[7].create_date == "2024-01-03 10:00:00"
+        assert shift_counter_map[7].standard_total == 1
+        assert closing_totals == {"ftop": 2, "standard": 1}
+
+    def test_tied_items_counted_ftop_first(self):
+        events = [
+            counter_event(1, "2024-01-01 10:00:00", 1, "standard"),
+            counter_event(2, "2024-01-01 10:00:00", -1, "standard", shift_id=8),
+            counter_event(3, "2024-01-01 10:00:00", 1, "ftop"),
+            counter_event(4, "2024-01-01 10:00:00", -1, "ftop", shift_id=9),
+        ]
+
+        shift_counter_map, _ = replay_counters(events, dict(OPENING))
+
+        assert shift_counter_map[9].ftop_total == 1
+        assert events[2]["ftop_total"] == 2
+        assert shift_counter_map[8].standard_total == -2
+        assert events[0]["standard_total"] == -1
+        assert events[0]["sum_current_qty"] == -1
+
+    def test_shift_with_both_counter_types_merged(self):
+        events = [
+            counter_event(1, "2024-01-01 10:00:00", -1, "ftop", shift_id=5),
+            counter_event(2, "2024-01-02 10:00:00", 1, "standard", shift_id=5),
+        ]
+
+        shift_counter_map, closing_totals = replay_counters(events, dict(OPENING))
+
+        assert shift_counter_map[5].type == "ftop"
+        assert shift_counter_map[5].point_qty == 0
+        assert shift_counter_map[5].create_date == "2024-01-02 10:00:00"
+        assert closing_totals == {"ftop": 1, "standard": 0}
+
+    def test_no_events(self):
+        assert replay_counters([], dict(OPENING)) == ({}, OPENING)
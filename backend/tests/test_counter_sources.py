@@ -0,0 +1,219 @@
+"""
+Tests for counter_sources module.
+
+Checks that the read_group counter mode produces exactly the same history
+response (running totals, shift counters, final totals) as replaying every
+counter event, including shifts whose events straddle the window start.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import counter_sources
+from utils import extract_id, get_last_n_cycles_date_range
+
+
+def window_start():
+    """Start of the 13-cycle history window, as computed by the endpoint."""
+    adjusted = {"weeks_per_cycle": 4, "week_a_date": "2024-12-16"}
+    start_date, _ = get_last_n_cycles_date_range(n=13, shift_config=adjusted)
+    return start_date
+
+
+def offset(start_date, days, hour="10:00:00"):
+    day = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=days)
+    return f"{day.strftime('%Y-%m-%d')} {hour}"
+
+
+def counter_event(event_id, create_date, point_qty, counter_type, shift_id=None, is_manual=False):
+    return {
+        "id": event_id,
+        "create_date": create_date,
+        "write_date": create_date,
+        "point_qty": point_qty,
+        "sum_current_qty": 0,
+        "shift_id": [shift_id, f"Shift {shift_id}"] if shift_id else False,
+        "is_manual": is_manual,
+        "name": "Manual" if is_manual else "Shift",
+        "type": counter_type,
+    }
+
+
+class FakeCounterOdoo:
+    """Answers counter queries from an in-memory event list, like Odoo would."""
+
+    def __init__(self, events):
+        self.events = events
+        self.calls = []
+
+    def get_member_counter_events(self, partner_id, limit=50, start_date=None, before_date=None, shift_ids=None):
+        self.calls.append(("events", start_date, before_date, shift_ids))
+        results = [
+            dict(e)
+            for e in self.events
+            if (not start_date or e["create_date"] >= start_date)
+            and (not before_date or e["create_date"] < before_date)
+            and (shift_ids is None or extract_id(e["shift_id"]) in shift_ids)
+        ]
+        return sorted(results, key=lambda e: e["create_date"], reverse=True)
+
+    def count_member_counter_events(self, partner_id, before_date=None, modified_after=None):
+        self.calls.append(("count", before_date, modified_after))
+        return len([
+            e
+            for e in self.events
+            if (not before_date or e["create_date"] < before_date)
+            and (not modified_after or e["write_date"] > modified_after)
+        ])
+
+    def get_member_counter_totals(self, partner_id, before_date, exclude_shift_ids=None):
+        self.calls.append(("read_group", before_date, exclude_shift_ids))
+        totals = {"ftop": 0, "standard": 0}
+        for e in self.events:
+            if e["create_date"] >= before_date:
+                continue
+            if exclude_shift_ids and extract_id(e["shift_id"]) in exclude_shift_ids:
+                continue
+            totals["ftop" if e["type"] == "ftop" else "standard"] += e["point_qty"]
+        return totals
+
+
+@pytest.fixture
+def straddling_history():
+    """Long-tenure member: years of events, one shift straddling the window start."""
+    start = window_start()
+    events = []
+    # Two years of older events (aggregated server-side in read_group mode)
+    for i in range(200):
+        create_date = offset(start, -730 + i * 3)
+        if i % 7 == 0:
+            events.append(counter_event(1000 + i, create_date, -1, "standard", is_manual=True))
+        else:
+            events.append(counter_event(1000 + i, create_date, 1 if i % 3 else -2, "ftop" if i % 2 else "standard", shift_id=500 + i))
+    # Shift 900: one event before the window, one inside it
+    events.append(counter_event(2000, offset(start, -2), -2, "standard", shift_id=900))
+    events.append(counter_event(2001, offset(start, 3), 1, "standard", shift_id=900))
+    # Shift 901: displayed in the window but only counted before it
+    events.append(counter_event(2002, offset(start, -1), 1, "ftop", shift_id=901))
+    # Events inside the window
+    events.append(counter_event(2003, offset(start, 5), 1, "ftop", shift_id=902))
+    events.append(counter_event(2004, offset(start, 6), 2, "ftop", is_manual=True))
+    events.append(counter_event(2005, offset(start, 8), -1, "standard", shift_id=903, is_manual=True))
+
+    shifts = [
+        {
+            "id": 1,
+            "date_begin": offset(start, 1, "09:00:00"),
+            "state": "done",
+            "shift_id": [900, "Shift 900"],
+            "shift_name": "Shift 900",
+            "shift_type_id": [2, "Standard"],
+        },
+        {
+            "id": 2,
+            "date_begin": offset(start, 0, "09:00:00"),
+            "state": "done",
+            "shift_id": [901, "Shift 901"],
+            "shift_name": "Shift 901",
+            "shift_type_id": [1, "FTOP"],
+        },
+        {
+            "id": 3,
+            "date_begin": offset(start, 5, "09:00:00"),
+            "state": "done",
+            "shift_id": [902, "Shift 902"],
+            "shift_name": "Shift 902",
+            "shift_type_id": [1, "FTOP"],
+        },
+    ]
+    return events, shifts
+
+
+def get_history(client, mock_odoo_client, mocker, events, shifts, mode):
+    fake = FakeCounterOdoo(events)
+    mock_odoo_client.get_member_purchase_history.return_value = []
+    mock_odoo_client.get_member_shift_history.return_value = shifts
+    mock_odoo_client.get_member_leaves.return_value = []
+    mock_odoo_client.get_member_counter_events.side_effect = fake.get_member_counter_events
+    mock_odoo_client.get_member_counter_totals.side_effect = fake.get_member_counter_totals
+    mock_odoo_client.count_member_counter_events.side_effect = fake.count_member_counter_events
+    mocker.patch("app.odoo", mock_odoo_client)
+    mocker.patch("app.COUNTER_AGGREGATION_MODE", mode)
+
+    # Rebuild rather than serve the response cached by a previous call
+    client.delete("/api/member/140/cache")
+    response = client.get("/api/member/140/history")
+    assert response.status_code == 200
+    return json.loads(response.data), fake
+
+
+class TestReadGroupMode:
+    """Test suite for the read_group counter mode."""
+
+    def test_identical_to_full_replay(self, client, mock_odoo_client, mocker, straddling_history):
+        """Running totals, shift counters and final totals must match exactly."""
+        events, shifts = straddling_history
+
+        full, _ = get_history(client, mock_odoo_client, mocker, events, shifts, "full")
+        read_group, fake = get_history(client, mock_odoo_client, mocker, events, shifts, "read_group")
+
+        assert read_group == full
+        assert full["counter_totals"]["ftop"] != 0
+
+    def test_shift_counted_only_before_window_keeps_its_counter(
+        self, client, mock_odoo_client, mocker, straddling_history
+    ):
+        """A displayed shift whose events all predate the window is not summed away."""
+        events, shifts = straddling_history
+
+        def shift_901(data):
+            return next(e for e in data["events"] if e["type"] == "shift" and e["id"] == 2)
+
+        full, _ = get_history(client, mock_odoo_client, mocker, events, shifts, "full")
+        read_group, fake = get_history(client, mock_odoo_client, mocker, events, shifts, "read_group")
+
+        assert shift_901(full)["counter"]["point_qty"] == 1
+        assert shift_901(read_group)["counter"] == shift_901(full)["counter"]
+        # Its event is fetched by shift ID and left out of the read_group sum
+        assert 901 in fake.calls[-1][2]
+
+    def test_only_window_and_live_shift_events_fetched(self, client, mock_odoo_client, mocker, straddling_history):
+        """Old events are aggregated server-side, not fetched row by row."""
+        events, shifts = straddling_history
+        start = window_start()
+
+        _, fake = get_history(client, mock_odoo_client, mocker, events, shifts, "read_group")
+
+        event_calls = [c for c in fake.calls if c[0] == "events"]
+        assert event_calls[0] == ("events", start, None, None)
+        # Earlier events are only fetched for shifts live in the window
+        assert event_calls[1] == ("events", None, start, [900, 901, 902, 903])
+        assert fake.calls[-1] == ("read_group", start, [900, 901, 902, 903])
+
+    def test_counter_error_falls_back_to_no_counters(self, client, mock_odoo_client, mocker, straddling_history):
+        """A failing aggregate query must not leave a half-seeded replay."""
+        events, shifts = straddling_history
+        mock_odoo_client.get_member_counter_totals.side_effect = Exception("read_group failed")
+        mock_odoo_client.get_member_purchase_history.return_value = []
+        mock_odoo_client.get_member_shift_history.return_value = shifts
+        mock_odoo_client.get_member_leaves.return_value = []
+        mock_odoo_client.get_member_counter_events.side_effect = FakeCounterOdoo(events).get_member_counter_events
+        mocker.patch("app.odoo", mock_odoo_client)
+        mocker.patch("app.COUNTER_AGGREGATION_MODE", "read_group")
+
+        response = client.get("/api/member/141/history")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["counter_totals"] == {"ftop": 0, "standard": 0}
+        assert not [e for e in data["events"] if e["type"] == "counter"]
+
+
+class TestLiveShiftIds:
+    """Test suite for live_shift_ids()."""
+
+    def test_collects_shift_ids_from_shifts_and_events(self):
+        shifts = [{"shift_id": [1, "A"]}, {"shift_id": False}]
+        events = [{"shift_id": [2, "B"]}, {"shift_id": False}, {"shift_id": 1}]
+        assert counter_sources.live_shift_ids(shifts, events) == {1, 2}
@@ -6,10 +6,14 @@ Tests the dynamic cycle calculation logic based on Odoo configuration.
 
 import pytest
 from datetime import datetime, timedelta
+import cycle_calculator
 from cycle_calculator import (
+    NUMPY_AVAILABLE,
+    CycleCalendar,
     calculate_cycle_info,
     get_cycle_start_date,
     get_cycle_date_range,
+    get_cycle_window,
     validate_shift_config,
 )
 
@@ -204,6 +208,45 @@ class TestGetCycleDateRange:
             get_cycle_date_range(0, "2025-01-13", 4)
 
 
+class TestGetCycleWindow:
+    """Tests for history page windows."""
+
+    def test_most_recent_page(self):
+        """Without a cursor the page ends today, in the current cycle."""
+        window = get_cycle_window(3, "2025-01-13", 4, today="2025-11-24")
+        assert window == {
+            "first_cycle": 10,
+            "last_cycle": 12,
+            "start_date": "2025-09-22",
+            "end_date": "2025-11-24",
+            "end_before": None,
+            "next_before_cycle": 10,
+        }
+
+    def test_page_before_cursor(self):
+        """A cursor page ends the day before the cursor cycle starts."""
+        window = get_cycle_window(3, "2025-01-13", 4, before_cycle=10, today="2025-11-24")
+        assert window["first_cycle"] == 7
+        assert window["last_cycle"] == 9
+        assert window["start_date"] == "2025-06-30"
+        assert window["end_date"] == "2025-09-21"
+        assert window["end_before"] == "2025-09-22"
+        assert window["next_before_cycle"] == 7
+
+    def test_last_page_has_no_cursor(self):
+        """Paging stops at cycle 1."""
+        window = get_cycle_window(13, "2025-01-13", 4, before_cycle=5, today="2025-11-24")
+        assert window["first_cycle"] == 1
+        assert window["start_date"] == "2025-01-13"
+        assert window["next_before_cycle"] is None
+
+    def test_invalid_cursor(self):
+        """Cursors outside 2..current+1 are rejected."""
+        for before_cycle in (1, 14):
+            with pytest.raises(ValueError, match="before_cycle"):
+                get_cycle_window(3, "2025-01-13", 4, before_cycle=before_cycle, today="2025-11-24")
+
+
 class TestCycleCalculatorMatchesJSON:
     """Tests to verify dynamic calculation matches existing 2025 JSON data."""
 
@@ -242,3 +285,85 @@ class TestCycleCalculatorMatchesJSON:
         assert result["week_letter"] == "C"
         assert result["week_start"] == "2025-12-29"
         assert result["week_end"] == "2026-01-04"
+
+
+class TestCycleCalendar:
+    """Tests for CycleCalendar lookups."""
+
+    DATES = [
+        (datetime(2025, 1, 13) + timedelta(days=days)).strftime("%Y-%m-%d")
+        for days in range(0, 400, 3)
+    ]
+
+    def test_invalid_config(self):
+        """Test that the configuration is validated when the calendar is built."""
+        with pytest.raises(ValueError, match="weeks_per_cycle must be between 1 and 12"):
+            CycleCalendar("2025-01-13", 13)
+
+    @pytest.mark.parametrize("weeks_per_cycle", [1, 3, 4])
+    def test_locate_matches_calculate_cycle_info(self, weeks_per_cycle):
+        """Test per-date lookups, datetimes included, against calculate_cycle_info."""
+        calendar = CycleCalendar("2025-01-13", weeks_per_cycle)
+        for day in self.DATES:
+            info = calculate_cycle_info(day, "2025-01-13", weeks_per_cycle)
+            expected = (info["cycle_number"], info["week_letter"])
+            assert calendar.locate(day) == expected
+            assert calendar.locate(f"{day} 23:59:59") == expected
+            assert calendar.cycle_info(day) == info
+
+    def test_locate_outside_calendar(self):
+        """Test that empty dates and dates before Week A are not located."""
+        calendar = CycleCalendar("2025-01-13", 4)
+        assert calendar.locate("2025-01-12 23:00:00") is None
+        assert calendar.locate(False) is None
+        assert calendar.locate(None) is None
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+    def test_label_dates_matches_cycle_info(self):
+        """Test that batch labels and bounds match cycle_info date by date."""
+        calendar = CycleCalendar("2025-01-13", 4)
+        labels = calendar.label_dates(self.DATES + ["2025-01-01", ""])
+
+        assert labels["valid"].tolist() == [True] * len(self.DATES) + [False, False]
+        for index, day in enumerate(self.DATES):
+            info = calendar.cycle_info(day)
+            for key in ("cycle_number", "week_number", "week_letter"):
+                assert labels[key][index] == info[key]
+            for key in ("week_start", "week_end", "cycle_start", "cycle_end"):
+                assert str(labels[key][index]) == info[key]
+        assert labels["cycle_number"][-1] == 0
+        assert labels["week_letter"][-1] == ""
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+    def test_label_dates_accepts_datetime64(self):
+        """Test batch labels of a numpy datetime64 array."""
+        import numpy as np
+
+        calendar = CycleCalendar("2025-01-13", 4)
+        labels = calendar.label_dates(np.array(["2025-02-20T10:00", "NaT"], dtype="datetime64[m]"))
+
+        assert labels["cycle_number"].tolist() == [2, 0]
+        assert labels["week_letter"].tolist() == ["B", ""]
+
+    @pytest.mark.parametrize("numpy", [True, False])
+    def test_locate_all(self, monkeypatch, numpy):
+        """Test batch lookups with and without NumPy."""
+        if numpy and not NUMPY_AVAILABLE:
+            pytest.skip("NumPy not installed")
+        if not numpy:
+            monkeypatch.setattr(cycle_calculator, "np", None)
+        calendar = CycleCalendar("2025-01-13", 4)
+        dates = [f"{day} 10:00:00" for day in self.DATES] + ["2024-12-31", False]
+
+        cycle_numbers, week_letters = calendar.locate_all(dates)
+
+        located = [calendar.locate(day) or (None, None) for day in dates]
+        assert cycle_numbers == [cycle for cycle, _ in located]
+        assert week_letters == [letter for _, letter in located]
+        assert cycle_numbers[-2:] == [None, None]
+
+    def test_label_dates_without_numpy(self, monkeypatch):
+        """Test that batch labels need NumPy."""
+        monkeypatch.setattr(cycle_calculator, "np", None)
+        with pytest.raises(RuntimeError, match="NumPy is required"):
+            CycleCalendar("2025-01-13", 4).label_dates(["2025-01-13"])
@@ -7,6 +7,7 @@ and shift_type_id field.
 """
 
 import pytest
+from history_events import ShiftCounter
 
 
 class TestDetermineShiftType:
@@ -27,14 +28,14 @@ class TestDetermineShiftType:
 
         # Create counter map with FTOP counter
         shift_counter_map = {
-            shift_id: {
+            shift_id: ShiftCounter.from_json({
                 "point_qty": sample_ftop_counter_event["point_qty"],
                 "create_date": sample_ftop_counter_event["create_date"],
                 "type": "ftop",
                 "ftop_total": 5,
                 "standard_total": 0,
                 "sum_current_qty": 5,
-            }
+            })
         }
 
         shift_type, shift_type_id = determine_shift_type(
@@ -60,14 +61,14 @@ class TestDetermineShiftType:
 
         # Create counter map with standard counter
         shift_counter_map = {
-            shift_id: {
+            shift_id: ShiftCounter.from_json({
                 "point_qty": sample_standard_counter_event["point_qty"],
                 "create_date": sample_standard_counter_event["create_date"],
                 "type": "standard",
                 "ftop_total": 0,
                 "standard_total": 3,
                 "sum_current_qty": 3,
-            }
+            })
         }
 
         shift_type, shift_type_id = determine_shift_type(
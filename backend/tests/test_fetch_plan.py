@@ -0,0 +1,138 @@
+"""
+Tests for fetch_plan module.
+
+Tests concurrent execution, dependency ordering and per-step error
+tolerance of the FetchPlan used by the member history endpoint.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fetch_plan import FetchPlan
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def slow(value, delay=0.1):
+    time.sleep(delay)
+    return value
+
+
+class TestFetchPlan:
+    """Test suite for FetchPlan."""
+
+    def test_independent_steps_run_concurrently(self, executor):
+        """Wall-clock time should be close to the slowest step, not the sum."""
+        plan = FetchPlan(executor)
+        plan.add("a", slow, 1)
+        plan.add("b", slow, 2)
+        plan.add("c", slow, 3)
+
+        start = time.monotonic()
+        results = plan.run()
+        elapsed = time.monotonic() - start
+
+        assert results == {"a": 1, "b": 2, "c": 3}
+        assert elapsed < 0.25
+
+    def test_dependent_step_receives_dependency_results(self, executor):
+        """A dependent step gets its dependencies' results as leading arguments."""
+        plan = FetchPlan(executor)
+        plan.add("shifts", slow, [1, 2, 3], delay=0.01)
+        plan.add("count", lambda shifts, offset: len(shifts) + offset, 10, depends_on=["shifts"])
+
+        assert plan.run()["count"] == 13
+
+    def test_dependent_step_starts_before_slow_sibling_finishes(self, executor):
+        """The dependent stage should not wait for unrelated steps."""
+        started = threading.Event()
+
+        def dependent(shifts):
+            started.set()
+            return shifts
+
+        def slow_sibling():
+            # Finishes only once the dependent step has started
+            assert started.wait(timeout=1)
+            return "done"
+
+        plan = FetchPlan(executor)
+        plan.add("sibling", slow_sibling)
+        plan.add("shifts", slow, ["s"], delay=0.01)
+        plan.add("exchanges", dependent, depends_on=["shifts"])
+
+        results = plan.run()
+        assert results["sibling"] == "done"
+        assert results["exchanges"] == ["s"]
+
+    def test_fallback_used_on_error(self, executor, caplog):
+        """Optional steps resolve to their fallback and log a warning."""
+
+        def failing():
+            raise RuntimeError("Odoo down")
+
+        plan = FetchPlan(executor, label="member 42")
+        plan.add("holidays", failing, fallback=[])
+        plan.add("purchases", slow, ["p"], delay=0.01)
+
+        results = plan.run()
+        assert results["holidays"] == []
+        assert results["purchases"] == ["p"]
+        assert "Error fetching holidays for member 42" in caplog.text
+
+    def test_required_step_error_propagates(self, executor):
+        """Required steps re-raise their error from run()."""
+
+        def failing():
+            raise RuntimeError("Odoo down")
+
+        plan = FetchPlan(executor)
+        plan.add("shifts", failing)
+
+        with pytest.raises(RuntimeError, match="Odoo down"):
+            plan.run()
+
+    def test_failed_dependency_uses_dependent_fallback(self, executor):
+        """A dependent step with fallback resolves to it when its dependency fails."""
+        calls = []
+
+        def failing():
+            raise RuntimeError("Odoo down")
+
+        plan = FetchPlan(executor)
+        plan.add("shifts", failing, fallback=None)
+        plan.add("exchanges", lambda shifts: calls.append(shifts) or {}, depends_on=["shifts"], fallback={})
+
+        results = plan.run()
+        # The dependency resolved to its fallback, so the dependent still ran
+        assert results["exchanges"] == {}
+        assert calls == [None]
+
+    def test_unknown_dependency_rejected(self, executor):
+        """Dependencies must be registered before their dependents."""
+        plan = FetchPlan(executor)
+        with pytest.raises(ValueError, match="unknown step"):
+            plan.add("exchanges", len, depends_on=["shifts"])
+
+    def test_duplicate_step_rejected(self, executor):
+        """Step names must be unique."""
+        plan = FetchPlan(executor)
+        plan.add("shifts", len, [])
+        with pytest.raises(ValueError, match="Duplicate"):
+            plan.add("shifts", len, [])
+
+    def test_single_worker_does_not_deadlock(self):
+        """Dependent steps never block a worker, even with a pool of one."""
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            plan = FetchPlan(pool)
+            plan.add("a", slow, 1, delay=0.01)
+            plan.add("b", lambda a: a + 1, depends_on=["a"])
+            plan.add("c", lambda a, b: a + b, depends_on=["a", "b"])
+            assert plan.run(timeout=2) == {"a": 1, "b": 2, "c": 3}
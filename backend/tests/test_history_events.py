@@ -0,0 +1,133 @@
+"""
+Tests for history_events module.
+
+Checks that history records give the same JSON as the dicts they replace,
+through the Flask JSON provider, the streamed history responses and the
+history segment store.
+"""
+
+import json
+
+import pytest
+from cycle_calculator import CycleCalendar
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from history_events import (
+    CounterEvent,
+    HistoryJSONProvider,
+    LeaveEndEvent,
+    LeaveStartEvent,
+    PurchaseEvent,
+    ShiftCounter,
+    ShiftEvent,
+    event_from_json,
+    iter_json,
+    locate_events,
+)
+
+
+def shift_counter():
+    counter = ShiftCounter(-1, "2024-03-05 12:00:00", "standard")
+    counter.ftop_total, counter.standard_total, counter.sum_current_qty = 0, -1, -1
+    return counter
+
+
+def sample_events():
+    return [
+        PurchaseEvent(1, "2024-03-06 18:00:00", "Order 00001-001-0001"),
+        ShiftEvent(2, "2024-03-05 09:00:00", "Épicerie", "absent", False, 2, "B", "standard",
+                   [1, "Standard"], counter=shift_counter()),
+        ShiftEvent(3, "2024-02-05 09:00:00", "Caisse", "done", True, 1, "A", "standard", [1, "Standard"],
+                   exchange_details={"exchange_state": "replacing"}, is_exchange=True),
+        CounterEvent(4, "2024-02-01 10:00:00", 1, 0, 0, 1, "Rattrapage", "standard"),
+        LeaveStartEvent(5, "2024-01-01", "Congé parental", "2024-01-20"),
+        LeaveEndEvent(5, "2024-01-20", "Congé parental", "2024-01-01"),
+    ]
+
+
+def sample_response():
+    return {
+        "member_id": 1,
+        "events": sample_events() * 50,
+        "leaves": [],
+        "holidays": [{"name": "Noël", "date_begin": "2024-12-25"}],
+        "counter_totals": {"ftop": 0, "standard": -1},
+        "page": {"cycles": 13, "opening_totals": {}, "next_before_cycle": None, "ratio": 0.5},
+        "by_id": {1: "int keys"},
+    }
+
+
+@pytest.fixture
+def flask_app():
+    return Flask(__name__)
+
+
+def encode(flask_app, provider_class, obj, debug=False):
+    flask_app.debug = debug
+    provider = provider_class(flask_app)
+    if provider_class is DefaultJSONProvider:
+        obj = json.loads(json.dumps(obj, default=HistoryJSONProvider.default))
+    with flask_app.app_context():
+        return provider.response(obj).get_data()
+
+
+class TestHistoryEvents:
+    """Test suite for history records."""
+
+    def test_to_json_matches_former_dicts(self):
+        purchase, absent, exchanged, counter, leave_start, leave_end = sample_events()
+
+        assert purchase.to_json() == {
+            "type": "purchase", "id": 1, "date": "2024-03-06 18:00:00", "reference": "Order 00001-001-0001",
+        }
+        assert absent.to_json()["counter"] == {
+            "point_qty": -1, "create_date": "2024-03-05 12:00:00", "type": "standard",
+            "ftop_total": 0, "standard_total": -1, "sum_current_qty": -1,
+        }
+        assert "exchange_details" not in absent.to_json()
+        assert "counter" not in exchanged.to_json()
+        assert exchanged.to_json()["is_exchange"] is True
+        assert counter.to_json()["counter_type"] == "standard"
+        assert leave_start.to_json() == {
+            "type": "leave_start", "id": 5, "date": "2024-01-01", "leave_type": "Congé parental",
+            "leave_end": "2024-01-20", "leave_id": 5,
+        }
+        assert leave_end.to_json()["leave_start"] == "2024-01-01"
+
+    def test_json_round_trip(self):
+        for event in sample_events():
+            rebuilt = event_from_json(json.loads(json.dumps(event.to_json())))
+
+            assert type(rebuilt) is type(event)
+            assert rebuilt.to_json() == event.to_json()
+        assert isinstance(event_from_json(sample_events()[1].to_json()).counter, ShiftCounter)
+
+    def test_located_events(self):
+        events = sample_events() + [PurchaseEvent(6, False, None)]
+        assert "cycle_number" not in events[0].to_json()
+
+        locate_events(events, CycleCalendar("2024-01-15", 4))
+
+        located = [(e.to_json()["cycle_number"], e.to_json()["week_letter"]) for e in events]
+        assert located == [(2, "D"), (2, "D"), (1, "D"), (1, "C"), (None, None), (1, "A"), (None, None)]
+        for event in events:
+            assert event_from_json(event.to_json()).to_json() == event.to_json()
+
+    @pytest.mark.parametrize("debug", [False, True])
+    def test_provider_output_same_as_default(self, flask_app, debug):
+        response = sample_response()
+
+        assert encode(flask_app, HistoryJSONProvider, response, debug) == encode(
+            flask_app, DefaultJSONProvider, response, debug
+        )
+
+    @pytest.mark.parametrize("chunk_size", [1, 100, 16384])
+    def test_streamed_output_same_as_provider(self, flask_app, chunk_size):
+        response = sample_response()
+        provider = HistoryJSONProvider(flask_app)
+
+        chunks = list(iter_json(response, provider, chunk_size=chunk_size))
+
+        assert b"".join(chunks) == encode(flask_app, HistoryJSONProvider, response)
+        if chunk_size == 100:
+            assert len(chunks) > 10
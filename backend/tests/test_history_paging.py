@@ -0,0 +1,142 @@
+"""
+Tests for cursor-paginated member history (?cycles=N&before_cycle=).
+
+Checks that each page only fetches its own date slice and that counter
+totals join up at page boundaries in every counter aggregation mode.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from counter_checkpoints import CounterCheckpointStore
+from cycle_calculator import calculate_cycle_info
+from tests.test_counter_sources import FakeCounterOdoo, counter_event
+
+
+def days_ago(days, hour="10:00:00"):
+    day = datetime.now() - timedelta(days=days)
+    return f"{day.strftime('%Y-%m-%d')} {hour}"
+
+
+@pytest.fixture
+def long_history():
+    """Member with counter events every 5 days over two years."""
+    events = []
+    for i in range(150):
+        create_date = days_ago(750 - i * 5)
+        if i % 4 == 0:
+            events.append(counter_event(3000 + i, create_date, -1, "standard", is_manual=True))
+        else:
+            events.append(
+                counter_event(3000 + i, create_date, 1 if i % 3 else -2, "ftop" if i % 2 else "standard", shift_id=700 + i)
+            )
+    return events
+
+
+@pytest.fixture
+def paging_odoo(mock_odoo_client, mocker, long_history, tmp_path):
+    fake = FakeCounterOdoo(long_history)
+    mock_odoo_client.get_member_purchase_history.return_value = []
+    mock_odoo_client.get_member_shift_history.return_value = []
+    mock_odoo_client.get_member_leaves.return_value = []
+    mock_odoo_client.get_member_counter_events.side_effect = fake.get_member_counter_events
+    mock_odoo_client.get_member_counter_totals.side_effect = fake.get_member_counter_totals
+    mock_odoo_client.count_member_counter_events.side_effect = fake.count_member_counter_events
+    mocker.patch("app.odoo", mock_odoo_client)
+    mocker.patch("app.checkpoint_store", CounterCheckpointStore(str(tmp_path / "checkpoints.sqlite3")))
+    return mock_odoo_client
+
+
+def get_page(client, query=""):
+    response = client.get(f"/api/member/140/history{query}")
+    assert response.status_code == 200, response.data
+    return json.loads(response.data)
+
+
+class TestHistoryPaging:
+    """Test suite for history pages."""
+
+    def test_default_page_is_13_cycles(self, client, paging_odoo):
+        data = get_page(client)
+
+        page = data["page"]
+        assert page["cycles"] == 13
+        assert page["last_cycle"] - page["first_cycle"] == 12
+        assert page["end_date"] == datetime.now().strftime("%Y-%m-%d")
+        assert page["next_before_cycle"] == page["first_cycle"]
+        # The most recent page is not bounded above
+        assert "before_date" not in paging_odoo.get_member_shift_history.call_args.kwargs
+
+    def test_older_page_fetches_only_its_slice(self, client, paging_odoo):
+        recent = get_page(client, "?cycles=1")
+        cursor = recent["page"]["next_before_cycle"]
+
+        older = get_page(client, f"?cycles=2&before_cycle={cursor}")
+
+        assert older["page"]["last_cycle"] == cursor - 1
+        assert older["page"]["first_cycle"] == cursor - 2
+        bounds = {"start_date": older["page"]["start_date"], "before_date": recent["page"]["start_date"]}
+        for fetch in (
+            paging_odoo.get_member_purchase_history,
+            paging_odoo.get_member_shift_history,
+            paging_odoo.get_member_leaves,
+        ):
+            assert fetch.call_args.kwargs == bounds
+        dates = [e["date"] for e in older["events"] if e["type"] == "counter"]
+        assert dates
+        assert all(bounds["start_date"] <= d < bounds["before_date"] for d in dates)
+
+    def test_events_located_in_their_page_cycles(self, client, paging_odoo):
+        data = get_page(client, "?cycles=3&before_cycle=10")
+
+        page = data["page"]
+        assert data["events"]
+        for event in data["events"]:
+            # Cycle 1 starts one cycle before the Odoo week A date
+            info = calculate_cycle_info(event["date"][:10], "2024-12-16", 4)
+            assert (event["cycle_number"], event["week_letter"]) == (info["cycle_number"], info["week_letter"])
+            assert page["first_cycle"] <= event["cycle_number"] <= page["last_cycle"]
+
+    @pytest.mark.parametrize("mode", ["full", "read_group", "checkpoint"])
+    def test_totals_join_up_at_page_boundaries(self, client, paging_odoo, mocker, mode):
+        mocker.patch("app.COUNTER_AGGREGATION_MODE", mode)
+        unpaged = get_page(client, "?cycles=52")
+
+        pages = [get_page(client, "?cycles=3")]
+        while pages[-1]["page"]["next_before_cycle"]:
+            pages.append(get_page(client, f"?cycles=3&before_cycle={pages[-1]['page']['next_before_cycle']}"))
+
+        assert pages[0]["counter_totals"] == unpaged["counter_totals"]
+        for newer, older in zip(pages, pages[1:]):
+            assert older["counter_totals"] == newer["page"]["opening_totals"]
+            assert older["page"]["end_date"] < newer["page"]["start_date"]
+        assert pages[-1]["page"]["opening_totals"] == unpaged["page"]["opening_totals"]
+
+        paged_events = [e for page in pages for e in page["events"] if e["type"] == "counter"]
+        unpaged_events = [e for e in unpaged["events"] if e["type"] == "counter"]
+        assert paged_events == unpaged_events
+
+    @pytest.mark.parametrize(
+        "query",
+        ["?cycles=0", "?cycles=abc", "?cycles=500", "?before_cycle=1", "?before_cycle=99999"],
+    )
+    def test_invalid_page_parameters(self, client, paging_odoo, query):
+        response = client.get(f"/api/member/140/history{query}")
+
+        assert response.status_code == 400
+        assert "error" in json.loads(response.data)
+
+    def test_profile_rejects_cursor_out_of_range(self, client, paging_odoo):
+        response = client.get("/api/member/140/profile?before_cycle=99999")
+
+        assert response.status_code == 400
+        assert "before_cycle" in json.loads(response.data)["error"]
+
+    def test_value_error_while_building_is_server_error(self, client, paging_odoo):
+        # Today before Week A: the calendar raises ValueError, not the client's fault
+        paging_odoo.get_shift_config.return_value = {"weeks_per_cycle": 4, "week_a_date": "2999-01-04"}
+
+        response = client.get("/api/member/140/history")
+
+        assert response.status_code == 500
@@ -0,0 +1,344 @@
+"""
+Tests for history_segments module.
+
+Checks that histories served from stored closed-cycle segments are identical
+to fully fetched ones, that only the last two cycles are fetched while the
+segments are valid, that late edits in Odoo invalidate them, and that shift
+names and exchanges changed later are rebuilt on read.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from history_segments import HistorySegmentStore, split_into_cycles
+from odoo_client import OdooClient
+from tests.test_counter_sources import FakeCounterOdoo, counter_event
+from utils import extract_id
+
+
+def days_ago(days, hour="10:00:00"):
+    day = datetime.now() - timedelta(days=days)
+    return f"{day.strftime('%Y-%m-%d')} {hour}"
+
+
+def matches(record, domain, shift_dates):
+    """Evaluate the small subset of Odoo domains used by the history."""
+    stack = []
+    for term in reversed(domain):
+        if term == "|":
+            stack.append(stack.pop() or stack.pop())
+            continue
+        field, op, value = term
+        if field == "shift_id.date_begin":
+            actual = shift_dates.get(extract_id(record.get("shift_id")))
+            if actual is None:
+                stack.append(False)
+                continue
+        else:
+            actual = record.get(field)
+        stack.append(
+            {
+                "=": lambda: actual == value,
+                "in": lambda: actual in value,
+                ">=": lambda: actual >= value,
+                "<": lambda: actual < value,
+            }[op]()
+        )
+    return all(stack)
+
+
+class FakeHistoryOdoo(FakeCounterOdoo):
+    """In-memory purchases, shift registrations and counter events of one member."""
+
+    def __init__(self):
+        super().__init__([])
+        self.purchases = []
+        self.registrations = []
+        self.rows_fetched = 0
+        for i in range(60):
+            date = days_ago(450 - i * 7, "11:00:00")
+            self.purchases.append(
+                {"id": 100 + i, "date_order": date, "name": f"Order {i}", "pos_reference": None,
+                 "partner_id": 140, "state": "done", "write_date": date}
+            )
+        self.shifts = {}
+        for i in range(16):
+            shift_id = 500 + i
+            date = days_ago(440 - i * 28, "09:00:00")
+            self.shifts[shift_id] = {"id": shift_id, "name": f"Shift {shift_id}", "date_begin": date,
+                                     "week_number": 1, "week_name": "A", "shift_type_id": [2, "Standard"]}
+            self.registrations.append(
+                {"id": 10 + i, "date_begin": date, "state": "done", "shift_id": [shift_id, f"Shift {shift_id}"],
+                 "is_late": False, "partner_id": 140, "write_date": date}
+            )
+            closed = days_ago(440 - i * 28, "12:00:00")
+            self.events.append(counter_event(2000 + i, closed, 1 if i % 3 else -2, "standard", shift_id=shift_id))
+            if i % 4 == 0:
+                self.events.append(counter_event(3000 + i, days_ago(430 - i * 28), -1, "ftop", is_manual=True))
+        for e in self.events:
+            e["partner_id"] = 140
+        # Registration of another member, which replaced an old shift of the member
+        self.shifts[600] = {"id": 600, "name": "Shift 600", "date_begin": days_ago(380, "14:00:00"),
+                            "week_number": 2, "week_name": "B", "shift_type_id": [2, "Standard"]}
+        self.other_registrations = {
+            900: {"id": 900, "date_begin": days_ago(380, "14:00:00"), "shift_id": [600, "Shift 600"],
+                  "partner_id": [141, "Other"], "state": "open"}
+        }
+        self.registrations[3].update(
+            is_exchanged=True, exchange_state="replaced", exchange_replacing_reg_id=[900, "Reg 900"]
+        )
+
+    def _window(self, rows, field, start_date, before_date):
+        results = [
+            dict(r)
+            for r in rows
+            if (not start_date or r[field] >= start_date) and (not before_date or r[field] < before_date)
+        ]
+        self.rows_fetched += len(results)
+        return sorted(results, key=lambda r: r[field], reverse=True)
+
+    def get_member_purchase_history(self, partner_id, limit=None, start_date=None, before_date=None):
+        return self._window(self.purchases, "date_order", start_date, before_date)
+
+    def get_member_shift_history(self, partner_id, limit=None, start_date=None, before_date=None):
+        results = self._window(self.registrations, "date_begin", start_date, before_date)
+        for registration in results:
+            shift = self.shifts[extract_id(registration["shift_id"])]
+            registration.update(shift_name=shift["name"], week_number=shift["week_number"],
+                                week_name=shift["week_name"], shift_type_id=shift["shift_type_id"])
+        return results
+
+    def get_shifts(self, shift_ids):
+        return {sid: dict(self.shifts[sid]) for sid in shift_ids if sid in self.shifts}
+
+    def execute(self, model, method, ids, fields=None):
+        assert (model, method) == ("shift.registration", "read")
+        return [dict(self.other_registrations[i]) for i in ids if i in self.other_registrations]
+
+    def get_member_counter_events(self, partner_id, limit=50, start_date=None, before_date=None, shift_ids=None):
+        results = super().get_member_counter_events(partner_id, limit, start_date, before_date, shift_ids)
+        self.rows_fetched += len(results)
+        return results
+
+    def get_records_fingerprint(self, model, domain):
+        self.calls.append(("fingerprint", model))
+        rows = {
+            "pos.order": self.purchases,
+            "shift.registration": self.registrations,
+            "shift.counter.event": self.events,
+        }[model]
+        shift_dates = {extract_id(r["shift_id"]): r["date_begin"] for r in self.registrations}
+        matched = [r for r in rows if matches(r, domain, shift_dates)]
+        return {
+            "count": len(matched),
+            "max_write_date": max((r["write_date"] for r in matched), default=None),
+        }
+
+
+@pytest.fixture
+def fake_odoo(mock_odoo_client, mocker):
+    fake = FakeHistoryOdoo()
+    for name in (
+        "get_member_purchase_history",
+        "get_member_shift_history",
+        "get_member_counter_events",
+        "get_member_counter_totals",
+        "count_member_counter_events",
+        "get_records_fingerprint",
+        "get_shifts",
+        "execute",
+    ):
+        getattr(mock_odoo_client, name).side_effect = getattr(fake, name)
+    mock_odoo_client.get_member_leaves.return_value = []
+    mocker.patch("app.odoo", mock_odoo_client)
+    return fake
+
+
+@pytest.fixture
+def store(tmp_path, mocker):
+    store = HistorySegmentStore(str(tmp_path / "segments.sqlite3"))
+    mocker.patch("app.history_segment_store", store)
+    return store
+
+
+def get_history(client, query=""):
+    client.delete("/api/member/140/cache")
+    response = client.get(f"/api/member/140/history{query}")
+    assert response.status_code == 200, response.data
+    return json.loads(response.data)
+
+
+def unsegmented(client, mocker, query=""):
+    mocker.patch("app.history_segment_store", None)
+    return get_history(client, query)
+
+
+class TestHistorySegments:
+    """Test suite for segment-backed history responses."""
+
+    @pytest.mark.parametrize("mode", ["full", "read_group"])
+    def test_identical_to_full_fetch(self, client, mocker, fake_odoo, tmp_path, mode):
+        mocker.patch("app.COUNTER_AGGREGATION_MODE", mode)
+        expected = unsegmented(client, mocker)
+        mocker.patch("app.history_segment_store", HistorySegmentStore(str(tmp_path / "segments.sqlite3")))
+
+        building = get_history(client)
+        reusing = get_history(client)
+
+        assert building == expected
+        assert reusing == expected
+        assert [e["type"] for e in expected["events"]].count("shift") == 13
+
+    def test_only_last_two_cycles_fetched(self, client, mocker, fake_odoo, store, mock_odoo_client):
+        # In full mode every counter event is fetched anyway
+        mocker.patch("app.COUNTER_AGGREGATION_MODE", "read_group")
+        first = get_history(client)
+        rows_building = fake_odoo.rows_fetched
+        fake_odoo.rows_fetched = 0
+
+        get_history(client)
+
+        page = first["page"]
+        block = store.get_block(140)
+        assert (block["first_cycle"], block["last_cycle"]) == (page["first_cycle"], page["last_cycle"] - 2)
+        live_start = mock_odoo_client.get_member_shift_history.call_args.kwargs["start_date"]
+        assert live_start == block["end_before"]
+        # 76 rows for 13 cycles, 7 for the last two
+        assert fake_odoo.rows_fetched * 8 < rows_building
+
+    def test_late_edit_invalidates_segments(self, client, mocker, fake_odoo, store):
+        get_history(client)
+        # Correct an old counter event, as staff would in Odoo
+        edited = next(e for e in fake_odoo.events if e["id"] == 2003)
+        edited["point_qty"] = 5
+        edited["write_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        data = get_history(client)
+
+        expected = unsegmented(client, mocker)
+        assert data == expected
+        assert data["counter_totals"] != {"ftop": 0, "standard": 0}
+
+    def test_late_event_for_old_shift_invalidates_segments(self, client, mocker, fake_odoo, store):
+        old_shift = fake_odoo.registrations[4]["shift_id"][0]
+        get_history(client)
+        fake_odoo.events.append(
+            dict(counter_event(4000, days_ago(1), 2, "standard", shift_id=old_shift), partner_id=140)
+        )
+
+        data = get_history(client)
+
+        assert data == unsegmented(client, mocker)
+
+    def test_new_live_events_keep_segments(self, client, mocker, fake_odoo, store, mock_odoo_client):
+        get_history(client)
+        block = store.get_block(140)
+        fake_odoo.events.append(dict(counter_event(4001, days_ago(1), -1, "ftop", is_manual=True), partner_id=140))
+
+        data = get_history(client)
+
+        assert mock_odoo_client.get_member_shift_history.call_args.kwargs["start_date"] == block["end_before"]
+        assert store.get_block(140)["fingerprint"] == block["fingerprint"]
+        assert data == unsegmented(client, mocker)
+
+    def test_renamed_shifts_and_exchanges_rebuilt_on_read(self, client, mocker, fake_odoo, store, mock_odoo_client):
+        get_history(client)
+        block = store.get_block(140)
+        # Changes to rows of shift.shift and of the other member, after the cycles closed
+        fake_odoo.shifts[503]["name"] = "Renamed shift"
+        fake_odoo.shifts[600]["name"] = "Renamed replacement"
+        fake_odoo.other_registrations[900]["shift_id"] = [601, "Shift 601"]
+        fake_odoo.shifts[601] = dict(fake_odoo.shifts[600], id=601, name="Moved replacement", week_name="C")
+
+        data = get_history(client)
+
+        assert mock_odoo_client.get_member_shift_history.call_args.kwargs["start_date"] == block["end_before"]
+        assert store.get_block(140)["fingerprint"] == block["fingerprint"]
+        exchanged = next(e for e in data["events"] if e["id"] == 13)
+        assert exchanged["shift_name"] == "Renamed shift"
+        assert exchanged["exchange_details"]["replacement_shift"]["shift_name"] == "Moved replacement"
+        assert exchanged["exchange_details"]["replacement_shift"]["week_name"] == "C"
+        assert data == unsegmented(client, mocker)
+
+    def test_older_pages_bypass_segments(self, client, fake_odoo, store):
+        first = get_history(client, "?cycles=3")
+        older = get_history(client, f"?cycles=3&before_cycle={first['page']['next_before_cycle']}")
+
+        assert store.get_block(140)["first_cycle"] == first["page"]["first_cycle"]
+        assert older["page"]["start_date"] < store.get_block(140)["start_date"]
+
+    def test_fingerprint_error_falls_back_to_full_fetch(self, client, mocker, fake_odoo, store, mock_odoo_client):
+        get_history(client)
+        mock_odoo_client.get_records_fingerprint.side_effect = Exception("read_group failed")
+
+        data = get_history(client)
+
+        assert data == unsegmented(client, mocker)
+        assert store.get_block(140) is not None
+
+    def test_segments_without_registration_links_dropped(self, tmp_path):
+        path = str(tmp_path / "segments.sqlite3")
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE history_segment (partner_id INTEGER, cycle_number INTEGER, "
+                "opening_totals TEXT, events TEXT)"
+            )
+            conn.execute("INSERT INTO history_segment VALUES (140, 1, '{}', '[]')")
+        conn.close()
+
+        store = HistorySegmentStore(path)
+
+        assert store.get_segments(140, 1, 1) == {}
+
+
+class TestRecordsFingerprint:
+    """Test suite for OdooClient.get_records_fingerprint()."""
+
+    @pytest.fixture
+    def client(self, mocker):
+        client = OdooClient()
+        client.uid = 1
+        client.models = mocker.MagicMock()
+        client.rpc_cache.model_ttls = {}
+        return client
+
+    def test_count_and_newest_write_date(self, client):
+        # Responses as returned by Odoo's search_read and search_count
+        client.models.execute_kw.side_effect = lambda db, uid, pw, model, method, args, kwargs: (
+            [{"id": 7, "write_date": "2025-03-02 10:00:00"}] if method == "search_read" else 12
+        )
+        domain = [("partner_id", "=", 140)]
+
+        fingerprint = client.get_records_fingerprint("pos.order", domain)
+
+        assert fingerprint == {"count": 12, "max_write_date": "2025-03-02 10:00:00"}
+        calls = [c.args[3:] for c in client.models.execute_kw.call_args_list]
+        assert calls == [
+            ("pos.order", "search_read", [domain],
+             {"fields": ["write_date"], "order": "write_date desc", "limit": 1}),
+            ("pos.order", "search_count", [domain], {}),
+        ]
+
+    def test_without_records(self, client):
+        client.models.execute_kw.side_effect = lambda db, uid, pw, model, method, args, kwargs: (
+            [] if method == "search_read" else 0
+        )
+
+        assert client.get_records_fingerprint("pos.order", []) == {"count": 0, "max_write_date": None}
+
+
+class TestSplitIntoCycles:
+    """Test suite for split_into_cycles()."""
+
+    def test_events_assigned_by_source_date(self):
+        starts = [(1, "2025-01-13"), (2, "2025-02-10"), (3, "2025-03-10")]
+        events = [
+            ("2025-02-10 00:00:00", {"id": 1}),
+            ("2025-02-09 23:59:59", {"id": 2}),
+            ("2025-03-10 08:00:00", {"id": 3}),
+            ("2025-01-01 08:00:00", {"id": 4}),
+        ]
+
+        assert split_into_cycles(events, starts) == {1: [{"id": 2}], 2: [{"id": 1}]}
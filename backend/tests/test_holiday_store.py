@@ -0,0 +1,167 @@
+"""
+Tests for holiday_store module.
+
+Checks that range and point lookups answered from the interval index match
+the shift.holiday domains they replace, and that refreshes pick up edited,
+cancelled and deleted holidays.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+from holiday_store import HOLIDAY_FIELDS, HolidayIndex, HolidayStore
+
+
+def day(offset):
+    return (date(2024, 1, 1) + timedelta(days=offset)).isoformat()
+
+
+def holiday(holiday_id, begin, end, state="done", write_date="2024-01-01 00:00:00"):
+    return {
+        "id": holiday_id,
+        "name": f"Holiday {holiday_id}",
+        "holiday_type": "long_period",
+        "date_begin": begin,
+        "date_end": end,
+        "state": state,
+        "make_up_type": "0_make_up",
+        "write_date": write_date,
+    }
+
+
+class FakeHolidayOdoo:
+    """Evaluates the shift.holiday domains used by the store."""
+
+    def __init__(self, records):
+        self.records = records
+        self.calls = []
+
+    def _matches(self, record, domain):
+        for field, operator, value in domain:
+            if operator == "in" and record[field] not in value:
+                return False
+            if operator == ">" and not record[field] > value:
+                return False
+        return True
+
+    def execute(self, model, method, domain, fields=None):
+        self.calls.append((method, domain))
+        matches = [r for r in self.records if self._matches(r, domain)]
+        if method == "search_count":
+            return len(matches)
+        return [{f: r[f] for f in fields} for r in matches]
+
+
+def odoo_get_holidays(records, start_date, end_date):
+    """Reference: the search_read previously made by OdooClient.get_holidays."""
+    matches = [
+        r
+        for r in records
+        if r["state"] in ("confirmed", "done")
+        and (not start_date or r["date_end"] >= start_date)
+        and (not end_date or r["date_begin"] <= end_date)
+    ]
+    return sorted(matches, key=lambda r: r["date_begin"], reverse=True)
+
+
+@pytest.fixture
+def records():
+    rng = random.Random(7)
+    result = []
+    for i in range(300):
+        begin = rng.randint(0, 1000)
+        result.append(
+            holiday(i + 1, day(begin), day(begin + rng.choice([0, 1, 7, 30, 120])), rng.choice(["done", "confirmed", "draft", "cancel"]))
+        )
+    return result
+
+
+class TestHolidayStore:
+    """Test suite for HolidayStore lookups."""
+
+    def test_range_lookups_match_odoo_domain(self, records):
+        store = HolidayStore(FakeHolidayOdoo(records))
+        rng = random.Random(3)
+
+        for _ in range(200):
+            start = rng.randint(-50, 1100)
+            start_date, end_date = day(start), day(start + rng.randint(0, 90))
+            expected = odoo_get_holidays(records, start_date, end_date)
+
+            result = store.get_holidays(start_date, end_date)
+
+            assert [r["id"] for r in result] == [r["id"] for r in expected]
+            assert all(set(r) == set(HOLIDAY_FIELDS) for r in result)
+
+        assert len(store.get_holidays()) == len(odoo_get_holidays(records, None, None))
+
+    def test_point_lookups(self, records):
+        odoo = FakeHolidayOdoo(records)
+        store = HolidayStore(odoo)
+
+        for offset in range(-10, 1200, 5):
+            expected = odoo_get_holidays(records, day(offset), day(offset))
+            result = store.get_holiday_for_date(day(offset))
+            if expected:
+                assert result["id"] in {r["id"] for r in expected}
+                assert "state" not in result
+            else:
+                assert result is None
+
+        # One load serves every lookup
+        assert len(odoo.calls) == 1
+
+
+class TestHolidayStoreRefresh:
+    """Test suite for HolidayStore refreshes."""
+
+    @pytest.fixture
+    def odoo(self):
+        return FakeHolidayOdoo([
+            holiday(1, "2025-01-01", "2025-01-10"),
+            holiday(2, "2025-03-01", "2025-03-05"),
+        ])
+
+    def expire(self, store):
+        store._cache.invalidate()
+
+    def test_edited_holiday_merged(self, odoo):
+        store = HolidayStore(odoo)
+        assert store.get_holiday_for_date("2025-01-12") is None
+
+        odoo.records[0] = holiday(1, "2025-01-01", "2025-01-15", write_date="2025-01-02 00:00:00")
+        self.expire(store)
+
+        assert store.get_holiday_for_date("2025-01-12")["id"] == 1
+        assert ("search_read", [("write_date", ">", "2024-01-01 00:00:00")]) in odoo.calls
+
+    def test_cancelled_holiday_removed(self, odoo):
+        store = HolidayStore(odoo)
+        odoo.records[1] = holiday(2, "2025-03-01", "2025-03-05", state="cancel", write_date="2025-02-01 00:00:00")
+        self.expire(store)
+
+        assert store.get_holiday_for_date("2025-03-02") is None
+        assert len(store.get_holidays()) == 1
+
+    def test_deleted_holiday_triggers_reload(self, odoo):
+        store = HolidayStore(odoo)
+        del odoo.records[1]
+        self.expire(store)
+
+        assert [r["id"] for r in store.get_holidays()] == [1]
+
+
+class TestHolidayIndex:
+    """Test suite for HolidayIndex."""
+
+    def test_long_interval_found_after_short_ones(self):
+        """A long early holiday still matches ranges past later short ones."""
+        index = HolidayIndex([
+            holiday(1, "2025-01-01", "2025-12-31"),
+            holiday(2, "2025-02-01", "2025-02-02"),
+            holiday(3, "2025-03-01", "2025-03-02"),
+        ])
+
+        assert [r["id"] for r in index.overlapping("2025-06-01", "2025-06-30")] == [1]
+        assert [r["id"] for r in index.overlapping("2025-02-02", "2025-03-01")] == [1, 2, 3]
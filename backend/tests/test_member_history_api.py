@@ -592,28 +592,29 @@ class TestMemberHistoryAPI:
                         "shift_id": [201, "BSat 14:00"]
                     })
                 return results
-            elif model == "shift.shift" and method == "read":
-                shift_ids = args[0]
-                results = []
-                if 202 in shift_ids:
-                    results.append({
-                        "id": 202,
-                        "name": "CWed 16:00",
-                        "date_begin": "2025-02-20 16:00:00",
-                        "week_number": 3,
-                        "week_name": "C"
-                    })
-                if 201 in shift_ids:
-                    results.append({
-                        "id": 201,
-                        "name": "BSat 14:00",
-                        "date_begin": "2025-02-15 14:00:00",
-                        "week_number": 2,
-                        "week_name": "B"
-                    })
-                return results
             return []
 
+        # Mock the shift metadata of those registrations
+        def mock_get_shifts(shift_ids):
+            shifts = {}
+            if 202 in shift_ids:
+                shifts[202] = {
+                    "id": 202,
+                    "name": "CWed 16:00",
+                    "date_begin": "2025-02-20 16:00:00",
+                    "week_number": 3,
+                    "week_name": "C"
+                }
+            if 201 in shift_ids:
+                shifts[201] = {
+                    "id": 201,
+                    "name": "BSat 14:00",
+                    "date_begin": "2025-02-15 14:00:00",
+                    "week_number": 2,
+                    "week_name": "B"
+                }
+            return shifts
+
         mock_counter_events = [
             {
                 "id": 801,
@@ -633,6 +634,7 @@ class TestMemberHistoryAPI:
         mock_odoo_client.get_member_counter_events.return_value = mock_counter_events
         mock_odoo_client.get_holidays.return_value = []
         mock_odoo_client.execute = mock_execute
+        mock_odoo_client.get_shifts.side_effect = mock_get_shifts
 
         mocker.patch("app.odoo", mock_odoo_client)
 
@@ -711,3 +713,43 @@ class TestMemberHistoryAPI:
         shift = shift_events[0]
         # Should NOT have exchange_details when there's no relationship data
         assert "exchange_details" not in shift
+
+    def test_optional_sources_failing_are_tolerated(self, client, mock_odoo_client, mocker):
+        """
+        Test that counter events and holidays failures don't sink the history.
+
+        These sources are fetched concurrently with the others; their errors
+        are logged and the response is built without them.
+        """
+        mock_odoo_client.get_member_purchase_history.return_value = [
+            {"id": 1, "date_order": "2025-03-01 10:00:00", "name": "Order 1", "pos_reference": "POS/1"}
+        ]
+        mock_odoo_client.get_member_shift_history.return_value = []
+        mock_odoo_client.get_member_leaves.return_value = []
+        mock_odoo_client.get_member_counter_events.side_effect = Exception("Counter RPC failed")
+        mock_odoo_client.get_holidays.side_effect = Exception("Holiday RPC failed")
+
+        mocker.patch("app.odoo", mock_odoo_client)
+
+        response = client.get("/api/member/135/history")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data["events"]) == 1
+        assert data["holidays"] == []
+        assert data["counter_totals"] == {"ftop": 0, "standard": 0}
+
+    def test_required_source_failing_returns_error(self, client, mock_odoo_client, mocker):
+        """Test that a failing shift fetch still fails the whole request."""
+        mock_odoo_client.get_member_purchase_history.return_value = []
+        mock_odoo_client.get_member_shift_history.side_effect = Exception("Shift RPC failed")
+        mock_odoo_client.get_member_leaves.return_value = []
+        mock_odoo_client.get_member_counter_events.return_value = []
+
+        mocker.patch("app.odoo", mock_odoo_client)
+
+        response = client.get("/api/member/136/history")
+
+        assert response.status_code == 500
+        data = json.loads(response.data)
+        assert "Shift RPC failed" in data["error"]
@@ -0,0 +1,292 @@
+"""
+Tests for member_index and partner_sync modules, and the indexed member search.
+"""
+
+import json
+
+import pytest
+from member_index import MemberNameIndex, fold
+from odoo_client import COOPERATIVE_MEMBER_DOMAIN, OdooClient
+from partner_sync import PartnerSync
+
+
+class FakePartnerOdoo:
+    """Answers the res.partner calls made by PartnerSync and read_members."""
+
+    def __init__(self, partners):
+        self.partners = {
+            p["id"]: dict(p, active=p.get("active", True), is_member=p.get("is_member", True)) for p in partners
+        }
+        self.calls = []
+
+    def execute(self, model, method, *args, fields=None, **options):
+        self.calls.append((method, args))
+        if method == "read":
+            missing = [i for i in args[0] if i not in self.partners]
+            if missing:
+                raise Exception(f"MissingError: records {missing} do not exist or have been deleted")
+            return [{f: self.partners[i].get(f, False) for f in fields} for i in args[0]]
+        matches = [p for p in self.partners.values() if self.matches(p, args[0])]
+        if method == "search_count":
+            return len(matches)
+        if method == "search":
+            return [p["id"] for p in matches]
+        return [{f: p.get(f, False) for f in fields} for p in matches]
+
+    @staticmethod
+    def matches(record, domain):
+        """Evaluate a domain of AND-ed terms and '|' of two terms."""
+        if not any(term[0] == "active" for term in domain if term != "|"):
+            domain = domain + [("active", "=", True)]
+        operators = {
+            "=": lambda a, b: a == b,
+            ">=": lambda a, b: a >= b,
+            "in": lambda a, b: a in b,
+            "ilike": lambda a, b: b.lower() in (a or "").lower(),
+        }
+
+        def evaluate(i):
+            if domain[i] == "|":
+                left, i = evaluate(i + 1)
+                right, i = evaluate(i)
+                return left or right, i
+            field, operator, value = domain[i]
+            return operators[operator](record.get(field), value), i + 1
+
+        i = 0
+        while i < len(domain):
+            matched, i = evaluate(i)
+            if not matched:
+                return False
+        return True
+
+    def write(self, partner_id, **values):
+        self.partners[partner_id].update(values, write_date="2025-06-01 00:00:00")
+
+
+def partner(partner_id, name, write_date="2025-01-01 00:00:00"):
+    return {"id": partner_id, "name": name, "write_date": write_date}
+
+
+@pytest.fixture
+def partners():
+    return [
+        partner(1, "MARTIN, Hélène"),
+        partner(2, "DUPONT, Marc"),
+        partner(3, "THOMAS, Paul"),
+        partner(4, "HELENE, Jean-Luc"),
+        partner(5, "MARTINEZ, Noël"),
+    ]
+
+
+@pytest.fixture
+def index(partners):
+    index = MemberNameIndex()
+    index.apply_changes(partners, set(), True)
+    return index
+
+
+class TestMemberNameIndex:
+    """Test suite for MemberNameIndex matching and ranking."""
+
+    def test_fold(self):
+        assert fold("  Hélène  D'ARC-Noël ") == "helene d arc noel"
+
+    @pytest.mark.parametrize("query", ["helene", "Hélène", "HELENE", "hélene"])
+    def test_accent_insensitive(self, index, query):
+        ids, total = index.search(query)
+        assert ids == [4, 1]
+        assert total == 2
+
+    def test_ranking(self, index):
+        """Name prefix, then word prefix, then substring, then fuzzy."""
+        assert index.search("mar")[0] == [1, 5, 2]
+        assert index.search("omas")[0] == [3]
+        assert index.search("martn")[0][:2] == [1, 5]
+        assert index.search("jean luc")[0] == [4]
+        assert index.search("zzz") == ([], 0)
+
+    def test_paging(self, index):
+        assert index.search("mar", limit=2) == ([1, 5], 3)
+        assert index.search("mar", limit=2, offset=2) == ([2], 3)
+
+    def test_incremental_changes(self, index):
+        index.apply_changes([partner(3, "THOMASSIN, Paul"), partner(6, "MARCEAU, Léa")], {5}, False)
+
+        assert index.search("mar")[0] == [6, 1, 2]
+        assert index.search("thomassin")[0] == [3]
+        assert index.search("noel") == ([], 0)
+
+
+class TestPartnerSync:
+    """Test suite for PartnerSync polling."""
+
+    def test_incremental_poll(self, partners):
+        odoo = FakePartnerOdoo(partners)
+        sync = PartnerSync(odoo, ["name"])
+        index = MemberNameIndex()
+        sync.subscribe(index.apply_changes)
+        sync.ensure_fresh()
+
+        odoo.write(2, name="DURAND, Marc")
+        odoo.write(3, active=False)
+        sync._cache.invalidate()
+        sync.ensure_fresh()
+
+        assert index.search("durand")[0] == [2]
+        assert index.search("thomas") == ([], 0)
+        assert ("search_read", ([("write_date", ">=", "2025-01-01 00:00:00"), ("active", "in", [True, False])],)) in odoo.calls
+
+    def test_only_partners_of_domain_kept(self, partners):
+        odoo = FakePartnerOdoo(partners + [dict(partner(6, "MARTIN SARL"), is_member=False)])
+        sync = PartnerSync(odoo, ["name"], domain=COOPERATIVE_MEMBER_DOMAIN)
+        sync.ensure_fresh()
+        assert set(sync.records) == {1, 2, 3, 4, 5}
+
+        odoo.write(2, is_member=False)
+        odoo.write(6, name="MARTIN & CO")
+        sync._cache.invalidate()
+        sync.ensure_fresh()
+
+        assert set(sync.records) == {1, 3, 4, 5}
+        # Load, then one poll without full reload
+        assert [call[0] for call in odoo.calls] == ["search_read", "search_read", "search", "search_count"]
+
+    def test_deleted_partner_triggers_reload(self, partners):
+        odoo = FakePartnerOdoo(partners)
+        sync = PartnerSync(odoo, ["name"])
+        sync.ensure_fresh()
+
+        del odoo.partners[5]
+        sync._cache.invalidate()
+        sync.ensure_fresh()
+
+        assert set(sync.records) == {1, 2, 3, 4}
+
+
+class TestIndexedSearchEndpoint:
+    """Test suite for /api/members/search served from the index."""
+
+    @pytest.fixture
+    def indexed(self, mocker, partners):
+        odoo = FakePartnerOdoo([
+            dict(p, barcode_base=p["id"], street=False, street2=False, city="Lille", zip="59000",
+                 phone=False, mobile=False, email=False, image=False, image_small=False, image_medium=False)
+            for p in partners
+        ])
+        sync = PartnerSync(odoo, ["name"])
+        index = MemberNameIndex()
+        sync.subscribe(index.apply_changes)
+        sync.ensure_fresh()
+        mock_odoo = mocker.MagicMock()
+        mock_odoo.read_members.side_effect = lambda ids, with_images=False: [
+            {k: v for k, v in odoo.partners[i].items() if with_images or not k.startswith("image")} for i in ids
+        ]
+        mocker.patch("app.odoo", mock_odoo)
+        mocker.patch("app.MEMBER_SEARCH_INDEX", True)
+        mocker.patch("app.partner_sync", sync)
+        mocker.patch("app.member_index", index)
+        return mock_odoo
+
+    def test_search_uses_index_and_hydrates_page(self, client, indexed):
+        response = client.get("/api/members/search?name=helene&limit=1")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [m["name"] for m in data["members"]] == ["HELENE, Jean-Luc"]
+        assert data["total"] == 2
+        indexed.read_members.assert_called_once_with([4], with_images=False)
+        indexed.search_members_by_name.assert_not_called()
+
+    def test_short_query_searches_odoo(self, client, indexed):
+        indexed.search_members_by_name.return_value = []
+        indexed.count_members_by_name.return_value = 0
+
+        response = client.get("/api/members/search?name=ar")
+
+        assert response.status_code == 200
+        indexed.search_members_by_name.assert_called_once_with("ar", limit=50, offset=0, with_images=False)
+        indexed.read_members.assert_not_called()
+
+    def test_falls_back_to_odoo_when_index_unavailable(self, client, indexed, mocker):
+        mocker.patch("app.partner_sync.ensure_fresh", side_effect=ConnectionError("Odoo down"))
+        indexed.search_members_by_name.return_value = []
+        indexed.count_members_by_name.return_value = 0
+
+        response = client.get("/api/members/search?name=helene")
+
+        assert response.status_code == 200
+        indexed.search_members_by_name.assert_called_once()
+
+    def test_index_not_loaded_searches_odoo_and_warms_up(self, client, indexed, mocker):
+        sync = PartnerSync(FakePartnerOdoo([]), ["name"])
+        warm_up = mocker.patch.object(sync, "warm_up")
+        mocker.patch("app.partner_sync", sync)
+        indexed.search_members_by_name.return_value = []
+        indexed.count_members_by_name.return_value = 0
+
+        response = client.get("/api/members/search?name=helene")
+
+        assert response.status_code == 200
+        indexed.search_members_by_name.assert_called_once()
+        warm_up.assert_called_once()
+
+
+class TestOdooMemberSearch:
+    """Test suite for the Odoo name search, used for short queries and before the index loads."""
+
+    @pytest.fixture
+    def odoo(self, mocker, partners):
+        fake = FakePartnerOdoo(partners + [
+            dict(partner(6, "MARTIN Fournitures"), is_member=False),
+            dict(partner(7, "MARTIN, Léo"), is_member=False, is_associated_people=True),
+        ])
+        client = OdooClient()
+        client.uid = 1
+        client.models = mocker.MagicMock()
+        client.models.execute_kw.side_effect = lambda db, uid, pw, model, method, args, kwargs: fake.execute(
+            model, method, *args, **kwargs
+        )
+        return client
+
+    def test_only_cooperative_members_searched(self, odoo):
+        found = odoo.search_members_by_name("martin", limit=50)
+
+        assert sorted(m["id"] for m in found) == [1, 5, 7]
+        assert odoo.count_members_by_name("martin") == 3
+
+    def test_same_answer_with_and_without_index(self, client, mocker, odoo, partners):
+        mocker.patch("app.odoo", odoo)
+        mocker.patch("app.MEMBER_SEARCH_INDEX", True)
+        sync = PartnerSync(odoo, ["name"], domain=COOPERATIVE_MEMBER_DOMAIN)
+        index = MemberNameIndex()
+        sync.subscribe(index.apply_changes)
+        mocker.patch("app.partner_sync", sync)
+        mocker.patch("app.member_index", index)
+        mocker.patch.object(sync, "warm_up")
+
+        before_load = json.loads(client.get("/api/members/search?name=martin").data)
+        sync.ensure_fresh()
+        indexed = json.loads(client.get("/api/members/search?name=martin").data)
+
+        assert before_load["total"] == indexed["total"] == 3
+        assert sorted(m["id"] for m in before_load["members"]) == sorted(m["id"] for m in indexed["members"])
+
+    def test_partner_deleted_since_poll_skipped(self, odoo):
+        assert [m["id"] for m in odoo.read_members([5, 99, 1])] == [5, 1]
+
+
+class TestWarmUp:
+    """Test suite for the background loads started by the first request."""
+
+    def test_first_request_starts_loads_once(self, client, app, mocker):
+        mocker.patch("app._warmed_up", False)
+        mocker.patch.dict(app.config, {"TESTING": False})
+        partner_warm_up = mocker.patch("app.partner_sync.warm_up")
+        shift_warm_up = mocker.patch("app.odoo.shift_metadata.warm_up")
+
+        client.get("/api/health")
+        client.get("/api/health")
+
+        partner_warm_up.assert_called_once()
+        shift_warm_up.assert_called_once()
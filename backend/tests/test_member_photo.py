@@ -0,0 +1,140 @@
+"""
+Tests for the /api/member/<id>/photo endpoint and photo_cache module.
+"""
+
+import base64
+import io
+
+import pytest
+
+from odoo_client import OdooClient
+from photo_cache import PhotoCache, photo_version
+
+# Pillow is optional for the app (photos are then served unresized)
+Image = pytest.importorskip("PIL.Image")
+
+
+def png_b64(width=600, height=400):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 120)).save(output, "PNG")
+    return base64.b64encode(output.getvalue()).decode()
+
+
+@pytest.fixture
+def photo_odoo(mock_odoo_client, mocker, tmp_path):
+    partner = {"id": 7, "write_date": "2025-03-01 10:00:00", "image": png_b64(), "image_medium": png_b64(128, 85)}
+
+    def get_partner_photo(partner_id, image_field=None):
+        result = {"id": partner["id"], "write_date": partner["write_date"]}
+        if image_field:
+            result[image_field] = partner[image_field]
+        return result
+
+    mock_odoo_client.get_partner_photo.side_effect = get_partner_photo
+    mock_odoo_client.partner = partner
+    mocker.patch("app.odoo", mock_odoo_client)
+    mocker.patch("app.photo_cache", PhotoCache(str(tmp_path / "photos")))
+    return mock_odoo_client
+
+
+class TestMemberPhoto:
+    """Test suite for the member photo endpoint."""
+
+    def test_resized_webp_with_strong_etag(self, client, photo_odoo):
+        response = client.get("/api/member/7/photo?size=medium", headers={"Accept": "image/webp,*/*"})
+
+        assert response.status_code == 200
+        assert response.mimetype == "image/webp"
+        assert Image.open(io.BytesIO(response.data)).size == (256, 171)
+        etag, weak = response.get_etag()
+        assert etag and not weak
+        assert response.cache_control.max_age == 86400
+        assert response.cache_control.private and not response.cache_control.public
+        assert "Accept" in response.vary
+
+    def test_jpeg_when_webp_not_accepted(self, client, photo_odoo):
+        response = client.get("/api/member/7/photo", headers={"Accept": "image/*"})
+
+        assert response.mimetype == "image/jpeg"
+        assert max(Image.open(io.BytesIO(response.data)).size) <= 128
+
+    def test_versioned_url_served_from_disk_and_immutable(self, client, photo_odoo):
+        version = photo_version("2025-03-01 10:00:00")
+        client.get(f"/api/member/7/photo?v={version}&format=jpeg")
+        photo_odoo.get_partner_photo.reset_mock()
+
+        response = client.get(f"/api/member/7/photo?v={version}&format=jpeg")
+
+        assert response.status_code == 200
+        assert response.cache_control.max_age == 31536000
+        assert response.cache_control.immutable
+        photo_odoo.get_partner_photo.assert_not_called()
+
+    def test_if_none_match_returns_304(self, client, photo_odoo):
+        first = client.get("/api/member/7/photo?format=jpeg")
+
+        second = client.get("/api/member/7/photo?format=jpeg", headers={"If-None-Match": first.headers["ETag"]})
+
+        assert second.status_code == 304
+        assert second.data == b""
+
+    def test_new_write_date_changes_version(self, client, photo_odoo):
+        first = client.get("/api/member/7/photo?format=jpeg")
+        photo_odoo.partner["write_date"] = "2025-04-01 10:00:00"
+        photo_odoo.partner["image_medium"] = png_b64(64, 64)
+
+        second = client.get("/api/member/7/photo?format=jpeg")
+
+        assert second.headers["ETag"] != first.headers["ETag"]
+        assert Image.open(io.BytesIO(second.data)).size == (64, 64)
+
+    def test_member_without_photo(self, client, photo_odoo):
+        photo_odoo.partner["image_medium"] = False
+
+        response = client.get("/api/member/7/photo")
+
+        assert response.status_code == 404
+
+    def test_unknown_member(self, client, mocker, tmp_path):
+        odoo = OdooClient()
+        odoo.uid = 1
+        odoo.models = mocker.MagicMock()
+
+        def execute_kw(db, uid, password, model, method, args, kwargs):
+            # Odoo's read raises MissingError for unknown IDs, search_read finds nothing
+            if method == "read":
+                raise Exception("MissingError: Record does not exist or has been deleted")
+            assert ("id", "=", 404404) in args[0]
+            return []
+
+        odoo.models.execute_kw.side_effect = execute_kw
+        mocker.patch("app.odoo", odoo)
+        mocker.patch("app.photo_cache", PhotoCache(str(tmp_path / "photos")))
+
+        response = client.get("/api/member/404404/photo")
+
+        assert response.status_code == 404
+        assert response.get_json() == {"error": "Member not found"}
+
+    def test_invalid_size(self, client, photo_odoo):
+        assert client.get("/api/member/7/photo?size=huge").status_code == 400
+
+    def test_cache_miss_reads_odoo_once(self, client, photo_odoo):
+        client.get("/api/member/7/photo?format=jpeg")
+
+        photo_odoo.get_partner_photo.assert_called_once_with(7, "image_medium")
+
+    @pytest.mark.parametrize("version", ["../../../tmp/x", "..%2F..%2Fx", "ABCDEF012345", "abc"])
+    def test_malformed_version_rejected(self, client, photo_odoo, tmp_path, version):
+        response = client.get(f"/api/member/7/photo?v={version}&format=jpeg")
+
+        assert response.status_code == 400
+        photo_odoo.get_partner_photo.assert_not_called()
+        assert not (tmp_path / "photos").exists()
+
+    def test_cache_refuses_paths_outside_directory(self, tmp_path):
+        cache = PhotoCache(str(tmp_path / "photos"))
+
+        with pytest.raises(ValueError):
+            cache.put(7, "../../escaped", "small", "jpeg", b"data")
+        assert not (tmp_path / "escaped-small.jpeg").exists()
@@ -0,0 +1,145 @@
+"""
+Tests for the combined /api/member/<id>/profile endpoint.
+
+History, status and shares are returned together; a failing section carries
+its own error without affecting the others.
+"""
+
+import json
+
+import pytest
+
+
+MEMBER_STATUS = {
+    "id": 123,
+    "name": "TEST, Member",
+    "cooperative_state": "up_to_date",
+    "is_worker_member": True,
+    "shift_type": "standard",
+    "is_unsubscribed": False,
+    "customer": True,
+}
+
+SHARE_INFORMATION = {
+    "total_shares": 2,
+    "join_date": "2023-05-01",
+    "first_purchase_date": "2023-05-01",
+    "share_purchases": [{"date": "2023-05-01", "quantity": 2}],
+}
+
+
+@pytest.fixture
+def profile_odoo(mock_odoo_client, mocker):
+    """Odoo mock with a member that has one shift and every section available."""
+    mock_odoo_client.get_member_purchase_history.return_value = []
+    mock_odoo_client.get_member_shift_history.return_value = [
+        {
+            "id": 1,
+            "date_begin": "2025-01-15 09:00:00",
+            "state": "done",
+            "shift_id": [101, "Wed 09:00"],
+            "shift_name": "Wed 09:00",
+            "is_late": False,
+            "week_number": 1,
+            "week_name": "A",
+            "shift_type_id": [2, "Standard"],
+        }
+    ]
+    mock_odoo_client.get_member_leaves.return_value = []
+    mock_odoo_client.get_member_counter_events.return_value = []
+    mock_odoo_client.get_member_status.return_value = MEMBER_STATUS
+    mock_odoo_client.get_member_share_information.return_value = SHARE_INFORMATION
+    mocker.patch("app.odoo", mock_odoo_client)
+    return mock_odoo_client
+
+
+class TestMemberProfileAPI:
+    """Test suite for the member profile endpoint."""
+
+    def test_all_sections(self, client, profile_odoo):
+        response = client.get("/api/member/123/profile")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["member_id"] == 123
+
+        history = client.get("/api/member/123/history").get_json()
+        assert data["history"] == dict(history, error=None)
+
+        assert data["status"]["error"] is None
+        assert data["status"]["cooperative_state"] == "up_to_date"
+        assert data["shares"] == dict(SHARE_INFORMATION, member_id=123, error=None)
+
+    def test_failed_shares_keep_history_and_status(self, client, profile_odoo):
+        profile_odoo.get_member_share_information.side_effect = Exception("Odoo timeout")
+
+        data = client.get("/api/member/123/profile").get_json()
+
+        assert data["shares"]["error"] == "Odoo timeout"
+        assert data["shares"]["total_shares"] == 0
+        assert data["shares"]["share_purchases"] == []
+        assert data["history"]["error"] is None
+        assert len(data["history"]["events"]) == 1
+        assert data["status"]["error"] is None
+
+    def test_failed_history_keeps_other_sections(self, client, profile_odoo):
+        profile_odoo.get_member_shift_history.side_effect = Exception("Connection refused")
+
+        response = client.get("/api/member/123/profile")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["history"] == {"error": "Connection refused"}
+        assert data["status"]["name"] == "TEST, Member"
+        assert data["shares"]["total_shares"] == 2
+
+    def test_status_not_found(self, client, profile_odoo):
+        profile_odoo.get_member_status.return_value = None
+
+        data = client.get("/api/member/123/profile").get_json()
+
+        assert data["status"] == {"error": "Member not found"}
+        assert data["history"]["error"] is None
+
+    def test_invalid_member_id(self, client, profile_odoo):
+        response = client.get("/api/member/0/profile")
+
+        assert response.status_code == 400
+        profile_odoo.get_member_status.assert_not_called()
+
+
+class TestCounterReconciliation:
+    """Test suite for stored vs replayed counter reconciliation."""
+
+    @pytest.mark.parametrize("standard, expected", [(0.0, True), (-2.0, False)])
+    def test_profile_reconciles_counters(self, client, profile_odoo, standard, expected):
+        profile_odoo.get_member_status.return_value = dict(
+            MEMBER_STATUS, final_standard_point=standard, final_ftop_point=0.0
+        )
+
+        data = client.get("/api/member/123/profile").get_json()
+
+        assert data["history"]["counter_totals"] == {"ftop": 0, "standard": 0}
+        assert data["status"]["counters"]["standard"] == int(standard)
+        assert data["status"]["counters_match"] is expected
+
+    def test_older_page_not_reconciled(self, client, profile_odoo):
+        profile_odoo.get_member_status.return_value = dict(
+            MEMBER_STATUS, final_standard_point=0.0, final_ftop_point=0.0
+        )
+        first_cycle = client.get("/api/member/123/history").get_json()["page"]["first_cycle"]
+
+        data = client.get(f"/api/member/123/profile?before_cycle={first_cycle}").get_json()
+
+        assert data["status"]["counters_match"] is None
+
+    def test_status_reconcile_parameter(self, client, profile_odoo):
+        profile_odoo.get_member_status.return_value = dict(
+            MEMBER_STATUS, final_standard_point=1.0, final_ftop_point=0.0
+        )
+
+        assert client.get("/api/member/123/status").get_json()["counters_match"] is None
+        profile_odoo.get_member_shift_history.assert_not_called()
+
+        data = client.get("/api/member/123/status?reconcile=true").get_json()
+        assert data["counters_match"] is False
@@ -0,0 +1,96 @@
+"""
+Tests for the /api/members/search endpoint.
+"""
+
+import json
+
+import pytest
+from photo_cache import photo_version
+
+
+def partner(partner_id, name):
+    return {
+        "id": partner_id,
+        "name": name,
+        "barcode_base": 1000 + partner_id,
+        "street": "1 rue de Lille",
+        "street2": False,
+        "city": "Lille",
+        "zip": "59000",
+        "phone": False,
+        "mobile": "06 00 00 00 00",
+        "email": "member@example.org",
+        "write_date": "2025-03-01 10:00:00",
+        "image_small": "c21hbGw=",
+        "image_medium": "bWVkaXVt",
+        "image": "aW1hZ2U=",
+    }
+
+
+@pytest.fixture
+def search_odoo(mock_odoo_client, mocker):
+    mock_odoo_client.search_members_by_name.return_value = [partner(1, "MARTIN, Marie"), partner(2, "MAS, Paul")]
+    mock_odoo_client.count_members_by_name.return_value = 120
+    mocker.patch("app.odoo", mock_odoo_client)
+    # Odoo search path; the local name index is covered in test_member_index
+    mocker.patch("app.MEMBER_SEARCH_INDEX", False)
+    return mock_odoo_client
+
+
+class TestMemberSearch:
+    """Test suite for member search modes and paging."""
+
+    def test_lean_by_default(self, client, search_odoo):
+        """No image fields are requested and no raw record is returned."""
+        response = client.get("/api/members/search?name=ma")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["members"][0] == {
+            "id": 1,
+            "name": "MARTIN, Marie",
+            "barcode_base": 1001,
+            "address": "1 rue de Lille, 59000, Lille",
+            "phone": "06 00 00 00 00",
+            "photo_url": f"/api/member/1/photo?size=small&v={photo_version('2025-03-01 10:00:00')}",
+        }
+        assert data["total"] == 120
+        assert data["limit"] == 50
+        assert data["offset"] == 0
+        search_odoo.search_members_by_name.assert_called_once_with("ma", limit=50, offset=0, with_images=False)
+
+    def test_limit_and_offset_forwarded(self, client, search_odoo):
+        response = client.get("/api/members/search?name=ma&limit=20&offset=40")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert (data["limit"], data["offset"], data["total"]) == (20, 40, 120)
+        search_odoo.search_members_by_name.assert_called_once_with("ma", limit=20, offset=40, with_images=False)
+
+    def test_full_mode_opt_in(self, client, search_odoo):
+        """Full mode keeps the previous unbounded response with image and raw."""
+        response = client.get("/api/members/search?name=ma&mode=full")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["members"][0]["image"] == "c21hbGw="
+        assert data["members"][0]["raw"]["email"] == "member@example.org"
+        assert data["total"] == 2
+        search_odoo.search_members_by_name.assert_called_once_with("ma", limit=None, offset=0, with_images=True)
+        search_odoo.count_members_by_name.assert_not_called()
+
+    def test_zero_padded_offset(self, client, search_odoo):
+        response = client.get("/api/members/search?name=ma&offset=00")
+
+        assert response.status_code == 200
+        assert json.loads(response.data)["offset"] == 0
+
+    @pytest.mark.parametrize(
+        "query",
+        ["limit=0", "limit=abc", "limit=500", "offset=-1", "offset=abc", "mode=huge"],
+    )
+    def test_invalid_parameters(self, client, search_odoo, query):
+        response = client.get(f"/api/members/search?name=ma&{query}")
+
+        assert response.status_code == 400
+        search_odoo.search_members_by_name.assert_not_called()
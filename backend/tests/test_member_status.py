@@ -127,6 +127,34 @@ class TestMemberStatusAPI:
         data = response.get_json()
         assert "error" in data
 
+    @patch("app.odoo")
+    def test_get_member_status_stored_counters(self, mock_odoo, client):
+        """Test counters and deadlines stored on res.partner are returned."""
+        mock_odoo.get_member_status.return_value = {
+            "id": 321,
+            "name": "DELAY, Member",
+            "cooperative_state": "delay",
+            "is_worker_member": True,
+            "shift_type": "standard",
+            "is_unsubscribed": False,
+            "customer": True,
+            "final_standard_point": -2.0,
+            "final_ftop_point": 0.0,
+            "date_alert_stop": "2025-03-01",
+            "date_delay_stop": False,
+        }
+
+        response = client.get("/api/member/321/status")
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data["counters"] == {"standard": -2, "ftop": 0}
+        assert data["date_alert_stop"] == "2025-03-01"
+        assert data["date_delay_stop"] is None
+        # Not reconciled without ?reconcile=true
+        assert data["counters_match"] is None
+        mock_odoo.get_member_counter_events.assert_not_called()
+
     @patch("app.odoo")
     def test_get_member_status_unsubscribed(self, mock_odoo, client):
         """Test unsubscribed member status."""
@@ -146,3 +174,74 @@ class TestMemberStatusAPI:
         data = response.get_json()
         assert data["cooperative_state"] == "unsubscribed"
         assert data["is_unsubscribed"] is True
+
+
+class TestMembersStatusBatchAPI:
+    """Test cases for the batch member status endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        app.config["TESTING"] = True
+        with app.test_client() as client:
+            yield client
+
+    @staticmethod
+    def statuses(*ids):
+        return {
+            i: {
+                "id": i,
+                "name": f"MEMBER, {i}",
+                "cooperative_state": "up_to_date",
+                "is_worker_member": True,
+                "shift_type": "standard",
+                "is_unsubscribed": False,
+                "customer": True,
+            }
+            for i in ids
+        }
+
+    @patch("app.odoo")
+    def test_query_string_ids(self, mock_odoo, client):
+        """One Odoo call for all ids, map keyed by id, missing ids listed."""
+        mock_odoo.get_members_status.return_value = self.statuses(1, 3)
+
+        response = client.get("/api/members/status?ids=1,2,3,1")
+        assert response.status_code == 200
+
+        data = response.get_json()
+        mock_odoo.get_members_status.assert_called_once_with([1, 2, 3])
+        assert set(data["members"]) == {"1", "3"}
+        assert data["members"]["3"]["member_id"] == 3
+        assert data["members"]["3"]["cooperative_state"] == "up_to_date"
+        assert data["missing"] == [2]
+
+    @patch("app.odoo")
+    def test_post_body_ids(self, mock_odoo, client):
+        mock_odoo.get_members_status.return_value = self.statuses(5)
+
+        response = client.post("/api/members/status", json={"ids": [5]})
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data["members"]["5"]["name"] == "MEMBER, 5"
+        assert data["missing"] == []
+
+    @patch("app.odoo")
+    def test_batch_size_capped(self, mock_odoo, client):
+        response = client.post("/api/members/status", json={"ids": list(range(1, 102))})
+        assert response.status_code == 400
+        mock_odoo.get_members_status.assert_not_called()
+
+    @pytest.mark.parametrize("query", ["", "?ids=", "?ids=1,abc", "?ids=0"])
+    @patch("app.odoo")
+    def test_invalid_ids(self, mock_odoo, client, query):
+        response = client.get(f"/api/members/status{query}")
+        assert response.status_code == 400
+
+    @patch("app.odoo")
+    def test_odoo_error(self, mock_odoo, client):
+        mock_odoo.get_members_status.side_effect = Exception("Odoo connection failed")
+
+        response = client.get("/api/members/status?ids=1")
+        assert response.status_code == 500
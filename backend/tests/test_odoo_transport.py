@@ -0,0 +1,255 @@
+"""
+Tests for odoo_transport module.
+
+Runs local threaded XML-RPC and JSON-RPC servers to check connection reuse,
+pool bounds, thread safety and protocol selection.
+"""
+
+import gzip
+import json
+import threading
+import time
+import xmlrpc.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+import pytest
+from odoo_client import OdooClient
+from odoo_transport import ConnectionPool, JsonRpcProxy, PooledTransport
+
+
+class KeepAliveHandler(SimpleXMLRPCRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadedXMLRPCServer(ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+
+
+def build_transport(url, pool_size=10, idle_timeout=60.0):
+    return PooledTransport(ConnectionPool(url, max_size=pool_size, idle_timeout=idle_timeout))
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadedXMLRPCServer(
+        ("127.0.0.1", 0), requestHandler=KeepAliveHandler, logRequests=False
+    )
+    server.register_function(lambda x: x * 2, "double")
+    server.register_function(lambda delay: time.sleep(delay) or True, "sleep")
+    server.register_function(lambda: 1 / 0, "fail")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestPooledTransport:
+    """Test suite for PooledTransport and ConnectionPool."""
+
+    def test_sequential_calls_reuse_one_connection(self, server_url):
+        """Keep-alive: one TCP connection should serve all sequential calls."""
+        transport = build_transport(server_url, pool_size=4)
+        proxy = xmlrpc.client.ServerProxy(server_url, transport=transport)
+
+        for i in range(10):
+            assert proxy.double(i) == i * 2
+
+        stats = transport.pool.stats()
+        assert stats["checkouts"] == 10
+        assert stats["created"] == 1
+        assert stats["reused"] == 9
+        assert stats["in_use"] == 0
+        assert stats["idle"] == 1
+
+    def test_concurrent_calls_share_one_proxy(self, server_url):
+        """A single ServerProxy can be used from many threads at once."""
+        transport = build_transport(server_url, pool_size=4)
+        proxy = xmlrpc.client.ServerProxy(server_url, transport=transport)
+        results = {}
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(5):
+                    results[(n, i)] = proxy.double(n * 100 + i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert all(results[(n, i)] == (n * 100 + i) * 2 for n in range(8) for i in range(5))
+        stats = transport.pool.stats()
+        assert stats["created"] <= 4
+        assert stats["peak_in_use"] <= 4
+
+    def test_pool_size_bounds_concurrency(self, server_url):
+        """Callers beyond the pool size wait for a free connection."""
+        transport = build_transport(server_url, pool_size=2)
+        proxy = xmlrpc.client.ServerProxy(server_url, transport=transport)
+
+        threads = [threading.Thread(target=proxy.sleep, args=(0.05,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = transport.pool.stats()
+        assert stats["peak_in_use"] == 2
+        assert stats["created"] == 2
+        assert stats["waits"] >= 1
+
+    def test_fault_keeps_connection(self, server_url):
+        """XML-RPC faults are normal responses; the connection stays pooled."""
+        transport = build_transport(server_url)
+        proxy = xmlrpc.client.ServerProxy(server_url, transport=transport)
+
+        with pytest.raises(xmlrpc.client.Fault):
+            proxy.fail()
+        assert proxy.double(2) == 4
+
+        stats = transport.pool.stats()
+        assert stats["created"] == 1
+        assert stats["closed_broken"] == 0
+
+    def test_idle_connections_expire(self, server_url):
+        """Connections idle longer than idle_timeout are closed, not reused."""
+        transport = build_transport(server_url, idle_timeout=0.01)
+        proxy = xmlrpc.client.ServerProxy(server_url, transport=transport)
+
+        proxy.double(1)
+        time.sleep(0.03)
+        proxy.double(2)
+
+        stats = transport.pool.stats()
+        assert stats["created"] == 2
+        assert stats["closed_idle"] == 1
+
+    def test_checkout_timeout(self, server_url):
+        """acquire() gives up after checkout_timeout when the pool is exhausted."""
+        pool = ConnectionPool(server_url, max_size=1, checkout_timeout=0.05)
+        connection, _ = pool.acquire()
+
+        with pytest.raises(TimeoutError):
+            pool.acquire()
+
+        pool.release(connection)
+        second, reused = pool.acquire()
+        assert second is connection
+        assert reused is True
+
+    def test_rejects_unsupported_scheme(self):
+        """Only http and https URLs can be pooled."""
+        with pytest.raises(ValueError, match="Unsupported URL scheme"):
+            ConnectionPool("ftp://odoo.example.com")
+
+
+class FakeOdooJsonRpcHandler(BaseHTTPRequestHandler):
+    """Minimal emulation of Odoo's /jsonrpc endpoint."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        params = request["params"]
+        reply = {"jsonrpc": "2.0", "id": request["id"]}
+        if params["service"] == "common" and params["method"] == "authenticate":
+            reply["result"] = 7
+        elif params["service"] == "object" and params["method"] == "execute_kw":
+            db, uid, password, model, method, args, kwargs = params["args"]
+            if model == "broken.model":
+                reply["error"] = {
+                    "code": 200,
+                    "message": "Odoo Server Error",
+                    "data": {"name": "ValueError", "debug": "Traceback: boom", "message": "boom"},
+                }
+            else:
+                reply["result"] = [
+                    {"id": 1, "model": model, "method": method, "domain": args[0], "fields": kwargs.get("fields")}
+                ]
+        else:
+            reply["error"] = {"code": 404, "message": "Unknown service"}
+
+        body = json.dumps(reply).encode()
+        compress = "gzip" in self.headers.get("Accept-Encoding", "")
+        if compress:
+            body = gzip.compress(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def jsonrpc_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOdooJsonRpcHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestJsonRpcProxy:
+    """Test suite for the JSON-RPC backend."""
+
+    def test_call_returns_result_over_kept_alive_connection(self, jsonrpc_url):
+        """Calls are JSON-encoded, gzip responses decoded, connections reused."""
+        pool = ConnectionPool(jsonrpc_url)
+        proxy = JsonRpcProxy(pool, "object")
+
+        for _ in range(3):
+            result = proxy.execute_kw(
+                "db", 7, "pw", "res.partner", "search_read", [[["name", "ilike", "ma"]]], {"fields": ["name"]}
+            )
+
+        assert result == [
+            {"id": 1, "model": "res.partner", "method": "search_read", "domain": [["name", "ilike", "ma"]], "fields": ["name"]}
+        ]
+        stats = pool.stats()
+        assert stats["created"] == 1
+        assert stats["reused"] == 2
+
+    def test_server_error_raises_fault(self, jsonrpc_url):
+        """Odoo errors surface as xmlrpc.client.Fault, like the XML-RPC backend."""
+        pool = ConnectionPool(jsonrpc_url)
+        proxy = JsonRpcProxy(pool, "object")
+
+        with pytest.raises(xmlrpc.client.Fault, match="boom"):
+            proxy.execute_kw("db", 7, "pw", "broken.model", "read", [[1]], {})
+        assert pool.stats()["closed_broken"] == 0
+
+    def test_odoo_client_uses_jsonrpc_when_configured(self, jsonrpc_url, monkeypatch):
+        """ODOO_PROTOCOL=jsonrpc switches OdooClient without changing its API."""
+        monkeypatch.setenv("ODOO_URL", jsonrpc_url)
+        monkeypatch.setenv("ODOO_PROTOCOL", "jsonrpc")
+        client = OdooClient()
+
+        assert client.authenticate() is True
+        assert client.uid == 7
+        rows = client.search_read("res.partner", [("id", "=", 1)], ["name"])
+        assert rows[0]["model"] == "res.partner"
+        assert rows[0]["domain"] == [["id", "=", 1]]
+        assert client.get_transport_stats()["protocol"] == "jsonrpc"
+
+    def test_invalid_protocol_rejected(self, monkeypatch):
+        """Unknown protocols are reported at construction time."""
+        monkeypatch.setenv("ODOO_PROTOCOL", "soap")
+        with pytest.raises(ValueError, match="ODOO_PROTOCOL"):
+            OdooClient()
@@ -0,0 +1,176 @@
+"""
+Tests for response_cache module and the cached member endpoints.
+"""
+
+import threading
+import time
+
+import pytest
+import app
+from caching import refresh_executor
+from response_cache import ResponseCache
+from tests.test_caching import Loader
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache."""
+
+    def test_served_within_soft_ttl(self):
+        loader = Loader()
+        cache = ResponseCache(soft_ttl=60, hard_ttl=600)
+
+        assert cache.get(("history", 1), loader) == {"version": 1}
+        assert cache.get(("history", 1), loader) == {"version": 1}
+        assert loader.calls == 1
+
+    def test_keys_are_independent(self):
+        loader = Loader()
+        cache = ResponseCache(soft_ttl=60, hard_ttl=600)
+
+        cache.get(("history", 1, 13, None), loader)
+        cache.get(("history", 1, 3, None), loader)
+
+        assert loader.calls == 2
+        assert cache.stats()["entries"] == 2
+
+    def test_stale_copy_served_while_refreshing(self):
+        """Between soft and hard TTL the old response is returned at once."""
+        loader = Loader()
+        cache = ResponseCache(soft_ttl=0, hard_ttl=600)
+
+        cache.get(("status", 1), loader)
+        loader.called.clear()
+
+        assert cache.get(("status", 1), loader) == {"version": 1}
+        assert loader.called.wait(1)
+        for _ in range(100):
+            if cache.get(("status", 1), loader)["version"] >= 2:
+                break
+            time.sleep(0.01)
+        assert cache.stats()["refreshes"] >= 1
+
+    def test_rebuilt_after_hard_ttl(self):
+        loader = Loader()
+        cache = ResponseCache(soft_ttl=0.01, hard_ttl=0.01)
+
+        cache.get(("shares", 1), loader)
+        time.sleep(0.02)
+
+        assert cache.get(("shares", 1), loader) == {"version": 2}
+
+    def test_failed_build_not_cached(self):
+        loader = Loader()
+        loader.fail = True
+        cache = ResponseCache(soft_ttl=60, hard_ttl=600)
+
+        with pytest.raises(ConnectionError):
+            cache.get(("history", 1), loader)
+
+        assert cache.stats()["entries"] == 0
+        loader.fail = False
+        assert cache.get(("history", 1), loader) == {"version": 2}
+
+    def test_not_served_past_hard_ttl_on_error(self):
+        loader = Loader()
+        cache = ResponseCache(soft_ttl=0.01, hard_ttl=0.01)
+        cache.get(("status", 1), loader)
+        time.sleep(0.02)
+        loader.fail = True
+
+        with pytest.raises(ConnectionError):
+            cache.get(("status", 1), loader)
+
+    def test_burst_of_stale_entries_refreshed_on_bounded_pool(self):
+        loader = Loader()
+        cache = ResponseCache(soft_ttl=0, hard_ttl=600)
+        for member_id in range(50):
+            cache.get(("status", member_id), loader)
+        before = threading.active_count()
+
+        for member_id in range(50):
+            cache.get(("status", member_id), loader)
+
+        assert threading.active_count() - before <= refresh_executor._max_workers
+
+    def test_least_recently_used_evicted(self):
+        loader = Loader()
+        cache = ResponseCache(soft_ttl=60, hard_ttl=600, max_entries=2)
+
+        cache.get(("status", 1), loader)
+        cache.get(("status", 2), loader)
+        cache.get(("status", 1), loader)
+        cache.get(("status", 3), loader)
+
+        assert cache.stats()["evictions"] == 1
+        calls = loader.calls
+        cache.get(("status", 1), loader)
+        assert loader.calls == calls
+        cache.get(("status", 2), loader)
+        assert loader.calls == calls + 1
+
+    def test_purge_drops_only_the_member(self):
+        loader = Loader()
+        cache = ResponseCache(soft_ttl=60, hard_ttl=600)
+        cache.get(("history", 1, 13, None), loader)
+        cache.get(("status", 1), loader)
+        cache.get(("status", 2), loader)
+
+        assert cache.purge(1) == 2
+
+        assert cache.stats()["entries"] == 1
+        cache.get(("status", 1), loader)
+        assert loader.calls == 4
+
+    def test_disabled_with_zero_hard_ttl(self):
+        loader = Loader()
+        cache = ResponseCache(soft_ttl=0, hard_ttl=0)
+
+        cache.get(("status", 1), loader)
+        cache.get(("status", 1), loader)
+
+        assert loader.calls == 2
+        assert cache.stats()["entries"] == 0
+
+
+class TestCachedMemberEndpoints:
+    """Test suite for the cached status/shares endpoints and the purge endpoint."""
+
+    @pytest.fixture
+    def odoo(self, mock_odoo_client, mocker):
+        mock_odoo_client.get_member_status.return_value = {
+            "id": 123,
+            "name": "TEST, Member",
+            "cooperative_state": "up_to_date",
+        }
+        mock_odoo_client.get_member_share_information.return_value = {"total_shares": 2}
+        mocker.patch("app.odoo", mock_odoo_client)
+        mocker.patch("app.response_cache", ResponseCache(soft_ttl=60, hard_ttl=600))
+        return mock_odoo_client
+
+    def test_repeated_views_served_from_cache(self, client, odoo):
+        for _ in range(3):
+            assert client.get("/api/member/123/status").status_code == 200
+            assert client.get("/api/member/123/shares").status_code == 200
+
+        assert odoo.get_member_status.call_count == 1
+        assert odoo.get_member_share_information.call_count == 1
+        assert app.response_cache.stats()["hits"] == 4
+
+    def test_purge_endpoint(self, client, odoo):
+        client.get("/api/member/123/status")
+        odoo.get_member_status.return_value = dict(
+            odoo.get_member_status.return_value, cooperative_state="suspended"
+        )
+
+        response = client.delete("/api/member/123/cache")
+
+        assert response.get_json() == {"member_id": 123, "purged": 1}
+        data = client.get("/api/member/123/status").get_json()
+        assert data["cooperative_state"] == "suspended"
+
+    def test_errors_not_cached(self, client, odoo):
+        odoo.get_member_share_information.side_effect = Exception("Odoo timeout")
+        assert client.get("/api/member/123/shares").status_code == 500
+
+        odoo.get_member_share_information.side_effect = None
+        assert client.get("/api/member/123/shares").status_code == 200
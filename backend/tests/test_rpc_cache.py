@@ -0,0 +1,187 @@
+"""
+Tests for rpc_cache module and the memoized OdooClient calls.
+"""
+
+import time
+
+import pytest
+from odoo_client import OdooClient
+from rpc_cache import RpcCache, make_key, parse_model_ttls
+
+
+class Rpc:
+    """Callable standing in for one Odoo call, counting round trips."""
+
+    def __init__(self, result=None):
+        self.result = result if result is not None else [{"id": 1, "name": "Shift"}]
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+class TestRpcCache:
+    """Test suite for RpcCache."""
+
+    def test_read_answered_from_cache(self):
+        cache = RpcCache({"shift.shift": 60})
+        rpc = Rpc()
+
+        for _ in range(3):
+            assert cache.call("shift.shift", "read", [[1]], {"fields": ["name"]}, rpc) == rpc.result
+
+        assert rpc.calls == 1
+        assert cache.stats()["hits"] == 2
+
+    def test_models_without_ttl_not_cached(self):
+        cache = RpcCache({"shift.shift": 60})
+        rpc = Rpc()
+
+        cache.call("res.partner", "read", [[1]], {}, rpc)
+        cache.call("res.partner", "read", [[1]], {}, rpc)
+
+        assert rpc.calls == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_expired_after_ttl(self):
+        cache = RpcCache({"shift.counter.event": 0.01})
+        rpc = Rpc()
+
+        cache.call("shift.counter.event", "search_count", [[]], {}, rpc)
+        time.sleep(0.02)
+        cache.call("shift.counter.event", "search_count", [[]], {}, rpc)
+
+        assert rpc.calls == 2
+
+    def test_writes_not_cached_and_invalidate_model(self):
+        cache = RpcCache({"shift.shift": 60, "shift.type": 60})
+        rpc = Rpc()
+        cache.call("shift.shift", "read", [[1]], {}, rpc)
+        cache.call("shift.type", "read", [[1]], {}, rpc)
+
+        cache.call("shift.shift", "write", [[1], {"name": "Renamed"}], {}, rpc)
+        cache.call("shift.shift", "write", [[1], {"name": "Renamed"}], {}, rpc)
+        cache.call("shift.shift", "read", [[1]], {}, rpc)
+        cache.call("shift.type", "read", [[1]], {}, rpc)
+
+        assert rpc.calls == 5
+        assert cache.stats()["invalidations"] == 1
+
+    def test_equivalent_calls_share_a_key(self):
+        assert make_key(
+            "shift.registration",
+            "search_read",
+            [[("partner_id", "=", 1), ("state", "in", ["done", "absent"])]],
+            {"fields": ["id", "state"], "order": "date_begin desc"},
+        ) == make_key(
+            "shift.registration",
+            "search_read",
+            [[["partner_id", "=", 1], ["state", "in", ("done", "absent")]]],
+            {"order": "date_begin desc", "fields": ["state", "id"]},
+        )
+        assert make_key("shift.shift", "read", [[1]], {"limit": 1}) != make_key(
+            "shift.shift", "read", [[1]], {"limit": 2}
+        )
+
+    def test_callers_get_private_copies(self):
+        cache = RpcCache({"shift.shift": 60})
+        rpc = Rpc()
+
+        first = cache.call("shift.shift", "read", [[1]], {}, rpc)
+        first[0]["name"] = "Decorated"
+        second = cache.call("shift.shift", "read", [[1]], {}, rpc)
+        second[0]["extra"] = True
+
+        assert cache.call("shift.shift", "read", [[1]], {}, rpc) == [{"id": 1, "name": "Shift"}]
+
+    def test_lru_eviction_by_entries(self):
+        cache = RpcCache({"shift.shift": 60}, max_entries=2)
+        rpc = Rpc()
+
+        for ids in ([1], [2], [1], [3]):
+            cache.call("shift.shift", "read", [ids], {}, rpc)
+        cache.call("shift.shift", "read", [[1]], {}, rpc)
+
+        assert rpc.calls == 3
+        assert cache.stats()["evictions"] == 1
+        cache.call("shift.shift", "read", [[2]], {}, rpc)
+        assert rpc.calls == 4
+
+    def test_lru_eviction_by_bytes(self):
+        rpc = Rpc([{"id": 1, "name": "x" * 1000}])
+        cache = RpcCache({"shift.shift": 60}, max_bytes=2500)
+
+        for shift_id in range(5):
+            cache.call("shift.shift", "read", [[shift_id]], {}, rpc)
+
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] <= 2500
+        assert stats["evictions"] == 3
+
+    def test_oversized_results_not_cached(self):
+        rpc = Rpc([{"id": 1, "name": "x" * 1000}])
+        cache = RpcCache({"shift.shift": 60}, max_bytes=100)
+
+        cache.call("shift.shift", "read", [[1]], {}, rpc)
+
+        assert cache.stats()["entries"] == 0
+
+    def test_errors_not_cached(self):
+        cache = RpcCache({"shift.shift": 60})
+
+        def failing():
+            raise ConnectionError("Odoo down")
+
+        with pytest.raises(ConnectionError):
+            cache.call("shift.shift", "read", [[1]], {}, failing)
+        assert cache.stats()["entries"] == 0
+
+    def test_parse_model_ttls(self):
+        ttls = parse_model_ttls("shift.shift=60, shift.counter.event=0,res.partner=10")
+
+        assert ttls["shift.shift"] == 60
+        assert ttls["shift.counter.event"] == 0
+        assert ttls["res.partner"] == 10
+        assert "shift.type" not in ttls
+        with pytest.raises(ValueError):
+            parse_model_ttls("shift.shift")
+
+
+class TestMemoizedOdooClient:
+    """Test suite for OdooClient helpers going through the RPC memo."""
+
+    @pytest.fixture
+    def client(self, mocker):
+        client = OdooClient()
+        client.uid = 1
+        client.models = mocker.MagicMock()
+
+        client.models.execute_kw.return_value = []
+        return client
+
+    def models_called(self, client):
+        return [c.args[3] for c in client.models.execute_kw.call_args_list]
+
+    def test_helpers_go_through_memo(self, client):
+        first = client.get_member_counter_events(140)
+        second = client.get_member_counter_events(140)
+
+        assert first == second
+        assert self.models_called(client) == ["shift.counter.event"]
+        assert client.get_cache_stats()["rpc"]["hits"] == 1
+
+    def test_generic_execute_goes_through_memo(self, client):
+        client.rpc_cache.model_ttls["shift.type"] = 3600
+        client.execute("shift.type", "search_read", [], fields=["name"])
+        client.execute("shift.type", "search_read", [], fields=["name"])
+
+        assert client.models.execute_kw.call_count == 1
+
+    @pytest.mark.parametrize("model", ["shift.shift", "shift.type", "res.config.settings"])
+    def test_models_with_own_caches_not_memoized_by_default(self, client, model):
+        client.execute(model, "search_read", [], fields=["name"])
+        client.execute(model, "search_read", [], fields=["name"])
+
+        assert client.models.execute_kw.call_count == 2
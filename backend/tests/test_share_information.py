@@ -0,0 +1,98 @@
+"""
+Tests for OdooClient.get_member_share_information() and build_share_information().
+"""
+
+import pytest
+from odoo_client import OdooClient, build_share_information
+
+
+def share_record(share_id, create_date, invoice_ids):
+    return {
+        "id": share_id,
+        "owned_share": 1,
+        "create_date": create_date,
+        "related_invoice_ids": invoice_ids,
+    }
+
+
+def invoice(invoice_id, date):
+    return {"id": invoice_id, "date": date, "number": f"SUB/{invoice_id}", "state": "paid", "amount_total": 10.0}
+
+
+@pytest.fixture
+def founding_member():
+    """Member with one share record per year and one invoice each (ids 100+)."""
+    records = [share_record(i, f"{2010 + i}-03-01 10:00:00", [[100 + i, f"SUB/{100 + i}"]]) for i in range(12)]
+    records.append(share_record(50, "2024-01-01 10:00:00", []))
+    invoices = {100 + i: invoice(100 + i, f"{2010 + i}-02-27") for i in range(12)}
+    return records, invoices
+
+
+@pytest.fixture
+def client(mocker, founding_member):
+    records, invoices = founding_member
+    client = OdooClient()
+    client.uid = 1
+    client.models = mocker.MagicMock()
+
+    def execute_kw(db, uid, password, model, method, args, kwargs):
+        if model == "res.partner":
+            return [{"id": 140, "total_partner_owned_share": 13}]
+        if model == "res.partner.owned.share":
+            return records
+        return [invoices[i] for i in args[0]]
+
+    client.models.execute_kw.side_effect = execute_kw
+    return client
+
+
+class TestShareInformation:
+    """Test suite for share information assembly."""
+
+    def test_at_most_three_round_trips(self, client):
+        data = client.get_member_share_information(140)
+
+        models = [c.args[3] for c in client.models.execute_kw.call_args_list]
+        assert models == ["res.partner", "res.partner.owned.share", "account.invoice"]
+        assert client.models.execute_kw.call_args.args[5] == [[100 + i for i in range(12)]]
+        assert data["total_shares"] == 13
+        assert len(data["share_purchases"]) == 13
+
+    def test_invoices_distributed_to_their_records(self, client):
+        data = client.get_member_share_information(140)
+
+        purchases = {p["share_id"]: p for p in data["share_purchases"]}
+        assert [inv["invoice_id"] for inv in purchases[3]["invoices"]] == [103]
+        assert purchases[3]["invoices"][0]["invoice_date"] == "2013-02-27"
+        assert purchases[50]["invoices"] == []
+        assert data["first_purchase_date"] == "2010-02-27"
+        assert data["join_date"] == data["first_purchase_date"]
+
+    def test_no_invoice_read_without_invoices(self, client, mocker):
+        client.models.execute_kw.side_effect = lambda db, uid, pw, model, method, args, kwargs: (
+            [{"total_partner_owned_share": 1}]
+            if model == "res.partner"
+            else [share_record(1, "2020-05-01 10:00:00", [])]
+        )
+
+        data = client.get_member_share_information(140)
+
+        assert client.models.execute_kw.call_count == 2
+        assert data["first_purchase_date"] == "2020-05-01 10:00:00"
+
+    def test_same_result_as_per_record_reads(self, founding_member):
+        records, invoices = founding_member
+
+        data = build_share_information(13, records, invoices)
+
+        expected_first = min(inv["date"] for inv in invoices.values())
+        assert data["first_purchase_date"] == expected_first
+        assert [p["share_id"] for p in data["share_purchases"]] == [r["id"] for r in records]
+
+    def test_failed_invoice_read_leaves_out_invoiced_records(self, founding_member):
+        records, _ = founding_member
+
+        data = build_share_information(13, records, None)
+
+        assert [p["share_id"] for p in data["share_purchases"]] == [50]
+        assert data["first_purchase_date"] == "2024-01-01 10:00:00"
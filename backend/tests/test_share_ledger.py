@@ -0,0 +1,186 @@
+"""
+Tests for share_ledger module and the ledger-backed share endpoints.
+
+Checks that the snapshot gives the same share information as the per-member
+Odoo lookup, is loaded in a few paged RPCs and follows share record and
+invoice changes incrementally.
+"""
+
+import pytest
+from odoo_client import OdooClient
+from share_ledger import ShareLedger
+
+
+def evaluate(record, domain):
+    for field, op, value in domain:
+        actual = record.get(field)
+        if isinstance(actual, list):
+            actual = actual[0]
+        if op == "=" and actual != value:
+            return False
+        if op == "in" and actual not in value:
+            return False
+        if op == ">=" and not (actual or "") >= value:
+            return False
+    return True
+
+
+class FakeShareOdoo:
+    """res.partner.owned.share, account.invoice and res.partner rows of a cooperative."""
+
+    def __init__(self, members=30):
+        self.shares, self.invoices, self.partners = [], {}, {}
+        self.calls = []
+        share_id, invoice_id = 1, 1000
+        for partner_id in range(100, 100 + members):
+            for n in range(1 + partner_id % 3):
+                invoice_ids = []
+                if (partner_id + n) % 4:
+                    self.invoices[invoice_id] = {
+                        "id": invoice_id, "date": f"{2012 + n}-0{1 + partner_id % 9}-15", "number": f"SUB/{invoice_id}",
+                        "state": "paid", "amount_total": 10.0, "write_date": f"2024-01-01 00:{invoice_id % 60:02d}:00",
+                    }
+                    invoice_ids = [[invoice_id, f"SUB/{invoice_id}"]]
+                    invoice_id += 1
+                self.shares.append({
+                    "id": share_id, "partner_id": [partner_id, f"Member {partner_id}"], "owned_share": 1 + n,
+                    "create_date": f"{2012 + n}-02-01 10:00:00", "related_invoice_ids": invoice_ids,
+                    "write_date": f"2024-01-01 {share_id // 60:02d}:{share_id % 60:02d}:00",
+                })
+                share_id += 1
+            self.partners[partner_id] = {
+                "id": partner_id,
+                "total_partner_owned_share": sum(s["owned_share"] for s in self.shares if s["partner_id"][0] == partner_id),
+            }
+
+    def execute_kw(self, db, uid, password, model, method, args, kwargs):
+        self.calls.append((model, method))
+        fields = kwargs.get("fields")
+
+        def project(record):
+            return {f: record.get(f) for f in ["id"] + fields} if fields else dict(record)
+
+        if model == "res.partner":
+            return [project(self.partners[i]) for i in args[0] if i in self.partners]
+        rows = self.shares if model == "res.partner.owned.share" else list(self.invoices.values())
+        if method == "read":
+            return [project(self.invoices[i]) for i in args[0]]
+        matched = [r for r in rows if evaluate(r, args[0])]
+        if method == "search_count":
+            return len(matched)
+        if kwargs.get("order") == "create_date asc":
+            matched.sort(key=lambda r: (r["create_date"], r["id"]))
+        offset = kwargs.get("offset", 0)
+        limit = kwargs.get("limit")
+        matched = matched[offset:offset + limit] if limit else matched[offset:]
+        return [project(r) for r in matched]
+
+
+@pytest.fixture
+def fake():
+    return FakeShareOdoo()
+
+
+@pytest.fixture
+def odoo(mocker, fake):
+    odoo = OdooClient()
+    odoo.uid = 1
+    odoo.models = mocker.MagicMock()
+    odoo.models.execute_kw.side_effect = fake.execute_kw
+    return odoo
+
+
+@pytest.fixture
+def ledger(odoo, tmp_path):
+    return ShareLedger(odoo, path=str(tmp_path / "ledger.sqlite3"), page_size=25)
+
+
+class TestShareLedger:
+    """Test suite for ShareLedger."""
+
+    def test_same_as_per_member_lookup(self, odoo, fake, ledger):
+        ledger.ensure_fresh()
+
+        for partner_id in fake.partners:
+            assert ledger.get(partner_id) == odoo.get_member_share_information(partner_id)
+
+    def test_loaded_in_a_few_paged_rpcs(self, fake, ledger):
+        ledger.ensure_fresh()
+
+        # 60 share records, 45 invoices and 30 partners in pages of 25
+        assert len(fake.calls) == 3 + 2 + 2
+        members = ledger.list_members()
+        assert len(members) == 30
+        assert members[1] == {"member_id": 101, "total_shares": 6, "join_date": "2012-03-15"}
+
+    def test_incremental_refresh_rebuilds_changed_members(self, fake, ledger):
+        ledger.ensure_fresh()
+        share = next(s for s in fake.shares if s["partner_id"][0] == 103)
+        share["owned_share"] = 5
+        share["write_date"] = "2025-01-01 00:00:00"
+        fake.partners[103]["total_partner_owned_share"] = 9
+        first_share = next(s for s in fake.shares if s["partner_id"][0] == 101)
+        invoice = fake.invoices[first_share["related_invoice_ids"][0][0]]
+        invoice["date"] = "2010-01-01"
+        invoice["write_date"] = "2025-01-01 00:00:00"
+        fake.calls.clear()
+
+        ledger._cache.invalidate()
+        ledger.ensure_fresh()
+
+        assert ledger.get(103)["total_shares"] == 9
+        assert ledger.get(103)["share_purchases"][0]["shares_purchased"] == 5
+        assert ledger.get(101)["first_purchase_date"] == "2010-01-01"
+        assert ("res.partner.owned.share", "search_count") in fake.calls
+        assert len(fake.calls) <= 6
+
+    def test_deleted_share_record_reloads(self, fake, ledger):
+        ledger.ensure_fresh()
+        fake.shares = [s for s in fake.shares if s["partner_id"][0] != 104]
+
+        ledger._cache.invalidate()
+        ledger.ensure_fresh()
+
+        assert ledger.get(104) is None
+        assert len(ledger.list_members()) == 29
+
+    def test_snapshot_persisted_across_restarts(self, odoo, fake, ledger):
+        ledger.ensure_fresh()
+        fake.calls.clear()
+
+        restarted = ShareLedger(odoo, path=ledger.path)
+
+        assert restarted.ready
+        assert restarted.get(105) == ledger.get(105)
+        assert fake.calls == []
+
+
+class TestLedgerEndpoints:
+    """Test suite for share endpoints served from the ledger."""
+
+    @pytest.fixture
+    def app_ledger(self, mocker, ledger):
+        ledger.ensure_fresh()
+        mocker.patch("app.share_ledger", ledger)
+        return ledger
+
+    def test_members_shares_report(self, client, app_ledger):
+        response = client.get("/api/members/shares")
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data["count"] == 30
+        assert data["members"][1]["member_id"] == 101
+
+    def test_member_shares_from_ledger(self, client, app_ledger, mock_odoo_client, mocker):
+        mocker.patch("app.odoo", mock_odoo_client)
+
+        data = client.get("/api/member/102/shares").get_json()
+
+        assert data["total_shares"] == app_ledger.get(102)["total_shares"]
+        mock_odoo_client.get_member_share_information.assert_not_called()
+
+    def test_report_unavailable_without_ledger(self, client, mocker):
+        mocker.patch("app.share_ledger", None)
+
+        assert client.get("/api/members/shares").status_code == 503
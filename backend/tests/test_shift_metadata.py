@@ -0,0 +1,153 @@
+"""
+Tests for shift_metadata module (shift.shift metadata cache).
+"""
+
+import time
+
+import pytest
+from odoo_client import OdooClient
+from shift_metadata import ShiftMetadataCache, shift_type_kind
+
+
+def shift(shift_id, type_name="Standard"):
+    return {
+        "id": shift_id,
+        "name": f"Shift {shift_id}",
+        "date_begin": "2025-02-20 16:00:00",
+        "week_number": 3,
+        "week_name": "C",
+        "shift_type_id": [1 if type_name == "Standard" else 2, type_name],
+    }
+
+
+class FakeShiftOdoo:
+    """OdooClient stand-in serving shift.shift reads and search_reads."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, model, method, *args, fields=None):
+        self.calls.append((method, args[0]))
+        if method == "read":
+            return [shift(sid) for sid in args[0] if sid < 1000]
+        return [shift(sid) for sid in (900, 901, 902)]
+
+    def get_shift_config(self):
+        return {"weeks_per_cycle": 4, "week_a_date": "2025-01-13"}
+
+
+class TestShiftMetadataCache:
+    """Test suite for ShiftMetadataCache."""
+
+    def test_only_unknown_shifts_read(self):
+        odoo = FakeShiftOdoo()
+        cache = ShiftMetadataCache(odoo)
+
+        cache.get_shifts([1, 2])
+        shifts = cache.get_shifts([2, 3, 3, None])
+
+        assert odoo.calls == [("read", [1, 2]), ("read", [3])]
+        assert set(shifts) == {2, 3}
+        assert shifts[3]["name"] == "Shift 3"
+        assert cache.stats()["hits"] == 1
+
+    def test_unknown_ids_absent_and_retried(self):
+        odoo = FakeShiftOdoo()
+        cache = ShiftMetadataCache(odoo)
+
+        assert cache.get_shifts([5000]) == {}
+        cache.get_shifts([5000])
+
+        assert len(odoo.calls) == 2
+
+    def test_bounded_lru(self):
+        odoo = FakeShiftOdoo()
+        cache = ShiftMetadataCache(odoo, max_entries=2)
+
+        cache.get_shifts([1, 2])
+        cache.get_shifts([1])
+        cache.get_shifts([3])
+        odoo.calls.clear()
+        cache.get_shifts([1, 2])
+
+        assert odoo.calls == [("read", [2])]
+        assert cache.stats()["evictions"] >= 1
+
+    def test_reread_after_ttl(self):
+        odoo = FakeShiftOdoo()
+        cache = ShiftMetadataCache(odoo, ttl=0.01)
+
+        cache.get_shifts([1])
+        time.sleep(0.02)
+        cache.get_shifts([1])
+
+        assert len(odoo.calls) == 2
+
+    def test_prefetched_shifts_served_without_read(self):
+        odoo = FakeShiftOdoo()
+        cache = ShiftMetadataCache(odoo)
+        cache.warm_up()
+        for _ in range(100):
+            if cache.stats()["entries"]:
+                break
+            time.sleep(0.01)
+
+        shifts = cache.get_shifts([900, 902])
+
+        assert [method for method, _ in odoo.calls] == ["search_read"]
+        assert set(shifts) == {900, 902}
+
+    def test_copies_returned(self):
+        cache = ShiftMetadataCache(FakeShiftOdoo())
+
+        cache.get_shifts([1])[1]["name"] = "Changed"
+
+        assert cache.get_shifts([1])[1]["name"] == "Shift 1"
+
+
+class TestShiftTypeKind:
+    """Test suite for shift_type_kind()."""
+
+    @pytest.mark.parametrize(
+        "shift_type_id, kind",
+        [
+            ([1, "Standard"], "standard"),
+            ([2, "FTOP"], "ftop"),
+            ([3, "Service Volant"], "ftop"),
+            (7, "standard"),
+            (False, None),
+        ],
+    )
+    def test_classification(self, shift_type_id, kind):
+        assert shift_type_kind(shift_type_id) == kind
+
+
+class TestSharedShiftMetadata:
+    """Test suite for the cache shared by the shift history and exchange lookups."""
+
+    def test_exchange_path_reuses_history_shifts(self, mocker):
+        import app
+
+        client = OdooClient()
+        client.uid = 1
+        client.models = mocker.MagicMock()
+        # Count every shift.shift round trip
+        client.rpc_cache.model_ttls = {}
+
+        def execute_kw(db, uid, password, model, method, args, kwargs):
+            if model == "shift.registration" and method == "search_read":
+                return [{"id": 10, "shift_id": [500, "Shift 500"], "state": "done",
+                         "exchange_replaced_reg_id": [11, "Reg 11"]}]
+            if model == "shift.registration":
+                return [{"id": 11, "shift_id": [500, "Shift 500"], "date_begin": "2025-02-20 16:00:00"}]
+            return [shift(500)]
+
+        client.models.execute_kw.side_effect = execute_kw
+        mocker.patch("app.odoo", client)
+
+        shifts = client.get_member_shift_history(140)
+        exchanges = app.fetch_exchange_registrations(shifts)
+
+        assert exchanges[11]["shift_name"] == "Shift 500"
+        models = [c.args[3] for c in client.models.execute_kw.call_args_list]
+        assert models.count("shift.shift") == 1
@@ -0,0 +1,68 @@
+"""
+Tests for timeline module.
+
+Checks that merging ordered streams gives the same events, in the same
+order, as sorting their concatenation by date (most recent first).
+"""
+
+import random
+
+from history_events import EVENT_TYPES
+from timeline import Timeline, event_date_key
+
+
+def event(kind, index, date):
+    return EVENT_TYPES[kind].from_json({"id": index, "date": date})
+
+
+def newest_first(events):
+    return sorted(events, key=event_date_key, reverse=True)
+
+
+def random_dates(rng, count):
+    # Few distinct dates, so that many events share one
+    return [f"2024-01-{rng.randint(1, 9):02d}" for _ in range(count)]
+
+
+class TestTimeline:
+    """Test suite for Timeline."""
+
+    def test_same_order_as_sorting_everything(self):
+        rng = random.Random(7)
+        purchases = newest_first([event("purchase", i, d) for i, d in enumerate(random_dates(rng, 200))])
+        shifts = [event("shift", i, d) for i, d in enumerate(random_dates(rng, 30))]
+        counters = newest_first([event("counter", i, d) for i, d in enumerate(random_dates(rng, 40))])
+        leaves = [event("leave_start", 1, "2024-01-05"), event("leave_end", 1, "2024-01-08")]
+
+        timeline = Timeline().add(purchases).add(shifts, ordered=False).add(counters).add(leaves, ordered=False)
+
+        assert list(timeline) == newest_first(purchases + shifts + counters + leaves)
+
+    def test_equal_dates_keep_stream_order(self):
+        timeline = Timeline()
+        timeline.add([event("purchase", 1, "2024-01-02"), event("purchase", 2, "2024-01-01")])
+        timeline.add([event("shift", 3, "2024-01-02"), event("shift", 4, "2024-01-02")])
+
+        assert [e.id for e in timeline] == [1, 3, 4, 2]
+
+    def test_events_without_date_last(self):
+        timeline = Timeline()
+        timeline.add([event("shift", 1, False), event("shift", 2, "2024-01-01")], ordered=False)
+        timeline.add([event("counter", 3, "2023-12-31")])
+
+        assert [e.id for e in timeline] == [2, 3, 1]
+
+    def test_generators_merged_lazily(self):
+        consumed = []
+
+        def purchases():
+            for i in range(1000):
+                consumed.append(i)
+                yield event("purchase", i, f"2024-{12 - i // 100:02d}-01")
+
+        timeline = Timeline().add(purchases()).add([event("shift", -1, "2024-12-15")])
+        merged = iter(timeline)
+
+        assert next(merged).id == -1
+        assert next(merged).id == 0
+        assert len(consumed) < 3
@@ -0,0 +1,58 @@
+"""
+Newest-first timeline of member history events.
+
+The history lists purchases, shifts, counter events and leaves, most
+recent first. Odoo already returns most of them in that order (purchases
+by date_order desc, counter events by create_date desc), so instead of
+concatenating every event and sorting the whole list, the timeline merges
+the ordered streams lazily (heapq.merge, O(n log k) for k streams). Only
+streams that are not ordered by their event date (shifts, whose technical
+FTOP events are dated by their counter event; leave ends) are sorted, on
+their own.
+
+The result is the same as a stable sort of the concatenated streams by
+date, most recent first: events with the same date keep the order of their
+streams, then their order within the stream.
+"""
+
+import heapq
+from typing import Iterable, Iterator, List
+
+from history_events import HistoryEvent
+
+
+def event_date_key(event: HistoryEvent) -> str:
+    """Sort key of a history event: its date, events without date last."""
+    return event.date if event.date else ""
+
+
+class Timeline:
+    """
+    Merge of event streams, most recent first.
+
+    Streams are merged in the order they were added when dates are equal.
+    Iterating the timeline consumes the streams added so far.
+    """
+
+    def __init__(self):
+        self._streams: List[Iterable[HistoryEvent]] = []
+
+    def add(self, events: Iterable[HistoryEvent], ordered: bool = True) -> "Timeline":
+        """
+        Add a stream of events.
+
+        Args:
+            events: Events or a generator of events
+            ordered: Whether the events already come most recent first; other
+                     streams are sorted (stable) before being merged
+
+        Returns:
+            The timeline, for chaining
+        """
+        if not ordered:
+            events = sorted(events, key=event_date_key, reverse=True)
+        self._streams.append(events)
+        return self
+
+    def __iter__(self) -> Iterator[HistoryEvent]:
+        return heapq.merge(*self._streams, key=event_date_key, reverse=True)
@@ -124,6 +124,35 @@ def validate_positive_int(value: Any, field_name: str = "value") -> int:
         raise ValueError(f"{field_name} must be a positive integer")
 
 
+def validate_non_negative_int(value: Any, field_name: str = "value") -> int:
+    """
+    Validate that a value is a non-negative integer.
+
+    Args:
+        value: Value to validate
+        field_name: Name of field for error message
+
+    Returns:
+        Integer value if valid
+
+    Raises:
+        ValueError: If value is not a non-negative integer
+
+    Examples:
+        >>> validate_non_negative_int("00", "offset")
+        0
+        >>> validate_non_negative_int(-5, "offset")
+        ValueError: offset must be a non-negative integer
+    """
+    try:
+        int_value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field_name} must be a non-negative integer")
+    if int_value < 0:
+        raise ValueError(f"{field_name} must be a non-negative integer")
+    return int_value
+
+
 def safe_get(dictionary: dict, key: str, default: Any = None) -> Any:
     """
     Safely get a value from a dictionary with a default.
@@ -141,6 +170,22 @@ def safe_get(dictionary: dict, key: str, default: Any = None) -> Any:
     return dictionary.get(key, default)
 
 
+def get_cache_dir() -> str:
+    """
+    Get the directory for on-disk caches and local stores, creating it if needed.
+
+    Uses the CACHE_DIR environment variable, defaulting to .cache in the
+    backend directory.
+
+    Returns:
+        Absolute path of the cache directory
+    """
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    cache_dir = os.path.abspath(os.getenv("CACHE_DIR", os.path.join(backend_dir, ".cache")))
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
 def load_cycle_data(year: int = 2025) -> Optional[dict]:
     """
     DEPRECATED: Load cycle data from the cycles JSON file.
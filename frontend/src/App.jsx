@@ -17,6 +17,7 @@ function App() {
   const [counterTotals, setCounterTotals] = useState(null)
   const [memberShares, setMemberShares] = useState(null)
   const [cycleConfig, setCycleConfig] = useState(null)
+  const [brokenPhotos, setBrokenPhotos] = useState({})
 
   // Use relative URLs if VITE_API_URL is undefined, otherwise use the provided URL
   const apiUrl = import.meta.env.VITE_API_URL !== undefined
@@ -93,46 +94,36 @@ function App() {
     setHistoryLoading(true)
 
     try {
-      // Fetch member history (required)
-      const historyResponse = await fetch(`${apiUrl}/api/member/${member.id}/history`)
+      // History, status and shares in one round trip; each section
+      // reports its own error
+      const profileResponse = await fetch(`${apiUrl}/api/member/${member.id}/profile`)
+      const profileData = await profileResponse.json()
 
-      if (!historyResponse.ok) {
-        const historyData = await historyResponse.json()
-        throw new Error(historyData.error || 'Failed to fetch history')
+      if (!profileResponse.ok) {
+        throw new Error(profileData.error || 'Failed to fetch member profile')
       }
 
-      const historyData = await historyResponse.json()
+      // History is required
+      const historyData = profileData.history
+      if (historyData.error) {
+        throw new Error(historyData.error)
+      }
       setHistoryEvents(historyData.events || [])
       setLeaves(historyData.leaves || [])
       setHolidays(historyData.holidays || [])
       setCounterTotals(historyData.counter_totals || null)
 
-      // Fetch member status (optional - don't fail if this errors)
-      try {
-        const statusResponse = await fetch(`${apiUrl}/api/member/${member.id}/status`)
-        if (statusResponse.ok) {
-          const statusData = await statusResponse.json()
-          setMemberStatus(statusData)
-        } else {
-          console.warn('Failed to fetch member status, continuing without it')
-        }
-       } catch (statusErr) {
-         console.warn('Error fetching member status:', statusErr)
-         // Continue without status - it's not critical
-       }
+      // Status and shares are optional - continue without them on error
+      if (profileData.status.error) {
+        console.warn('Failed to fetch member status, continuing without it:', profileData.status.error)
+      } else {
+        setMemberStatus(profileData.status)
+      }
 
-      // Fetch member shares (optional - don't fail if this errors)
-      try {
-        const sharesResponse = await fetch(`${apiUrl}/api/member/${member.id}/shares`)
-        if (sharesResponse.ok) {
-          const sharesData = await sharesResponse.json()
-          setMemberShares(sharesData)
-        } else {
-          console.warn('Failed to fetch member shares, continuing without it')
-        }
-      } catch (sharesErr) {
-        console.warn('Error fetching member shares:', sharesErr)
-        // Continue without shares - it's not critical
+      if (profileData.shares.error) {
+        console.warn('Failed to fetch member shares, continuing without it:', profileData.shares.error)
+      } else {
+        setMemberShares(profileData.shares)
       }
     } catch (err) {
       setHistoryError(err.message || 'An error occurred')
@@ -149,6 +140,13 @@ function App() {
     return null
   }
 
+  // Search results reference cached photo URLs (full mode still inlines base64)
+  const getMemberPhotoSrc = (member) => {
+    if (brokenPhotos[member.id]) return null
+    if (member.photo_url) return `${apiUrl}${member.photo_url}`
+    return getImageSrc(member.image)
+  }
+
   const getInitials = (name) => {
     if (!name) return '?'
     const parts = name.split(',').map(p => p.trim())
@@ -409,10 +407,12 @@ function App() {
                     >
                       <div className="flex items-start gap-4">
                         <div className="flex-shrink-0">
-                          {getImageSrc(member.image) ? (
+                          {getMemberPhotoSrc(member) ? (
                             <img
-                              src={getImageSrc(member.image)}
+                              src={getMemberPhotoSrc(member)}
                               alt={member.name}
+                              loading="lazy"
+                              onError={() => setBrokenPhotos((prev) => ({ ...prev, [member.id]: true }))}
                               className="w-16 h-16 rounded-full object-cover border-2 border-purple-300 shadow-md"
                             />
                           ) : (